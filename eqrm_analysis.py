@@ -12,6 +12,10 @@ if __name__ == '__main__':
     if eqrm_dir == '':
         eqrm_dir = '.'
 
+    # --resume carries on from the checkpoints of a run that stopped
+    resume = '--resume' in argv
+    if resume:
+        argv.remove('--resume')
     if len(argv) > 2:
         f = argv[1]  # note argv[0] will be 'main.py'
         use_determ_seed = argv[2]
@@ -32,7 +36,8 @@ if __name__ == '__main__':
             elif compress_output is 'n':
                 print 'Not compressing output'
                 compress_output = False
-        main(f, use_determ_seed, compress_output=compress_output)
+        main(f, use_determ_seed, compress_output=compress_output,
+             resume=resume)
     else:
         assert len(argv) == 1
         import profile
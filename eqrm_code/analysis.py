@@ -19,16 +19,18 @@ import os
 import time
 import shutil
 import copy
+import random
 import datetime
 import sys
 platform = sys.platform
 
 from scipy import where, newaxis, array, isfinite, zeros, \
-    arange, reshape, tile, ravel
+    arange, reshape, tile, ravel, searchsorted, concatenate, unique
+from numpy import broadcast_arrays, random as numpy_random
 
 from eqrm_code.parse_in_parameters import  \
     AttributeSyntaxError, create_parameter_data, eqrm_flags_to_control_file
-from eqrm_code.event_set import create_event_set
+from eqrm_code.event_set import create_event_set, Event_Activity_Table
 from eqrm_code.ground_motion_interface import BEDROCKVs30
 from eqrm_code.regolith_amplification_model import get_soil_SA, \
     Regolith_amplification_model, load_site_class2Vs30
@@ -38,34 +40,91 @@ from eqrm_code.output_manager import save_motion_to_binary, save_distances, \
     join_parallel_files, join_parallel_files_column, \
     join_parallel_data_files, \
     save_damage, save_fatalities, \
-    save_bridge_days_to_complete
+    save_bridge_days_to_complete, FILE_TAG_DELIMITER
 from eqrm_code.util import reset_seed, determine_eqrm_path, \
     get_local_or_default, add_last_directory
 from .ground_motion_distribution import Distribution_Log_Normal, \
-    GroundMotionDistributionLogNormal
+    GroundMotionDistributionLogNormal, Random_Stream
 from eqrm_code.structures import Structures
 from eqrm_code.structures_vulnerability import Structures_Vulnerability
 from eqrm_code.exceedance_curves import hzd_do_value, \
-    collapse_att_model, collapse_source_gmms
+    hazard_grid, accumulate_hazard_histogram, hzd_do_value_histogram, \
+    HAZARD_GRID_MAX_SA, collapse_att_model, collapse_source_gmms
 from eqrm_code.sites import Sites, truncate_sites_for_test
-from eqrm_code.parallel import Parallel
+from eqrm_code.parallel import Parallel, run_local_processes
 from eqrm_code.ANUGA_utilities import log
 from eqrm_code.bridges import Bridges
 from . import eqrm_filesystem as eq_fs
 from eqrm_code.RSA2MMI import rsa2mmi_array
 from eqrm_code.fatalities import forecast_fatality
-from eqrm_code.filters import source_model_threshold_distance_subset
+from eqrm_code.filters import source_model_threshold_distance_subset, \
+    Event_Spatial_Index
 from eqrm_code.analysis_data import Analysis_Data
+from eqrm_code.checkpoint import save_checkpoint, load_checkpoint, \
+    remove_checkpoint, save_block_done, load_block_done, remove_block_done
+from eqrm_code.distance_cache import Distance_Cache, event_set_fingerprint, \
+    distances_key
+from eqrm_code.ground_motion_calculator import Distribution_Buffers
 
 logs_per_scenario_con = 10
 
 
+def create_run_inputs(eqrm_flags, parallel):
+    """
+    Make the inputs of the site loop that are the same for every site.
+
+    Returns a dictionary of the event_set, with its per-event rupture
+    geometry, the event_activity, spawned, the source_model, the
+    event_index (an Event_Spatial_Index), the sites of the run, the
+    ground_motion_distribution and the event_activity_table.
+    """
+    # load event set data
+    (event_set, event_activity, source_model) = create_event_set(eqrm_flags,
+                                                                 parallel)
+
+    # Index the events, so only the events that may be close to a
+    # block of sites have their distances calculated.
+    event_index = Event_Spatial_Index(event_set)
+
+    # Work out the per-event distance terms once.  The event set
+    # slices for each block of sites take a slice of them.
+    event_set.rupture_geometry()
+
+    # load all data into a 'sites' object
+    # if we have bridge data, 'have_bridge_data' will be True
+    sites = load_data(eqrm_flags)
+
+    # if required, 'thin' sites for testing
+    all_sites = truncate_sites_for_test(eqrm_flags.use_site_indexes, sites,
+                                        eqrm_flags.site_indexes)
+
+    ground_motion_distribution = GroundMotionDistributionLogNormal(
+        eqrm_flags.atten_variability_method,
+        eqrm_flags.atten_spawn_bins,
+        event_activity.recurrence_model_count())
+
+    event_activity.spawn(ground_motion_distribution.spawn_weights)
+
+    # The site independent event activity used in calc_and_save_SA
+    event_activity_table = Event_Activity_Table(event_activity, source_model)
+
+    return {'event_set': event_set,
+            'event_activity': event_activity,
+            'source_model': source_model,
+            'event_index': event_index,
+            'sites': all_sites,
+            'ground_motion_distribution': ground_motion_distribution,
+            'event_activity_table': event_activity_table}
+
+
 def main(parameter_handle,
          use_determ_seed=True,
          compress_output=False,
          eqrm_dir=None,
          is_parallel=True,
-         parallel_finalise=True):
+         parallel_finalise=True,
+         resume=False,
+         run_inputs=None):
     """Script to run eqrm program.
 
     The parameters are defined by the parameter_handle.
@@ -82,6 +141,13 @@ def main(parameter_handle,
     output_file.txt
 
     eqrm_dir: The directory which 'eqrm_code' and 'resources' reside.
+
+    If resume is True, each node starts at the site of its last
+    checkpoint (see checkpoint_interval), with the random number
+    generators in the state they were in at the checkpoint.
+
+    run_inputs is used by local processes (see local_processes), to
+    share the inputs made by create_run_inputs before they started.
     """
     t0 = t0_clock = time.clock()
     t0_time = time.time()
@@ -90,6 +156,14 @@ def main(parameter_handle,
     if eqrm_dir is None:
         eqrm_dir = determine_eqrm_path(__file__)
 
+    # The arguments for main, if local processes are used.
+    main_kwargs = {'use_determ_seed': use_determ_seed,
+                   'compress_output': compress_output,
+                   'eqrm_dir': eqrm_dir,
+                   'is_parallel': is_parallel,
+                   'parallel_finalise': parallel_finalise,
+                   'resume': resume}
+
     # Get an object that holds all the parameters in parameter_handle.
     # Note that arrays and floating point numbers will be converted,
     # everthing else will be a string.
@@ -101,7 +175,8 @@ def main(parameter_handle,
             use_determ_seed=use_determ_seed,
             compress_output=compress_output,
             eqrm_dir=eqrm_dir,
-            is_parallel=is_parallel)
+            is_parallel=is_parallel,
+            resume=resume)
     except AttributeSyntaxError as e:
         print 'File parameter error:', e
         import sys
@@ -112,6 +187,7 @@ def main(parameter_handle,
     del compress_output
     del eqrm_dir
     del is_parallel
+    del resume
 
     # Reset random seeds if required
     # If use_determ_seed is True, then use a hardwired seed.
@@ -121,6 +197,20 @@ def main(parameter_handle,
     # Setting up parallelisation
     parallel = Parallel(eqrm_flags.is_parallel)
 
+    # If MPI is not being used, run main in local processes instead.
+    # The run inputs are made once, and the processes are forked, so
+    # they share the arrays, copy on write.
+    if (eqrm_flags.is_parallel and not parallel.is_parallel and
+            eqrm_flags.local_processes > 1 and run_inputs is None):
+        add_last_directory(eqrm_flags.output_dir)
+        run_inputs = create_run_inputs(eqrm_flags, parallel)
+        run_inputs['random_state'] = (random.getstate(),
+                                      numpy_random.get_state())
+        run_local_processes(eqrm_flags.local_processes, main,
+                            parameter_handle, run_inputs=run_inputs,
+                            **main_kwargs)
+        return
+
     # Make the output dir, if it is not present
     if parallel.rank == 0:
         # print "Creating last directory, processor", parallel.rank
@@ -161,17 +251,29 @@ def main(parameter_handle,
     log.debug('Memory: Initial')
     log.resource_usage(tag=log.INITIAL_J)
 
-    # load event set data
-    (event_set, event_activity, source_model) = create_event_set(eqrm_flags,
-                                                                 parallel)
-
-    # load all data into a 'sites' object
-    # if we have bridge data, 'have_bridge_data' will be True
-    sites = load_data(eqrm_flags)
-
-    # if required, 'thin' sites for testing
-    all_sites = truncate_sites_for_test(eqrm_flags.use_site_indexes, sites,
-                                        eqrm_flags.site_indexes)
+    if run_inputs is None:
+        run_inputs = create_run_inputs(eqrm_flags, parallel)
+    elif parallel.rank == 0:
+        # Rank 0 goes on from the random state after making the event
+        # set, as if it had made it.
+        random.setstate(run_inputs['random_state'][0])
+        numpy_random.set_state(run_inputs['random_state'][1])
+    event_set = run_inputs['event_set']
+    event_activity = run_inputs['event_activity']
+    source_model = run_inputs['source_model']
+    event_index = run_inputs['event_index']
+    all_sites = run_inputs['sites']
+    ground_motion_distribution = run_inputs['ground_motion_distribution']
+    event_activity_table = run_inputs['event_activity_table']
+
+    # The distances of each block of sites can be kept on disk, for
+    # runs with the same sites and event set.
+    distance_cache = None
+    if eqrm_flags.distance_cache_dir is not None:
+        distance_cache = Distance_Cache(
+            eqrm_flags.distance_cache_dir,
+            eqrm_flags.distance_cache_max_mb * 1024 * 1024)
+        event_set_key = event_set_fingerprint(event_set)
 
     # Save sites to numpy array
     if parallel.rank == 0:
@@ -179,7 +281,6 @@ def main(parameter_handle,
                              eqrm_flags.site_tag,
                              sites=all_sites)
 
-    del sites
     num_sites = len(all_sites)
 
     log.info('P%s: Sites set created. Number of sites=%s' % (parallel.rank,
@@ -196,12 +297,9 @@ def main(parameter_handle,
     num_rm = event_activity.recurrence_model_count()
     log.log_json({log.RECMOD_J: num_rm}, log.INFO)
 
-    ground_motion_distribution = GroundMotionDistributionLogNormal(
-        eqrm_flags.atten_variability_method,
-        eqrm_flags.atten_spawn_bins,
-        num_rm)
-
-    event_activity.spawn(ground_motion_distribution.spawn_weights)
+    # Scratch space for the ground motion model results, used by
+    # every source at every block of sites.
+    ground_motion_buffers = Distribution_Buffers()
 
     log.log_json({log.PSEUDOEVENTS_J: num_pseudo_events}, log.INFO)
     log.debug('Memory: Pseudo Event Set created')
@@ -235,537 +333,686 @@ def main(parameter_handle,
 
     # parallelising over the site loop.
     parallel.calc_lo_hi(num_sites)
-    all_sites = all_sites[parallel.calc_indices(num_sites)]
-    num_site_block = len(all_sites)
-    msg = ('blocking over sites if running in parallel. block_size=' +
-           str(num_site_block))
-    log.debug(msg)
-    log.log_json({log.BLOCKSITES_J: num_site_block}, log.DEBUG)
-
-    msg = 'Number of atten_periods=' + str(len(eqrm_flags.atten_periods))
-    log.debug(msg)
-
-    if eqrm_flags.use_amplification is True:
-        log.log_json({log.SASURFACES_J: 2}, log.DEBUG)
-    else:
-        log.log_json({log.SASURFACES_J: 1}, log.DEBUG)
-
-    # initialise some matrices.  These matrices have a site dimension and
-    # are filled while looping over sites.  Whether they are needed or
-    # not often depends on what is being saved.
+    dynamic_scheduler = eqrm_flags.site_scheduler == 'dynamic'
+    if dynamic_scheduler:
+        # The sites are split into chunks, that are handed out to the
+        # nodes on demand.  Each chunk is saved as a file block.
+        chunk_indices = parallel.calc_chunk_indices(
+            num_sites, eqrm_flags.site_chunk_size)
+    run_sites = all_sites
+    # Are the files of the blocks joined at the end?
+    join_blocks = parallel.is_parallel or dynamic_scheduler
+
+    # Loop over the work of this node.  With the striped scheduler
+    # this is one pass over the sites of this node.
+    first_pass = True
+    while True:
+        if dynamic_scheduler:
+            chunk = parallel.next_chunk(len(chunk_indices))
+            if chunk is None:
+                break
+            site_indices = chunk_indices[chunk]
+            block_tag = FILE_TAG_DELIMITER + str(chunk)
+            write_title = (chunk == 0)
+        elif first_pass:
+            site_indices = parallel.calc_indices(num_sites)
+            block_tag = parallel.file_tag
+            write_title = (parallel.rank == 0)
+        else:
+            break
+        first_pass = False
+
+        if (eqrm_flags.resume is True and join_blocks and
+                load_block_done(eqrm_flags.output_dir, block_tag,
+                                site_indices) is not None):
+            # The results of these sites were saved before the run
+            # stopped.
+            log.info('P%i: skipping saved block %s' %
+                     (parallel.rank, block_tag))
+            continue
 
-    data = Analysis_Data()
+        all_sites = run_sites[site_indices]
+        num_site_block = len(all_sites)
+        msg = ('blocking over sites if running in parallel. block_size=' +
+               str(num_site_block))
+        log.debug(msg)
+        log.log_json({log.BLOCKSITES_J: num_site_block}, log.DEBUG)
 
-    if eqrm_flags.save_hazard_map is True:
-        data.bedrock_hazard = zeros((num_site_block,
-                                     len(eqrm_flags.atten_periods),
-                                     len(eqrm_flags.return_periods)),
-                                    dtype=float)
+        msg = 'Number of atten_periods=' + str(len(eqrm_flags.atten_periods))
+        log.debug(msg)
 
-        log.log_json({log.BEDROCKHAZ_J: data.bedrock_hazard.nbytes},
-                     log.DEBUG)
-    else:
-        data.bedrock_hazard = None
-
-    if eqrm_flags.save_hazard_map is True and \
-            eqrm_flags.use_amplification is True:
-        data.soil_hazard = zeros((num_site_block,
-                                  len(eqrm_flags.atten_periods),
-                                  len(eqrm_flags.return_periods)),
-                                 dtype=float)
-        log.log_json({log.SOILHAZ_J: data.soil_hazard.nbytes},
-                     log.DEBUG)
-    else:
-        data.soil_hazard = None
-    log.debug('Memory: hazard_map array created')
-    log.resource_usage()
-    num_gmm_dimensions = event_activity.get_gmm_dimensions()
-
-    log.log_json({log.EVENTACTIVITY_J: event_activity.get_bytes()},
-                 log.DEBUG)
-    if eqrm_flags.save_motion is True:
-        data.bedrock_SA_all = zeros((num_spawning, num_gmm_dimensions, num_rm,
-                                     num_site_block, num_events,
-                                     len(eqrm_flags.atten_periods)),
-                                    dtype=float)
-        log_dic = {"cra_site_block": num_site_block,
-                   "cra_spawning": num_spawning,
-                   "cra_num_gmm_dimensions_motion": num_gmm_dimensions,
-                   "cra_num_rm": num_rm,
-                   "cra_num_events": num_events,
-                   "cra_return_periods": len(eqrm_flags.return_periods)}
-        log.log_json(log_dic,
-                     log.DEBUG)
-        log.log_json({log.BEDROCKALL_J: data.bedrock_SA_all.nbytes},
-                     log.DEBUG)
-    else:
-        data.bedrock_SA_all = None
-
-    if eqrm_flags.save_motion is True and \
-            eqrm_flags.use_amplification is True:
-        data.soil_SA_all = zeros((num_spawning, num_gmm_dimensions, num_rm,
-                                  num_site_block, num_events,
-                                  len(eqrm_flags.atten_periods)),
-                                 dtype=float)
-        log.log_json({log.SOILALL_J: data.soil_SA_all.nbytes},
-                     log.DEBUG)
-    else:
-        data.soil_SA_all = None
-    log.debug('Memory: save_motion array created')
-    log.resource_usage()
+        if eqrm_flags.use_amplification is True:
+            log.log_json({log.SASURFACES_J: 2}, log.DEBUG)
+        else:
+            log.log_json({log.SASURFACES_J: 1}, log.DEBUG)
 
-    if eqrm_flags.save_fatalities is True:
-        total_fatalities = zeros((num_site_block, num_pseudo_events),
-                                 dtype=float)
-
-    if eqrm_flags.save_total_financial_loss is True:
-        total_building_loss_qw = zeros((num_site_block, num_spawning,
-                                        num_gmm_max, num_rm, num_events),
-                                       dtype=float)
-    if eqrm_flags.save_building_loss is True:
-        building_loss_qw = zeros((num_site_block, num_spawning,
-                                  num_gmm_max, num_rm, num_events),
-                                 dtype=float)
-    if eqrm_flags.save_contents_loss is True:
-        contents_loss_qw = zeros((num_site_block, num_spawning,
-                                  num_gmm_max, num_rm, num_events),
-                                 dtype=float)
-    if (eqrm_flags.save_prob_structural_damage is True and
-            num_pseudo_events == 1):
-        # total_structure_damage, given as a non-cumulative
-        # probability. The axis are  sites, model_generated_psudo_events,
-        # damage_states
-        # (the damage_states are slight, moderate, extensive and complete.
-        # subtract all of these from 1 to get the prob of no damage.)
-        total_structure_damage = zeros((num_site_block, 4), dtype=float)
-
-    # create result array to save 'days to complete' data
-    # need to store 'fp' days + state field
-
-    if eqrm_flags.bridges_functional_percentages is not None:
-        saved_days_to_complete = zeros((
-            num_site_block, num_pseudo_events,
-            len(eqrm_flags.bridges_functional_percentages)))
-
-    log.debug('Memory: Created all data collection arrays.')
-    log.resource_usage()
+        # initialise some matrices.  These matrices have a site dimension and
+        # are filled while looping over sites.  Whether they are needed or
+        # not often depends on what is being saved.
 
-    # if we're doing fatality calculation
-    # check the attenuation period is 1.0 seconds and only 1 dimension
-    if eqrm_flags.run_type == "fatality":
-        if not ((len(eqrm_flags.atten_periods) == 1) and
-                (eqrm_flags.atten_periods[0] == 1.0)):
-            msg = "Attenuation period should be [1.0] for fatality calculation"
-            raise RuntimeError(msg)
+        data = Analysis_Data()
 
-    for i in xrange(num_site_block):
-        rel_i = i  # - parallel.lo
-        msg = 'P%i: do site ' % parallel.rank + str(i + 1) + ' of ' + \
-            str(num_site_block)
-        log.info(msg, logs_per_scenario=logs_per_scenario_con, site=rel_i,
-                 sites=num_site_block)
+        if eqrm_flags.save_hazard_map is True:
+            data.bedrock_hazard = zeros((num_site_block,
+                                         len(eqrm_flags.atten_periods),
+                                         len(eqrm_flags.return_periods)),
+                                        dtype=float)
 
-        log.debug('Memory: site ' + str(i + 1),
-                  logs_per_scenario=logs_per_scenario_con,
-                  site=rel_i,
-                  sites=num_site_block)
-        log.resource_usage(tag=log.LOOPING_J,
-                           logs_per_scenario=logs_per_scenario_con,
-                           site=rel_i,
-                           sites=num_site_block)
-
-        sites = all_sites[i:i + 1]  # take site i
-        distances = sites.distances_from_event_set(event_set)
-
-        ### HAZARD CALCULATIONS ###
-
-        # note if you take sites[i], it will collapse the dimension
-
-        # By not collapsing sites, and making the assignment
-        # sites=all_sites[i:i+1], the code will work with a single site
-        # at a time, without multiple reference to the loop variable 'i'.
-
-        # This also means that the code below will deal with a vectorized
-        # sites without any modification.
-        # To remove loop over sites, just disable the loop
-        # and remove the 'sites=all_sites[i:i+1]'.
-        # and change NUM_SITES_PER_SITE_LOOP
-
-        # CAUTIONS on doing multiple sites in a loop:
-        #  1.  this will run out of memory if sites*events is large.
-        #  2.  this has not been tested recently
-        #  3.  it absolutely will not work
-
-        # A source model subset - each event reference in the source model
-        # meets the attenuation threshold criteria i.e.
-        # This subset only has close events
-        source_model_subset = source_model_threshold_distance_subset(
-            distances,
-            source_model,
-            eqrm_flags.atten_threshold_distance)
-
-        soil_SA, bedrock_SA = calc_and_save_SA(
-            eqrm_flags,
-            sites,
-            event_set,
-            distances,
-            data.bedrock_SA_all,
-            data.soil_SA_all,
-            data.bedrock_hazard,
-            data.soil_hazard,
-            soil_amplification_model,
-            i,
-            rel_i,
-            ground_motion_distribution,
-            amp_distribution,
-            event_activity,
-            source_model_subset,
-            num_site_block)
-
-        # soil_SA and bedrock_SA dimensions
-        # (num_sites, num_events*num_gmm_max*num_spawn*num_rm, num_periods)
-        # soil_SA can also be None
-
-        ### POST-HAZARD SETUP ###
-
-        # Decide which SA to use post-hazard
-        if soil_SA is not None:
-            SA = soil_SA
+            log.log_json({log.BEDROCKHAZ_J: data.bedrock_hazard.nbytes},
+                         log.DEBUG)
         else:
-            SA = bedrock_SA
-
-        # smooth SA (function of periods) using a weighted
-        # running 3-point smoother
-
-        if not eqrm_flags.run_type == "hazard" and \
-                eqrm_flags.atten_smooth_spectral_acceleration is True:
-            SA[..., 1:-2] = (0.25 * SA[..., 0:-3] +
-                             0.50 * SA[..., 1:-2] +
-                             0.25 * SA[..., 2:-1])
-
-        ### RUN TYPE CALCULATIONS ###
+            data.bedrock_hazard = None
+
+        if eqrm_flags.save_hazard_map is True and \
+                eqrm_flags.use_amplification is True:
+            data.soil_hazard = zeros((num_site_block,
+                                      len(eqrm_flags.atten_periods),
+                                      len(eqrm_flags.return_periods)),
+                                     dtype=float)
+            log.log_json({log.SOILHAZ_J: data.soil_hazard.nbytes},
+                         log.DEBUG)
+        else:
+            data.soil_hazard = None
+        log.debug('Memory: hazard_map array created')
+        log.resource_usage()
+        num_gmm_dimensions = event_activity.get_gmm_dimensions()
 
-        # calculate fatality
+        log.log_json({log.EVENTACTIVITY_J: event_activity.get_bytes()},
+                     log.DEBUG)
+        if eqrm_flags.save_motion is True:
+            data.bedrock_SA_all = zeros((num_spawning, num_gmm_dimensions, num_rm,
+                                         num_site_block, num_events,
+                                         len(eqrm_flags.atten_periods)),
+                                        dtype=float)
+            log_dic = {"cra_site_block": num_site_block,
+                       "cra_spawning": num_spawning,
+                       "cra_num_gmm_dimensions_motion": num_gmm_dimensions,
+                       "cra_num_rm": num_rm,
+                       "cra_num_events": num_events,
+                       "cra_return_periods": len(eqrm_flags.return_periods)}
+            log.log_json(log_dic,
+                         log.DEBUG)
+            log.log_json({log.BEDROCKALL_J: data.bedrock_SA_all.nbytes},
+                         log.DEBUG)
+        else:
+            data.bedrock_SA_all = None
+
+        if eqrm_flags.save_motion is True and \
+                eqrm_flags.use_amplification is True:
+            data.soil_SA_all = zeros((num_spawning, num_gmm_dimensions, num_rm,
+                                      num_site_block, num_events,
+                                      len(eqrm_flags.atten_periods)),
+                                     dtype=float)
+            log.log_json({log.SOILALL_J: data.soil_SA_all.nbytes},
+                         log.DEBUG)
+        else:
+            data.soil_SA_all = None
+        log.debug('Memory: save_motion array created')
+        log.resource_usage()
+
+        if eqrm_flags.save_fatalities is True:
+            total_fatalities = zeros((num_site_block, num_pseudo_events),
+                                     dtype=float)
+
+        if eqrm_flags.save_total_financial_loss is True:
+            total_building_loss_qw = zeros((num_site_block, num_spawning,
+                                            num_gmm_max, num_rm, num_events),
+                                           dtype=float)
+        if eqrm_flags.save_building_loss is True:
+            building_loss_qw = zeros((num_site_block, num_spawning,
+                                      num_gmm_max, num_rm, num_events),
+                                     dtype=float)
+        if eqrm_flags.save_contents_loss is True:
+            contents_loss_qw = zeros((num_site_block, num_spawning,
+                                      num_gmm_max, num_rm, num_events),
+                                     dtype=float)
+        if (eqrm_flags.save_prob_structural_damage is True and
+                num_pseudo_events == 1):
+            # total_structure_damage, given as a non-cumulative
+            # probability. The axis are  sites, model_generated_psudo_events,
+            # damage_states
+            # (the damage_states are slight, moderate, extensive and complete.
+            # subtract all of these from 1 to get the prob of no damage.)
+            total_structure_damage = zeros((num_site_block, 4), dtype=float)
+
+        # create result array to save 'days to complete' data
+        # need to store 'fp' days + state field
+
+        if eqrm_flags.bridges_functional_percentages is not None:
+            saved_days_to_complete = zeros((
+                num_site_block, num_pseudo_events,
+                len(eqrm_flags.bridges_functional_percentages)))
+
+        log.debug('Memory: Created all data collection arrays.')
+        log.resource_usage()
+
+        # if we're doing fatality calculation
+        # check the attenuation period is 1.0 seconds and only 1 dimension
         if eqrm_flags.run_type == "fatality":
+            if not ((len(eqrm_flags.atten_periods) == 1) and
+                    (eqrm_flags.atten_periods[0] == 1.0)):
+                msg = "Attenuation period should be [1.0] for fatality calculation"
+                raise RuntimeError(msg)
+
+        # The arrays filled in the site loop, that are saved in
+        # checkpoints, and the site axis of the SA arrays.
+        checkpoint_site_axes = {'bedrock_SA_all': 3, 'soil_SA_all': 3}
+        checkpoint_arrays = {}
+        for name in ['bedrock_hazard', 'soil_hazard',
+                     'bedrock_SA_all', 'soil_SA_all']:
+            if getattr(data, name) is not None:
+                checkpoint_arrays[name] = getattr(data, name)
+        if eqrm_flags.save_fatalities is True:
+            checkpoint_arrays['total_fatalities'] = total_fatalities
+        if eqrm_flags.save_total_financial_loss is True:
+            checkpoint_arrays['total_building_loss_qw'] = \
+                total_building_loss_qw
+        if eqrm_flags.save_building_loss is True:
+            checkpoint_arrays['building_loss_qw'] = building_loss_qw
+        if eqrm_flags.save_contents_loss is True:
+            checkpoint_arrays['contents_loss_qw'] = contents_loss_qw
+        if (eqrm_flags.save_prob_structural_damage is True and
+                num_pseudo_events == 1):
+            checkpoint_arrays['total_structure_damage'] = \
+                total_structure_damage
+        if eqrm_flags.bridges_functional_percentages is not None:
+            checkpoint_arrays['saved_days_to_complete'] = \
+                saved_days_to_complete
+
+        # Sites are processed in blocks of up to site_block_size sites.
+        # A block is shrunk if the number of (site, close event) pairs it
+        # would hold exceeds site_block_max_close_pairs.
+        i = 0
+        if eqrm_flags.resume is True:
+            # Skip the sites done before the last checkpoint.
+            i = load_checkpoint(eqrm_flags.output_dir, block_tag,
+                                site_indices, checkpoint_arrays,
+                                checkpoint_site_axes)
+            log.info('P%i: resuming at site %i of %i' %
+                     (parallel.rank, i + 1, num_site_block))
+        checkpoint_site = i
+
+        # This means calc_total_loss does not know about the
+        # dimensions of multiple gmms and spawning.  It is the same
+        # array for every block, so the capacity spectrum model can
+        # reuse the capacity parameters and kappa of building types.
+        overloaded_MW = tile(event_set.Mw,
+                             num_gmm_max * num_spawning * num_rm)
+
+        while i < num_site_block:
+            rel_i = i  # - parallel.lo
+            msg = 'P%i: do site ' % parallel.rank + str(i + 1) + ' of ' + \
+                str(num_site_block)
+            log.info(msg, logs_per_scenario=logs_per_scenario_con, site=rel_i,
+                     sites=num_site_block)
 
-            MMI = rsa2mmi_array(SA)
-
-            fatality = forecast_fatality(MMI,
-                                         sites.attributes['POPULATION'][0],
-                                         beta=eqrm_flags.fatality_beta,
-                                         theta=eqrm_flags.fatality_theta)
-
-            numelement = MMI.shape[1]
-
-            if eqrm_flags.save_fatalities is True:
-                total_fatalities[rel_i, :] = reshape(fatality[0,:, 0], numelement)
-
-        # calculate damage
-        elif eqrm_flags.run_type == "risk_csm":
-
-            # This means calc_total_loss does not know about the
-            # dimensions of multiple gmms and spawning.
-            overloaded_MW = tile(event_set.Mw,
-                                 num_gmm_max * num_spawning * num_rm)
-
-            (total_loss,
-             damage) = sites.calc_total_loss(SA, eqrm_flags, overloaded_MW)
-
-            assert isfinite(total_loss[0]).all()
-
-            # It is called total building loss since it includes contents
-            # break loss tuple into components
-            # structure_loss = structural loss
-            # nsd_loss = non-structural drift sensitive loss
-            # accel_loss = non-structural acceleration  sensitive loss
-            # con_loss = contents loss
-            (structure_loss, nsd_loss, accel_loss, con_loss) = total_loss
-            # The losses have the dimensions of (site, event)
-            # the event dimension is overloaded with event * max_gmm * spawning
-            # Can unload the event dimension.
-            #  dimensions of (site, spawn, max ground motion model, events)
-            newshape = (1, num_spawning, num_gmm_max, num_rm, num_events)
-            structure_loss_qw = structure_loss.reshape(newshape)
-            nsd_loss_qw = nsd_loss.reshape(newshape)
-            accel_loss_qw = accel_loss.reshape(newshape)
-            con_loss_qw = con_loss.reshape(newshape)
-
-            # Putting economic loss values into a big array
-            # (number of buildings versus number of events)
-            # Note that this matrix is transposed before saving
-            # (i.e. to number of events versus number of buildings)
-            if eqrm_flags.save_total_financial_loss is True:
-                total_building_loss_qw[rel_i, ...] = (
-                    structure_loss_qw + nsd_loss_qw + accel_loss_qw
-                    + con_loss_qw)[0, ...]
-            if eqrm_flags.save_building_loss is True:
-                building_loss_qw[rel_i, ...] = (
-                    structure_loss_qw + nsd_loss_qw + accel_loss_qw)[0, ...]
-            if eqrm_flags.save_contents_loss is True:
-                contents_loss_qw[rel_i, ...] = con_loss_qw[0, ...]
-
-            if (eqrm_flags.save_prob_structural_damage is True and
-                    num_pseudo_events == 1):
-                # This is not cumulative
-                total_structure_damage[rel_i, :] = damage.structure_state
-
-        # calculate bridge damage
-        elif eqrm_flags.run_type == "bridge":
-            # print 'STARTING bridge damage calculations'
-
-            (damage,
-             days_to_complete) = sites.calc_total_loss(SA, eqrm_flags)
-
-            # accumulate days to complete
-            if eqrm_flags.bridges_functional_percentages is not None:
-                saved_days_to_complete[rel_i, :,:] = days_to_complete
-
-            if (eqrm_flags.save_prob_structural_damage is True and
-                    num_pseudo_events == 1):
-                # This is not cumulative
-                total_structure_damage[rel_i, :] = damage.structure_state
-
-        elif eqrm_flags.run_type == "risk_mmi":
-            # print 'STARTING vulnerability damage calculations
-            loss = sites.calc_loss(
-                SA,
-                atten_periods=eqrm_flags.atten_periods)
-
-            # This brings out all the psudo_event dimensions
-            newshape = (1, num_spawning, num_gmm_max, num_rm, num_events)
-            loss_qw = loss.reshape(newshape)
-
-            if eqrm_flags.save_building_loss is True:
-                building_loss_qw[rel_i, ...] = loss_qw[0, ...]
-
-        # Delete some objects before next loop to avoid memory spikes
-        del sites
-        del distances
-        del source_model_subset
-        del soil_SA
-        del bedrock_SA
-
-    # --------------------------------------------------------------
-    # THIS IS THE END OF THE LOOP OVER SITES
-
-    log.debug('Memory: Ended looping over sites')
-    log.resource_usage()
-
-    row_files_that_parallel_splits = []
-    column_files_that_parallel_splits = []
-    data_files_that_parallel_splits = []
-
-    event_loop_time = (time.clock() - t0)
-    #time_taken_site_loop = event_loop_time - time_taken_pre_site_loop
-    time_pre_site_loop_fraction = time_taken_pre_site_loop / event_loop_time
-
-    log.log_json({log.PRESITELOOP_J: time_pre_site_loop_fraction}, log.INFO)
-    msg = "event_loop_time (excluding file saving) " + \
-        str(datetime.timedelta(seconds=event_loop_time)) + " hr:min:sec"
-    log.info(msg)
-
-    log.log_json({log.EVENTLOOPTIME_J: event_loop_time}, log.INFO)
-
-    # print "time_taken_pre_site_loop", time_taken_pre_site_loop
-    # print "time_taken_site_loop", time_taken_site_loop
-
-    # SAVE HAZARD
-    if parallel.rank == 0:
-        write_title = True
-    else:
-        write_title = False
-
-    if eqrm_flags.save_hazard_map is True and parallel.lo != parallel.hi:
-        files = save_hazard(soil_amp=False, eqrm_flags=eqrm_flags,
-                            hazard=data.bedrock_hazard,
-                            sites=all_sites,
-                            compress=eqrm_flags.compress_output,
-                            parallel_tag=parallel.file_tag,
-                            write_title=(parallel.rank == False))
-        row_files_that_parallel_splits.extend(files)
-
-        if data.soil_hazard is not None:
-            files = save_hazard(soil_amp=True, eqrm_flags=eqrm_flags,
-                                hazard=data.soil_hazard,
+            log.debug('Memory: site ' + str(i + 1),
+                      logs_per_scenario=logs_per_scenario_con,
+                      site=rel_i,
+                      sites=num_site_block)
+            log.resource_usage(tag=log.LOOPING_J,
+                               logs_per_scenario=logs_per_scenario_con,
+                               site=rel_i,
+                               sites=num_site_block)
+
+            block_size = eqrm_flags.site_block_size
+            while True:
+                i_hi = min(i + block_size, num_site_block)
+                sites = all_sites[i:i_hi]  # take sites i to i_hi - 1
+                # Only the (site, event) pairs within the threshold
+                # distance are kept, a tile at a time, so the close
+                # events of the block are found without a dense
+                # (sites, candidate events) array.
+                close_pairs = sites.sparse_distances_from_event_set(
+                    event_set,
+                    ['Joyner_Boore'],
+                    threshold_distance=eqrm_flags.atten_threshold_distance,
+                    event_index=event_index)
+                close_events = unique(close_pairs.event_indexes)
+                if (block_size == 1 or len(sites) * len(close_events) <=
+                        eqrm_flags.site_block_max_close_pairs):
+                    break
+                block_size = max(1, block_size // 2)
+            num_sites_in_block = len(sites)
+
+            # The dense distances are only for the close events
+            distances = sites.distances_from_event_set(
+                event_set[close_events])
+            if distance_cache is not None:
+                distances.use_disk_cache(
+                    distance_cache,
+                    distances_key(sites.latitude, sites.longitude,
+                                  event_set_key, close_events))
+
+            # A source model subset - each event reference in the source
+            # model meets the attenuation threshold criteria for at
+            # least one site in the block i.e.
+            # This subset only has close events
+            source_model_subset = source_model_threshold_distance_subset(
+                distances,
+                source_model,
+                eqrm_flags.atten_threshold_distance,
+                event_indexes=close_events,
+                num_events=len(event_set),
+                source_event_indexes=(
+                    event_activity_table.source_event_indexes))
+
+            ### HAZARD CALCULATIONS ###
+
+            # note if you take sites[i], it will collapse the dimension
+
+            # By not collapsing sites, and making the assignment
+            # sites=all_sites[i:i_hi], the code below works on a block of
+            # sites, with site axes of length num_sites_in_block.
+            # Events that are close to one site in the block, but not to
+            # another, have their SA zeroed for the far sites in
+            # calc_and_save_SA.
+
+            soil_SA, bedrock_SA = calc_and_save_SA(
+                eqrm_flags,
+                sites,
+                event_set,
+                distances,
+                data.bedrock_SA_all,
+                data.soil_SA_all,
+                data.bedrock_hazard,
+                data.soil_hazard,
+                soil_amplification_model,
+                i,
+                rel_i,
+                ground_motion_distribution,
+                amp_distribution,
+                event_activity_table,
+                source_model_subset,
+                num_site_block,
+                distance_event_indexes=close_events,
+                ground_motion_buffers=ground_motion_buffers,
+                site_indexes=site_indices[i:i_hi])
+
+            # soil_SA and bedrock_SA dimensions
+            # (num_sites, num_events*num_gmm_max*num_spawn*num_rm, num_periods)
+            # soil_SA can also be None
+
+            ### POST-HAZARD SETUP ###
+
+            # Decide which SA to use post-hazard
+            if soil_SA is not None:
+                SA = soil_SA
+            else:
+                SA = bedrock_SA
+
+            # smooth SA (function of periods) using a weighted
+            # running 3-point smoother
+
+            if not eqrm_flags.run_type == "hazard" and \
+                    eqrm_flags.atten_smooth_spectral_acceleration is True:
+                SA[..., 1:-2] = (0.25 * SA[..., 0:-3] +
+                                 0.50 * SA[..., 1:-2] +
+                                 0.25 * SA[..., 2:-1])
+
+            ### RUN TYPE CALCULATIONS ###
+
+            # calculate fatality
+            if eqrm_flags.run_type == "fatality":
+
+                MMI = rsa2mmi_array(SA)
+
+                population = sites.attributes['POPULATION'][:, newaxis, newaxis]
+                fatality = forecast_fatality(MMI,
+                                             population,
+                                             beta=eqrm_flags.fatality_beta,
+                                             theta=eqrm_flags.fatality_theta)
+
+                numelement = MMI.shape[1]
+
+                if eqrm_flags.save_fatalities is True:
+                    total_fatalities[i:i_hi, :] = reshape(
+                        fatality[:, :, 0], (num_sites_in_block, numelement))
+
+            # calculate damage
+            elif eqrm_flags.run_type == "risk_csm":
+
+                (total_loss,
+                 damage) = sites.calc_total_loss(SA, eqrm_flags, overloaded_MW)
+
+                assert isfinite(total_loss[0]).all()
+
+                # It is called total building loss since it includes contents
+                # break loss tuple into components
+                # structure_loss = structural loss
+                # nsd_loss = non-structural drift sensitive loss
+                # accel_loss = non-structural acceleration  sensitive loss
+                # con_loss = contents loss
+                (structure_loss, nsd_loss, accel_loss, con_loss) = total_loss
+                # The losses have the dimensions of (site, event)
+                # the event dimension is overloaded with event * max_gmm * spawning
+                # Can unload the event dimension.
+                #  dimensions of (site, spawn, max ground motion model, events)
+                newshape = (num_sites_in_block, num_spawning, num_gmm_max,
+                            num_rm, num_events)
+                structure_loss_qw = structure_loss.reshape(newshape)
+                nsd_loss_qw = nsd_loss.reshape(newshape)
+                accel_loss_qw = accel_loss.reshape(newshape)
+                con_loss_qw = con_loss.reshape(newshape)
+
+                # Putting economic loss values into a big array
+                # (number of buildings versus number of events)
+                # Note that this matrix is transposed before saving
+                # (i.e. to number of events versus number of buildings)
+                if eqrm_flags.save_total_financial_loss is True:
+                    total_building_loss_qw[i:i_hi, ...] = (
+                        structure_loss_qw + nsd_loss_qw + accel_loss_qw
+                        + con_loss_qw)
+                if eqrm_flags.save_building_loss is True:
+                    building_loss_qw[i:i_hi, ...] = (
+                        structure_loss_qw + nsd_loss_qw + accel_loss_qw)
+                if eqrm_flags.save_contents_loss is True:
+                    contents_loss_qw[i:i_hi, ...] = con_loss_qw
+
+                if (eqrm_flags.save_prob_structural_damage is True and
+                        num_pseudo_events == 1):
+                    # This is not cumulative
+                    total_structure_damage[i:i_hi, :] = \
+                        damage.structure_state.reshape((num_sites_in_block, 4))
+
+            # calculate bridge damage
+            elif eqrm_flags.run_type == "bridge":
+                # print 'STARTING bridge damage calculations'
+
+                (damage,
+                 days_to_complete) = sites.calc_total_loss(SA, eqrm_flags)
+
+                # accumulate days to complete
+                if eqrm_flags.bridges_functional_percentages is not None:
+                    saved_days_to_complete[rel_i, :,:] = days_to_complete
+
+                if (eqrm_flags.save_prob_structural_damage is True and
+                        num_pseudo_events == 1):
+                    # This is not cumulative
+                    total_structure_damage[rel_i, :] = damage.structure_state
+
+            elif eqrm_flags.run_type == "risk_mmi":
+                # print 'STARTING vulnerability damage calculations
+                loss = sites.calc_loss(
+                    SA,
+                    atten_periods=eqrm_flags.atten_periods)
+
+                # This brings out all the psudo_event dimensions
+                newshape = (1, num_spawning, num_gmm_max, num_rm, num_events)
+                loss_qw = loss.reshape(newshape)
+
+                if eqrm_flags.save_building_loss is True:
+                    building_loss_qw[rel_i, ...] = loss_qw[0, ...]
+
+            # Delete some objects before next loop to avoid memory spikes
+            del sites
+            del distances
+            del source_model_subset
+            del soil_SA
+            del bedrock_SA
+
+            i = i_hi
+
+            if (eqrm_flags.checkpoint_interval is not None and
+                    i < num_site_block and
+                    i - checkpoint_site >= eqrm_flags.checkpoint_interval):
+                # Only the sites done since the last checkpoint
+                save_checkpoint(eqrm_flags.output_dir, block_tag,
+                                checkpoint_site, i, site_indices,
+                                checkpoint_arrays, checkpoint_site_axes)
+                checkpoint_site = i
+
+        # --------------------------------------------------------------
+        # THIS IS THE END OF THE LOOP OVER SITES
+
+        log.debug('Memory: Ended looping over sites')
+        log.resource_usage()
+
+        row_files_that_parallel_splits = []
+        column_files_that_parallel_splits = []
+        data_files_that_parallel_splits = []
+
+        event_loop_time = (time.clock() - t0)
+        #time_taken_site_loop = event_loop_time - time_taken_pre_site_loop
+        time_pre_site_loop_fraction = time_taken_pre_site_loop / event_loop_time
+
+        log.log_json({log.PRESITELOOP_J: time_pre_site_loop_fraction}, log.INFO)
+        msg = "event_loop_time (excluding file saving) " + \
+            str(datetime.timedelta(seconds=event_loop_time)) + " hr:min:sec"
+        log.info(msg)
+
+        log.log_json({log.EVENTLOOPTIME_J: event_loop_time}, log.INFO)
+
+        # print "time_taken_pre_site_loop", time_taken_pre_site_loop
+        # print "time_taken_site_loop", time_taken_site_loop
+
+        # SAVE HAZARD
+        if eqrm_flags.save_hazard_map is True and num_site_block > 0:
+            files = save_hazard(soil_amp=False, eqrm_flags=eqrm_flags,
+                                hazard=data.bedrock_hazard,
+                                sites=all_sites,
                                 compress=eqrm_flags.compress_output,
-                                parallel_tag=parallel.file_tag,
-                                write_title=(parallel.rank == False))
+                                parallel_tag=block_tag,
+                                write_title=write_title)
             row_files_that_parallel_splits.extend(files)
 
-    # Save Ground Motion
-    if eqrm_flags.save_motion is True and parallel.lo != parallel.hi:
-
-        # Save to csv
-        # TODO: This is deprecated, remove once post-processing scripts written
-        a_file = save_sites_to_csv(eqrm_flags.output_dir,
-                                   eqrm_flags.site_tag,
-                                   sites=all_sites,
-                                   compress=eqrm_flags.compress_output,
-                                   parallel_tag=parallel.file_tag,
-                                   write_title=(parallel.rank == False))
-        # save_hazard also calls save_sites. Only append if not already exists.
-        # FIXME: This will overwrite what is written in save_hazard.
-        #        Is this correct?
-        if a_file not in row_files_that_parallel_splits:
-            row_files_that_parallel_splits.append(a_file)
-
-        # Save to numpy binary
-        a_file, _ = save_motion_to_binary(soil_amp=False,
-                                          eqrm_flags=eqrm_flags,
-                                          motion=data.bedrock_SA_all,
-                                          parallel_tag=parallel.file_tag)
-        data_files_that_parallel_splits.append(a_file)
+            if data.soil_hazard is not None:
+                files = save_hazard(soil_amp=True, eqrm_flags=eqrm_flags,
+                                    hazard=data.soil_hazard,
+                                    compress=eqrm_flags.compress_output,
+                                    parallel_tag=block_tag,
+                                    write_title=write_title)
+                row_files_that_parallel_splits.extend(files)
+
+        # Save Ground Motion
+        if eqrm_flags.save_motion is True and num_site_block > 0:
+
+            # Save to csv
+            # TODO: This is deprecated, remove once post-processing scripts written
+            a_file = save_sites_to_csv(eqrm_flags.output_dir,
+                                       eqrm_flags.site_tag,
+                                       sites=all_sites,
+                                       compress=eqrm_flags.compress_output,
+                                       parallel_tag=block_tag,
+                                       write_title=write_title)
+            # save_hazard also calls save_sites. Only append if not already exists.
+            # FIXME: This will overwrite what is written in save_hazard.
+            #        Is this correct?
+            if a_file not in row_files_that_parallel_splits:
+                row_files_that_parallel_splits.append(a_file)
 
-        if data.soil_SA_all is not None:
             # Save to numpy binary
-            a_file, _ = save_motion_to_binary(soil_amp=True,
+            a_file, _ = save_motion_to_binary(soil_amp=False,
                                               eqrm_flags=eqrm_flags,
-                                              motion=data.soil_SA_all,
-                                              parallel_tag=parallel.file_tag)
+                                              motion=data.bedrock_SA_all,
+                                              parallel_tag=block_tag)
             data_files_that_parallel_splits.append(a_file)
 
-    # Save damage information
-    if (eqrm_flags.save_prob_structural_damage is True and
-            num_pseudo_events == 1 and
-            parallel.lo != parallel.hi):
-        # No sites were investigated.
-        a_file = save_damage(eqrm_flags.output_dir, eqrm_flags.site_tag,
-                             'structural', total_structure_damage,
-                             all_sites.attributes['BID'],
-                             compress=eqrm_flags.compress_output,
-                             parallel_tag=parallel.file_tag,
-                             write_title=(parallel.rank == False))
-        row_files_that_parallel_splits.append(a_file)
-
-    if ((eqrm_flags.save_motion is True or
-         eqrm_flags.save_total_financial_loss is True or
-         eqrm_flags.save_building_loss is True or
-         eqrm_flags.save_contents_loss is True or
-         eqrm_flags.save_prob_structural_damage is True) and
-            parallel.lo != parallel.hi):
-        files = save_distances(eqrm_flags, sites=all_sites,
-                               event_set=event_set,
-                               compress=eqrm_flags.compress_output,
-                               parallel_tag=parallel.file_tag)
-        column_files_that_parallel_splits.extend(files)
-
-    # Save economic loss
-    if ((eqrm_flags.save_total_financial_loss is True or
-         eqrm_flags.save_building_loss is True or
-         eqrm_flags.save_contents_loss is True) and
-            parallel.lo != parallel.hi):
-        a_file = save_structures(eqrm_flags, all_sites,
+            if data.soil_SA_all is not None:
+                # Save to numpy binary
+                a_file, _ = save_motion_to_binary(soil_amp=True,
+                                                  eqrm_flags=eqrm_flags,
+                                                  motion=data.soil_SA_all,
+                                                  parallel_tag=block_tag)
+                data_files_that_parallel_splits.append(a_file)
+
+        # Save damage information
+        if (eqrm_flags.save_prob_structural_damage is True and
+                num_pseudo_events == 1 and
+                num_site_block > 0):
+            # No sites were investigated.
+            a_file = save_damage(eqrm_flags.output_dir, eqrm_flags.site_tag,
+                                 'structural', total_structure_damage,
+                                 all_sites.attributes['BID'],
+                                 compress=eqrm_flags.compress_output,
+                                 parallel_tag=block_tag,
+                                 write_title=write_title)
+            row_files_that_parallel_splits.append(a_file)
+
+        if ((eqrm_flags.save_motion is True or
+             eqrm_flags.save_total_financial_loss is True or
+             eqrm_flags.save_building_loss is True or
+             eqrm_flags.save_contents_loss is True or
+             eqrm_flags.save_prob_structural_damage is True) and
+                num_site_block > 0):
+            files = save_distances(eqrm_flags, sites=all_sites,
+                                   event_set=event_set,
+                                   compress=eqrm_flags.compress_output,
+                                   parallel_tag=block_tag)
+            column_files_that_parallel_splits.extend(files)
+
+        # Save economic loss
+        if ((eqrm_flags.save_total_financial_loss is True or
+             eqrm_flags.save_building_loss is True or
+             eqrm_flags.save_contents_loss is True) and
+                num_site_block > 0):
+            a_file = save_structures(eqrm_flags, all_sites,
+                                     compress=eqrm_flags.compress_output,
+                                     parallel_tag=block_tag,
+                                     write_title=write_title)
+            row_files_that_parallel_splits.append(a_file)
+
+        if (eqrm_flags.save_total_financial_loss is True and
+                num_site_block > 0):
+
+            #  dimensions of total_building_loss_qw;
+            # (site, spawn, max ground motion model, events)
+            # want (spawn, max ground motion model, site, events, periods)
+            # or (site, spawn, max ground motion model, dummy, events, periods)
+            new_total_building_loss_qw = collapse_source_gmms(
+                total_building_loss_qw[..., newaxis, :, newaxis],
+                source_model, eqrm_flags.atten_collapse_Sa_of_atten_models)
+            # collapse out fake site axis and fake periods axis.
+            new_total_building_loss_qw = new_total_building_loss_qw[..., 0, :, 0]
+            # overload the event
+            new_total_building_loss_qw = new_total_building_loss_qw.reshape(
+                (num_site_block, -1))
+
+            a_file = save_ecloss('_total_building', eqrm_flags,
+                                 new_total_building_loss_qw, all_sites,
                                  compress=eqrm_flags.compress_output,
-                                 parallel_tag=parallel.file_tag,
-                                 write_title=(parallel.rank == False))
-        row_files_that_parallel_splits.append(a_file)
-
-    if (eqrm_flags.save_total_financial_loss is True and
-            parallel.lo != parallel.hi):
-
-        #  dimensions of total_building_loss_qw;
-        # (site, spawn, max ground motion model, events)
-        # want (spawn, max ground motion model, site, events, periods)
-        # or (site, spawn, max ground motion model, dummy, events, periods)
-        new_total_building_loss_qw = collapse_source_gmms(
-            total_building_loss_qw[..., newaxis, :, newaxis],
-            source_model, eqrm_flags.atten_collapse_Sa_of_atten_models)
-        # collapse out fake site axis and fake periods axis.
-        new_total_building_loss_qw = new_total_building_loss_qw[..., 0, :, 0]
-        # overload the event
-        new_total_building_loss_qw = new_total_building_loss_qw.reshape(
-            (num_site_block, -1))
-
-        a_file = save_ecloss('_total_building', eqrm_flags,
-                             new_total_building_loss_qw, all_sites,
-                             compress=eqrm_flags.compress_output,
-                             parallel_tag=parallel.file_tag)
-        column_files_that_parallel_splits.append(a_file)
-
-        a_file = save_val(eqrm_flags,
-                          sum(
-                              all_sites.cost_breakdown(
-                                  ci=eqrm_flags.loss_regional_cost_index_multiplier)),
-                          '_bval',
-                          compress=eqrm_flags.compress_output,
-                          parallel_tag=parallel.file_tag)
-        row_files_that_parallel_splits.append(a_file)
-
-    if eqrm_flags.save_building_loss is True and parallel.lo != parallel.hi:
-        new_building_loss_qw = collapse_source_gmms(
-            building_loss_qw[..., newaxis, :, newaxis],
-            source_model, eqrm_flags.atten_collapse_Sa_of_atten_models)
-        # collapse out fake site axis and fake periods axis.
-        new_building_loss_qw = new_building_loss_qw[..., 0, :, 0]
-        # overload the event
-        new_building_loss_qw = new_building_loss_qw.reshape(
-            (num_site_block, -1))
-        a_file = save_ecloss('_building', eqrm_flags, new_building_loss_qw,
-                             all_sites, compress=eqrm_flags.compress_output,
-                             parallel_tag=parallel.file_tag)
-        column_files_that_parallel_splits.append(a_file)
-
-        if eqrm_flags.run_type == "risk_mmi":
-            # Save the building structure values
-            # all_sites.cost_breakdown(
-            # ci=eqrm_flags.loss_regional_cost_index_multiplier)
-            structure_costs = all_sites.cost_breakdown()
+                                 parallel_tag=block_tag)
+            column_files_that_parallel_splits.append(a_file)
+
             a_file = save_val(eqrm_flags,
-                              structure_costs,
-                              '_building_value',
+                              sum(
+                                  all_sites.cost_breakdown(
+                                      ci=eqrm_flags.loss_regional_cost_index_multiplier)),
+                              '_bval',
                               compress=eqrm_flags.compress_output,
-                              parallel_tag=parallel.file_tag)
+                              parallel_tag=block_tag)
             row_files_that_parallel_splits.append(a_file)
 
-    if eqrm_flags.save_contents_loss is True and parallel.lo != parallel.hi:
-        new_contents_loss_qw = collapse_source_gmms(
-            contents_loss_qw[..., newaxis, :, newaxis],
-            source_model, eqrm_flags.atten_collapse_Sa_of_atten_models)
-        # collapse out fake site axis and fake periods axis.
-        new_contents_loss_qw = new_contents_loss_qw[..., 0, :, 0]
-        # overload the event
-        new_contents_loss_qw = new_contents_loss_qw.reshape(
-            (num_site_block, -1))
-
-        a_file = save_ecloss('_contents', eqrm_flags, new_contents_loss_qw,
-                             all_sites, compress=eqrm_flags.compress_output,
-                             parallel_tag=parallel.file_tag)
-        column_files_that_parallel_splits.append(a_file)
-
-    if eqrm_flags.bridges_functional_percentages is not None and \
-            parallel.lo != parallel.hi:
-        files = save_bridge_days_to_complete(
-            eqrm_flags,
-            saved_days_to_complete, compress=eqrm_flags.compress_output,
-            parallel_tag=parallel.file_tag)
-        row_files_that_parallel_splits.extend(files)
-
-    if (eqrm_flags.save_fatalities is True and
-            parallel.lo != parallel.hi):
-        # note: will not handle multiple GMPES
-        file_row, file_col = save_fatalities(
-            '_fatalities', eqrm_flags,
-            total_fatalities,
-            sites=all_sites,
-            compress=eqrm_flags.compress_output,
-            parallel_tag=parallel.file_tag,
-            write_title=(parallel.rank == False))
-        row_files_that_parallel_splits.append(file_row)
-        if not file_col is None:
-            column_files_that_parallel_splits.append(file_col)
-
-        files = save_distances(eqrm_flags, sites=all_sites,
-                               event_set=event_set,
-                               compress=eqrm_flags.compress_output,
-                               parallel_tag=parallel.file_tag)
-        column_files_that_parallel_splits.extend(files)
-
-    # parallel code.  Needed if # of processes is > # of structures
-    num_blocks = parallel.calc_num_blocks()
+        if eqrm_flags.save_building_loss is True and num_site_block > 0:
+            new_building_loss_qw = collapse_source_gmms(
+                building_loss_qw[..., newaxis, :, newaxis],
+                source_model, eqrm_flags.atten_collapse_Sa_of_atten_models)
+            # collapse out fake site axis and fake periods axis.
+            new_building_loss_qw = new_building_loss_qw[..., 0, :, 0]
+            # overload the event
+            new_building_loss_qw = new_building_loss_qw.reshape(
+                (num_site_block, -1))
+            a_file = save_ecloss('_building', eqrm_flags, new_building_loss_qw,
+                                 all_sites, compress=eqrm_flags.compress_output,
+                                 parallel_tag=block_tag)
+            column_files_that_parallel_splits.append(a_file)
+
+            if eqrm_flags.run_type == "risk_mmi":
+                # Save the building structure values
+                # all_sites.cost_breakdown(
+                # ci=eqrm_flags.loss_regional_cost_index_multiplier)
+                structure_costs = all_sites.cost_breakdown()
+                a_file = save_val(eqrm_flags,
+                                  structure_costs,
+                                  '_building_value',
+                                  compress=eqrm_flags.compress_output,
+                                  parallel_tag=block_tag)
+                row_files_that_parallel_splits.append(a_file)
+
+        if eqrm_flags.save_contents_loss is True and num_site_block > 0:
+            new_contents_loss_qw = collapse_source_gmms(
+                contents_loss_qw[..., newaxis, :, newaxis],
+                source_model, eqrm_flags.atten_collapse_Sa_of_atten_models)
+            # collapse out fake site axis and fake periods axis.
+            new_contents_loss_qw = new_contents_loss_qw[..., 0, :, 0]
+            # overload the event
+            new_contents_loss_qw = new_contents_loss_qw.reshape(
+                (num_site_block, -1))
+
+            a_file = save_ecloss('_contents', eqrm_flags, new_contents_loss_qw,
+                                 all_sites, compress=eqrm_flags.compress_output,
+                                 parallel_tag=block_tag)
+            column_files_that_parallel_splits.append(a_file)
+
+        if eqrm_flags.bridges_functional_percentages is not None and \
+                num_site_block > 0:
+            files = save_bridge_days_to_complete(
+                eqrm_flags,
+                saved_days_to_complete, compress=eqrm_flags.compress_output,
+                parallel_tag=block_tag)
+            row_files_that_parallel_splits.extend(files)
 
-    # Now process 0 can stitch some files together.
-    if parallel.is_parallel and parallel.rank == 0:
+        if (eqrm_flags.save_fatalities is True and
+                num_site_block > 0):
+            # note: will not handle multiple GMPES
+            file_row, file_col = save_fatalities(
+                '_fatalities', eqrm_flags,
+                total_fatalities,
+                sites=all_sites,
+                compress=eqrm_flags.compress_output,
+                parallel_tag=block_tag,
+                write_title=write_title)
+            row_files_that_parallel_splits.append(file_row)
+            if not file_col is None:
+                column_files_that_parallel_splits.append(file_col)
+
+            files = save_distances(eqrm_flags, sites=all_sites,
+                                   event_set=event_set,
+                                   compress=eqrm_flags.compress_output,
+                                   parallel_tag=block_tag)
+            column_files_that_parallel_splits.extend(files)
+
+        # The results of these sites are saved.  The done mark is kept
+        # until the files are joined, so a resumed run skips the block.
+        if join_blocks:
+            save_block_done(eqrm_flags.output_dir, block_tag, site_indices,
+                            (row_files_that_parallel_splits,
+                             column_files_that_parallel_splits,
+                             data_files_that_parallel_splits))
+        remove_checkpoint(eqrm_flags.output_dir, block_tag)
+
+    if dynamic_scheduler:
+        # Wait for all the chunks to be saved.
+        parallel.barrier()
+        num_blocks = len(chunk_indices)
+        block_indices = chunk_indices
+        num_block_tags = num_blocks
+    else:
+        # parallel code.  Needed if # of processes is > # of structures
+        num_blocks = parallel.calc_num_blocks()
         block_indices = parallel.calc_all_indices(num_sites)
+        num_block_tags = parallel.size
+
+    # Now process 0 can stitch some files together.
+    if join_blocks and parallel.rank == 0:
+        # The files of all the blocks, from their done marks.  Some
+        # blocks may have been done by other nodes, or before a resume.
+        row_files_that_parallel_splits = []
+        column_files_that_parallel_splits = []
+        data_files_that_parallel_splits = []
+        for block in range(num_block_tags):
+            tag = FILE_TAG_DELIMITER + str(block)
+            files = load_block_done(eqrm_flags.output_dir, tag)
+            if files is None:
+                continue
+            for all_files, block_files in zip(
+                    (row_files_that_parallel_splits,
+                     column_files_that_parallel_splits,
+                     data_files_that_parallel_splits), files):
+                for a_file in block_files:
+                    if a_file not in all_files:
+                        all_files.append(a_file)
+            remove_block_done(eqrm_flags.output_dir, tag)
 
         join_parallel_files(row_files_that_parallel_splits,
                             num_blocks,
@@ -828,12 +1075,31 @@ def calc_and_save_SA(eqrm_flags,
                      rel_site_index,
                      ground_motion_distribution,
                      amp_distribution,
-                     event_activity,
+                     event_activity_table,
                      source_model,
-                     num_site_block):
+                     num_site_block,
+                     distance_event_indexes=None,
+                     ground_motion_buffers=None,
+                     site_indexes=None):
     """
     Calculate the spectral acceleration, in g, for both bedrock and soil.
 
+    sites is a block of sites. site_index and rel_site_index are the
+    index of the first site of the block.
+
+    If distances are only for some events, distance_event_indexes are
+    the sorted indexes of these events in event_set.
+
+    event_activity_table is an Event_Activity_Table, made once a run.
+
+    ground_motion_buffers is a Distribution_Buffers, for the ground
+    motion model results of each source, and of the Vs30 models in
+    get_soil_SA.
+
+    site_indexes are the indexes of the sites of the block in the sites
+    of the run.  If eqrm_flags.atten_stream_seed is set, the random
+    sampling of each (site, source) uses a Random_Stream keyed by them.
+
     Return:
       bedrock_SA_all,
       soil_SA_all,
@@ -845,31 +1111,46 @@ def calc_and_save_SA(eqrm_flags,
       rock_SA_overloaded
     """
 
-    num_spawn = event_activity.get_num_spawn()
-    num_rm = event_activity.recurrence_model_count()
+    num_spawn = event_activity_table.num_spawn
+    num_rm = event_activity_table.num_rm
 
     # WARNING - this only works if the event activity is not collapsed.
-    num_gmm_after_collapsing = event_activity.get_gmm_dimensions()
+    num_gmm_after_collapsing = event_activity_table.num_gmm
 
-    num_gmm_max = source_model.get_max_num_atten_models()
+    num_gmm_max = event_activity_table.num_gmm_max
 
     num_sites = len(sites)
-    assert num_sites == 1
     num_events = len(event_set)
     num_periods = len(eqrm_flags.atten_periods)
 
     # Build some arrays to save into.
-    # NUM_SITES IS 1
 
-    # Array to save SA into.  Only storing close event info
     num_close_events = 0
     for source in source_model:
         num_close_events += len(source.get_event_set_indexes())
 
-    coll_rock_SA_close_events = zeros(
-        (num_spawn, num_gmm_after_collapsing, num_rm,
-         num_sites, num_close_events, num_periods),
-        dtype=float)
+    # If the hazard is accumulated in histograms, the close event SA
+    # is not kept.
+    use_hazard_histogram = (
+        eqrm_flags.save_hazard_map is True and
+        eqrm_flags.hazard_map_bins_per_decade is not None)
+    if use_hazard_histogram:
+        max_sa = HAZARD_GRID_MAX_SA
+        if eqrm_flags.atten_pga_scaling_cutoff is not None:
+            # The spectral SA is seldom more than a few times the PGA
+            max_sa = max(max_sa, 10.0 * eqrm_flags.atten_pga_scaling_cutoff)
+        hazard_edges = hazard_grid(eqrm_flags.hazard_map_bins_per_decade,
+                                   max_sa)
+        hazard_histogram_shape = (num_sites, num_periods,
+                                  len(hazard_edges) - 1)
+        coll_rock_SA_close_events = zeros(hazard_histogram_shape,
+                                          dtype=float)
+    else:
+        # Array to save SA into.  Only storing close event info
+        coll_rock_SA_close_events = zeros(
+            (num_spawn, num_gmm_after_collapsing, num_rm,
+             num_sites, num_close_events, num_periods),
+            dtype=float)
 
     log_dic = {log.CLOSEROCKSAE_J: coll_rock_SA_close_events.nbytes,
                "cra_num_close_events": num_close_events,
@@ -889,12 +1170,14 @@ def calc_and_save_SA(eqrm_flags,
                  site=rel_site_index,
                  sites=num_site_block)
 
+    # The SA passed to risk has the spawn, rm, gmm and event axes
+    # overloaded into one axis, with dimensions
+    # (sites, events * gmm * rm * spawn, period).
+    # It is filled as a (sites, spawn, rm, gmm, events, period) array.
+    overloaded_shape = (num_sites, num_spawn, num_rm, num_gmm_max,
+                        num_events, num_periods)
     if not eqrm_flags.run_type == "hazard":
-        rock_SA_overloaded = zeros((num_sites,
-                                    num_events * num_gmm_max *
-                                    num_spawn * num_rm,
-                                    num_periods),
-                                   dtype=float)
+        rock_SA_overloaded = zeros(overloaded_shape, dtype=float)
 
         log.log_json({log.ROCKOVERLOADED_J: rock_SA_overloaded.nbytes},
                      log.DEBUG, logs_per_scenario=logs_per_scenario_con,
@@ -904,16 +1187,16 @@ def calc_and_save_SA(eqrm_flags,
         rock_SA_overloaded = None
 
     if eqrm_flags.use_amplification is True:
-        coll_soil_SA_close_events = zeros(
-            (num_spawn, num_gmm_after_collapsing, num_rm, num_sites,
-             num_close_events, num_periods), dtype=float)
+        if use_hazard_histogram:
+            coll_soil_SA_close_events = zeros(hazard_histogram_shape,
+                                              dtype=float)
+        else:
+            coll_soil_SA_close_events = zeros(
+                (num_spawn, num_gmm_after_collapsing, num_rm, num_sites,
+                 num_close_events, num_periods), dtype=float)
 
         if not eqrm_flags.run_type == "hazard":
-            soil_SA_overloaded = zeros((num_sites,
-                                        num_events * num_gmm_max * num_spawn *
-                                        num_rm,
-                                        num_periods),
-                                       dtype=float)
+            soil_SA_overloaded = zeros(overloaded_shape, dtype=float)
         else:
             soil_SA_overloaded = None
     else:
@@ -922,32 +1205,53 @@ def calc_and_save_SA(eqrm_flags,
     s_evnti = 0  # start event index for the close event dimension
     e_evnti = 0  # end event index for the close event dimension
 
-    # A list of indexes into the all events dimension
-    all_event_indexes = zeros((num_close_events), dtype=int)
-    for source in source_model:
+    for source_index, source in enumerate(source_model):
         # The event_inds are the close events in this source
         event_inds = source.get_event_set_indexes()
         e_evnti += len(event_inds)
-        all_event_indexes[s_evnti:e_evnti] = event_inds
         if len(event_inds) == 0:
             continue
         sub_event_set = event_set[event_inds]
-        distance_subset = distances[event_inds]
+        if distance_event_indexes is None:
+            distance_subset = distances[event_inds]
+        else:
+            distance_subset = distances[
+                searchsorted(distance_event_indexes, event_inds)]
         atten_model_weights = source.atten_model_weights
         ground_motion_calc = source.ground_motion_calculator
+        if num_sites > 1:
+            # Calculate the distances of the threshold and of the ground
+            # motion models in one pass.
+            distance_types = ['Joyner_Boore']
+            for GM_model in ground_motion_calc.GM_models:
+                distance_types.extend(GM_model.GM_spec.distance_types)
+            distance_subset.calc_distances(distance_types)
+            # The source model subset holds the events that are close to
+            # any site in the block.  Find the (site, event) pairs that
+            # are beyond the threshold distance, so their SA is zeroed.
+            far_site_events = (distance_subset.distance('Joyner_Boore') >
+                               eqrm_flags.atten_threshold_distance)
+        else:
+            far_site_events = None
 
         log_mean_extend_GM, log_sigma_extend_GM = ground_motion_calc.distribution(
             event_set=sub_event_set,
             sites=sites,
             distances=distance_subset,
-            Vs30=BEDROCKVs30)
+            Vs30=BEDROCKVs30,
+            buffers=ground_motion_buffers)
         # *_extend_GM has shape of (GM_model, sites, events, periods)
         # the value of GM_model can change for each source.
 
         # evaluate the RSA
         # that is desired (i.e. chosen in parameter_handle)
+        if eqrm_flags.atten_stream_seed is None:
+            stream = None
+        else:
+            stream = Random_Stream(eqrm_flags.atten_stream_seed,
+                                   site_indexes, source_index, event_inds)
         bedrock_SA = ground_motion_distribution.ground_motion_sample(
-            log_mean_extend_GM, log_sigma_extend_GM)
+            log_mean_extend_GM, log_sigma_extend_GM, stream=stream)
         # bedrock_SA shape (spawn, GM_model, rec_model, sites, events, periods)
         # the events here is close events in this source
         # print 'ENDING Calculating attenuation'
@@ -965,7 +1269,9 @@ def calc_and_save_SA(eqrm_flags,
                                   sub_event_set,
                                   sites,
                                   distance_subset,
-                                  ground_motion_distribution)
+                                  ground_motion_distribution,
+                                  stream=stream,
+                                  buffers=ground_motion_buffers)
             # Amplification factor cutoffs
             # Applies a minimum and maxium acceptable amplification factor
             # re-scale SAsoil if Ampfactor falls ouside acceptable
@@ -984,6 +1290,12 @@ def calc_and_save_SA(eqrm_flags,
         cutoff_pga(bedrock_SA,
                    eqrm_flags.atten_pga_scaling_cutoff)
 
+        if far_site_events is not None:
+            far_sites, far_events = where(far_site_events)
+            bedrock_SA[..., far_sites, far_events, :] = 0
+            if soil_SA is not None:
+                soil_SA[..., far_sites, far_events, :] = 0
+
         # collapse  multiple attenuation models
         # gmm is 1 if its collapsed
         if (eqrm_flags.save_motion is True or
@@ -1006,15 +1318,26 @@ def calc_and_save_SA(eqrm_flags,
         if eqrm_flags.save_motion is True:
             gmm_n = collapsed_bedrock_SA.shape[1]
             # Put into arrays
-            assert collapsed_bedrock_SA.shape[3] == 1  # only one site
-            coll_bedrock_SA = collapsed_bedrock_SA[:, :,:, 0,:,:]
-            bedrock_SA_all[:, :gmm_n, :, rel_site_index, event_inds,:] = \
-                coll_bedrock_SA
+            site_slice = slice(rel_site_index, rel_site_index + num_sites)
+            bedrock_SA_all[:, :gmm_n, :, site_slice, event_inds,:] = \
+                collapsed_bedrock_SA
             if soil_SA is not None:
-                coll_soil_SA = collapsed_soil_SA[:, :,:, 0,:,:]
-                soil_SA_all[:, :gmm_n, :, rel_site_index, event_inds,:] = \
-                    coll_soil_SA
-        if eqrm_flags.save_hazard_map is True:
+                soil_SA_all[:, :gmm_n, :, site_slice, event_inds,:] = \
+                    collapsed_soil_SA
+        if use_hazard_histogram:
+            # Add the SA to the rate histograms
+            # (sites, periods, SA bins)
+            gmm_n = collapsed_bedrock_SA.shape[1]
+            source_activity = event_activity_table.close_event_activity(
+                event_inds, gmm_n)
+            accumulate_hazard_histogram(coll_rock_SA_close_events,
+                                        collapsed_bedrock_SA,
+                                        source_activity, hazard_edges)
+            if soil_SA is not None:
+                accumulate_hazard_histogram(coll_soil_SA_close_events,
+                                            collapsed_soil_SA,
+                                            source_activity, hazard_edges)
+        elif eqrm_flags.save_hazard_map is True:
             gmm_n = collapsed_bedrock_SA.shape[1]
             # Build collapsed_bedrock_SA for all events
             # before getting out of the loop
@@ -1029,61 +1352,59 @@ def calc_and_save_SA(eqrm_flags,
 
         # Set up the arrays to pass to risk
         # This is built up as sources are iterated over.
-        # assume one site
 
         if not eqrm_flags.run_type == "hazard":
-            for i_spawn in arange(bedrock_SA.shape[0]):  # loop over spawn
-                for i_gmm in arange(bedrock_SA.shape[1]):  # loop over gmm
-                    for i_rm in xrange(bedrock_SA.shape[2]):
-                        # FIXME Reinventing multidimensional array
-                        # indexing here. Just use a ndarray() and return
-                        # whataver.reshape(num_sites, -1, num_periods)
-                        i_overloaded = (i_spawn * num_rm *
-                                        num_gmm_max * num_events
-                                        + i_rm * num_gmm_max * num_events +
-                                        i_gmm * num_events +
-                                        event_inds)
-                        # rock_SA_overloaded
-                        # dim (sites, events * gmm * rm * spawn, period)
-                        rock_SA_overloaded[0, i_overloaded, :] = \
-                            bedrock_SA[i_spawn, i_gmm, i_rm, 0, :,:]
-                        if soil_SA is not None:
-                            soil_SA_overloaded[0, i_overloaded, :] = \
-                                soil_SA[i_spawn, i_gmm, i_rm, 0, :,:]
-
-        # can not do this, the current SA only has a subset of all events.
-        # 0 to drop site out
-        # rock_SA_overloaded_auto = (bedrock_SA[:,:,0,:,:]).reshape(
-        #    (num_sites, num_spawn*num_gmm_max*num_events, num_periods))
+            # bedrock_SA axes (spawn, gmm, rm, sites, events, periods)
+            # moved to (sites, spawn, rm, gmm, events, periods)
+            gmm_n = bedrock_SA.shape[1]
+            rock_SA_overloaded[:, :, :, :gmm_n, event_inds, :] = \
+                bedrock_SA.transpose(3, 0, 2, 1, 4, 5)
+            if soil_SA is not None:
+                soil_SA_overloaded[:, :, :, :gmm_n, event_inds, :] = \
+                    soil_SA.transpose(3, 0, 2, 1, 4, 5)
+
         s_evnti = e_evnti
 
     # End source loop
 
     # Compute hazard if desired
-    if eqrm_flags.save_hazard_map is True:
-        # event_activity.event_activity is [spawns, gmm, rec_models,
+    site_slice = slice(site_index, site_index + num_sites)
+    return_rates = 1.0 / array(eqrm_flags.return_periods)
+    if use_hazard_histogram:
+        bedrock_hazard[site_slice, :, :] = hzd_do_value_histogram(
+            coll_rock_SA_close_events, hazard_edges, return_rates)
+        if eqrm_flags.use_amplification is True:
+            soil_hazard[site_slice, :, :] = hzd_do_value_histogram(
+                coll_soil_SA_close_events, hazard_edges, return_rates)
+    elif eqrm_flags.save_hazard_map is True:
+        # A list of indexes into the all events dimension
+        all_event_indexes = concatenate(
+            [source.get_event_set_indexes() for source in source_model])
+        # The close event activity is [spawns, gmm, rec_models,
         # events]
-        event_act_d_events = event_activity.event_activity.reshape(-1)
-        event_act_d_close = event_activity.event_activity[:, :,:, \
-                                                          all_event_indexes]
-        event_act_d_close = event_act_d_close.reshape(-1)
-        assert coll_rock_SA_close_events.shape[3] == 1  # only one site
-
-        for j in xrange(len(eqrm_flags.atten_periods)):
-            # Get these two arrays to be vectors.
-            # The sites and spawning dimensions are flattened
-            # into the events dimension.
-            bedrock_SA_close = ravel(coll_rock_SA_close_events[:, :,:,:,:, j])
-            bedrock_hazard[site_index, j, :] = \
-                hzd_do_value(bedrock_SA_close,
-                             event_act_d_close,
-                             1.0 / array(eqrm_flags.return_periods))
-
-            if eqrm_flags.use_amplification is True:
-                soil_SA_close = ravel(coll_soil_SA_close_events[:, :,:,:,:, j])
-                soil_hazard[site_index, j, :] = \
-                    hzd_do_value(soil_SA_close, event_act_d_close,
-                                 1.0 / array(eqrm_flags.return_periods))
+        event_act_d_close = event_activity_table.close_event_activity(
+            all_event_indexes).reshape(-1)
+
+        for k in xrange(num_sites):
+            for j in xrange(len(eqrm_flags.atten_periods)):
+                # Get these two arrays to be vectors.
+                # The spawning, gmm and rm dimensions are flattened
+                # into the events dimension.
+                # Events beyond the threshold distance of site k have
+                # an SA of 0, so hzd_do_value ignores them.
+                bedrock_SA_close = ravel(
+                    coll_rock_SA_close_events[:, :,:, k,:, j])
+                bedrock_hazard[site_index + k, j, :] = \
+                    hzd_do_value(bedrock_SA_close,
+                                 event_act_d_close,
+                                 return_rates)
+
+                if eqrm_flags.use_amplification is True:
+                    soil_SA_close = ravel(
+                        coll_soil_SA_close_events[:, :,:, k,:, j])
+                    soil_hazard[site_index + k, j, :] = \
+                        hzd_do_value(soil_SA_close, event_act_d_close,
+                                     return_rates)
 
     log.debug('Memory: calc_and_save_SA before return',
               logs_per_scenario=logs_per_scenario_con,
@@ -1094,11 +1415,21 @@ def calc_and_save_SA(eqrm_flags,
                        site=rel_site_index,
                        sites=num_site_block)
 
+    # Overload the spawn, rm, gmm and event axes. This is a view.
+    if rock_SA_overloaded is not None:
+        rock_SA_overloaded = rock_SA_overloaded.reshape(
+            (num_sites, -1, num_periods))
+    if soil_SA_overloaded is not None:
+        soil_SA_overloaded = soil_SA_overloaded.reshape(
+            (num_sites, -1, num_periods))
+
     return soil_SA_overloaded, rock_SA_overloaded
 
 
 def amp_rescale(soil_SA,
                 amp_min_factor, amp_max_factor, bedrock_SA):
+    # The bedrock SA may have a rec_model dimension of length 1
+    bedrock_SA = broadcast_arrays(bedrock_SA, soil_SA)[0]
     if amp_min_factor is not None:
         too_low = (soil_SA / bedrock_SA) < amp_min_factor
         soil_SA[where(too_low)] = (amp_min_factor *
@@ -1250,6 +1581,9 @@ def load_data(eqrm_flags):
 # this will run if eqrm_analysis.py is called from DOS prompt or double clicked
 if __name__ == '__main__':
     from sys import argv
+    resume = '--resume' in argv
+    if resume:
+        argv.remove('--resume')
     if len(argv) > 2:
         f = argv[1]  # note argv[0] will be 'main.py'
         use_determ_seed = argv[2]
@@ -1270,7 +1604,8 @@ if __name__ == '__main__':
             elif compress_output is 'n':
                 print 'Not compressing output'
                 compress_output = False
-        main(f, use_determ_seed, compress_output=compress_output)
+        main(f, use_determ_seed, compress_output=compress_output,
+             resume=resume)
     else:
         assert len(argv) == 1
         import profile
@@ -455,12 +455,13 @@ def calculate_updated_demand(periods, SA0, SD0, Ra, Rv, Rd, TAV, TVD,
     assert SA0.shape == (num_sites, num_events, num_periods)
     assert SD0.shape == (num_sites, num_events, num_periods)
 
-    assert ((Ra.shape == (num_sites, num_events, 1) and
-             Rv.shape == (num_sites, num_events, 1) and
-             Rd.shape == (num_sites, num_events, 1)) or
-            (Ra.shape == (1, 1, 1) and
-             Rv.shape == (1, 1, 1) and
-             Rd.shape == (1, 1, 1)))
+    if not (Ra.shape == (1, 1, 1) and
+            Rv.shape == (1, 1, 1) and
+            Rd.shape == (1, 1, 1)):
+        # Damping may vary by site only (e.g. a block of buildings
+        # before the non-linear damping is added), so expand it.
+        Ra, Rv, Rd = [R_i + zeros((num_sites, num_events, 1))
+                      for R_i in (Ra, Rv, Rd)]
 
     R = zeros((num_sites, num_events, num_periods), dtype=float)
 
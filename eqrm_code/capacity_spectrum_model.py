@@ -10,7 +10,10 @@
   Copyright 2007 by Geoscience Australia
 """
 
-from scipy import newaxis, where
+import copy
+
+from scipy import newaxis, where, zeros_like, column_stack, asarray, \
+    empty, concatenate
 
 from eqrm_code.equivalent_linear_solver import solve
 from eqrm_code.capacity_spectrum_functions import \
@@ -28,6 +31,15 @@ CSM_DAMPING_MODIFY_TAV = True  # TRUE 0
 CSM_DAMPING_DO_NOT_MODIFY_TAV = False  # FALSE 1
 CSM_HYSTERETIC_DAMPING_DEFAULT = 'trapezoidal'
 
+# The building parameters the capacity parameters and kappa are worked
+# out from.  They are set by the structure classification, so they
+# are the same for all buildings of a type.
+BUILDING_TYPE_PARAMETERS = ['design_strength', 'natural_elastic_period',
+                            'fraction_in_first_mode',
+                            'height_to_displacement', 'yield_to_design',
+                            'ultimate_to_yield', 'ductility', 'damping_s',
+                            'damping_m', 'damping_l']
+
 
 class Capacity_spectrum_model(object):
 
@@ -46,7 +58,8 @@ class Capacity_spectrum_model(object):
                  csm_damping_max_iterations=7,
                  sdtcap=.3,
                  csm_use_variability=False,
-                 csm_variability_method=None):
+                 csm_variability_method=None,
+                 csm_active_set=False):
         """
 Usage:
 
@@ -64,6 +77,7 @@ capacity_spectrum_model.damp_corner_periods=True
 capacity_spectrum_model.use_exact_area=True
 capacity_spectrum_model.rtol=0.01
 capacity_spectrum_model.csm_damping_max_iterations=7
+capacity_spectrum_model.csm_active_set=True  # only update unconverged points
 
 To get the building response, call: csm.building_response(self,site_key,SA)
 
@@ -83,6 +97,7 @@ should NOT be set after initialization - read __init__ for reasons.
         self.csm_hysteretic_damping = csm_hysteretic_damping
         self.rtol = rtol
         self.csm_damping_max_iterations = csm_damping_max_iterations
+        self.csm_active_set = csm_active_set
 
         self.csm_use_variability = csm_use_variability
         self.csm_variability_method = csm_variability_method
@@ -96,10 +111,16 @@ should NOT be set after initialization - read __init__ for reasons.
         # for specific sites from self.all_capacity_parameters[site_index]
         # using self.set_building_type_index(index)
 
-        self.capacity_parameters = self._calculate_parameters(
-            building_parameters, magnitudes)
-
-        self.kappa = self._calculate_kappa(building_parameters, magnitudes)
+        if csm_use_variability and csm_variability_method == 3:
+            # Each building has random capacity parameters
+            self.capacity_parameters = self._calculate_parameters(
+                building_parameters, magnitudes)
+            self.kappa = self._calculate_kappa(building_parameters,
+                                               magnitudes)
+        else:
+            (self.capacity_parameters,
+             self.kappa) = _building_type_tables(self).lookup(
+                self, building_parameters)
         self.kappa = self.kappa[:, :, newaxis]
 
         self.initial_damping = building_parameters['damping_Be'][
@@ -137,7 +158,8 @@ should NOT be set after initialization - read __init__ for reasons.
         # print "SD.tolist()[0][0]", SD.tolist()[0][0]
         # now solve
         SD_building, non_convergant = solve(SA, SD, SAcap, update_function,
-                                            rtol=rtol, maxits=maxits)
+                                            rtol=rtol, maxits=maxits,
+                                            active_set=self.csm_active_set)
         SA_building = calculate_capacity(SD_building[:, :, newaxis],
                                          self.capacity_parameters)
         assert SA_building.shape[-1] == 1  # should not have periods
@@ -147,10 +169,18 @@ should NOT be set after initialization - read __init__ for reasons.
         # print "cap_spec_mod SA_building,SD_building", SA_building,SD_building
         return SA_building, SD_building
 
-    def updated_response(self, displacement):
+    def updated_response(self, displacement, active=None):
         """
         Calculate the updated response for a given displacement
+
+        If active is a tuple of (building, event) indexes, the
+        displacement and response are for those points only, with
+        dimensions (1, point) and (1, point, period).  See
+        equivalent_linear_solver.solve_active_set.
         """
+        if active is not None:
+            return self._active_model(active).updated_response(displacement)
+
         # get the non-linear damping offset:
         if not len(displacement.shape) == 2:
             print displacement
@@ -160,6 +190,25 @@ should NOT be set after initialization - read __init__ for reasons.
         exit_flag = not (non_linear_damping > 0).any()
         return SA, SD, SAcap, exit_flag
 
+    def _active_model(self, active):
+        """
+        Return a copy of this model for the (building, event) points
+        of active, with the points in the event dimension.  The
+        corner period TVD depends on the event, so it stays in the
+        event dimension.
+        """
+        model = copy.copy(self)
+        model.undamped_response = tuple(
+            _take_points(values, active) for values in self.undamped_response)
+        model.corner_periods = tuple(
+            _take_points(values, active) for values in self.corner_periods)
+        model.capacity_parameters = tuple(
+            _take_points(values, active)
+            for values in self.capacity_parameters)
+        model.kappa = _take_points(self.kappa, active)
+        model.initial_damping = _take_points(self.initial_damping, active)
+        return model
+
     def _non_linear_damping(self, displacement):
 
         # Calculate the acceleration of the intersect point.
@@ -276,3 +325,102 @@ should NOT be set after initialization - read __init__ for reasons.
         # blow up magnitude to [sites,events,sample]
         kappa = calculate_kappa(magnitude, damping_s, damping_m, damping_l)
         return kappa
+
+
+class _Building_type_tables(object):
+
+    """
+    The capacity parameters and kappa of the building types seen so
+    far, for one magnitude array and capacity settings.
+
+    A building type is keyed by its BUILDING_TYPE_PARAMETERS values.
+    """
+
+    def __init__(self, model):
+        # Keep the magnitude array, so its identity is not reused
+        self.magnitudes = model.magnitudes
+        self.settings = _capacity_settings(model)
+        self.types = {}
+        self.capacity_parameters = None
+        self.kappa = None
+
+    def matches(self, model):
+        return (self.magnitudes is model.magnitudes and
+                self.settings == _capacity_settings(model))
+
+    def lookup(self, model, building_parameters):
+        """
+        Return the capacity parameters, dimensions (building, 1, 1),
+        and kappa, dimensions (building, event), of the buildings.
+        Only the building types not seen before are worked out.
+        """
+        values = column_stack([asarray(building_parameters[name],
+                                       dtype=float)
+                               for name in BUILDING_TYPE_PARAMETERS])
+        type_index = empty(values.shape[0], dtype=int)
+        new_buildings = []
+        for i, row in enumerate(values):
+            key = row.tostring()
+            index = self.types.get(key)
+            if index is None:
+                index = len(self.types)
+                self.types[key] = index
+                new_buildings.append(i)
+            type_index[i] = index
+
+        if new_buildings:
+            new_parameters = dict(
+                (name, building_parameters[name][new_buildings])
+                for name in BUILDING_TYPE_PARAMETERS)
+            capacity_parameters = model._calculate_parameters(
+                new_parameters, self.magnitudes)
+            kappa = model._calculate_kappa(new_parameters, self.magnitudes)
+            if self.kappa is None:
+                self.capacity_parameters = capacity_parameters
+                self.kappa = kappa
+            else:
+                self.capacity_parameters = tuple(
+                    concatenate((table, new))
+                    for table, new in zip(self.capacity_parameters,
+                                          capacity_parameters))
+                self.kappa = concatenate((self.kappa, kappa))
+
+        capacity_parameters = tuple(table[type_index]
+                                    for table in self.capacity_parameters)
+        return capacity_parameters, self.kappa[type_index]
+
+
+def _capacity_settings(model):
+    return (model.sdtcap, model.csm_use_variability,
+            model.csm_variability_method)
+
+
+# The building type tables of the last magnitude array
+_last_building_type_tables = None
+
+
+def _building_type_tables(model):
+    """
+    Return the building type tables for the magnitudes and capacity
+    settings of model.  The tables are kept while the same magnitude
+    array is used, e.g. for all the site blocks of a risk_csm run.
+    """
+    global _last_building_type_tables
+    if (_last_building_type_tables is None or
+            not _last_building_type_tables.matches(model)):
+        _last_building_type_tables = _Building_type_tables(model)
+    return _last_building_type_tables
+
+
+def _take_points(values, points):
+    """
+    Take the (building, event) points from values, of dimensions
+    (building, event, ...), where the building and event dimensions
+    may be of length 1.  Returns dimensions (1, point, ...).
+    """
+    buildings, events = points
+    if values.shape[0] == 1:
+        buildings = zeros_like(buildings)
+    if values.shape[1] == 1:
+        events = zeros_like(events)
+    return values[buildings, events][newaxis]
@@ -0,0 +1,226 @@
+"""
+checkpoint.py
+
+Save and load the state of the analysis site loop, so a long run can
+be resumed if a node dies.
+
+A checkpoint is saved in parts.  Each part holds the site accumulator
+array slices of the sites done since the last part, the index of the
+next site to do and the random number generator states.  There are
+checkpoint parts for each file block (see Parallel.file_tag).
+
+Once the results of a file block are saved, the block is marked as
+done, with the files it was saved to.  The done marks are kept until
+the files of all the blocks are joined, so a resumed run skips the
+blocks that are done.
+"""
+
+import os
+import glob
+import random
+import cPickle as pickle
+
+from numpy import savez, load, array, random as np_random
+
+CHECKPOINT_DIR = 'checkpoint'
+
+
+def _make_checkpoint_dir(file_name):
+    checkpoint_dir = os.path.dirname(file_name)
+    if not os.path.exists(checkpoint_dir):
+        try:
+            os.makedirs(checkpoint_dir)
+        except OSError:
+            # Another node made it
+            pass
+
+
+def _rename(tmp_file_name, file_name):
+    try:
+        os.rename(tmp_file_name, file_name)
+    except OSError:
+        # Windows will not rename over a file
+        os.remove(file_name)
+        os.rename(tmp_file_name, file_name)
+
+
+def _site_slice(site_axis, first_site, next_site):
+    return (slice(None),) * site_axis + (slice(first_site, next_site),)
+
+
+def checkpoint_file_name(output_dir, block_tag, first_site):
+    """
+    Return the name of the checkpoint part of a file block that
+    starts at first_site.
+    """
+    return os.path.join(output_dir, CHECKPOINT_DIR,
+                        'checkpoint%s_%i.npz' % (block_tag, first_site))
+
+
+def checkpoint_file_names(output_dir, block_tag):
+    """
+    Return the names of the checkpoint parts of a file block, in
+    site order.
+    """
+    pattern = checkpoint_file_name(output_dir, block_tag, 0)[:-len('0.npz')]
+    parts = []
+    for file_name in glob.glob(pattern + '*.npz'):
+        first_site = file_name[len(pattern):-len('.npz')]
+        if first_site.isdigit():
+            parts.append((int(first_site), file_name))
+    parts.sort()
+    return [file_name for _, file_name in parts]
+
+
+def save_checkpoint(output_dir, block_tag, first_site, next_site,
+                    site_indices, arrays, site_axes=None):
+    """
+    Save a checkpoint part, with the sites done since the last part.
+
+    Args:
+      output_dir: The EQRM output directory.
+      block_tag: The tag of the file block the sites are saved to.
+      first_site: The index of the first site done since the last
+        checkpoint part, in the block.
+      next_site: The index of the next site to do, in the block.
+      site_indices: The indices of the block sites in all the sites.
+        Used to check the checkpoint is for the same sites.
+      arrays: A dictionary of the site accumulator arrays.
+      site_axes: A dictionary of the site axis of the arrays that do
+        not have the sites on axis 0.
+
+    The file is written then renamed, so a checkpoint part is never
+    half written.
+    """
+    if site_axes is None:
+        site_axes = {}
+    file_name = checkpoint_file_name(output_dir, block_tag, first_site)
+    _make_checkpoint_dir(file_name)
+
+    state = {'first_site': first_site,
+             'next_site': next_site,
+             'array_names': arrays.keys(),
+             'python_random_state': random.getstate(),
+             'numpy_random_state': np_random.get_state()}
+    save_arrays = {}
+    for name, values in arrays.iteritems():
+        site_slice = _site_slice(site_axes.get(name, 0),
+                                 first_site, next_site)
+        save_arrays[name] = values[site_slice]
+    save_arrays['_state'] = array(pickle.dumps(state, protocol=2))
+    save_arrays['_site_indices'] = site_indices
+
+    # savez adds .npz if the name does not end with it.
+    tmp_file_name = file_name[:-len('.npz')] + '_tmp.npz'
+    savez(tmp_file_name, **save_arrays)
+    _rename(tmp_file_name, file_name)
+
+
+def load_checkpoint(output_dir, block_tag, site_indices, arrays,
+                    site_axes=None):
+    """
+    Load the state of the site loop, if there is a checkpoint for
+    the sites.
+
+    The arrays in the arrays dictionary are filled in place, and the
+    random number generator states are restored.  A resumed run skips
+    the file blocks that are done, and the dynamic scheduler hands out
+    blocks in any order, so the restored states only repeat an
+    uninterrupted run for the striped scheduler.  Randomly sampled
+    ground motion uses atten_stream_seed, which is needed to checkpoint
+    it, but other random sampling, e.g. of the building capacity, uses
+    these states.
+
+    Returns the index of the next site to do, which is 0 if there is
+    no checkpoint.
+    """
+    if site_axes is None:
+        site_axes = {}
+    next_site = 0
+    state = None
+    for file_name in checkpoint_file_names(output_dir, block_tag):
+        saved = load(file_name)
+        state = pickle.loads(str(saved['_state']))
+        if (sorted(state['array_names']) != sorted(arrays.keys()) or
+                saved['_site_indices'].shape != site_indices.shape or
+                (saved['_site_indices'] != site_indices).any()):
+            raise RuntimeError('Checkpoint %s is not for this run.' %
+                               file_name)
+        if state['first_site'] != next_site:
+            raise RuntimeError('Checkpoint %s does not follow site %i.' %
+                               (file_name, next_site))
+        next_site = state['next_site']
+
+        for name, values in arrays.iteritems():
+            site_slice = _site_slice(site_axes.get(name, 0),
+                                     state['first_site'], next_site)
+            values[site_slice] = saved[name]
+        saved.close()
+
+    if state is not None:
+        random.setstate(state['python_random_state'])
+        np_random.set_state(state['numpy_random_state'])
+
+    return next_site
+
+
+def remove_checkpoint(output_dir, block_tag):
+    """
+    Remove the checkpoint parts of a file block, if there are any.
+    """
+    for file_name in checkpoint_file_names(output_dir, block_tag):
+        os.remove(file_name)
+
+
+def done_file_name(output_dir, block_tag):
+    """
+    Return the name of the done mark of a file block.
+    """
+    return os.path.join(output_dir, CHECKPOINT_DIR,
+                        'done' + block_tag + '.pkl')
+
+
+def save_block_done(output_dir, block_tag, site_indices, files):
+    """
+    Mark the results of a file block as saved.
+
+    files is a tuple of the lists of files, (row files, column files,
+    data files), the block was saved to.  They are joined with the
+    files of the other blocks at the end of the run.
+    """
+    file_name = done_file_name(output_dir, block_tag)
+    _make_checkpoint_dir(file_name)
+    tmp_file_name = file_name + '.tmp'
+    f = open(tmp_file_name, 'wb')
+    pickle.dump({'site_indices': list(site_indices), 'files': files}, f,
+                protocol=2)
+    f.close()
+    _rename(tmp_file_name, file_name)
+
+
+def load_block_done(output_dir, block_tag, site_indices=None):
+    """
+    Return the files of a file block that is done, or None if the
+    block is not done.
+
+    If site_indices is given, check the block is for the same sites.
+    """
+    file_name = done_file_name(output_dir, block_tag)
+    if not os.path.exists(file_name):
+        return None
+    f = open(file_name, 'rb')
+    done = pickle.load(f)
+    f.close()
+    if (site_indices is not None and
+            done['site_indices'] != list(site_indices)):
+        raise RuntimeError('Done mark %s is not for this run.' % file_name)
+    return done['files']
+
+
+def remove_block_done(output_dir, block_tag):
+    """
+    Remove the done mark of a file block, if there is one.
+    """
+    file_name = done_file_name(output_dir, block_tag)
+    if os.path.exists(file_name):
+        os.remove(file_name)
@@ -15,22 +15,36 @@
 """
 
 from scipy.stats import norm
-from scipy import where, newaxis, array, asarray, log, shape, seterr
+from scipy import where, newaxis, array, asarray, log, shape, seterr, \
+    empty, concatenate, ascontiguousarray, arange
 import numpy as np
 
 from eqrm_code.capacity_spectrum_model import Capacity_spectrum_model, \
-    CSM_DAMPING_REGIMES_USE_ALL, CSM_DAMPING_MODIFY_TAV
+    CSM_DAMPING_REGIMES_USE_ALL, CSM_DAMPING_MODIFY_TAV, \
+    BUILDING_TYPE_PARAMETERS
 from eqrm_code.capacity_spectrum_functions import CSM_DAMPING_USE_SMOOTHING
 from . import bridge_damage
 from .bridge_time_complete import time_to_complete
 
 
+# The building parameters the damage states are worked out from,
+# other than the SA.
+DAMAGE_PARAMETERS = BUILDING_TYPE_PARAMETERS + [
+    'damping_Be', 'structural_damage_threshold', 'drift_threshold',
+    'acceleration_threshold']
+
+
 class Damage_model(object):
 
     """
     attributes:
       structure_state: only created after get_building_states is called.
         Axis of sites, model_generated_psudo_events, 4 (# of damage states)
+
+    Buildings with the same DAMAGE_PARAMETERS and SA, e.g. buildings
+    of a type at one site, have the same damage states.  The damage
+    states are worked out once for each unique building, then copied
+    to the other buildings.
     """
 
     def __init__(
@@ -73,8 +87,29 @@ class Damage_model(object):
                           'atten_cutoff_max_spectral_displacement': False,
                           'loss_min_pga': 0.0}
 
+        building_parameters = structures.building_parameters
+        if (csm_params['csm_use_variability'] and
+                csm_params['csm_variability_method'] == 3):
+            # Each building has random capacity parameters
+            unique = None
+        else:
+            unique, self.building_index = unique_buildings(
+                building_parameters, SA)
+        if unique is None or len(unique) == len(self.building_index):
+            self.building_index = None
+            self.unique_parameters = building_parameters
+            self.unique_SA = SA
+        else:
+            self.unique_parameters = dict(
+                (name, asarray(building_parameters[name])[unique])
+                for name in _damage_parameters(building_parameters))
+            if SA.shape[0] == len(self.building_index):
+                self.unique_SA = SA[unique]
+            else:
+                self.unique_SA = SA
+
         csm_params['periods'] = periods
-        csm_params['building_parameters'] = structures.building_parameters
+        csm_params['building_parameters'] = self.unique_parameters
         csm_params['magnitudes'] = magnitudes
         self.capacity_spectrum_model = Capacity_spectrum_model(**csm_params)
 
@@ -112,11 +147,12 @@ class Damage_model(object):
                    'csm_use_variability not properly defined')
             raise RuntimeError(msg)
 
-        (SA, SD) = self.get_building_displacement()
+        (SA, SD) = self.capacity_spectrum_model.building_response(
+            self.unique_SA)
         SA = SA.round(4)
         SD = SD.round(4)
 
-        building_parameters = self.structures.building_parameters
+        building_parameters = self.unique_parameters
         threshold = building_parameters['structural_damage_threshold']
 
         # reshape threshold so it is [sites,magnitudes,damage_states]
@@ -141,13 +177,21 @@ class Damage_model(object):
         threshold = threshold[:, newaxis, :]
         acceleration_sensitive_state = state_probability(threshold,
                                                          beta_nsd_a, SA)
+        if self.building_index is not None:
+            structure_state = structure_state[self.building_index]
+            non_structural_state = non_structural_state[self.building_index]
+            acceleration_sensitive_state = \
+                acceleration_sensitive_state[self.building_index]
         self.structure_state = structure_state  # for writing to file
 
         return (structure_state, non_structural_state,
                 acceleration_sensitive_state)
 
     def get_building_displacement(self):
-        point = self.capacity_spectrum_model.building_response(self.SA)
+        point = self.capacity_spectrum_model.building_response(
+            self.unique_SA)
+        if self.building_index is not None:
+            point = tuple(value[self.building_index] for value in point)
 
         return point
 
@@ -257,6 +301,60 @@ class Bridge_damage_model(object):
                 acceleration_sensitive_state)
 
 
+def unique_buildings(building_parameters, SA):
+    """
+    Find the buildings with the same DAMAGE_PARAMETERS and SA.
+
+    building_parameters  dictionary of building parameter arrays
+    SA                   array of Spectral Acceleration, with axis;
+                           buildings (or 1), events, periods
+
+    Returns a tuple (unique, building_index) where:
+      unique          array of the index of the first of each set of
+                      buildings with the same parameters and SA
+      building_index  array of the index into unique of each building
+
+    The SA rows are grouped first, so the parameters are compared with
+    the group of the SA rather than another copy of SA.
+    """
+    num_buildings = len(building_parameters['damping_Be'])
+    values = [asarray(building_parameters[name],
+                      dtype=float).reshape((num_buildings, -1))
+              for name in _damage_parameters(building_parameters)]
+    # When SA has one row it is the same for all buildings
+    if SA.shape[0] == num_buildings and SA.shape[0] > 1:
+        _, SA_index = _unique_rows(SA.reshape((num_buildings, -1)))
+        values.append(SA_index[:, newaxis].astype(float))
+    return _unique_rows(concatenate(values, axis=1))
+
+
+def _unique_rows(rows):
+    """
+    Find the rows of a 2D array with the same values.
+
+    Returns a tuple (unique, index) where unique is the index of the
+    first row of each set, in order, and index is the index into
+    unique of each row.
+    """
+    rows = ascontiguousarray(rows)
+    # Compare each row as one value, by its bytes
+    keys = rows.view(np.dtype((np.void, rows.dtype.itemsize *
+                               rows.shape[1]))).ravel()
+    _, first, index = np.unique(keys, return_index=True,
+                                return_inverse=True)
+    # np.unique gives the sets in key order, so put them in row order
+    order = first.argsort()
+    position = empty(len(order), dtype=int)
+    position[order] = arange(len(order))
+    return first[order], position[index]
+
+
+def _damage_parameters(building_parameters):
+    # Some tests only give the parameters the capacity curve needs
+    return [name for name in DAMAGE_PARAMETERS
+            if name in building_parameters]
+
+
 def state_probability(threshold, beta, value):
     """Calculate the state probabilities for a given threshold, beta and value.
 
@@ -0,0 +1,159 @@
+"""
+distance_cache.py
+
+Keep site to event distances on disk, so runs with the same sites and
+event set do not work the distances out again.  e.g. sensitivity
+studies that only change the ground motion model weights, the
+amplification or the vulnerability.
+
+The distances of a block of sites are saved as .npy files named by a
+fingerprint of the site locations and the event geometry, and are
+loaded as memory maps.  When the cache is bigger than its size limit
+the least recently used files are removed.
+"""
+
+import os
+import hashlib
+
+from numpy import save, load, ascontiguousarray
+
+# Change this if the distance functions change, so old cached
+# distances are not used.
+DISTANCE_CACHE_VERSION = '1'
+
+# The event set attributes the distances depend on.
+EVENT_GEOMETRY_ATTRIBUTES = ['rupture_centroid_lat', 'rupture_centroid_lon',
+                             'length', 'azimuth', 'width', 'dip', 'depth',
+                             'depth_to_top', 'trace_start_lat',
+                             'trace_start_lon', 'rupture_centroid_x',
+                             'rupture_centroid_y']
+
+
+def fingerprint(*arrays):
+    """
+    Return a hex digest of the dtypes, shapes and values of the arrays.
+    """
+    digest = hashlib.sha1()
+    for values in arrays:
+        values = ascontiguousarray(values)
+        digest.update('%s%s' % (values.dtype.str, values.shape))
+        digest.update(values.data)
+    return digest.hexdigest()
+
+
+def event_set_fingerprint(event_set):
+    """
+    Return a fingerprint of the geometry of the events of an event set.
+    """
+    return fingerprint(*[getattr(event_set, attribute)
+                         for attribute in EVENT_GEOMETRY_ATTRIBUTES])
+
+
+def distances_key(site_latitude, site_longitude, event_set_key,
+                  event_indexes):
+    """
+    Return the cache key of the distances from some sites to some of
+    the events of an event set.
+
+    event_set_key is the event_set_fingerprint of the event set and
+    event_indexes are the indexes of the events in the event set.
+    """
+    return fingerprint(DISTANCE_CACHE_VERSION, event_set_key,
+                       site_latitude, site_longitude, event_indexes)
+
+
+class Distance_Cache(object):
+
+    """
+    A directory of cached distance arrays, of at most max_bytes.
+
+    The directory is only scanned when the size of the cache, as known
+    to this process, is over max_bytes.  Nodes sharing the cache do
+    not see each other's files until then.
+    """
+
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        # The size of the cache, None until the directory is scanned
+        self.total_bytes = None
+        if not os.path.exists(cache_dir):
+            try:
+                os.makedirs(cache_dir)
+            except OSError:
+                # Another node made it
+                pass
+
+    def file_name(self, key, distance_type):
+        return os.path.join(self.cache_dir,
+                            '%s_%s.npy' % (key, distance_type))
+
+    def load(self, key, distance_type):
+        """
+        Return the cached distances, as a copy on write memory map, or
+        None if they are not in the cache.
+        """
+        file_name = self.file_name(key, distance_type)
+        try:
+            # Mark the file as recently used
+            os.utime(file_name, None)
+            return load(file_name, mmap_mode='c')
+        except (IOError, OSError, ValueError):
+            # Not cached, or removed by another node
+            return None
+
+    def save(self, key, distance_type, distances):
+        """
+        Save distances in the cache, then remove the least recently
+        used files if the cache is too big.
+
+        The file is written then renamed, so a cached file is never
+        half written.
+        """
+        file_name = self.file_name(key, distance_type)
+        tmp_file_name = '%s.%i.tmp.npy' % (file_name[:-len('.npy')],
+                                           os.getpid())
+        save(tmp_file_name, distances)
+        size = os.path.getsize(tmp_file_name)
+        try:
+            os.rename(tmp_file_name, file_name)
+        except OSError:
+            # Windows will not rename over a file
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+            os.rename(tmp_file_name, file_name)
+        if self.total_bytes is not None:
+            self.total_bytes += size
+        if self.total_bytes is None or self.total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """
+        Remove the least recently used files until the cache is no
+        bigger than max_bytes.
+        """
+        files = []
+        total_bytes = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.npy') or name.endswith('.tmp.npy'):
+                continue
+            file_name = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(file_name)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, file_name))
+            total_bytes += stat.st_size
+
+        files.sort()
+        for _, size, file_name in files:
+            if total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(file_name)
+            except OSError:
+                pass
+            total_bytes -= size
+        self.total_bytes = total_bytes
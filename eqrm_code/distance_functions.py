@@ -41,6 +41,8 @@ from scipy import newaxis, sqrt, pi, cos, sin, where, reshape, arctan, sign
 from scipy import tan, arcsin, arccos, zeros
 
 from .projections import azimuthal_orthographic_ll_to_xy as ll2xy
+from .projections import azimuthal_orthographic_ll_to_xy_trig as ll2xy_trig
+from .projections import PI_DIV_180
 
 csc = lambda x: 1 / sin(x)
 sec = lambda x: 1 / cos(x)
@@ -81,6 +83,13 @@ def Hypocentral(
         angular_to_cartesian(lat_sites, lon_sites,
                              lat_events, lon_events, azimuths)
 
+    return _Hypocentral_local(site_x, site_y, depths)
+
+
+def _Hypocentral_local(site_x, site_y, depths):
+    """
+    Hypocentral, given the site co-ordinates with the event as the origin.
+    """
     return sqrt(site_x * site_x + site_y * site_y + depths * depths)
 
 
@@ -117,6 +126,13 @@ def Epicentral(lat_sites, lon_sites, lat_events, lon_events, lengths, azimuths,
         angular_to_cartesian(lat_sites, lon_sites,
                              lat_events, lon_events, azimuths)
 
+    return _Epicentral_local(site_x, site_y)
+
+
+def _Epicentral_local(site_x, site_y):
+    """
+    Epicentral, given the site co-ordinates with the event as the origin.
+    """
     return sqrt(site_x * site_x + site_y * site_y)
 
 
@@ -284,27 +300,41 @@ def Joyner_Boore_xy(lat_sites,
 
     rad = pi / 180
     cos_dip = cos(dips * rad)
-    sin_dip = sin(dips * rad)
-
-    x0 = rupture_centroid_x
-    y0 = rupture_centroid_y
 
     (x, y) = ll2xy(lat_sites, lon_sites, trace_start_lat,
                    trace_start_lon, azimuths)
 
-    # STARTING Matlab code:
-    x = abs(x - x0)  # distance from x to rupture_centroid_x
-    y = abs(y - y0)  # distance from y to rupture_centroid_y
+    return _Joyner_Boore_xy_local(x, y, lengths, widths, cos_dip,
+                                  rupture_centroid_x, rupture_centroid_y)
+
 
+def _Joyner_Boore_xy_local(x, y, lengths, widths, cos_dip, x0, y0):
+    """
+    Joyner_Boore_xy, given x, y, the site locations in the local
+    co-ordinates of the rupture, with the start of the trace as the
+    origin.
+    """
     l = lengths / 2.0        # length from start/end to rupture_centroid_x
     w = cos_dip * widths / 2.0  # width from start/end to rupture_centroid_x
 
     if l.shape == (1, 1):
         l = reshape(l, (1))
-    x = where(x < l, l, x)    # max(l, x)
-
     if w.shape == (1, 1):
         w = reshape(w, (1))
+
+    return _Joyner_Boore_xy_edges(x, y, x0, y0, l, w)
+
+
+def _Joyner_Boore_xy_edges(x, y, x0, y0, l, w):
+    """
+    Joyner_Boore_xy, given l and w, the half length and the half
+    surface width of the ruptures.
+    """
+    # STARTING Matlab code:
+    x = abs(x - x0)  # distance from x to rupture_centroid_x
+    y = abs(y - y0)  # distance from y to rupture_centroid_y
+
+    x = where(x < l, l, x)    # max(l, x)
     y = where(y < w, w, y)    # max(w, y)
 
     x = x - l  # distance from x to edge of rupture plane
@@ -318,9 +348,7 @@ def Joyner_Boore(*args):
 
     x, y = Joyner_Boore_xy(*args)
 
-    joyner_boore_distance = sqrt(x * x + y * y)
-    return where(joyner_boore_distance < DISTANCE_LIMIT,
-                 DISTANCE_LIMIT, joyner_boore_distance)
+    return _Joyner_Boore_local(x, y)
 
 
 def Horizontal(lat_sites, lon_sites, lat_events, lon_events, lengths,
@@ -362,6 +390,13 @@ def Horizontal(lat_sites, lon_sites, lat_events, lon_events, lengths,
     (_, Rx) = ll2xy(lat_sites, lon_sites, trace_start_lat,
                     trace_start_lon, azimuths)
 
+    return _Horizontal_local(Rx)
+
+
+def _Horizontal_local(Rx):
+    """
+    Horizontal, given Rx, the local y co-ordinate of the sites.
+    """
     # limit distance to 1.0km minimum
     return where(abs(Rx) < DISTANCE_LIMIT,
                  sign(Rx) * DISTANCE_LIMIT, Rx)
@@ -403,6 +438,25 @@ def calc_Rx(lat_sites,
     (_, y) = ll2xy(lat_sites, lon_sites, trace_start_lat,
                    trace_start_lon, azimuths)
 
+    return _calc_Rx_local(y, widths, cos_dip, rupture_centroid_y)
+
+
+def _calc_Rx_local(y, widths, cos_dip, rupture_centroid_y):
+    """
+    calc_Rx, given y, the local y co-ordinate of the sites.
+    """
+    # returning Rx
+    # distance from y to rupture_centroid_y
+    # if Rx is -ve it is on the footwall side
+    # if Rx is +ve it is on the Hanging wall side
+    return y - _surface_top_edge(widths, cos_dip, rupture_centroid_y)
+
+
+def _surface_top_edge(widths, cos_dip, rupture_centroid_y):
+    """
+    The local y co-ordinate of the surface projection of the top edge
+    of the rupture plane.
+    """
     # surface projection top edge of rupture plane to rupture_centroid_x
     w = cos_dip * widths / 2.0
 
@@ -414,13 +468,7 @@ def calc_Rx(lat_sites,
     # max(surf_top_edge, 0)
     if surf_top_edge.shape == (1, 1):
         surf_top_edge = reshape(surf_top_edge, (1))
-    surf_top_edge = where(0 < surf_top_edge, surf_top_edge, 0)
-
-    # returning Rx
-    # distance from y to rupture_centroid_y
-    # if Rx is -ve it is on the footwall side
-    # if Rx is +ve it is on the Hanging wall side
-    return y - surf_top_edge
+    return where(0 < surf_top_edge, surf_top_edge, 0)
 
 def Kaklamanos_Ry(*args):
     """
@@ -474,25 +522,51 @@ def Kaklamanos_Rrup_prime(Rx, widths, dips, depths_to_top):
                     /
     """
 
+    return _Kaklamanos_Rrup_prime_zones(
+        Rx, *_Kaklamanos_zone_terms(widths, dips, depths_to_top))
+
+
+def _Kaklamanos_zone_terms(widths, dips, depths_to_top):
+    """
+    The terms of Kaklamanos_Rrup_prime that only depend on the events.
+
+    Returns (zone_a_limit, zone_b_limit, sin_dip, top_cos_dip,
+    width_cos_dip, top_squared, bottom_squared).
+    """
     d = dips * pi / 180  # define dips in terms of radians
     Ztor = depths_to_top
     W = widths
 
+    return (Ztor * tan(d),
+            Ztor * tan(d) + W * sec(d),
+            sin(d),
+            Ztor * cos(d),
+            W * cos(d),
+            Ztor ** 2,
+            (Ztor + W * sin(d)) ** 2)
+
+
+def _Kaklamanos_Rrup_prime_zones(Rx, zone_a_limit, zone_b_limit, sin_dip,
+                                 top_cos_dip, width_cos_dip, top_squared,
+                                 bottom_squared):
+    """
+    Kaklamanos_Rrup_prime, given the result of _Kaklamanos_zone_terms.
+    """
     Rrup_p = zeros(Rx.shape)
 
     # Zone A
-    Rrup_p = where(Rx < Ztor * tan(d),
-                   sqrt(Rx ** 2 + Ztor ** 2),
+    Rrup_p = where(Rx < zone_a_limit,
+                   sqrt(Rx ** 2 + top_squared),
                    Rrup_p)
 
     # Zone B
-    Rrup_p = where((Rx >= Ztor * tan(d)) & (Rx <= Ztor * tan(d) + W * sec(d)),
-                   Rx * sin(d) + Ztor * cos(d),
+    Rrup_p = where((Rx >= zone_a_limit) & (Rx <= zone_b_limit),
+                   Rx * sin_dip + top_cos_dip,
                    Rrup_p)
 
     # Zone C
-    Rrup_p = where(Rx > Ztor * tan(d) + W * sec(d),
-                   sqrt((Rx - W * cos(d)) ** 2 + (Ztor + W * sin(d)) ** 2),
+    Rrup_p = where(Rx > zone_b_limit,
+                   sqrt((Rx - width_cos_dip) ** 2 + bottom_squared),
                    Rrup_p)
 
     return Rrup_p
@@ -579,39 +653,53 @@ def Rupture(lat_sites,
     Implementation of Rupture Distance as specified by
     Kaklamanos et al. (2011)
     """
+    lat_sites = lat_sites[:, newaxis]
+    lon_sites = lon_sites[:, newaxis]
+
+    rad = pi / 180
+    cos_dip = cos(dips * rad)
+
+    # The site locations are projected once, for Rjb, Rx and Ry
+    (x, y) = ll2xy(lat_sites, lon_sites, trace_start_lat,
+                   trace_start_lon, azimuths)
+
+    jb_x, jb_y = _Joyner_Boore_xy_local(x, y, lengths, widths, cos_dip,
+                                        rupture_centroid_x,
+                                        rupture_centroid_y)
+    Rx = _calc_Rx_local(y, widths, cos_dip, rupture_centroid_y)
+    return _Rupture_local(jb_x, jb_y, Rx, widths, dips, depths_to_top)
 
+
+def _Joyner_Boore_local(jb_x, jb_y):
+    """
+    Joyner_Boore, given the result of _Joyner_Boore_xy_local.
+    """
+    joyner_boore_distance = sqrt(jb_x * jb_x + jb_y * jb_y)
+    return where(joyner_boore_distance < DISTANCE_LIMIT,
+                 DISTANCE_LIMIT, joyner_boore_distance)
+
+
+def _Kaklamanos_Non_Vertical_Rrup_local(Rx, Ry, widths, dips,
+                                        depths_to_top):
+    """
+    Kaklamanos_Non_Vertical_Rrup, given Rx and Ry.
+    """
+    # Calculate Rrup_inplane
+    Rrup_prime = Kaklamanos_Rrup_prime(Rx, widths, dips, depths_to_top)
+
+    return sqrt(Rrup_prime ** 2 + Ry ** 2)
+
+
+def _Rupture_local(jb_x, jb_y, Rx, widths, dips, depths_to_top):
+    """
+    Rupture, given the result of _Joyner_Boore_xy_local and Rx.
+    """
     # Calculate Rjb
-    Rjb = Joyner_Boore(lat_sites,
-                       lon_sites,
-                       lat_events,
-                       lon_events,
-                       lengths,
-                       azimuths,
-                       widths,
-                       dips,
-                       depths,
-                       depths_to_top,
-                       projection,
-                       trace_start_lat,
-                       trace_start_lon,
-                       rupture_centroid_x,
-                       rupture_centroid_y)
+    Rjb = _Joyner_Boore_local(jb_x, jb_y)
 
-    Rrup_non_vertical = Kaklamanos_Non_Vertical_Rrup(lat_sites,
-                                                     lon_sites,
-                                                     lat_events,
-                                                     lon_events,
-                                                     lengths,
-                                                     azimuths,
-                                                     widths,
-                                                     dips,
-                                                     depths,
-                                                     depths_to_top,
-                                                     projection,
-                                                     trace_start_lat,
-                                                     trace_start_lon,
-                                                     rupture_centroid_x,
-                                                     rupture_centroid_y)
+    # The x component of Joyner_Boore_xy is Ry
+    Rrup_non_vertical = _Kaklamanos_Non_Vertical_Rrup_local(
+        Rx, jb_x, widths, dips, depths_to_top)
 
     Rrup_vertical = Kaklamanos_Vertical_Rrup(Rjb, depths_to_top)
 
@@ -636,3 +724,179 @@ for function_name in __local_functions.keys():
     if not function_name.startswith('_'):  # If it's not private
         function = __local_functions[function_name]
         distance_functions[function_name] = function
+
+
+# The distance types that fused_distances works out from the site
+# locations in the local co-ordinates of the rupture trace.
+RUPTURE_FRAME_DISTANCES = ['Joyner_Boore', 'Horizontal', 'calc_Rx',
+                           'Kaklamanos_Ry', 'Kaklamanos_Non_Vertical_Rrup',
+                           'Rupture']
+# The distance types that fused_distances works out from the site
+# locations with the event as the origin.
+EVENT_FRAME_DISTANCES = ['Epicentral', 'Hypocentral']
+
+
+class Rupture_Geometry(object):
+
+    """
+    The terms of the rupture frame distances that only depend on the
+    events, e.g. the sine and cosine of the azimuths and the half
+    lengths of the ruptures.
+
+    These are worked out once for an event set, so the distances to
+    each block of sites only do the site dependent arithmetic.
+    """
+
+    # The per-event arrays, which are sliced with the events.
+    attributes = ['cos_azimuth', 'sin_azimuth', 'half_length',
+                  'half_surface_width', 'surface_top_edge', 'zone_a_limit',
+                  'zone_b_limit', 'sin_dip', 'top_cos_dip', 'width_cos_dip',
+                  'top_squared', 'bottom_squared', 'vertical']
+
+    def __init__(self, lengths, azimuths, widths, dips, depths_to_top,
+                 rupture_centroid_y):
+        rad = pi / 180
+        cos_dip = cos(dips * rad)
+
+        self.cos_azimuth = cos(azimuths * PI_DIV_180)
+        self.sin_azimuth = sin(azimuths * PI_DIV_180)
+        self.half_length = lengths / 2.0
+        self.half_surface_width = cos_dip * widths / 2.0
+        self.surface_top_edge = _surface_top_edge(widths, cos_dip,
+                                                  rupture_centroid_y)
+        (self.zone_a_limit, self.zone_b_limit, self.sin_dip,
+         self.top_cos_dip, self.width_cos_dip, self.top_squared,
+         self.bottom_squared) = _Kaklamanos_zone_terms(widths, dips,
+                                                       depths_to_top)
+        self.vertical = (dips == 90.0)
+
+    def __getitem__(self, key):
+        """
+        Take a slice by the event dimension.
+        """
+        geometry = Rupture_Geometry.__new__(Rupture_Geometry)
+        for attribute in self.attributes:
+            setattr(geometry, attribute, getattr(self, attribute)[key])
+        return geometry
+
+    def __len__(self):
+        return len(self.half_length)
+
+
+def fused_distances(distance_types,
+                    lat_sites,
+                    lon_sites,
+                    lat_events,
+                    lon_events,
+                    lengths,
+                    azimuths,
+                    widths,
+                    dips,
+                    depths,
+                    depths_to_top,
+                    projection,
+                    trace_start_lat,
+                    trace_start_lon,
+                    rupture_centroid_x,
+                    rupture_centroid_y,
+                    rupture_geometry=None):
+    """
+    Calculate several distance types in one pass.
+
+    The sites are projected into the frame of each rupture once, and
+    all of the requested distance types are worked out from the
+    projected locations.  The results are the same as calling the
+    distance functions one at a time.  Distance types without a
+    shared frame are calculated by their distance function.
+
+    rupture_geometry is the Rupture_Geometry of the events.  If it is
+    None it is worked out.
+
+    Returns a dictionary of distance type to distance array
+    (sites, events).
+    """
+    args = (lat_sites, lon_sites, lat_events, lon_events, lengths,
+            azimuths, widths, dips, depths, depths_to_top, projection,
+            trace_start_lat, trace_start_lon, rupture_centroid_x,
+            rupture_centroid_y)
+    results = {}
+    lat_sites = lat_sites[:, newaxis]
+    lon_sites = lon_sites[:, newaxis]
+
+    rupture_types = [distance_type for distance_type in distance_types
+                     if distance_type in RUPTURE_FRAME_DISTANCES]
+    if len(rupture_types) > 0:
+        if rupture_geometry is None:
+            rupture_geometry = Rupture_Geometry(lengths, azimuths, widths,
+                                                dips, depths_to_top,
+                                                rupture_centroid_y)
+        geometry = rupture_geometry
+        (x, y) = ll2xy_trig(lat_sites, lon_sites, trace_start_lat,
+                            trace_start_lon, geometry.cos_azimuth,
+                            geometry.sin_azimuth)
+        jb_x, jb_y = _Joyner_Boore_xy_edges(x, y, rupture_centroid_x,
+                                            rupture_centroid_y,
+                                            geometry.half_length,
+                                            geometry.half_surface_width)
+        Rx = y - geometry.surface_top_edge
+        for distance_type in rupture_types:
+            if distance_type == 'Joyner_Boore':
+                results[distance_type] = _Joyner_Boore_local(jb_x, jb_y)
+            elif distance_type == 'Horizontal':
+                results[distance_type] = _Horizontal_local(y)
+            elif distance_type == 'calc_Rx':
+                results[distance_type] = Rx
+            elif distance_type == 'Kaklamanos_Ry':
+                results[distance_type] = jb_x
+            elif distance_type == 'Kaklamanos_Non_Vertical_Rrup':
+                results[distance_type] = _Rupture_geometry_non_vertical(
+                    Rx, jb_x, geometry)
+            elif distance_type == 'Rupture':
+                results[distance_type] = _Rupture_geometry(
+                    jb_x, jb_y, Rx, geometry)
+
+    event_types = [distance_type for distance_type in distance_types
+                   if distance_type in EVENT_FRAME_DISTANCES]
+    if len(event_types) > 0:
+        # get the coordinates of the site, with events as the origin.
+        (site_x, site_y) = projection.\
+            angular_to_cartesian(lat_sites, lon_sites,
+                                 lat_events, lon_events, azimuths)
+        for distance_type in event_types:
+            if distance_type == 'Epicentral':
+                results[distance_type] = _Epicentral_local(site_x, site_y)
+            elif distance_type == 'Hypocentral':
+                results[distance_type] = _Hypocentral_local(site_x, site_y,
+                                                            depths)
+
+    for distance_type in distance_types:
+        if distance_type not in results:
+            results[distance_type] = distance_functions[distance_type](*args)
+    return results
+
+
+def _Rupture_geometry_non_vertical(Rx, Ry, geometry):
+    """
+    Kaklamanos_Non_Vertical_Rrup, given Rx, Ry and the Rupture_Geometry.
+    """
+    Rrup_prime = _Kaklamanos_Rrup_prime_zones(
+        Rx, geometry.zone_a_limit, geometry.zone_b_limit, geometry.sin_dip,
+        geometry.top_cos_dip, geometry.width_cos_dip, geometry.top_squared,
+        geometry.bottom_squared)
+    return sqrt(Rrup_prime ** 2 + Ry ** 2)
+
+
+def _Rupture_geometry(jb_x, jb_y, Rx, geometry):
+    """
+    Rupture, given the result of _Joyner_Boore_xy_edges, Rx and the
+    Rupture_Geometry.
+    """
+    Rjb = _Joyner_Boore_local(jb_x, jb_y)
+
+    # The x component of Joyner_Boore_xy is Ry
+    Rrup_non_vertical = _Rupture_geometry_non_vertical(Rx, jb_x, geometry)
+    Rrup_vertical = sqrt(Rjb ** 2 + geometry.top_squared)
+
+    Rrup = where(geometry.vertical, Rrup_vertical, Rrup_non_vertical)
+
+    return where(Rrup < DISTANCE_LIMIT, DISTANCE_LIMIT, Rrup)
@@ -15,9 +15,17 @@
 
 # FIXME.  This looks like it can be optimised a lot.
 
-from scipy import array
+import copy
 
-from .distance_functions import distance_functions
+from scipy import array, asarray, arange, zeros, ones, concatenate, \
+    bincount, nonzero, cumsum, inf
+
+from .distance_functions import distance_functions, fused_distances, \
+    RUPTURE_FRAME_DISTANCES
+
+# The number of sites and events in each tile of sparse_distances
+SPARSE_SITE_CHUNK = 100
+SPARSE_EVENT_CHUNK = 10000
 
 # def distance_limit(distance):
  #   """ Given an array of distances, set a lower limit.
@@ -41,7 +49,13 @@ class Distances(object):
                  trace_start_lat=None,
                  trace_start_lon=None,
                  rupture_centroid_x=None,
-                 rupture_centroid_y=None):
+                 rupture_centroid_y=None,
+                 rupture_geometry=None):
+        """
+        rupture_geometry is an optional Rupture_Geometry of the events.
+        If it is given, the rupture frame distances use it rather than
+        working out the per-event terms again.
+        """
 
         self.distance_functions = distance_functions
         self.distance_cache = {}
@@ -75,6 +89,45 @@ class Distances(object):
         if self.rupture_centroid_y is not None:
             self.rupture_centroid_y = array(self.rupture_centroid_y)
 
+        self.rupture_geometry = rupture_geometry
+
+        # An optional Distance_Cache on disk, see use_disk_cache
+        self.disk_cache = None
+        self.disk_cache_key = None
+
+    def use_disk_cache(self, disk_cache, key):
+        """
+        Load the distances from disk_cache, a Distance_Cache, if they
+        are there, and save the distances that are calculated to it.
+
+        key is the distances_key of the sites and events.
+        """
+        self.disk_cache = disk_cache
+        self.disk_cache_key = key
+
+    def _load_from_disk(self, distance_types):
+        """
+        Add the distance types that are in the disk cache to the cache.
+        """
+        if self.disk_cache is None:
+            return
+        for distance_type in distance_types:
+            if distance_type not in self.distance_cache:
+                distances = self.disk_cache.load(self.disk_cache_key,
+                                                 distance_type)
+                if distances is not None:
+                    self.distance_cache[distance_type] = distances
+
+    def _save_to_disk(self, distance_types):
+        """
+        Save the distance types to the disk cache.
+        """
+        if self.disk_cache is None:
+            return
+        for distance_type in distance_types:
+            self.disk_cache.save(self.disk_cache_key, distance_type,
+                                 self.distance_cache[distance_type])
+
     def __getattr__(self, distance_type):
         """self.Epicentral = self.distance['Epicentral']"""
 
@@ -84,6 +137,12 @@ class Distances(object):
             return self.distance(distance_type)
 
     def distance(self, distance_type):
+        if distance_type not in self.distance_cache:
+            self._load_from_disk([distance_type])
+        if distance_type not in self.distance_cache and \
+                self.rupture_geometry is not None and \
+                distance_type in RUPTURE_FRAME_DISTANCES:
+            self.calc_distances([distance_type])
         if distance_type not in self.distance_cache:
             self.distance_cache[distance_type] = self.raw_distances(
                 site_latitude=self.site_latitude,
@@ -102,8 +161,45 @@ class Distances(object):
                 trace_start_lon=self.trace_start_lon,
                 rupture_centroid_x=self.rupture_centroid_x,
                 rupture_centroid_y=self.rupture_centroid_y)
+            self._save_to_disk([distance_type])
         return self.distance_cache[distance_type]
 
+    def calc_distances(self, distance_types):
+        """
+        Calculate the distance types that are not in the cache in one
+        pass, and add them to the cache.
+
+        The sites are only projected into the frame of each rupture
+        once, however many distance types are needed.
+        """
+        self._load_from_disk(distance_types)
+        new_types = []
+        for distance_type in distance_types:
+            if distance_type not in self.distance_cache and \
+                    distance_type not in new_types:
+                new_types.append(distance_type)
+        if len(new_types) == 0:
+            return
+        self.distance_cache.update(fused_distances(
+            new_types,
+            self.site_latitude,
+            self.site_longitude,
+            self.rupture_centroid_lat,
+            self.rupture_centroid_lon,
+            self.lengths,
+            self.azimuths,
+            self.widths,
+            self.dips,
+            self.depths,
+            self.depths_to_top,
+            self.projection,
+            self.trace_start_lat,
+            self.trace_start_lon,
+            self.rupture_centroid_x,
+            self.rupture_centroid_y,
+            rupture_geometry=self.rupture_geometry))
+        self._save_to_disk(new_types)
+
     def raw_distances(self,
                       site_latitude,
                       site_longitude,
@@ -174,6 +270,9 @@ class Distances(object):
         if self.rupture_centroid_x is not None:
             rupture_centroid_x = self.rupture_centroid_x[event]
             rupture_centroid_y = self.rupture_centroid_y[event]
+        rupture_geometry = None
+        if self.rupture_geometry is not None:
+            rupture_geometry = self.rupture_geometry[event]
 
         distances = Distances(site_latitude,
                               site_longitude,
@@ -189,7 +288,8 @@ class Distances(object):
                               trace_start_lat=trace_start_lat,
                               trace_start_lon=trace_start_lon,
                               rupture_centroid_x=rupture_centroid_x,
-                              rupture_centroid_y=rupture_centroid_y)
+                              rupture_centroid_y=rupture_centroid_y,
+                              rupture_geometry=rupture_geometry)
 
         # Take a slice of the cached distances
         distance_cache = {}
@@ -198,3 +298,201 @@ class Distances(object):
         distances.distance_cache = distance_cache
 
         return distances
+
+    def site_subset(self, key):
+        """
+        Take a subset of the sites, keeping the cached distances of
+        the subset.  The subset does not use the disk cache.
+        """
+        distances = copy.copy(self)
+        distances.site_latitude = self.site_latitude[key]
+        distances.site_longitude = self.site_longitude[key]
+        distances.distance_cache = dict(
+            (distance_type, values[key])
+            for distance_type, values in self.distance_cache.iteritems())
+        distances.disk_cache = None
+        distances.disk_cache_key = None
+        return distances
+
+
+class Sparse_Distances(object):
+
+    """
+    The distances of the (site, event) pairs that are within a threshold
+    distance, in compressed sparse row form.
+
+    The pairs of site i are site_pointers[i]:site_pointers[i + 1].
+    event_indexes holds the event of each pair, in increasing order
+    for each site, and distances is a dictionary of distance type to
+    the distance of each pair.
+    """
+
+    def __init__(self, num_sites, num_events, site_pointers, event_indexes,
+                 distances):
+        self.num_sites = num_sites
+        self.num_events = num_events
+        self.site_pointers = site_pointers
+        self.event_indexes = event_indexes
+        self.distances = distances
+
+    def __len__(self):
+        """The number of (site, event) pairs"""
+        return len(self.event_indexes)
+
+    def site_events(self, site_index):
+        """
+        Return the event indexes of the pairs of a site, and a
+        dictionary of distance type to the distances of these pairs.
+        """
+        lo = self.site_pointers[site_index]
+        hi = self.site_pointers[site_index + 1]
+        return (self.event_indexes[lo:hi],
+                dict((distance_type, distance[lo:hi])
+                     for distance_type, distance
+                     in self.distances.iteritems()))
+
+    def site_indexes(self):
+        """Return the site index of each pair."""
+        return arange(self.num_sites).repeat(
+            self.site_pointers[1:] - self.site_pointers[:-1])
+
+    def dense(self, distance_type, fill_value=inf):
+        """
+        Return the (sites, events) array of a distance type.  Pairs
+        beyond the threshold distance are fill_value.
+
+        Only use this for a few sites - it is O(sites x events).
+        """
+        result = zeros((self.num_sites, self.num_events))
+        result[:] = fill_value
+        result[self.site_indexes(), self.event_indexes] = \
+            self.distances[distance_type]
+        return result
+
+
+def sparse_distances(site_latitude,
+                     site_longitude,
+                     event_set,
+                     distance_types,
+                     projection,
+                     threshold_distance=None,
+                     threshold_distance_type='Joyner_Boore',
+                     event_index=None,
+                     site_chunk_size=SPARSE_SITE_CHUNK,
+                     event_chunk_size=SPARSE_EVENT_CHUNK):
+    """
+    Calculate the distances from the sites to the events of an event
+    set, a tile of sites x events at a time, and keep the pairs within
+    the threshold distance.  The memory used is O(tile + pairs kept)
+    rather than O(sites x events).
+
+    site_latitude, site_longitude: The site locations.
+    event_set: An Event_Set, with trace starts.
+    distance_types: The distance types to calculate.
+    threshold_distance: Pairs further than this, measured using
+      threshold_distance_type, are dropped.  If None all pairs are kept.
+    event_index: An optional Event_Spatial_Index of the event set.  Only
+      the candidate events of each chunk of sites are tiled.
+      threshold_distance_type must be Joyner_Boore to use it.
+
+    Returns a Sparse_Distances.
+    """
+    site_latitude = asarray(site_latitude)
+    site_longitude = asarray(site_longitude)
+    num_sites = len(site_latitude)
+    num_events = len(event_set)
+
+    calc_types = list(distance_types)
+    if threshold_distance is not None and \
+            threshold_distance_type not in calc_types:
+        calc_types.append(threshold_distance_type)
+    if event_index is not None and threshold_distance is not None and \
+            threshold_distance_type != 'Joyner_Boore':
+        raise RuntimeError('The event index only finds events within a '
+                           'Joyner_Boore threshold distance.')
+
+    # Read the event arrays once, rather than for each tile
+    rupture_centroid_lat = asarray(event_set.rupture_centroid_lat)
+    rupture_centroid_lon = asarray(event_set.rupture_centroid_lon)
+    length = asarray(event_set.length)
+    azimuth = asarray(event_set.azimuth)
+    width = asarray(event_set.width)
+    dip = asarray(event_set.dip)
+    depth = asarray(event_set.depth)
+    depth_to_top = asarray(event_set.depth_to_top)
+    trace_start_lat = asarray(event_set.trace_start_lat)
+    trace_start_lon = asarray(event_set.trace_start_lon)
+    rupture_centroid_x = asarray(event_set.rupture_centroid_x)
+    rupture_centroid_y = asarray(event_set.rupture_centroid_y)
+    rupture_geometry = event_set.rupture_geometry()
+
+    counts = zeros(num_sites, dtype=int)
+    chunk_events = []
+    chunk_distances = dict((distance_type, []) for distance_type
+                           in distance_types)
+    for i in range(0, num_sites, site_chunk_size):
+        i_hi = min(i + site_chunk_size, num_sites)
+        if event_index is not None and threshold_distance is not None:
+            candidates = event_index.candidate_events(
+                site_latitude[i:i_hi], site_longitude[i:i_hi],
+                threshold_distance)
+        else:
+            candidates = arange(num_events)
+
+        # The pairs of this chunk of sites, from each tile
+        tile_sites = []
+        tile_events = []
+        tile_distances = dict((distance_type, []) for distance_type
+                              in distance_types)
+        for j in range(0, len(candidates), event_chunk_size):
+            events = candidates[j:j + event_chunk_size]
+            distances = Distances(
+                site_latitude[i:i_hi],
+                site_longitude[i:i_hi],
+                rupture_centroid_lat[events],
+                rupture_centroid_lon[events],
+                length[events],
+                azimuth[events],
+                width[events],
+                dip[events],
+                depth[events],
+                depth_to_top[events],
+                projection,
+                trace_start_lat=trace_start_lat[events],
+                trace_start_lon=trace_start_lon[events],
+                rupture_centroid_x=rupture_centroid_x[events],
+                rupture_centroid_y=rupture_centroid_y[events],
+                rupture_geometry=rupture_geometry[events])
+            distances.calc_distances(calc_types)
+            if threshold_distance is None:
+                close = ones((i_hi - i, len(events)), dtype=bool)
+            else:
+                close = (distances.distance(threshold_distance_type) <=
+                         threshold_distance)
+            (sites, event_inds) = nonzero(close)
+            tile_sites.append(sites)
+            tile_events.append(events[event_inds])
+            for distance_type in distance_types:
+                tile_distances[distance_type].append(
+                    distances.distance(distance_type)[sites, event_inds])
+
+        if len(tile_sites) == 0:
+            continue
+        # Order the pairs by site, then event
+        sites = concatenate(tile_sites)
+        order = sites.argsort(kind='mergesort')
+        counts[i:i_hi] = bincount(sites, minlength=i_hi - i)
+        chunk_events.append(concatenate(tile_events)[order])
+        for distance_type in distance_types:
+            chunk_distances[distance_type].append(
+                concatenate(tile_distances[distance_type])[order])
+
+    site_pointers = zeros(num_sites + 1, dtype=int)
+    site_pointers[1:] = cumsum(counts)
+    event_indexes = concatenate(chunk_events + [zeros(0, dtype=int)])
+    pair_distances = {}
+    for distance_type in distance_types:
+        pair_distances[distance_type] = concatenate(
+            chunk_distances[distance_type] + [zeros(0)])
+    return Sparse_Distances(num_sites, num_events, site_pointers,
+                            event_indexes, pair_distances)
@@ -12,10 +12,12 @@
   ModifiedDate: $Date: 2009-09-18 17:10:15 +1000 (Fri, 18 Sep 2009) $
 """
 
-from scipy import nan_to_num, where, array, zeros, indices, ndarray, seterr
+from scipy import nan_to_num, where, array, zeros, indices, ndarray, seterr, \
+    ones, nonzero, newaxis
 
 
-def solve(SA, SD, SAcap, update_function, rtol=0.05, maxits=100):
+def solve(SA, SD, SAcap, update_function, rtol=0.05, maxits=100,
+          active_set=False):
     """
     #FIXME DSG-EQRM what is the dimensions of these, and the return value?
     SA = demand curve (g)
@@ -34,7 +36,13 @@ def solve(SA, SD, SAcap, update_function, rtol=0.05, maxits=100):
     maxits is the maximum iterations. If maxits is exceeded, then
     any points that are not yet deemed to have converged are set
     to (intersection_x + old_intersection_x)/2
+
+    If active_set is True, see solve_active_set.
     """
+    if active_set:
+        return solve_active_set(SA, SD, SAcap, update_function, rtol=rtol,
+                                maxits=maxits)
+
     # old terminology, SDcr was intersection_x
     iters = 0
     intersection_x = find_intersection(SD, SA, SAcap)
@@ -72,6 +80,63 @@ def solve(SA, SD, SAcap, update_function, rtol=0.05, maxits=100):
         non_convergent = array([])
     return intersection_x, non_convergent
 
+
+def solve_active_set(SA, SD, SAcap, update_function, rtol=0.05, maxits=100):
+    """
+    As solve, but each point stops being updated once it has moved by
+    less than rtol.  Only the points that have not converged, the
+    active set, are passed to update_function.
+
+    SA, SD and SAcap have dimensions (building, event, period).
+
+    update_function(intersection_x, active) makes a new SA, SD, SAcap
+    and exit flag for the active points.  active is a tuple of the
+    (building, event) indexes of the active points, intersection_x
+    their intersections, dimensions (1, active point), and the new
+    curves have dimensions (1, active point, period).  It is usually
+    eqrm_code.capacity_spectrum_model.Capacity_spectrum_model.updated_response
+
+    The results are within rtol of solve's, as solve keeps on
+    updating the points that have converged until they all have.
+    """
+    iters = 0
+    intersection_x = find_intersection(SD, SA, SAcap)
+    old_intersection_x = intersection_x.copy()
+    # Where each point has not converged
+    not_converged = ones(intersection_x.shape, dtype=bool)
+    exit_flag = False
+    while ((iters <= maxits) & (not exit_flag)):
+        active = nonzero(not_converged)
+        if len(active[0]) == 0:
+            break
+        iters += 1  # update number of iterations
+        old_intersection_x[active] = intersection_x[active]
+        # update curves of the active points
+        SA, SD, SAcap, exit_flag = update_function(
+            intersection_x[active][newaxis, :], active)
+
+        # get new intersection
+        active_x = find_intersection(SD, SA, SAcap)[0]
+        intersection_x[active] = active_x
+        oldsettings = seterr(invalid='ignore')
+        diff = abs(active_x - old_intersection_x[active]) / \
+            old_intersection_x[active]
+        seterr(**oldsettings)
+        # This is needed in windows to stop nan's setting the diff to -1.#IND
+        diff = nan_to_num(diff)
+        not_converged[active] = diff >= rtol
+
+    if exit_flag:
+        not_converged[:] = False
+    # if iteration doesn't converge, take the average value
+    non_convergent = where(not_converged)
+    # x = (x+x_old)/2
+    intersection_x[non_convergent] += old_intersection_x[non_convergent]
+    intersection_x[non_convergent] *= 0.5
+    if len(non_convergent[0]) == 0:
+        non_convergent = array([])
+    return intersection_x, non_convergent
+
 # In EQRM versions before 617 there is a commented out attempt to
 # write this function in C at this point.
 
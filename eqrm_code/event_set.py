@@ -42,6 +42,7 @@ from eqrm_code import source_model #import create_fault_sources
 from eqrm_code import ground_motion_misc
 from eqrm_code import scaling
 from eqrm_code import file_store
+from eqrm_code.distance_functions import Rupture_Geometry
 
 # This specifies the dtypes used in  event set.
 # This was investigated to save memory
@@ -117,6 +118,9 @@ class Event_Set(file_store.File_Store):
         """
         super(Event_Set, self).__init__('event_set')
         
+        # The Rupture_Geometry of the events, see rupture_geometry()
+        self._rupture_geometry = None
+        
         self.azimuth = azimuth
         self.dip = dip
         self.ML = ML
@@ -193,10 +197,10 @@ class Event_Set(file_store.File_Store):
     # END PROPERTIES #
 
     @classmethod
-    def load(cls, load_dir):
+    def load(cls, load_dir, mmap_mode=None):
         """
         Return an Event_Set object from the .npy files stored in the specified
-        directory
+        directory. mmap_mode is passed to numpy.load.
         """
         event_set = cls(azimuth=None,
                         dip=None,
@@ -214,7 +218,7 @@ class Event_Set(file_store.File_Store):
                         rupture_centroid_lat=None,
                         rupture_centroid_lon=None,
                         source=None)
-        event_set._load(load_dir)
+        event_set._load(load_dir, mmap_mode=mmap_mode)
         return event_set
 
     @classmethod
@@ -711,7 +715,26 @@ class Event_Set(file_store.File_Store):
             else:
                 args[att] = getattr(self, att)[key]
         
-        return Event_Set(**args) # FIXME relies on arg/attr name correspondence
+        # FIXME relies on arg/attr name correspondence
+        event_set = Event_Set(**args)
+        if self._rupture_geometry is not None:
+            event_set._rupture_geometry = self._rupture_geometry[key]
+        return event_set
+    
+    def rupture_geometry(self):
+        """
+        Return the Rupture_Geometry of the events - the per-event terms
+        of the distance calculations.
+
+        It is worked out the first time it is asked for and kept.  Slices
+        of this event set take a slice of it, so ask for it before
+        slicing the event set.
+        """
+        if self._rupture_geometry is None:
+            self._rupture_geometry = Rupture_Geometry(
+                self.length, self.azimuth, self.width, self.dip,
+                self.depth_to_top, self.rupture_centroid_y)
+        return self._rupture_geometry
    
     def __len__(self):
         return len(self.rupture_centroid_lat)
@@ -723,6 +746,7 @@ class Event_Set(file_store.File_Store):
             newValues=append(getattr(self, att),getattr(other, att))
             setattr(self,att,newValues)      
             c =getattr(self, att)
+        self._rupture_geometry = None
         return self
 
     def __repr__(self):
@@ -1110,13 +1134,13 @@ class Event_Activity(file_store.File_Store):
     # END PROPERTIES #
     
     @classmethod
-    def load(cls, num_events, load_dir):
+    def load(cls, num_events, load_dir, mmap_mode=None):
         """
         Return an Event_Activity object from the .npy files stored in the
-        specified directory
+        specified directory. mmap_mode is passed to numpy.load.
         """
         event_activity = cls(num_events)
-        event_activity._load(load_dir)
+        event_activity._load(load_dir, mmap_mode=mmap_mode)
         return event_activity
 
     def save(self, dir=None):
@@ -1264,6 +1288,45 @@ class Event_Activity(file_store.File_Store):
         return self.event_activity.nbytes
         
 
+class Event_Activity_Table(object):
+    """
+    The event activity, as used in the site loop.
+
+    The site loop only needs the event activity of the close events,
+    so this is worked out once, after spawning, instead of for every
+    site.  If the event activity is a file array it is kept as the
+    memmap, so only the close events are read.
+
+    Attributes:
+      num_spawn, num_gmm, num_rm, num_events: The event activity dimensions.
+      num_gmm_max: The max number of ground motion models of the sources.
+      event_activity: The (spawn, gmm, rm, events) event activity.
+      source_event_indexes: A list of the event indexes of each
+        source, as int arrays.
+    """
+    def __init__(self, event_activity, source_model):
+        self.event_activity = event_activity.event_activity
+        (self.num_spawn, self.num_gmm, self.num_rm,
+         self.num_events) = self.event_activity.shape
+        self.num_gmm_max = source_model.get_max_num_atten_models()
+        self.source_event_indexes = [
+            asarray(source.get_event_set_indexes(), dtype=int)
+            for source in source_model]
+
+    def close_event_activity(self, event_indexes, num_gmm=None):
+        """
+        Return the event activity of some events, as a
+        (spawn, gmm, rm, events) array.
+
+        event_indexes: The indexes of the events.
+        num_gmm: Only return the first num_gmm ground motion models.
+        """
+        activity = self.event_activity
+        if num_gmm is not None:
+            activity = activity[:, :num_gmm]
+        return asarray(activity[..., event_indexes])
+
+
 ####################################################################
 from eqrm_code.source_model import source_model_from_xml, Source_Model
 from eqrm_code.output_manager import get_source_file_handle
@@ -1409,7 +1472,8 @@ def generate_event_set(parallel, eqrm_flags):
     log.resource_usage()
     
     # Add the ground motion models to the source
-    source_model.set_ground_motion_calcs(eqrm_flags.atten_periods)
+    source_model.set_ground_motion_calcs(eqrm_flags.atten_periods,
+                                         eqrm_flags.atten_tabulated)
     
     # Save event set to standard output file
     save_event_set_to_csv(eqrm_flags, 
@@ -10,10 +10,11 @@
   ModifiedBy: $Author: dgray $
   ModifiedDate: $Date: 2010-03-09 15:48:50 +1100 (Tue, 09 Mar 2010) $
 """
-from numpy import NaN
+from numpy import NaN, minimum, errstate
 import scipy
 from scipy import allclose, isfinite, array, newaxis, zeros, ndarray, \
-    asarray, where, concatenate, allclose, reshape, ones, interp, nonzero
+    asarray, where, concatenate, allclose, reshape, ones, interp, nonzero, \
+    arange, searchsorted, bincount
 
 
 def _collapse_att_model_dimension(data, weights):
@@ -159,3 +160,118 @@ def _rte2cumrte(each_risk, each_rte):
     rsk = each_risk[risk_order]
     cumrte = each_rte[risk_order].cumsum()
     return rsk, cumrte
+
+
+# The default SA grid of the hazard histograms, in g.  SA values
+# outside the grid go into the first or last bin.
+HAZARD_GRID_MIN_SA = 1.0e-6
+HAZARD_GRID_MAX_SA = 100.0
+
+
+def hazard_grid(bins_per_decade, max_sa=HAZARD_GRID_MAX_SA):
+    """
+    Return the bin edges of a log SA grid, in g.
+
+    parrams:
+    bins_per_decade  The number of bins per factor of 10 in SA.
+    max_sa           The SA the grid goes up to.
+
+    returns:
+    edges   [vector (bins + 1)] SA of the bin edges
+    """
+    num_decades = scipy.log10(max_sa / HAZARD_GRID_MIN_SA)
+    num_bins = int(scipy.ceil(num_decades * bins_per_decade))
+    return HAZARD_GRID_MIN_SA * 10 ** (arange(num_bins + 1) /
+                                      float(bins_per_decade))
+
+
+def accumulate_hazard_histogram(histogram, sa, r_nu, edges):
+    """
+    Add the event activity of SA values to the bins of the SA.
+
+    Zero SA values are ignored, as in hzd_do_value.  SA below the first
+    edge is in the first bin and SA above the last edge in the last bin.
+
+    parrams:
+    histogram  [array (sites, periods, bins)] the rate in each bin,
+               updated in place
+    sa         [array (spawn, gmm, rm, sites, events, periods)] SA
+    r_nu       [array (spawn, gmm, rm, events)] event activity for
+               the corresponding elements in sa
+    edges      [vector (bins + 1)] SA of the bin edges
+
+    sa may have an rm dimension of length 1, if the SA is the same for
+    each recurrence model.
+    """
+    num_sites, num_periods, num_bins = histogram.shape
+    if sa.shape[2] == 1 and r_nu.shape[2] > 1:
+        r_nu = r_nu.sum(axis=2)[:, :, newaxis, :]
+    assert sa.shape[3:] == (num_sites, sa.shape[4], num_periods)
+    assert sa.shape[:3] + sa.shape[4:5] == r_nu.shape
+
+    bins = searchsorted(edges, sa, side='right') - 1
+    bins = bins.clip(0, num_bins - 1)
+    # The bin of each SA in the flattened histogram
+    bins += ((arange(num_sites)[:, newaxis, newaxis] * num_periods +
+              arange(num_periods)) * num_bins)
+    rates = where(sa > 0, r_nu[:, :, :, newaxis, :, newaxis], 0.0)
+    histogram += bincount(
+        bins.ravel(), weights=rates.ravel(),
+        minlength=histogram.size).reshape(histogram.shape)
+
+
+def hzd_do_value_histogram(histogram, edges, rtrn_rte):
+    """
+    The hazard values of rate histograms, from
+    accumulate_hazard_histogram.
+
+    The exceedance rate of the lower edge of each bin is the rate of
+    that bin and the bins above it.  Like hzd_do_value, which
+    interpolates between the SA of the events either side of a return
+    rate, the SA of a return rate is interpolated, linearly in rate,
+    between the lower edges of the non-empty bins either side of it.
+    Each event is moved to the lower edge of its bin, so the hazard
+    values are within one bin of those of hzd_do_value, a factor of
+    10**(1/bins_per_decade) in SA.  SA
+    outside the grid is counted in the first or last bin, so hazard
+    values are not more than the last edge.
+
+    parrams:
+    histogram  [array (sites, periods, bins)] the rate in each bin
+    edges      [vector (bins + 1)] SA of the bin edges
+    rtrn_rte   [vector (m)] return rates of interest.
+
+    returns:
+    hzd       [array (sites, periods, m)] hazard value for each return rate
+    """
+    num_sites, num_periods, num_bins = histogram.shape
+    rates = histogram.reshape((-1, num_bins))
+    # The exceedance rate of each edge, (sites * periods, bins + 1)
+    exceed = zeros((rates.shape[0], num_bins + 1))
+    exceed[:, :-1] = rates[:, ::-1].cumsum(axis=1)[:, ::-1]
+    # The first non-empty bin from each bin up, or num_bins if there
+    # is none, (sites * periods, bins + 1)
+    non_empty = zeros((rates.shape[0], num_bins + 1), dtype=int)
+    non_empty[:, :-1] = where(rates > 0, arange(num_bins), num_bins)
+    non_empty[:, -1] = num_bins
+    non_empty = minimum.accumulate(non_empty[:, ::-1], axis=1)[:, ::-1]
+    rows = arange(rates.shape[0])
+    hzd_val = zeros((rates.shape[0], len(rtrn_rte)))
+    for i, rte in enumerate(rtrn_rte):
+        # The non-empty bin with exceed[lower] > rte >= exceed[lower + 1].
+        # It is -1 if rte is not less than the total rate.
+        lower = (exceed > rte).sum(axis=1) - 1
+        above = lower >= 0
+        lower = lower.clip(0, None)
+        upper = non_empty[rows, lower + 1]
+        lower_rate = exceed[rows, lower]
+        upper_rate = exceed[rows, upper]
+        with errstate(divide='ignore', invalid='ignore'):
+            fraction = (lower_rate - rte) / (lower_rate - upper_rate)
+        # for exceedance rates smaller than what we have data for,
+        # give the top non-empty bin.
+        fraction = where(upper < num_bins, fraction, 0.0)
+        value = edges[lower] + fraction * (edges[upper] - edges[lower])
+        # for exceedance rates larger than what we have data for, give 0.
+        hzd_val[:, i] = where(above, value, 0.0)
+    return hzd_val.reshape((num_sites, num_periods, len(rtrn_rte)))
@@ -165,8 +165,12 @@ class File_Store(object):
             filename = os.path.join(save_dir, '%s.npy' % name)
             save(filename, self._get_file_array(name))
 
-    def _load(self, dir=None):
-        """Load the .npy files from the given dir into file_store arrays"""
+    def _load(self, dir=None, mmap_mode=None):
+        """Load the .npy files from the given dir into file_store arrays
+
+        mmap_mode is passed to numpy.load. Use 'c' (copy on write) to
+        share the file pages between processes.
+        """
         if dir is None:
             dir = os.path.curdir
 
@@ -180,4 +184,6 @@ class File_Store(object):
             for file in files:
                 name, ext = os.path.splitext(file)
                 if ext == '.npy':
-                    self._set_file_array(name, load(os.path.join(root, file)))
+                    self._set_file_array(name,
+                                         load(os.path.join(root, file),
+                                              mmap_mode=mmap_mode))
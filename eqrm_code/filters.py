@@ -6,9 +6,22 @@ Created on 17/01/2012
 Functions used by analysis to filter data
 """
 
-import copy
+from scipy import where, asarray, zeros, sqrt, sin, cos, minimum, pi, \
+    unique, concatenate
+from scipy.spatial import cKDTree
 
-from scipy import where, intersect1d
+from eqrm_code.source_model import Source_Model, Source_View
+
+# Radius of the earth used to convert chord lengths to distances, in km.
+EARTH_RADIUS = 6367.0
+
+# The exact distances use a local projection, so the search radius
+# is increased to make sure no event within the threshold is missed.
+INDEX_SEARCH_FACTOR = 1.25
+INDEX_SEARCH_BUFFER = 10.0  # km
+
+# The most (site, event) pairs refined at once by candidate_events.
+INDEX_REFINE_PAIRS = 2 ** 20
 
 
 def apply_threshold_distance(bedrock_SA,
@@ -39,9 +52,99 @@ def apply_threshold_distance(bedrock_SA,
     # print "soil_SA", soil_SA
 
 
+def _unit_vectors(lat, lon):
+    """
+    Return the (n, 3) array of points on the unit sphere.
+    """
+    rad = pi / 180.0
+    lat = asarray(lat) * rad
+    lon = asarray(lon) * rad
+    xyz = zeros((len(lat), 3), dtype=float)
+    xyz[:, 0] = cos(lat) * cos(lon)
+    xyz[:, 1] = cos(lat) * sin(lon)
+    xyz[:, 2] = sin(lat)
+    return xyz
+
+
+def _distance_to_chord(distance):
+    """
+    Convert a great circle distance, in km, to a chord on the unit sphere.
+    """
+    return 2.0 * sin(minimum(asarray(distance) / (2.0 * EARTH_RADIUS),
+                             pi / 2.0))
+
+
+class Event_Spatial_Index(object):
+
+    """
+    A KD-tree of the rupture centroids of an event set.
+
+    Used to find the events that may be within a threshold distance
+    of a block of sites, so the exact distances are only calculated
+    for these candidate events.
+
+    Each event is buffered by half the diagonal of its rupture's
+    surface projection, which is centred on the rupture centroid.
+    """
+
+    def __init__(self, event_set):
+        self.num_events = len(event_set)
+        self.points = _unit_vectors(event_set.rupture_centroid_lat,
+                                    event_set.rupture_centroid_lon)
+        rad = pi / 180.0
+        half_length = asarray(event_set.length) / 2.0
+        half_width = cos(asarray(event_set.dip) * rad) * \
+            asarray(event_set.width) / 2.0
+        self.buffers = sqrt(half_length ** 2 + half_width ** 2)
+        if self.num_events > 0:
+            self.tree = cKDTree(self.points)
+            self.max_buffer = self.buffers.max()
+        else:
+            self.tree = None
+            self.max_buffer = 0.0
+
+    def candidate_events(self, site_lat, site_lon, threshold_distance):
+        """
+        Return the sorted indexes of the events that may be within
+        threshold_distance, in km, of any of the sites.  The events
+        not returned are further than threshold_distance (Joyner_Boore)
+        from all of the sites.
+        """
+        if self.tree is None or len(site_lat) == 0:
+            return zeros(0, dtype=int)
+
+        site_points = _unit_vectors(site_lat, site_lon)
+        search_radius = (threshold_distance + self.max_buffer) * \
+            INDEX_SEARCH_FACTOR + INDEX_SEARCH_BUFFER
+        near_lists = self.tree.query_ball_point(
+            site_points, _distance_to_chord(search_radius))
+        near = [asarray(l, dtype=int) for l in near_lists]
+        near = unique(concatenate(near + [zeros(0, dtype=int)]))
+        if len(near) == 0:
+            return near
+
+        # Refine using each event's own buffer.  For unit vectors
+        # chord ** 2 = 2 - 2 * dot, so an event is close to a site if
+        # their dot product is at least min_dot.  The dot products are
+        # worked out for groups of sites, to bound the memory used.
+        event_radius = (threshold_distance + self.buffers[near]) * \
+            INDEX_SEARCH_FACTOR + INDEX_SEARCH_BUFFER
+        min_dot = 1.0 - 0.5 * _distance_to_chord(event_radius) ** 2
+        near_points = self.points[near].T
+        close = zeros(len(near), dtype=bool)
+        group_size = max(1, INDEX_REFINE_PAIRS // len(near))
+        for lo in range(0, len(site_points), group_size):
+            dots = site_points[lo:lo + group_size].dot(near_points)
+            close |= (dots >= min_dot).any(axis=0)
+        return near[close]
+
+
 def source_model_threshold_distance_subset(distances,
                                            source_model,
-                                           atten_threshold_distance):
+                                           atten_threshold_distance,
+                                           event_indexes=None,
+                                           num_events=None,
+                                           source_event_indexes=None):
     """
     source_model_threshold_distance_subset
     Calculate the distances of the event_set from the sites array. For those
@@ -57,6 +160,14 @@ def source_model_threshold_distance_subset(distances,
             continue
         sub_event_set = event_set[event_inds]
 
+    If the distances are only for some events, event_indexes are the
+    indexes of these events in the event set, and num_events is the
+    number of events in the event set.
+
+    source_event_indexes is a list of the event indexes of each source
+    in source_model, as int arrays, e.g. from an Event_Activity_Table,
+    so they are not made again for each block of sites.
+
     Returns source_model_subset
     """
     # A rethink of apply_threshold distance
@@ -66,17 +177,30 @@ def source_model_threshold_distance_subset(distances,
 
     # distances is an ndarray where [sites, events]. We only want the events
     # dimension for this function as we're trimming events
-    (sites_to_keep, events_to_keep) = where(Rjb <= atten_threshold_distance)
+    close_events = (Rjb <= atten_threshold_distance).any(axis=0)
+    if event_indexes is not None:
+        if num_events is None:
+            raise ValueError('num_events is needed with event_indexes.')
+        # Expand the mask to all events. Events without distances are far.
+        event_indexes = asarray(event_indexes, dtype=int)
+        close_events_subset = close_events
+        close_events = zeros(num_events, dtype=bool)
+        close_events[event_indexes] = close_events_subset
 
-    source_model_subset = copy.deepcopy(source_model)
-    # Re-sync the event indices in the source model. As we don't want to add
+    # The sources are not copied. Each Source_View shares the source data
+    # and only holds the close event indices. As we don't want to add
     # events that may already be excluded by generate_synthetic_events_fault(),
-    # do the following
-    # 1. Grab the event set already calculated
-    # 2. The intersection of this and events_to_keep is what we want
-    for source in source_model_subset:
-        source_indices = source.get_event_set_indexes()
-        source.set_event_set_indexes(
-            intersect1d(source_indices, events_to_keep))
+    # keep the events of the source that are close.
+    if source_event_indexes is None:
+        source_event_indexes = [
+            asarray(source.get_event_set_indexes(), dtype=int)
+            for source in source_model]
+    source_views = []
+    for source, source_indices in zip(source_model, source_event_indexes):
+        source_views.append(
+            Source_View(source, source_indices[close_events[source_indices]]))
+
+    source_model_subset = Source_Model(source_views,
+                                       source_model._magnitude_type)
 
     return source_model_subset
@@ -12,9 +12,84 @@
 """
 from scipy import asarray, alltrue, newaxis, ndarray, allclose, isfinite, \
     zeros, concatenate, absolute, array
+from numpy import broadcast_arrays, empty, prod, log, exp, arange, floor, \
+    clip, unique, seterr
 
 from eqrm_code.ground_motion_specification import Ground_motion_specification
 
+# The models that can be tabulated.  Their log_mean and log_sigma only
+# depend on the magnitude, one distance and, if they use them, Vs30
+# and the fault type.  The other models of one distance are cheaper
+# to work out than to interpolate.
+TABULATED_MODELS = ['Boore_08', 'Atkinson06_soil', 'Campbell03']
+
+# The grid of the ground motion tables.  The distance axis is evenly
+# spaced in log(distance).
+TABLE_MAG_MIN = 2.0
+TABLE_MAG_MAX = 8.5
+TABLE_MAG_STEP = 0.05
+TABLE_DISTANCE_MIN = 1.0
+TABLE_DISTANCE_MAX = 1000.0
+TABLE_LOG_DISTANCE_STEP = 0.025
+
+# With the default grid, the tabulated log_mean and log_sigma of the
+# TABULATED_MODELS are within this of the model's.  The largest
+# errors, about 0.016, are at the distance hinges of Atkinson06.
+TABLE_ERROR_BOUND = 0.02
+
+# The number of points interpolated at a time
+TABLE_CHUNK_SIZE = 10000
+
+# The coefficients of this process, interpolated to the periods,
+# {(model name, periods): (coefficient, sigma_coefficient)}
+_ground_motion_coefficients = {}
+
+# The ground motion tables of this process,
+# {(model name, periods): Ground_motion_table}
+_ground_motion_tables = {}
+
+
+def _model_periods_key(GM_spec, periods):
+    return (GM_spec.ground_motion_model_name,
+            tuple(asarray(periods, dtype=float).ravel()))
+
+
+def ground_motion_coefficients(GM_spec, periods):
+    """
+    Return the coefficient and sigma_coefficient of a model,
+    interpolated to the periods, with dimensions
+    (number of coefficients, 1, 1, periods).
+
+    They are worked out once for each model and periods, and shared
+    by all of the calculators using the model and periods, so they
+    are read only.
+    """
+    key = _model_periods_key(GM_spec, periods)
+    if key not in _ground_motion_coefficients:
+        periods = asarray(periods)
+        coefficient = GM_spec.calc_coefficient(periods)
+        sigma_coefficient = GM_spec.calc_sigma_coefficient(periods)
+
+        # Adding extra dimensions.
+        coefficient = coefficient[:, newaxis, newaxis, :]
+        sigma_coefficient = sigma_coefficient[:, newaxis, newaxis, :]
+        coefficient.setflags(write=False)
+        sigma_coefficient.setflags(write=False)
+        _ground_motion_coefficients[key] = (coefficient, sigma_coefficient)
+    return _ground_motion_coefficients[key]
+
+
+def ground_motion_table(GM_spec, coefficient, sigma_coefficient, periods):
+    """
+    Return the Ground_motion_table of a model and periods.  It is
+    shared by all of the calculators using the model and periods.
+    """
+    key = _model_periods_key(GM_spec, periods)
+    if key not in _ground_motion_tables:
+        _ground_motion_tables[key] = Ground_motion_table(
+            GM_spec, coefficient, sigma_coefficient, periods)
+    return _ground_motion_tables[key]
+
 
 class Ground_motion_calculator(object):
 
@@ -26,14 +101,21 @@ class Ground_motion_calculator(object):
       coefficient:   ground motion coefficient for the given periods
       sigma_coefficient:  ground motion sigma coefficient for the given periods
       periods:  the periods
+      table: a Ground_motion_table if the model is tabulated, else None
     """
 
-    def __init__(self, ground_motion_model_name, periods):
+    # Calculators saved before tables were added have no table
+    table = None
+
+    def __init__(self, ground_motion_model_name, periods, tabulated=False):
         """
         Args:
         ground_motion_model_name: A string, naming the ground motion model
         periods: The periods that will be used for this simulation.  Used
           to calculate coefficient and sigma_coefficient.
+        tabulated: If True interpolate the results from a
+          Ground_motion_table.  The model must be one of the
+          TABULATED_MODELS.
 
         RESIZING NOTES
         Adding lots of extra dimensions.
@@ -87,24 +169,33 @@ class Ground_motion_calculator(object):
 
         self.GM_spec = Ground_motion_specification(ground_motion_model_name)
 
-        periods = asarray(periods)
-        # calc the coefficient and sigma_coefficient for the input periods
-        coefficient = self.GM_spec.calc_coefficient(periods)
-        sigma_coefficient = self.GM_spec.calc_sigma_coefficient(periods)
+        # The coefficient and sigma_coefficient for the input periods,
+        # shared with the other calculators of the model and periods.
+        (self.coefficient,
+         self.sigma_coefficient) = ground_motion_coefficients(self.GM_spec,
+                                                              periods)
 
-        # Adding extra dimensions.
-        self.coefficient = coefficient[:, newaxis, newaxis, :]
-        self.sigma_coefficient = sigma_coefficient[:, newaxis, newaxis, :]
+        self.table = None
+        if tabulated:
+            if ground_motion_model_name not in TABULATED_MODELS:
+                raise ValueError('%s can not be tabulated.' %
+                                 ground_motion_model_name)
+            self.table = ground_motion_table(self.GM_spec, self.coefficient,
+                                             self.sigma_coefficient, periods)
 
     def distribution_function(self, dist_object, dist_types, mag_dict,
                               periods=None, depth=None, depth_to_top=None,
                               fault_type=None, Vs30=None, mag_type=None,
                               Z25=None, dip=None, width=None,
-                              event_activity=None):
+                              event_activity=None, log_mean_out=None,
+                              log_sigma_out=None):
         """
         dist_object must give distance info if dist_object.distance(dist_type)
         is called.  The distance info must be an array.
 
+        If log_mean_out and log_sigma_out are given, the results are
+        written into them, and they are returned.
+
         Returns:
           log_mean - dimensions are
           log_sigma
@@ -150,7 +241,27 @@ class Ground_motion_calculator(object):
         for dist_type in dist_types:
             distribution_args[dist_type] = distances[dist_type]
 
-        (log_mean, log_sigma) = self.GM_spec.distribution(**distribution_args)
+        if self.table is not None and (Vs30 is None or
+                                       asarray(Vs30).size == 1):
+            (log_mean, log_sigma) = self.table.distribution(
+                mag, distances[dist_types[0]], fault_type, Vs30)
+        else:
+            (log_mean, log_sigma) = self.GM_spec.distribution(
+                **distribution_args)
+
+        if log_mean_out is not None:
+            # Broadcasting also expands a log_sigma that does not vary
+            # by site.
+            log_mean_out[...] = log_mean
+            log_sigma_out[...] = log_sigma
+            log_mean = log_mean_out
+            log_sigma = log_sigma_out
+        elif log_mean.shape != log_sigma.shape:
+            # Some models return a log_sigma that does not vary by site.
+            # With more than one site, expand it to the log_mean shape.
+            log_mean, log_sigma = broadcast_arrays(log_mean, log_sigma)
+            log_mean = log_mean.copy()
+            log_sigma = log_sigma.copy()
 
         # FIXME when will this fail?  Maybe let it fail then?
         # If it does not fail here it fails in analysis.py"
@@ -234,6 +345,238 @@ class Ground_motion_calculator(object):
         return dist
 
 
+class Ground_motion_table(object):
+
+    """A table of the log_mean and log_sigma of a ground motion model
+    over a grid of magnitudes and distances, for the periods of a run.
+
+    Values between grid points are found by bilinear interpolation in
+    magnitude and log(distance).  With the default grid, the
+    log_mean and log_sigma of the TABULATED_MODELS are within
+    TABLE_ERROR_BOUND of the model's.  Magnitudes and distances off
+    the grid, such as distances under 1 km, use the model.
+
+    A table is made for each fault type and Vs30 value the first time
+    it is needed.  Grid cells with a corner where the model is not
+    finite, such as a zero distance in a model using log(distance),
+    also use the model.
+
+    Attributes:
+      GM_spec: instance of Ground_motion_specification
+      tables: {(fault_type, Vs30): (values, finite_cells)}.  values
+        are the log_mean and log_sigma side by side, dimensions
+        (magnitudes * distances, 2 * periods).  finite_cells is True
+        for the grid cells with finite corners, dimensions
+        (magnitudes - 1, distances - 1).
+    """
+
+    def __init__(self, GM_spec, coefficient, sigma_coefficient, periods,
+                 mag_min=TABLE_MAG_MIN, mag_max=TABLE_MAG_MAX,
+                 mag_step=TABLE_MAG_STEP,
+                 distance_min=TABLE_DISTANCE_MIN,
+                 distance_max=TABLE_DISTANCE_MAX,
+                 log_distance_step=TABLE_LOG_DISTANCE_STEP):
+        assert len(GM_spec.distance_types) == 1
+        self.GM_spec = GM_spec
+        self.coefficient = coefficient
+        self.sigma_coefficient = sigma_coefficient
+        self.periods = periods
+        self.mag_min = mag_min
+        self.mag_step = mag_step
+        self.num_mags = int(round((mag_max - mag_min) / mag_step)) + 1
+        self.log_distance_min = log(distance_min)
+        self.log_distance_step = log_distance_step
+        self.num_distances = int(round(
+            (log(distance_max) - self.log_distance_min) /
+            log_distance_step)) + 1
+        self.tables = {}
+
+    def _model(self, mag, distance, fault_type, Vs30):
+        """
+        Return the model log_mean and log_sigma, with the same shape.
+        """
+        if Vs30 is not None:
+            # One site
+            Vs30 = array([Vs30])
+        distribution_args = {'mag': mag,
+                             'coefficient': self.coefficient,
+                             'sigma_coefficient': self.sigma_coefficient,
+                             'depth': None,
+                             'depth_to_top': None,
+                             'fault_type': fault_type,
+                             'Vs30': Vs30,
+                             'Z25': None,
+                             'dip': None,
+                             'width': None,
+                             'periods': self.periods}
+        distribution_args[self.GM_spec.distance_types[0]] = distance
+        (log_mean, log_sigma) = self.GM_spec.distribution(**distribution_args)
+        return broadcast_arrays(log_mean, log_sigma)
+
+    def _table(self, fault_type, Vs30):
+        """
+        Return the values and finite_cells tables for a fault type and
+        Vs30 value, making them if they have not been made.
+        """
+        key = (fault_type, Vs30)
+        if key not in self.tables:
+            mags = self.mag_min + self.mag_step * arange(self.num_mags)
+            distances = exp(self.log_distance_min + self.log_distance_step *
+                            arange(self.num_distances))
+            # One event per grid point
+            grid_mag = (mags[:, newaxis] + 0 * distances).reshape(1, -1, 1)
+            grid_distance = (0 * mags[:, newaxis] + distances).reshape(
+                1, -1, 1)
+            if fault_type is None:
+                grid_fault_type = None
+            else:
+                grid_fault_type = fault_type + 0 * grid_mag.astype(int)
+            oldsettings = seterr(all='ignore')
+            log_mean, log_sigma = self._model(grid_mag, grid_distance,
+                                              grid_fault_type, Vs30)
+            seterr(**oldsettings)
+            values = concatenate((log_mean[0], log_sigma[0]), axis=1)
+            finite = isfinite(values).all(axis=1).reshape(
+                self.num_mags, self.num_distances)
+            finite_cells = (finite[:-1, :-1] & finite[1:, :-1] &
+                            finite[:-1, 1:] & finite[1:, 1:])
+            self.tables[key] = (values, finite_cells)
+        return self.tables[key]
+
+    def _interpolate(self, values, cells, t, u, result):
+        """
+        Interpolate the table values into result, a chunk of points
+        at a time.
+
+        cells are the indexes of the grid points below the points,
+        into the first axis of values.  t and u are the fractions of
+        the way to the next grid point in magnitude and distance.
+        """
+        num_distances = self.num_distances
+        for start in range(0, len(cells), TABLE_CHUNK_SIZE):
+            chunk = slice(start, start + TABLE_CHUNK_SIZE)
+            cell = cells[chunk]
+            tt = t[chunk, newaxis]
+            uu = u[chunk, newaxis]
+            lower = values.take(cell, axis=0)
+            lower += tt * (values.take(cell + num_distances, axis=0) - lower)
+            upper = values.take(cell + 1, axis=0)
+            upper += tt * (values.take(cell + num_distances + 1, axis=0) -
+                           upper)
+            lower += uu * (upper - lower)
+            result[chunk] = lower
+
+    def distribution(self, mag, distance, fault_type=None, Vs30=None):
+        """
+        mag has dimensions (1, events, 1), distance (sites, events, 1)
+        and fault_type, if it is given, (1, events, 1).  Vs30 is None or
+        one value.
+
+        Returns:
+          log_mean, log_sigma - dimensions (sites, events, periods)
+        """
+        if Vs30 is not None:
+            Vs30 = float(asarray(Vs30).reshape(()))
+        num_sites, num_events = distance.shape[0:2]
+        num_periods = self.coefficient.shape[-1]
+
+        # The grid point below each value, as (i, j), and the fraction
+        # of the way to the next grid point, as (t, u).
+        mag_index = (mag[..., 0] - self.mag_min) / self.mag_step
+        oldsettings = seterr(divide='ignore', invalid='ignore')
+        distance_index = ((log(distance[..., 0]) - self.log_distance_min) /
+                          self.log_distance_step)
+        seterr(**oldsettings)
+        i = clip(floor(mag_index).astype(int), 0, self.num_mags - 2)
+        j = clip(floor(distance_index).astype(int), 0,
+                 self.num_distances - 2)
+        t = mag_index - i
+        u = distance_index - j
+        i, j, t, u = [x.ravel() for x in broadcast_arrays(i, j, t, u)]
+        off_grid = ~((t >= 0) & (t <= 1) & (u >= 0) & (u <= 1))
+
+        if fault_type is None:
+            point_fault_type = None
+            fault_types = [None]
+        else:
+            point_fault_type = broadcast_arrays(fault_type[..., 0],
+                                                distance[..., 0])[0].ravel()
+            fault_types = unique(fault_type)
+
+        # log_mean and log_sigma side by side
+        result = empty((num_sites * num_events, 2 * num_periods))
+        for fault in fault_types:
+            if fault is not None:
+                fault = int(fault)
+            values, finite_cells = self._table(fault, Vs30)
+            # Cells with a corner where the model is not finite use
+            # the model.
+            off_grid |= ~finite_cells[i, j]
+            if len(fault_types) == 1 and not off_grid.any():
+                self._interpolate(values, i * self.num_distances + j, t, u,
+                                  result)
+            else:
+                if fault is None:
+                    points = (~off_grid).nonzero()[0]
+                else:
+                    points = ((point_fault_type == fault) &
+                              ~off_grid).nonzero()[0]
+                points_result = empty((len(points), 2 * num_periods))
+                self._interpolate(values,
+                                  i[points] * self.num_distances + j[points],
+                                  t[points], u[points], points_result)
+                result[points] = points_result
+        result = result.reshape(num_sites, num_events, 2 * num_periods)
+        log_mean = result[..., :num_periods]
+        log_sigma = result[..., num_periods:]
+
+        # The points off the grid, as one site with many events
+        sites, events = off_grid.reshape(num_sites, num_events).nonzero()
+        if len(sites) > 0:
+            if fault_type is None:
+                off_fault_type = None
+            else:
+                off_fault_type = fault_type[0, events][newaxis, :]
+            model_mean, model_sigma = self._model(
+                mag[0, events][newaxis, :],
+                distance[sites, events][newaxis, :],
+                off_fault_type, Vs30)
+            log_mean[sites, events] = model_mean[0]
+            log_sigma[sites, events] = model_sigma[0]
+        return log_mean, log_sigma
+
+
+class Distribution_Buffers(object):
+
+    """Scratch space for the log_mean and log_sigma of
+    Multiple_ground_motion_calculator.distribution, kept from call to
+    call so a site loop does not allocate them each time.
+
+    The arrays returned by a call using the buffers are overwritten by
+    the next call using the same buffers.
+
+    Attributes:
+      log_mean: 1D array holding the log_mean values
+      log_sigma: 1D array holding the log_sigma values
+    """
+
+    def __init__(self):
+        self.log_mean = empty(0, dtype=float)
+        self.log_sigma = empty(0, dtype=float)
+
+    def arrays(self, shape):
+        """
+        Return log_mean and log_sigma arrays with the given shape,
+        growing the buffers if they are too small.
+        """
+        size = int(prod(shape))
+        if self.log_mean.size < size:
+            self.log_mean = empty(size, dtype=float)
+            self.log_sigma = empty(size, dtype=float)
+        return (self.log_mean[:size].reshape(shape),
+                self.log_sigma[:size].reshape(shape))
+
+
 class Multiple_ground_motion_calculator(object):
 
     """Multiple Ground_motion_calculator instances are used to
@@ -244,7 +587,8 @@ class Multiple_ground_motion_calculator(object):
       GM_models: a list of Ground_motion_calculator instances.
     """
 
-    def __init__(self, ground_motion_model_names, periods, model_weights):
+    def __init__(self, ground_motion_model_names, periods, model_weights,
+                 tabulated=False):
         self.periods = periods
 
         # Should do this just once, when the para values are first verified.
@@ -257,10 +601,11 @@ class Multiple_ground_motion_calculator(object):
         self.GM_models = []
         for GM_model_name in ground_motion_model_names:
             self.GM_models.append(Ground_motion_calculator(GM_model_name,
-                                                           periods))
+                                                           periods,
+                                                           tabulated))
 
     def distribution(self, sites, event_set, distances, event_activity=None,
-                     Vs30=None, GM_models=None):
+                     Vs30=None, GM_models=None, buffers=None):
         """
         Calculate the ground motion shaking at a site, given an array of
         events.
@@ -270,6 +615,8 @@ class Multiple_ground_motion_calculator(object):
           instance will be equal to the shape of the returned arrays.
         Vs30 - the Vs30 value used if the gmm needs it.  If none is given the
           site Vs30 value is used.
+        buffers - a Distribution_Buffers instance.  If given, the returned
+          arrays are in its scratch space.
 
         returns:
           *_extend_GM has shape of (GM_model, sites, events, periods)
@@ -289,7 +636,8 @@ class Multiple_ground_motion_calculator(object):
             width=event_set.width,
             event_activity=event_activity,
             periods=self.periods,
-            GM_models=GM_models)
+            GM_models=GM_models,
+            buffers=buffers)
 
         return log_mean_extend_GM, log_sigma_extend_GM
 
@@ -298,39 +646,55 @@ class Multiple_ground_motion_calculator(object):
                                fault_type=None, Vs30=None, Z25=None,
                                dip=None, width=None,
                                event_activity=None,
-                               GM_models=None):
+                               GM_models=None, buffers=None):
         """
         The event_activity not used currently.
         But if we spawn they will be.
 
+        The results of the first model give the shape of the results.
+        The (GM_model, sites, events, periods) arrays are made then,
+        or taken from buffers if it is given, and each model writes
+        into its slice.
+
         returning values
-          log_mean_extend_event the log_mean values
-            dimensions (sites, events * GM_model, periods)
+          log_mean_extend_GM the log_mean values
+            dimensions (GM_model, sites, events, periods)
           log_sigma_extend_GM the log_sigma values
-            dimensions (sites, events * GM_model, periods)
+            dimensions (GM_model, sites, events, periods)
         """
         if GM_models is None:
             GM_models = self.GM_models
+        # Calculate the distances all of the models need in one pass.
+        if hasattr(dist_object, 'calc_distances'):
+            distance_types = []
+            for GM_model in GM_models:
+                distance_types.extend(GM_model.GM_spec.distance_types)
+            dist_object.calc_distances(distance_types)
         for mod_i, GM_model in enumerate(GM_models):
+            if mod_i == 0:
+                log_mean_out = None
+                log_sigma_out = None
+            else:
+                log_mean_out = log_mean_extend_GM[mod_i]
+                log_sigma_out = log_sigma_extend_GM[mod_i]
             (log_mean, log_sigma) = GM_model.distribution_function(
                 dist_object, GM_model.GM_spec.distance_types,
                 mag_dict, periods=periods,
                 depth=depth, depth_to_top=depth_to_top,
                 fault_type=fault_type, Vs30=Vs30,
                 Z25=Z25, dip=dip, width=width,
-                mag_type=GM_model.GM_spec.magnitude_type)
+                mag_type=GM_model.GM_spec.magnitude_type,
+                log_mean_out=log_mean_out,
+                log_sigma_out=log_sigma_out)
             if mod_i == 0:
-                log_mean_extend_GM = log_mean[newaxis, :]
-                log_sigma_extend_GM = log_sigma[newaxis, :]
-            else:
-                new_axis = 0
-                event_axis = 1
-                log_mean_extend_GM = concatenate(
-                    (log_mean_extend_GM, log_mean[newaxis, :]),
-                    axis=new_axis)
-
-                log_sigma_extend_GM = concatenate(
-                    (log_sigma_extend_GM, log_sigma[newaxis, :]),
-                    axis=new_axis)
+                shape = (len(GM_models),) + log_mean.shape
+                if buffers is None:
+                    log_mean_extend_GM = empty(shape, dtype=float)
+                    log_sigma_extend_GM = empty(shape, dtype=float)
+                else:
+                    (log_mean_extend_GM,
+                     log_sigma_extend_GM) = buffers.arrays(shape)
+                log_mean_extend_GM[0] = log_mean
+                log_sigma_extend_GM[0] = log_sigma
 
         return log_mean_extend_GM, log_sigma_extend_GM
@@ -14,7 +14,8 @@
 """
 
 from scipy import exp, log, where, isfinite, reshape, array, r_, rollaxis, \
-    seterr, newaxis, repeat
+    seterr, newaxis, asarray, arange, prod, uint64
+from scipy.special import ndtri
 from scipy.stats import norm
 
 SPAWN = 1 
@@ -27,6 +28,98 @@ RANDOM_SAMPLING = 2
 # subclasses) in the test suite.
 gm_rvs = norm.rvs  # function from scipy.stats
 
+# Constants of the splitmix64 generator, used to hash the keys and
+# counters of a Random_Stream.
+_GOLDEN_GAMMA = uint64(0x9e3779b97f4a7c15)
+_MIX_1 = uint64(0xbf58476d1ce4e5b9)
+_MIX_2 = uint64(0x94d049bb133111eb)
+
+
+def _hash(key, values):
+    """
+    Mix the integer values into the uint64 array key, broadcasting.
+    """
+    key = key ^ (asarray(values).astype(uint64) + _GOLDEN_GAMMA)
+    key = (key ^ (key >> uint64(30))) * _MIX_1
+    key = (key ^ (key >> uint64(27))) * _MIX_2
+    return key ^ (key >> uint64(31))
+
+
+class Random_Stream(object):
+    """
+    Counter based random number streams for a block of sites and the
+    events of a source.
+
+    Each (site, source) has its own stream, keyed by (seed, site index,
+    source index).  A variate is a hash of the key, the index of the
+    event in the event set and a draw counter, so it does not depend
+    on the order the sites are done in, the blocks the sites are split
+    into, the number of nodes or where a run was resumed.  The variates
+    of a block of sites are made together, with array operations.
+    """
+
+    def __init__(self, seed, site_indexes, source_index, event_indexes):
+        """
+        seed: an int.
+        site_indexes: the indexes of the sites of the block in the
+          sites of the run.
+        source_index: the index of the source in the source model.
+        event_indexes: the indexes of the events in the event set.
+        """
+        key = _hash(asarray([seed], dtype=uint64), source_index)
+        key = _hash(key, asarray(site_indexes)[:, newaxis])
+        # dimensions (site, event)
+        self.key = _hash(key, asarray(event_indexes)[newaxis, :])
+
+    def _copy(self, key):
+        stream = Random_Stream.__new__(Random_Stream)
+        stream.key = key
+        return stream
+
+    def sites(self, index):
+        """
+        Return the stream of some of the sites of the block.
+        """
+        return self._copy(self.key[index])
+
+    def tagged(self, *tags):
+        """
+        Return an independent stream for another use of the same
+        sites, source and events.  The tags are ints.
+        """
+        key = self.key
+        for tag in tags:
+            key = _hash(key, tag)
+        return self._copy(key)
+
+    def standard_normal(self, num_draws):
+        """
+        Return num_draws standard normal variates for each site and
+        event, dimensions (draw, site, event).
+        """
+        counters = arange(num_draws)[:, newaxis, newaxis]
+        bits = _hash(self.key[newaxis, :, :], counters)
+        # The top 53 bits, as a uniform variate in (0, 1)
+        uniform = ((bits >> uint64(11)).astype(float) + 0.5) * 2.0 ** -53
+        return ndtri(uniform)
+
+    def variates(self, shape, var_in_last_axis):
+        """
+        Return standard normal variates of dimensions (..., site, event,
+        period).  If var_in_last_axis is False the period dimension is
+        of length 1.
+        """
+        shape = tuple(shape)
+        num_sites, num_events, num_periods = shape[-3:]
+        if not var_in_last_axis:
+            num_periods = 1
+        leading = shape[:-3]
+        variate = self.standard_normal(int(prod(leading)) * num_periods)
+        variate = variate.reshape(leading + (num_periods, num_sites,
+                                             num_events))
+        # roll the period dimension to the end
+        return rollaxis(variate, len(leading), variate.ndim)
+
 class Distribution(object):
     """
     Provides a way to pick normally or lognormally distributed samples from 
@@ -44,10 +137,15 @@ class Distribution(object):
         self.rvs = gm_rvs
         self.val_func = exp
             
-    def sample_for_eqrm(self, mean, sigma, var_in_last_axis=False):
+    def sample_for_eqrm(self, mean, sigma, var_in_last_axis=False,
+                        stream=None):
         """
         mean, sigma: ndarray. Must have identical shapes.
 
+        stream: a Random_Stream for random sampling, or None to use
+        self.rvs.  mean and sigma have dimensions (site, event, period)
+        if a stream is used.
+
         Returns: ndarray in the same shape as mean. Estimated
         pectral accelerations at a site due to an event.
         """
@@ -58,7 +156,8 @@ class Distribution(object):
         elif self.var_method == RANDOM_SAMPLING:
             # monte carlo
             sample_values = self._monte_carlo(mean, sigma, var_in_last_axis=
-                                              var_in_last_axis)
+                                              var_in_last_axis,
+                                              stream=stream)
         elif self.var_method == 3:
             # + 2 sigma
             sample_values = self.val_func(mean+2*sigma)
@@ -75,9 +174,14 @@ class Distribution(object):
             raise RuntimeError('Unknown var_method %s' % str(self.var_method))
         return sample_values
         
-    def _vs(self, sigma, var_in_last_axis):
+    def _vs(self, sigma, var_in_last_axis, stream=None):
         # Gets overridden in child class
         #return self.rvs(size=sigma.size).reshape(sigma.shape)
+        # If var_in_last_axis is False the last dimension of the
+        # variate is of length 1, and broadcasts in ._monte_carlo()
+        if stream is not None:
+            return stream.variates(sigma.shape, var_in_last_axis)
+
         if var_in_last_axis:
             size =  sigma.size
             shape = sigma.shape
@@ -86,22 +190,16 @@ class Distribution(object):
             shape = list(sigma.shape)
             shape[-1] = 1
 
-        variate = self.rvs(size=size).reshape(shape)
-        if not var_in_last_axis:
-            #consume = self.rvs(size=size*(sigma.shape[-1]-1))
-            variate = repeat(variate, sigma.shape[-1],  
-                             axis=len(variate.shape)-1)
-
-        return variate 
+        return self.rvs(size=size).reshape(shape)
 
-    def _monte_carlo(self, mean, sigma, var_in_last_axis):
+    def _monte_carlo(self, mean, sigma, var_in_last_axis, stream=None):
         """
         Perform random sampling about mean with sigma.
         self.sample_shape and self._vs() controls the shape of the
         result.
         """
         assert sigma.shape == mean.shape
-        variate_site = self._vs(sigma, var_in_last_axis)
+        variate_site = self._vs(sigma, var_in_last_axis, stream=stream)
 
         oldsettings = seterr(over='ignore')
         # self.sample_shape and variate_site will have compatible dims
@@ -170,16 +268,25 @@ class GroundMotionDistributionLogNormal(Distribution_Log_Normal):
         log_sigma = log_sigma.reshape(new_shape)
         spawned_log_sigma = log_sigma * self.spawn_centroids
         # roll the spawn dimension to the front
-        spawned_log_sigma = rollaxis(spawned_log_sigma,
-                                     spawned_log_sigma.ndim-1, 0)
-        sample_values = exp(log_mean + spawned_log_sigma)
+        sample_values = rollaxis(spawned_log_sigma,
+                                 spawned_log_sigma.ndim-1, 0)
+        # In place, so there is one spawned array
+        sample_values += log_mean
+        exp(sample_values, sample_values)
         return sample_values
 
     
-    def _vs(self, log_sigma, var_in_last_axis):
+    def _vs(self, log_sigma, var_in_last_axis, stream=None):
         # Overriding to cater for multiple recurrence models. 
         # Called by ._monte_carlo()
+        # As Distribution._vs(), the period dimension broadcasts if
+        # var_in_last_axis is False.
         ngmm, ns, ne, np = log_sigma.shape
+        if stream is not None:
+            return stream.variates(
+                (ngmm, self.n_recurrence_models, ns, ne, np),
+                var_in_last_axis)
+
         if  var_in_last_axis:
             s = (ngmm, self.n_recurrence_models, ns, ne, np)
             new_size = log_sigma.size * self.n_recurrence_models
@@ -187,13 +294,9 @@ class GroundMotionDistributionLogNormal(Distribution_Log_Normal):
             s = (ngmm, self.n_recurrence_models, ns, ne, 1)
             new_size = log_sigma.size * self.n_recurrence_models / np
 
-        variate = self.rvs(size = new_size).reshape(s)
-      
-        if not var_in_last_axis:
-            variate = repeat(variate, np, axis=4)
-        return variate
+        return self.rvs(size = new_size).reshape(s)
 
-    def ground_motion_sample(self, log_mean, log_sigma):
+    def ground_motion_sample(self, log_mean, log_sigma, stream=None):
         """
         Like .sample_for_eqrm() but adds spawn and recurrence_model dimensions.
 
@@ -204,8 +307,15 @@ class GroundMotionDistributionLogNormal(Distribution_Log_Normal):
         gmm. See the ground_motion_interface module for more
         information.
 
+        stream: a Random_Stream for random sampling, or None to use
+        self.rvs.
+
         Returns: ndarray[spawn, GMmodel, rec_model, site, event,
-        period] spectral accelerations, measured in G.
+        period] spectral accelerations, measured in G.  The SA only
+        differs between recurrence models with random sampling.
+        Otherwise the rec_model dimension is of length 1, and
+        broadcasts against arrays with a dimension per recurrence
+        model.
         
         """
         assert log_mean.ndim == 4
@@ -213,18 +323,15 @@ class GroundMotionDistributionLogNormal(Distribution_Log_Normal):
         if self.var_method == SPAWN:
             s = self._spawn(log_mean, log_sigma)
         else:  
-            s = self.sample_for_eqrm(log_mean, log_sigma, self.var_in_last_axis)[newaxis, ...]
+            s = self.sample_for_eqrm(log_mean, log_sigma, self.var_in_last_axis,
+                                     stream=stream)[newaxis, ...]
 
         # monte_carlo has added and populated the recurrence model dimension
         if self.var_method == RANDOM_SAMPLING:
             return s
 
-        # Add the recurrence model dimension and "manually" broadcast
-        # it so that our caller doesn't have to treat this as a
-        # special case.
-        return repeat(s[:, :, newaxis, :, :, :],
-                      self.n_recurrence_models,
-                      2)
+        # Add a recurrence model dimension of length 1
+        return s[:, :, newaxis, :, :, :]
     
 def normalised_pdf(sigma_delta, atten_spawn_bins):
     """
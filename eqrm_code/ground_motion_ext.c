@@ -0,0 +1,229 @@
+// Python - C extension for ground_motion_interface module.
+//
+// To compile:
+//  python compile.py ground_motion_ext.c
+//
+// See the module ground_motion_interface.py.  These are optional - each
+// model has a NumPy version, which gives the same numbers.  The
+// arithmetic here is in the same order as the NumPy versions.
+//
+// All arrays are C contiguous doubles:
+//   coefficient        (number of coefficients, periods)
+//   sigma_coefficient  (number of sigma coefficients, periods)
+//   mag                (events)
+//   distance           (sites, events)
+//   log_mean           (sites, events, periods) - output
+//   log_sigma          (sites, events, periods) - output
+
+
+#include "Python.h"
+#include "numpy/arrayobject.h"
+#include "math.h"
+
+
+void _toro_1997_midcontinent(long num_sites, long num_events,
+			     long num_periods,
+			     double* coefficient, double* sigma_coefficient,
+			     double* mag, double* distance,
+			     double* log_mean, double* log_sigma) {
+
+  double c1, c2, c3, c4, c5, c6, c7;
+  double d1, d2, d3, f1, f2;
+  double m, d, Rm, log_Rm, log_Rm_100, sig_1, sig_2;
+  double log_100 = 4.60517018599;  // As the NumPy version
+  long i, j, k, ijk;
+
+  for (i=0; i<num_sites; i++) {
+    for (j=0; j<num_events; j++) {
+      m = mag[j];
+      d = distance[i*num_events + j];
+      for (k=0; k<num_periods; k++) {
+	c1 = coefficient[0*num_periods + k];
+	c2 = coefficient[1*num_periods + k];
+	c3 = coefficient[2*num_periods + k];
+	c4 = coefficient[3*num_periods + k];
+	c5 = coefficient[4*num_periods + k];
+	c6 = coefficient[5*num_periods + k];
+	c7 = coefficient[6*num_periods + k];
+
+	d1 = sigma_coefficient[0*num_periods + k];
+	d2 = sigma_coefficient[1*num_periods + k];
+	d3 = sigma_coefficient[2*num_periods + k];
+	f1 = sigma_coefficient[3*num_periods + k];
+	f2 = sigma_coefficient[4*num_periods + k];
+
+	Rm = sqrt(d*d + c7*c7);
+	log_Rm = log(Rm);
+	log_Rm_100 = log_Rm - log_100;
+	if (!(log_Rm_100 > 0))
+	  log_Rm_100 = 0.0;
+
+	ijk = (i*num_events + j)*num_periods + k;
+	log_mean[ijk] = c1 + c2*(m-6.0) + c3*((m-6.0)*(m-6.0)) - c4*log_Rm
+	  - (c5-c4)*log_Rm_100 - c6*Rm;
+
+	sig_1 = (m <= 5)*d1 +
+	  (5 < m)*(m <= 5.5)*(d1 + (d2-d1)*(m-5)/0.5) +
+	  (5.5 < m)*(m <= 8)*(d2 + (d3-d2)*(m-5.5)/2.5) +
+	  (8 < m)*d3;
+	sig_2 = (d <= 5)*f1 +
+	  (5 < d)*(d <= 20)*(f1 + (f2-f1)*(d-5)/15) +
+	  (20 < d)*f2;
+	log_sigma[ijk] = sqrt(sig_1*sig_1 + sig_2*sig_2);
+      }
+    }
+  }
+}
+
+
+void _atkinson_boore_97(long num_sites, long num_events, long num_periods,
+			double* coefficient, double* sigma_coefficient,
+			double* mag, double* distance,
+			double* log_mean, double* log_sigma) {
+
+  double c1, c2, c3, c4;
+  double m, d;
+  long i, j, k, ijk;
+
+  for (i=0; i<num_sites; i++) {
+    for (j=0; j<num_events; j++) {
+      m = mag[j];
+      d = distance[i*num_events + j];
+      for (k=0; k<num_periods; k++) {
+	c1 = coefficient[0*num_periods + k];
+	c2 = coefficient[1*num_periods + k];
+	c3 = coefficient[2*num_periods + k];
+	c4 = coefficient[3*num_periods + k];
+
+	ijk = (i*num_events + j)*num_periods + k;
+	log_mean[ijk] = c1 + c2*(m-6) + c3*((m-6)*(m-6)) - log(d) - c4*d;
+	log_sigma[ijk] = sigma_coefficient[k];
+      }
+    }
+  }
+}
+
+
+void _sadigh_97(long num_sites, long num_events, long num_periods,
+		double* coefficient, double* sigma_coefficient,
+		double* mag, double* distance,
+		double* log_mean, double* log_sigma) {
+
+  double F = 1.0;
+  double c1, c2, c3, c4, c5, c6, c7, c8;
+  double s1, s2, s3;
+  double m, d, R;
+  long i, j, k, ijk, c_offset;
+
+  for (i=0; i<num_sites; i++) {
+    for (j=0; j<num_events; j++) {
+      m = mag[j];
+      d = distance[i*num_events + j];
+
+      // The second 8 coefficients are for magnitudes over 6.5
+      c_offset = (m > 6.5) ? 8 : 0;
+
+      for (k=0; k<num_periods; k++) {
+	c1 = coefficient[(0 + c_offset)*num_periods + k];
+	c2 = coefficient[(1 + c_offset)*num_periods + k];
+	c3 = coefficient[(2 + c_offset)*num_periods + k];
+	c4 = coefficient[(3 + c_offset)*num_periods + k];
+	c5 = coefficient[(4 + c_offset)*num_periods + k];
+	c6 = coefficient[(5 + c_offset)*num_periods + k];
+	c7 = coefficient[(6 + c_offset)*num_periods + k];
+	c8 = coefficient[(7 + c_offset)*num_periods + k];
+
+	s1 = sigma_coefficient[0*num_periods + k];
+	s2 = sigma_coefficient[1*num_periods + k];
+	s3 = sigma_coefficient[2*num_periods + k];
+
+	R = d + c7*exp(c8*m);
+	ijk = (i*num_events + j)*num_periods + k;
+	log_mean[ijk] = c1*F + c2 + c3*m + c4*pow((8.5-m), 2.5) +
+	  c5*log(R) + c6*log(d+2);
+	log_sigma[ijk] = (m > 7.21) ? s3 : s1 - s2*m;
+      }
+    }
+  }
+}
+
+
+
+// Gateways to Python
+typedef void (*model_function)(long, long, long, double*, double*,
+			       double*, double*, double*, double*);
+
+PyObject *_call_model(PyObject *args, model_function function) {
+  //
+  // model(coefficient, sigma_coefficient, mag, distance,
+  //       log_mean, log_sigma)
+  //
+
+  PyArrayObject
+    *coefficient,
+    *sigma_coefficient,
+    *mag,
+    *distance,
+    *log_mean,
+    *log_sigma;
+
+  // Convert Python arguments to C
+  if (!PyArg_ParseTuple(args, "OOOOOO",
+			&coefficient,
+			&sigma_coefficient,
+			&mag,
+			&distance,
+			&log_mean,
+			&log_sigma))
+    return NULL;
+
+  // Call underlying routine
+  function(log_mean -> dimensions[0],   // sites
+	   log_mean -> dimensions[1],   // events
+	   log_mean -> dimensions[2],   // periods
+	   (double*) coefficient -> data,
+	   (double*) sigma_coefficient -> data,
+	   (double*) mag -> data,
+	   (double*) distance -> data,
+	   (double*) log_mean -> data,
+	   (double*) log_sigma -> data);
+
+  return Py_BuildValue("");
+}
+
+
+PyObject *toro_1997_midcontinent(PyObject *self, PyObject *args) {
+  return _call_model(args, _toro_1997_midcontinent);
+}
+
+
+PyObject *atkinson_boore_97(PyObject *self, PyObject *args) {
+  return _call_model(args, _atkinson_boore_97);
+}
+
+
+PyObject *sadigh_97(PyObject *self, PyObject *args) {
+  return _call_model(args, _sadigh_97);
+}
+
+
+
+// Method table for python module
+static struct PyMethodDef MethodTable[] = {
+  {"toro_1997_midcontinent", toro_1997_midcontinent, METH_VARARGS,
+   "Toro_1997_midcontinent log_mean and log_sigma"},
+  {"atkinson_boore_97", atkinson_boore_97, METH_VARARGS,
+   "Atkinson_Boore_97 log_mean and log_sigma"},
+  {"sadigh_97", sadigh_97, METH_VARARGS,
+   "Sadigh_97 log_mean and log_sigma"},
+  {NULL, NULL, 0, NULL}   // sentinel
+};
+
+
+
+// Module initialisation
+void initground_motion_ext(void){
+  Py_InitModule("ground_motion_ext", MethodTable);
+
+  import_array();     //Necessary for handling of NumPY structures
+}
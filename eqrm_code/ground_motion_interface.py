@@ -19,8 +19,9 @@ Description:
     (RSA), in units of 'g'. 
 
     The data required to calculate the ground motion (coefficients, constants,
-    etc) is placed into a list which is stored in a dictionary
-    'ground_motion_init' with the model name as key.
+    etc) is placed into a list which is stored in
+    'ground_motion_init' with the model name as key.  The list is made
+    by a function of the model, the first time the model is looked up.
 
     Each dictionary list contains (in the following order):
         distribution function
@@ -111,10 +112,10 @@ Description:
 import math
 from copy import  deepcopy
 from scipy import where, sqrt, array, asarray, exp, log, newaxis, zeros, \
-                  log10, isfinite, weave, ones, shape, reshape, concatenate, \
+                  log10, isfinite, ones, shape, reshape, concatenate, \
                   tanh, cosh, power, shape, tile, cos, pi, copy, resize, \
                   logical_and, logical_or, sum, minimum, maximum, ones_like, \
-                  seterr, allclose, dot
+                  seterr, allclose, dot, ascontiguousarray
  
 from eqrm_code.ground_motion_misc import linear_interpolation, \
                                          Australian_standard_model, \
@@ -122,7 +123,14 @@ from eqrm_code.ground_motion_misc import linear_interpolation, \
 from eqrm_code import util 
 from eqrm_code import conversions
 from eqrm_code import ground_motion_misc
-from eqrm_code import weave_converters
+
+# The optional C versions of some of the models.  Build them with
+# 'python compile.py ground_motion_ext.c'.  Without them the NumPy
+# versions are used, which give the same numbers.
+try:
+    from eqrm_code import ground_motion_ext
+except ImportError:
+    ground_motion_ext = None
 
 # Note, this is covering up, in Abrahamson08_distribution, Ztor being 0,
 # causing divide by 0 errors.  It may be covering up other things.
@@ -133,7 +141,7 @@ from eqrm_code import weave_converters
 LOG10E = math.log10(math.e)
 BEDROCKVs30 = array([760.]) # m/s
 
-# A dictionary of all the info specified bellow.  This is used by
+# All the info specified bellow, by model name.  This is used by
 # ground_motion_specification.  Each entry is a list, which gets
 # passed as *args to
 # ground_motion_specification._set_interface_values()
@@ -149,57 +157,65 @@ BEDROCKVs30 = array([760.]) # m/s
 # ground_motion_specification) and then the coefficients can be class
 # attributes.
 
-ground_motion_init = {}
+class Ground_motion_models(object):
+    """
+    The ground_motion_init values of the models, by model name.
+
+    Each model is added with a function making its values, which is
+    called the first time the model is looked up.  This keeps the
+    coefficient tables of the models that are not used out of the
+    import.
+    """
+    def __init__(self):
+        self._make_values = {}
+        self._values = {}
+
+    def add_model(self, name, make_values):
+        self._make_values[name] = make_values
+        self._values.pop(name, None)
+
+    def __getitem__(self, name):
+        values = self._values.get(name)
+        if values is None:
+            values = self._make_values[name]()
+            self._values[name] = values
+        return values
+
+    def __contains__(self, name):
+        return name in self._make_values
+
+    def keys(self):
+        return self._make_values.keys()
+
+ground_motion_init = Ground_motion_models()
+
+# The ground_motion_init values of the models that have been used,
+# with the coefficients and periods as float arrays.
+# {model name: list of interface values}
+_ground_motion_models = {}
+
+# The indexes of the coefficients and periods in the interface values
+_ARRAY_INTERFACE_VALUES = (3, 4, 6, 7)
+
+
+def ground_motion_model(ground_motion_model_name):
+    """
+    Return the ground_motion_init values of a model, with the
+    coefficients and periods as float arrays.
+
+    The arrays are made the first time a model is used in a process,
+    and shared by all the uses after that, so do not change them.
+    """
+    model = _ground_motion_models.get(ground_motion_model_name)
+    if model is None:
+        model = list(ground_motion_init[ground_motion_model_name])
+        for i in _ARRAY_INTERFACE_VALUES:
+            model[i] = asarray(model[i], dtype=float)
+        _ground_motion_models[ground_motion_model_name] = model
+    return model
 
 #***************  START OF ALLEN MODEL  ****************************
 
-Allen_coefficient_period=[ 10.,5. ,3.003 , 2. ,   1.6   ,   1.,
-         0.7502,   0.5   ,   0.4   ,   0.3   ,   0.24  ,   0.2   ,
-         0.16  ,   0.15  ,   0.12  ,   0.1   ,   0.08  ,   0.07  ,
-         0.06  ,   0.055 ,   0.05  ,   0.04  ,   0.0323,   0.025 ,
-         0.02  ,   0.01  ]
-Allen_coefficient=[
-    [-21.8702, -18.3005, -15.225 , -12.7432, -11.4433,  -8.5082,
-     -6.7579,  -4.4525,  -3.3069,  -1.8805,  -0.8188,   0.1416,
-     1.0249,   1.205 ,   1.9958,   2.3232,   2.3007,   2.1033,
-     1.6085,   1.348 ,   1.0695,   0.4338,   0.0729,  -0.3766,
-     -0.5665,  -0.7655],
-    [  2.8736,   2.6008,   2.3016,   2.0264,   1.8696,   1.5271,
-       1.3317,   1.0786,   0.9523,   0.8122,   0.7134,   0.6282,
-       0.5411,   0.5212,   0.436 ,   0.3878,   0.3603,   0.3595,
-       0.38  ,   0.3908,   0.4033,   0.4371,   0.4605,   0.4954,
-       0.5118,   0.5302],
-    [-11.    , -10.    ,  -9.7   ,  -9.2   ,  -8.4   ,  -0.7   ,
-     0.2   ,   0.9   ,   1.2   ,   1.5   ,   1.7   ,   1.9   ,
-     2.    ,   2.    ,   2.1   ,   2.1   ,   2.    ,   1.9   ,
-     1.7   ,   1.6   ,   1.5   ,   1.3   ,   1.3   ,   1.2   ,
-     1.2   ,   1.2   ],
-    [ -1.0306,  -1.0884,  -1.1887,  -1.2996,  -1.3656,  -1.5514,
-      -1.6958,  -1.921 ,  -2.0661,  -2.2576,  -2.4222,  -2.5899,
-      -2.7617,  -2.8002,  -2.9774,  -3.0705,  -3.1098,  -3.0987,
-      -3.0347,  -3.0013,  -2.9643,  -2.8732,  -2.8224,  -2.7489,
-      -2.7181,  -2.6852],
-    [  0.0222,   0.0239,   0.0325,   0.0433,   0.0496,   0.0665,
-       0.0789,   0.0967,   0.1081,   0.1221,   0.1343,   0.1471,
-       0.1618,   0.1655,   0.1826,   0.1937,   0.2021,   0.2044,
-       0.2029,   0.2023,   0.2013,   0.1977,   0.1952,   0.1899,
-       0.1874,   0.1845],
-    [ -0.24  ,  -0.365 ,  -0.4074,  -0.4016,  -0.385 ,  -0.3224,
-      -0.2778,  -0.214 ,  -0.1844,  -0.1517,  -0.132 ,  -0.1197,
-      -0.109 ,  -0.1067,  -0.1015,  -0.0999,  -0.1007,  -0.1022,
-      -0.1049,  -0.1067,  -0.1087,  -0.1136,  -0.1182,  -0.1217,
-      -0.1235,  -0.1255]
-    ]
-Allen_sigma_coefficient_period=deepcopy(Allen_coefficient_period)
-Allen_sigma_coefficient=[
-    [ 1.2756,  1.1358,  0.9711,  0.8642,  0.7764,  0.6627,  0.6599,
-             0.5899,  0.5648,  0.557 ,  0.533 ,  0.5208,  0.5101,  0.5114,
-             0.5184,  0.4997,  0.489 ,  0.4884,  0.4918,  0.4851,  0.4891,
-             0.4847,  0.4793,  0.4742,  0.4768,  0.4774],
-           [ 0.235 ,  0.258 ,  0.2739,  0.2938,  0.3074,  0.3373,  0.3546,
-             0.3832,  0.4015,  0.4298,  0.456 ,  0.4786,  0.4996,  0.5064,
-             0.5219,  0.5327,  0.5211,  0.5074,  0.4848,  0.4696,  0.4574,
-             0.4525,  0.4547,  0.4482,  0.4429,  0.4404]]
 
 Allen_interpolation=linear_interpolation
 
@@ -230,22 +246,71 @@ Allen_distance_types=['Hypocentral',]
 
 Allen_uses_Vs30 = False
 
-Allen_args=[
-    Allen_distribution,
-    Allen_magnitude_type,
-    Allen_distance_types,
-    
-    Allen_coefficient,
-    Allen_coefficient_period,
-    Allen_interpolation,
-    
-    Allen_sigma_coefficient,
-    Allen_sigma_coefficient_period,
-    Allen_interpolation,
 
-    Allen_uses_Vs30]
-
-ground_motion_init['Allen'] = Allen_args
+def Allen_args():
+    Allen_coefficient_period=[ 10.,5. ,3.003 , 2. ,   1.6   ,   1.,
+             0.7502,   0.5   ,   0.4   ,   0.3   ,   0.24  ,   0.2   ,
+             0.16  ,   0.15  ,   0.12  ,   0.1   ,   0.08  ,   0.07  ,
+             0.06  ,   0.055 ,   0.05  ,   0.04  ,   0.0323,   0.025 ,
+             0.02  ,   0.01  ]
+    Allen_coefficient=[
+        [-21.8702, -18.3005, -15.225 , -12.7432, -11.4433,  -8.5082,
+         -6.7579,  -4.4525,  -3.3069,  -1.8805,  -0.8188,   0.1416,
+         1.0249,   1.205 ,   1.9958,   2.3232,   2.3007,   2.1033,
+         1.6085,   1.348 ,   1.0695,   0.4338,   0.0729,  -0.3766,
+         -0.5665,  -0.7655],
+        [  2.8736,   2.6008,   2.3016,   2.0264,   1.8696,   1.5271,
+           1.3317,   1.0786,   0.9523,   0.8122,   0.7134,   0.6282,
+           0.5411,   0.5212,   0.436 ,   0.3878,   0.3603,   0.3595,
+           0.38  ,   0.3908,   0.4033,   0.4371,   0.4605,   0.4954,
+           0.5118,   0.5302],
+        [-11.    , -10.    ,  -9.7   ,  -9.2   ,  -8.4   ,  -0.7   ,
+         0.2   ,   0.9   ,   1.2   ,   1.5   ,   1.7   ,   1.9   ,
+         2.    ,   2.    ,   2.1   ,   2.1   ,   2.    ,   1.9   ,
+         1.7   ,   1.6   ,   1.5   ,   1.3   ,   1.3   ,   1.2   ,
+         1.2   ,   1.2   ],
+        [ -1.0306,  -1.0884,  -1.1887,  -1.2996,  -1.3656,  -1.5514,
+          -1.6958,  -1.921 ,  -2.0661,  -2.2576,  -2.4222,  -2.5899,
+          -2.7617,  -2.8002,  -2.9774,  -3.0705,  -3.1098,  -3.0987,
+          -3.0347,  -3.0013,  -2.9643,  -2.8732,  -2.8224,  -2.7489,
+          -2.7181,  -2.6852],
+        [  0.0222,   0.0239,   0.0325,   0.0433,   0.0496,   0.0665,
+           0.0789,   0.0967,   0.1081,   0.1221,   0.1343,   0.1471,
+           0.1618,   0.1655,   0.1826,   0.1937,   0.2021,   0.2044,
+           0.2029,   0.2023,   0.2013,   0.1977,   0.1952,   0.1899,
+           0.1874,   0.1845],
+        [ -0.24  ,  -0.365 ,  -0.4074,  -0.4016,  -0.385 ,  -0.3224,
+          -0.2778,  -0.214 ,  -0.1844,  -0.1517,  -0.132 ,  -0.1197,
+          -0.109 ,  -0.1067,  -0.1015,  -0.0999,  -0.1007,  -0.1022,
+          -0.1049,  -0.1067,  -0.1087,  -0.1136,  -0.1182,  -0.1217,
+          -0.1235,  -0.1255]
+        ]
+    Allen_sigma_coefficient_period=deepcopy(Allen_coefficient_period)
+    Allen_sigma_coefficient=[
+        [ 1.2756,  1.1358,  0.9711,  0.8642,  0.7764,  0.6627,  0.6599,
+                 0.5899,  0.5648,  0.557 ,  0.533 ,  0.5208,  0.5101,  0.5114,
+                 0.5184,  0.4997,  0.489 ,  0.4884,  0.4918,  0.4851,  0.4891,
+                 0.4847,  0.4793,  0.4742,  0.4768,  0.4774],
+               [ 0.235 ,  0.258 ,  0.2739,  0.2938,  0.3074,  0.3373,  0.3546,
+                 0.3832,  0.4015,  0.4298,  0.456 ,  0.4786,  0.4996,  0.5064,
+                 0.5219,  0.5327,  0.5211,  0.5074,  0.4848,  0.4696,  0.4574,
+                 0.4525,  0.4547,  0.4482,  0.4429,  0.4404]]
+    return [
+        Allen_distribution,
+        Allen_magnitude_type,
+        Allen_distance_types,
+
+        Allen_coefficient,
+        Allen_coefficient_period,
+        Allen_interpolation,
+
+        Allen_sigma_coefficient,
+        Allen_sigma_coefficient_period,
+        Allen_interpolation,
+
+        Allen_uses_Vs30]
+
+ground_motion_init.add_model('Allen', Allen_args)
 
 #***************  END OF ALLEN MODEL  ****************************
 
@@ -259,10 +324,6 @@ Gaull_1990_WA_distance_types=['Rupture',]
 # m/s2 to g.  In this version coefficient a and d have been rolled
 # into one value
 # showing a lot of significant figures so the scenario tests pass
-Gaull_1990_WA_coefficient=[-5.971261839790,1.10,1.03]
-Gaull_1990_WA_coefficient_period=[0.0]
-Gaull_1990_WA_sigma_coefficient=[[0.28,0.28],[0.28,0.28]]
-Gaull_1990_WA_sigma_coefficient_period=[0.0,1.0]
 
 def Gaull_1990_WA_distribution(**kwargs):    
     """
@@ -334,70 +395,68 @@ Gaull_1990_WA_sigma_coefficient_interpolation=linear_interpolation
 
 Gaull_1990_WA_uses_Vs30 = False
 
-Gaull_1990_WA_args=[
-    Gaull_1990_WA_distribution,
-    Gaull_1990_WA_magnitude_type,
-    Gaull_1990_WA_distance_types,
-    
-    Gaull_1990_WA_coefficient,
-    Gaull_1990_WA_coefficient_period,
-    Gaull_1990_WA_coefficient_interpolation,
-    
-    Gaull_1990_WA_sigma_coefficient,
-    Gaull_1990_WA_sigma_coefficient_period,
-    Gaull_1990_WA_sigma_coefficient_interpolation,
 
-    Gaull_1990_WA_uses_Vs30]
+def Gaull_1990_WA_args():
+    Gaull_1990_WA_coefficient=[-5.971261839790,1.10,1.03]
+    Gaull_1990_WA_coefficient_period=[0.0]
+    Gaull_1990_WA_sigma_coefficient=[[0.28,0.28],[0.28,0.28]]
+    Gaull_1990_WA_sigma_coefficient_period=[0.0,1.0]
+    return [
+        Gaull_1990_WA_distribution,
+        Gaull_1990_WA_magnitude_type,
+        Gaull_1990_WA_distance_types,
+
+        Gaull_1990_WA_coefficient,
+        Gaull_1990_WA_coefficient_period,
+        Gaull_1990_WA_coefficient_interpolation,
+
+        Gaull_1990_WA_sigma_coefficient,
+        Gaull_1990_WA_sigma_coefficient_period,
+        Gaull_1990_WA_sigma_coefficient_interpolation,
 
-ground_motion_init['Gaull_1990_WA'] = Gaull_1990_WA_args
+        Gaull_1990_WA_uses_Vs30]
+
+ground_motion_init.add_model('Gaull_1990_WA', Gaull_1990_WA_args)
 
 #***************  End of Gaull 1990 WA MODEL  ****************************
 
 #***************  Start of Toro_1997_midcontinent MODEL  ******************
 
-Toro_1997_midcontinent_coefficient=[
-    [  2.20000000e+00, 2.20000000e+00, 4.00000000e+00, 3.68000000e+00,
-              2.37000000e+00,   1.73000000e+00,   1.07000000e+00,
-              9.00000000e-02,  -7.40000000e-01,  -3.23000000e+00],
-           [  8.10000000e-01,  8.10000000e-01, 7.90000000e-01, 8.00000000e-01,
-              8.10000000e-01,   8.40000000e-01,   1.05000000e+00,
-              1.42000000e+00,   1.86000000e+00,   3.18000000e+00],
-           [  0.00000000e+00, 0.00000000e+00,  0.00000000e+00, 0.00000000e+00,
-              0.00000000e+00,   0.00000000e+00,  -1.00000000e-01,
-              -2.00000000e-01,  -3.10000000e-01,  -6.40000000e-01],
-           [  1.27000000e+00, 1.27000000e+00, 1.57000000e+00, 1.46000000e+00,
-              1.10000000e+00,   9.80000000e-01,   9.30000000e-01,
-              9.00000000e-01,   9.20000000e-01,   9.80000000e-01],
-           [  1.16000000e+00,  1.16000000e+00, 1.83000000e+00, 1.77000000e+00,
-              1.02000000e+00,   6.60000000e-01,   5.60000000e-01,
-              4.90000000e-01,   4.60000000e-01,   3.70000000e-01],
-           [  2.10000000e-03, 2.10000000e-03,   8.00000000e-04, 1.30000000e-03,
-              4.00000000e-03,   4.20000000e-03,   3.30000000e-03,
-              2.30000000e-03,   1.70000000e-03,  -1.00000000e-04],
-           [  9.30000000e+00,   9.30000000e+00, 1.11000000e+01,  .05000000e+01,
-              8.30000000e+00,   7.50000000e+00,   7.10000000e+00,
-              6.80000000e+00,   6.90000000e+00,   7.20000000e+00]]
-
-Toro_1997_midcontinent_coefficient_period=[
-    0.00000000e+00,   0.02,2.85000000e-02,   4.00000000e-02,
-             1.00000000e-01,   2.00000000e-01,   4.00000000e-01,
-             1.00000000e+00,   2.00000000e+00,   5.00000000e+00]
-
-Toro_1997_midcontinent_sigma_coefficient = [
-    [0.55, 0.55, 0.62, 0.62, 0.59, 0.60, 0.63, 0.63, 0.61, 0.61],
-           [0.59,0.59, 0.63, 0.63, 0.61, 0.64, 0.68, 0.64, 0.62, 0.62],
-           [0.50, 0.50, 0.50, 0.50, 0.50, 0.56, 0.64, 0.67, 0.66, 0.66],
-           [0.54, 0.54, 0.62, 0.57, 0.50, 0.45, 0.45, 0.45, 0.45, 0.45],
-           [0.20, 0.20, 0.35, 0.29, 0.17, 0.12, 0.12, 0.12, 0.12, 0.12],
-           [0.36,0.36,0.36,0.36,0.36,0.36,0.36,0.35,0.34,0.34],
-           [0.7,0.7,0.7,0.7,0.7,0.7,0.7,0.65,0.6,0.6]]
+
+
 
 Toro_1997_midcontinent_sigma_coefficient_period = [
     0, 0.02, 1.0/35, 0.04, 0.1, 0.2, 0.4, 1, 2, 10]
 
 
+def _ground_motion_ext_distribution(model_function, mag, distance,
+                                    coefficient, sigma_coefficient):
+    """
+    Return (log_mean, log_sigma) of a model of the ground_motion_ext C
+    extension.  The arguments have the shapes passed to the
+    distribution functions.
+    """
+    (num_sites, num_events) = distance.shape[0:2]
+    num_periods = coefficient.shape[3]
+
+    log_mean = zeros((num_sites, num_events, num_periods), dtype=float)
+    log_sigma = zeros((num_sites, num_events, num_periods), dtype=float)
+
+    model_function(
+        ascontiguousarray(coefficient[:, 0, 0, :], dtype=float),
+        ascontiguousarray(sigma_coefficient[:, 0, 0, :], dtype=float),
+        ascontiguousarray(mag[0, :, 0], dtype=float),
+        ascontiguousarray(distance[:, :, 0], dtype=float),
+        log_mean,
+        log_sigma)
+
+    return (log_mean, log_sigma)
+
+
 def Toro_1997_midcontinent_distribution(**kwargs):
-    return Toro_1997_midcontinent_distribution_python(**kwargs)
+    if ground_motion_ext is None:
+        return Toro_1997_midcontinent_distribution_python(**kwargs)
+    return Toro_1997_midcontinent_distribution_c(**kwargs)
 
 
 def Toro_1997_midcontinent_distribution_python(**kwargs):
@@ -444,6 +503,8 @@ def Toro_1997_midcontinent_distribution_python(**kwargs):
 def Toro_1997_midcontinent_distribution_c(**kwargs):
     """The usual parameters passed are:
         mag, distance, coefficient, sigma_coefficient, depth,  Vs30
+
+    Uses the ground_motion_ext C extension.
     """
 
     mag = kwargs['mag']
@@ -455,84 +516,12 @@ def Toro_1997_midcontinent_distribution_c(**kwargs):
     num_periods = coefficient.shape[3]
 
     assert coefficient.shape == (7,1,1,num_periods)
-    #assert sigma_coefficient.shape==(7,1,1,num_periods)
     assert mag.shape == (1,num_events,1)
     assert distance.shape == (num_sites,num_events,1)
 
-    log_mean = zeros((num_sites,num_events,num_periods), dtype=float)
-    log_sigma = zeros((num_sites,num_events,num_periods), dtype=float)
-
-    coefficient = coefficient[:,0,0,:]
-    sigma_coefficient = sigma_coefficient[:,0,0,:]
-    mag = mag[0,:,0]
-    distance = distance[:,:,0]
-    
-    code = """
-    double c1, c2, c3, c4, c5, c6, c7;
-    double d1, d2, d3, f1, f2, e1, e2;
-    double m, d;
-    double Rm,log_Rm, log_Rm_100, log_100;
-    double sig_1, sig_2;
-
-    for (int i=0; i < num_sites; ++i) {
-        for (int j=0; j < num_events; ++j) {
-            m = mag(j);
-            d = distance(i, j);
-            
-            for (int k=0; k < num_periods; ++k) {
-                c1 = coefficient(0, k);
-                c2 = coefficient(1, k);
-                c3 = coefficient(2, k);
-                c4 = coefficient(3, k);
-                c5 = coefficient(4, k);
-                c6 = coefficient(5, k);
-                c7 = coefficient(6, k);
-                
-                Rm = sqrt(d*d + c7*c7);
-                log_Rm = log(Rm);
-                log_100 = 4.6051701859880918; /* log(100) */
-                log_Rm_100 = log_Rm - log_100;
-
-                if (log_Rm_100 < 0.0)
-                    log_Rm_100 = 0.0;
-
-                log_mean(i, j, k) = c1 + c2*(m-6.0) + c3*((m-6.0)*(m-6.0))
-                                       - c4*log_Rm - (c5-c4)*log_Rm_100-c6*Rm;
-
-                d1 = sigma_coefficient(0, k);
-                d2 = sigma_coefficient(1, k);
-                d3 = sigma_coefficient(2, k);
-                f1 = sigma_coefficient(3, k);
-                f2 = sigma_coefficient(4, k);
-                e1 = sigma_coefficient(5, k);
-                e2 = sigma_coefficient(6, k);
-
-                sig_1 = (m <= 5)*d1 +
-                            (5 < m)*(m <= 5.5)*(d1 + (d2-d1)*(m-5)/0.5) +
-                            (5.5 < m)*(m <= 8)*(d2 + (d3-d2)*(m-5.5)/2.5) +
-                            (8 < m)*d3;
-                sig_2 = (d <= 5)*f1 +
-                            (5 < d)*(d <= 20)*(f1 + (f2-f1)*(d-5)/15) +
-                            (20 < d)*f2;
-                log_sigma(i, j, k) = sqrt(sig_1*sig_1 + sig_2*sig_2);
-            }       
-        }
-    }
-
-    return_val = 0;
-    """
-
-    try:
-        weave.inline(code,
-                     ['num_sites', 'num_events', 'num_periods',
-                      'coefficient', 'sigma_coefficient',
-                      'mag', 'log_mean', 'distance', 'log_sigma'],
-                     type_converters=weave_converters.eqrm,
-                     compiler='gcc')   
-    except IOError:
-        raise util.WeaveIOError 
-    
-    return (log_mean, log_sigma)
+    return _ground_motion_ext_distribution(
+        ground_motion_ext.toro_1997_midcontinent, mag, distance,
+        coefficient, sigma_coefficient)
 
 Toro_1997_midcontinent_magnitude_type='Mw'
 Toro_1997_midcontinent_distance_types=['Joyner_Boore',]
@@ -624,64 +613,76 @@ Toro_1997_midcontinent_test_mean=[[[ 0.32568276,  0.16652828],
 
 Toro_1997_midcontinent_uses_Vs30 = False
 
-Toro_1997_midcontinent_args=[
-    Toro_1997_midcontinent_distribution,
-    Toro_1997_midcontinent_magnitude_type,
-    Toro_1997_midcontinent_distance_types,
-    
-    Toro_1997_midcontinent_coefficient,
-    Toro_1997_midcontinent_coefficient_period,
-    Toro_1997_midcontinent_interpolation,
-    
-    Toro_1997_midcontinent_sigma_coefficient,
-    Toro_1997_midcontinent_coefficient_period,
-    Toro_1997_midcontinent_sigma_coefficient_interpolation,
-
-    Toro_1997_midcontinent_uses_Vs30]
 
-ground_motion_init['Toro_1997_midcontinent'] = Toro_1997_midcontinent_args
+def Toro_1997_midcontinent_args():
+    Toro_1997_midcontinent_coefficient=[
+        [  2.20000000e+00, 2.20000000e+00, 4.00000000e+00, 3.68000000e+00,
+                  2.37000000e+00,   1.73000000e+00,   1.07000000e+00,
+                  9.00000000e-02,  -7.40000000e-01,  -3.23000000e+00],
+               [  8.10000000e-01,  8.10000000e-01, 7.90000000e-01, 8.00000000e-01,
+                  8.10000000e-01,   8.40000000e-01,   1.05000000e+00,
+                  1.42000000e+00,   1.86000000e+00,   3.18000000e+00],
+               [  0.00000000e+00, 0.00000000e+00,  0.00000000e+00, 0.00000000e+00,
+                  0.00000000e+00,   0.00000000e+00,  -1.00000000e-01,
+                  -2.00000000e-01,  -3.10000000e-01,  -6.40000000e-01],
+               [  1.27000000e+00, 1.27000000e+00, 1.57000000e+00, 1.46000000e+00,
+                  1.10000000e+00,   9.80000000e-01,   9.30000000e-01,
+                  9.00000000e-01,   9.20000000e-01,   9.80000000e-01],
+               [  1.16000000e+00,  1.16000000e+00, 1.83000000e+00, 1.77000000e+00,
+                  1.02000000e+00,   6.60000000e-01,   5.60000000e-01,
+                  4.90000000e-01,   4.60000000e-01,   3.70000000e-01],
+               [  2.10000000e-03, 2.10000000e-03,   8.00000000e-04, 1.30000000e-03,
+                  4.00000000e-03,   4.20000000e-03,   3.30000000e-03,
+                  2.30000000e-03,   1.70000000e-03,  -1.00000000e-04],
+               [  9.30000000e+00,   9.30000000e+00, 1.11000000e+01,  .05000000e+01,
+                  8.30000000e+00,   7.50000000e+00,   7.10000000e+00,
+                  6.80000000e+00,   6.90000000e+00,   7.20000000e+00]]
+    Toro_1997_midcontinent_coefficient_period=[
+        0.00000000e+00,   0.02,2.85000000e-02,   4.00000000e-02,
+                 1.00000000e-01,   2.00000000e-01,   4.00000000e-01,
+                 1.00000000e+00,   2.00000000e+00,   5.00000000e+00]
+    Toro_1997_midcontinent_sigma_coefficient = [
+        [0.55, 0.55, 0.62, 0.62, 0.59, 0.60, 0.63, 0.63, 0.61, 0.61],
+               [0.59,0.59, 0.63, 0.63, 0.61, 0.64, 0.68, 0.64, 0.62, 0.62],
+               [0.50, 0.50, 0.50, 0.50, 0.50, 0.56, 0.64, 0.67, 0.66, 0.66],
+               [0.54, 0.54, 0.62, 0.57, 0.50, 0.45, 0.45, 0.45, 0.45, 0.45],
+               [0.20, 0.20, 0.35, 0.29, 0.17, 0.12, 0.12, 0.12, 0.12, 0.12],
+               [0.36,0.36,0.36,0.36,0.36,0.36,0.36,0.35,0.34,0.34],
+               [0.7,0.7,0.7,0.7,0.7,0.7,0.7,0.65,0.6,0.6]]
+    return [
+        Toro_1997_midcontinent_distribution,
+        Toro_1997_midcontinent_magnitude_type,
+        Toro_1997_midcontinent_distance_types,
+
+        Toro_1997_midcontinent_coefficient,
+        Toro_1997_midcontinent_coefficient_period,
+        Toro_1997_midcontinent_interpolation,
+
+        Toro_1997_midcontinent_sigma_coefficient,
+        Toro_1997_midcontinent_coefficient_period,
+        Toro_1997_midcontinent_sigma_coefficient_interpolation,
+
+        Toro_1997_midcontinent_uses_Vs30]
+
+ground_motion_init.add_model('Toro_1997_midcontinent', Toro_1997_midcontinent_args)
 
 #***************  End of Toro_1997_midcontinent MODEL  ******************
 
 #***************  Start of Atkinson_Boore_97 MODEL  ******************
 
-Atkinson_Boore_97_coefficient=[
-    [  1.84100000e+00,   2.76200000e+00,   2.46300000e+00,
-        2.30100000e+00,   2.14000000e+00,   1.74900000e+00,
-        1.26500000e+00,   6.20000000e-01,  -9.40000000e-02,
-        -5.08000000e-01,  -9.00000000e-01,  -1.66000000e+00],
-     [  6.86000000e-01,   7.55000000e-01,   7.97000000e-01,
-        8.29000000e-01,   8.64000000e-01,   9.63000000e-01,
-        1.09400000e+00,   1.26700000e+00,   1.39100000e+00,
-        1.42800000e+00,   1.46200000e+00,   1.46000000e+00],
-     [ -1.23000000e-01,  -1.10000000e-01,  -1.13000000e-01,
-       -1.21000000e-01,  -1.29000000e-01,  -1.48000000e-01,
-       -1.65000000e-01,  -1.47000000e-01,  -1.18000000e-01,
-       -9.40000000e-02,  -7.10000000e-02,  -3.90000000e-02],
-     [ -3.11000000e-03,  -5.20000000e-03,  -3.52000000e-03,
-       -2.79000000e-03,  -2.07000000e-03,  -1.05000000e-03,
-       -2.40000000e-04,   0.00000000e+00,   0.00000000e+00,
-       0.00000000e+00,   0.00000000e+00,   0.00000000e+00]]
-
-Atkinson_Boore_97_coefficient_period= [
-    0.00000000e+00,   5.00000000e-02,   7.70000000e-02,
-    1.00000000e-01,   1.30000000e-01,   2.00000000e-01,
-    3.10000000e-01,   5.00000000e-01,   7.70000000e-01,
-    1.00000000e+00,   1.25000000e+00,   2.00000000e+00]
+
 
 Atkinson_Boore_97_interpolation=linear_interpolation
 
 
-Atkinson_Boore_97_sigma_coefficient=[
-    [0.622, 0.622, 0.599, 0.553, 0.553, 0.553]]
 
-Atkinson_Boore_97_sigma_coefficient_period=[0, 0.10, 0.20, 0.50, 1.00, 100]
 
 Atkinson_Boore_97_sigma_coefficient_interpolation=linear_interpolation
 
 def Atkinson_Boore_97_distribution(**kwargs):
-
-    return Atkinson_Boore_97_distribution_python(**kwargs)
+    if ground_motion_ext is None:
+        return Atkinson_Boore_97_distribution_python(**kwargs)
+    return Atkinson_Boore_97_distribution_c(**kwargs)
     
 def Atkinson_Boore_97_distribution_python(**kwargs):
     mag = kwargs['mag']
@@ -706,8 +707,9 @@ def Atkinson_Boore_97_distribution_python(**kwargs):
 def Atkinson_Boore_97_distribution_c(**kwargs):
     """The usual parameters passed are:
            mag, distance, coefficient, sigma_coefficient, depth,  Vs30
+
+    Uses the ground_motion_ext C extension.
     """
-    # This was giving seg faults on NCI raijin.
     mag = kwargs['mag']
     distance = kwargs['Rupture']
     coefficient = kwargs['coefficient']
@@ -721,70 +723,60 @@ def Atkinson_Boore_97_distribution_c(**kwargs):
     assert mag.shape == (1,num_events,1)
     assert distance.shape == (num_sites,num_events,1)
 
-    log_mean = zeros((num_sites, num_events, num_periods), dtype=float)
-    log_sigma = zeros((num_sites, num_events, num_periods), dtype=float)
-
-    coefficient = coefficient[:,0,0,:]
-    sigma_coefficient = sigma_coefficient[0,0,0,:]
-    mag = mag[0,:,0]
-    distance = distance[:,:,0]
-    code="""
-    double c1, c2, c3, c4;
-    double m, d;
-    for (int i=0; i < num_sites; ++i) {
-        for (int j=0; j < num_events; ++j) {
-            m = mag(j);
-            d = distance(i,j);
-            for (int k=0; k < num_periods; ++k) {
-                c1 = coefficient(0, k);
-                c2 = coefficient(1, k);
-                c3 = coefficient(2, k);
-                c4 = coefficient(3, k);
-                
-                log_mean(i, j, k) = c1 + c2*(m-6) + (c3*(m-6)*(m-6)) - log(d) - c4*d;
-                log_sigma(i, j, k) = sigma_coefficient(k);
-            }       
-        }
-    }
-
-    return_val = 0;
-    """
-
-    try:
-        weave.inline(code,
-                     ['num_sites', 'num_events', 'num_periods',
-                      'coefficient', 'sigma_coefficient',
-                      'mag', 'log_mean', 'distance', 'log_sigma'],
-                     type_converters=weave_converters.eqrm,
-                     compiler='gcc')     
-    except IOError:
-        raise util.WeaveIOError 
-  
-    return (log_mean, log_sigma)
+    return _ground_motion_ext_distribution(
+        ground_motion_ext.atkinson_boore_97, mag, distance,
+        coefficient, sigma_coefficient)
 
 Atkinson_Boore_97_distance_types=['Rupture',]
 Atkinson_Boore_97_magnitude_type='Mw'
 
 Atkinson_Boore_97_uses_Vs30 = False
 
-Atkinson_Boore_97_args=[
-    Atkinson_Boore_97_distribution,
-    Atkinson_Boore_97_magnitude_type,
-    Atkinson_Boore_97_distance_types,
-    
-    Atkinson_Boore_97_coefficient,
-    Atkinson_Boore_97_coefficient_period,
-    Atkinson_Boore_97_interpolation,
-    
-    Atkinson_Boore_97_sigma_coefficient,
-    Atkinson_Boore_97_sigma_coefficient_period,
-    Atkinson_Boore_97_sigma_coefficient_interpolation,
 
-    Atkinson_Boore_97_uses_Vs30
-    ]
 
-
-ground_motion_init['Atkinson_Boore_97'] = Atkinson_Boore_97_args
+def Atkinson_Boore_97_args():
+    Atkinson_Boore_97_coefficient=[
+        [  1.84100000e+00,   2.76200000e+00,   2.46300000e+00,
+            2.30100000e+00,   2.14000000e+00,   1.74900000e+00,
+            1.26500000e+00,   6.20000000e-01,  -9.40000000e-02,
+            -5.08000000e-01,  -9.00000000e-01,  -1.66000000e+00],
+         [  6.86000000e-01,   7.55000000e-01,   7.97000000e-01,
+            8.29000000e-01,   8.64000000e-01,   9.63000000e-01,
+            1.09400000e+00,   1.26700000e+00,   1.39100000e+00,
+            1.42800000e+00,   1.46200000e+00,   1.46000000e+00],
+         [ -1.23000000e-01,  -1.10000000e-01,  -1.13000000e-01,
+           -1.21000000e-01,  -1.29000000e-01,  -1.48000000e-01,
+           -1.65000000e-01,  -1.47000000e-01,  -1.18000000e-01,
+           -9.40000000e-02,  -7.10000000e-02,  -3.90000000e-02],
+         [ -3.11000000e-03,  -5.20000000e-03,  -3.52000000e-03,
+           -2.79000000e-03,  -2.07000000e-03,  -1.05000000e-03,
+           -2.40000000e-04,   0.00000000e+00,   0.00000000e+00,
+           0.00000000e+00,   0.00000000e+00,   0.00000000e+00]]
+    Atkinson_Boore_97_coefficient_period= [
+        0.00000000e+00,   5.00000000e-02,   7.70000000e-02,
+        1.00000000e-01,   1.30000000e-01,   2.00000000e-01,
+        3.10000000e-01,   5.00000000e-01,   7.70000000e-01,
+        1.00000000e+00,   1.25000000e+00,   2.00000000e+00]
+    Atkinson_Boore_97_sigma_coefficient=[
+        [0.622, 0.622, 0.599, 0.553, 0.553, 0.553]]
+    Atkinson_Boore_97_sigma_coefficient_period=[0, 0.10, 0.20, 0.50, 1.00, 100]
+    return [
+        Atkinson_Boore_97_distribution,
+        Atkinson_Boore_97_magnitude_type,
+        Atkinson_Boore_97_distance_types,
+
+        Atkinson_Boore_97_coefficient,
+        Atkinson_Boore_97_coefficient_period,
+        Atkinson_Boore_97_interpolation,
+
+        Atkinson_Boore_97_sigma_coefficient,
+        Atkinson_Boore_97_sigma_coefficient_period,
+        Atkinson_Boore_97_sigma_coefficient_interpolation,
+
+        Atkinson_Boore_97_uses_Vs30
+        ]
+
+ground_motion_init.add_model('Atkinson_Boore_97', Atkinson_Boore_97_args)
 
 
 #***************  End of Atkinson_Boore_97 MODEL  ******************
@@ -1026,10 +1018,17 @@ def Sadigh_97_distribution_python(**kwargs):
     return (log_mean, log_sigma)
 
 def Sadigh_97_distribution(**kwargs):
+    if ground_motion_ext is None:
+        return Sadigh_97_distribution_python(**kwargs)
+    return Sadigh_97_distribution_c(**kwargs)
+
+def Sadigh_97_distribution_c(**kwargs):
 
     """
     distance is a 3D array. First D is sites, second dimension is events,
     third can only have one value.
+
+    Uses the ground_motion_ext C extension.
     """
     # This function is called in Ground_motion_calculator.distribution_function
     # The usual parameters passed are
@@ -1049,74 +1048,9 @@ def Sadigh_97_distribution(**kwargs):
     assert mag.shape == (1,num_events,1)
     assert distance.shape == (num_sites,num_events,1)
 
-    log_mean =zeros((num_sites, num_events, num_periods), dtype=float)
-    log_sigma =zeros((num_sites, num_events, num_periods), dtype=float)
-
-    coefficient = coefficient[:,0,0,:]
-    sigma_coefficient = sigma_coefficient[:,0,0,:]
-    mag = mag[0,:,0]
-    distance = distance[:,:,0]
-    code = """
-    double F = 1.0;
-    double c1,c2,c3,c4,c5,c6,c7,c8;
-    double s1,s2,s3;
-    double m,d;
-    double R;
-    int c_offset;
-
-    for (int i=0; i < num_sites; ++i) {
-        for (int j=0; j < num_events; ++j) {
-            m = mag(j);
-            d = distance(i,j);
-
-            c_offset = (m > 6.5) ? 8 : 0;            
-#ifdef JUNK
-            if (m > 6.5)
-                c_offset=8;
-            else
-                c_offset=0;
-#endif
-
-            for (int k=0; k < num_periods; ++k) {
-                c1 = coefficient((0 + c_offset), k);
-                c2 = coefficient((1 + c_offset), k);
-                c3 = coefficient((2 + c_offset), k);
-                c4 = coefficient((3 + c_offset), k);
-                c5 = coefficient((4 + c_offset), k);
-                c6 = coefficient((5 + c_offset), k);
-                c7 = coefficient((6 + c_offset), k);
-                c8 = coefficient((7 + c_offset), k);
-                
-                R = d + c7*exp(c8*m);
-                log_mean(i, j, k) = c1*F + c2 + c3*m + c4*pow((8.5-m), 2.5) +
-                                        c5*log(R)+ c6*log(d+2.0);
-
-                s1 = sigma_coefficient(0, k);
-                s2 = sigma_coefficient(1, k);
-                s3 = sigma_coefficient(2, k);
-
-                log_sigma(i, j, k) = (m > 7.21) ? s3 : s1 - s2*m;
-#ifdef JUNK
-                if (m > 7.21)
-                    log_sigma(i, j, k) = s3;
-                else
-                    log_sigma(i, j, k) = s1 - s2*m;
-#endif
-            }       
-        }
-    }
-
-    return_val = 0;
-    """
-    try:
-        weave.inline(code,
-                     ['num_sites', 'num_events', 'num_periods',
-                      'coefficient', 'sigma_coefficient',
-                      'mag', 'log_mean', 'distance', 'log_sigma'],
-                     type_converters=weave_converters.eqrm,
-                     compiler='gcc')   
-    except IOError:
-        raise util.WeaveIOError 
+    (log_mean, log_sigma) = _ground_motion_ext_distribution(
+        ground_motion_ext.sadigh_97, mag, distance,
+        coefficient, sigma_coefficient)
 
     assert isfinite(log_mean).all()
 
@@ -1127,22 +1061,24 @@ Sadigh_97_magnitude_type='Mw'
 
 Sadigh_97_uses_Vs30 = False
 
-Sadigh_97_args=[
-    Sadigh_97_distribution,
-    Sadigh_97_magnitude_type,
-    Sadigh_97_distance_types,
-    
-    Sadigh_97_coefficient,
-    Sadigh_97_coefficient_period,
-    Sadigh_97_interpolation,
-    
-    Sadigh_97_sigma_coefficient,
-    Sadigh_97_sigma_coefficient_period,
-    Sadigh_97_sigma_coefficient_interpolation,
 
-    Sadigh_97_uses_Vs30]
+def Sadigh_97_args():
+    return [
+        Sadigh_97_distribution,
+        Sadigh_97_magnitude_type,
+        Sadigh_97_distance_types,
+
+        Sadigh_97_coefficient,
+        Sadigh_97_coefficient_period,
+        Sadigh_97_interpolation,
+
+        Sadigh_97_sigma_coefficient,
+        Sadigh_97_sigma_coefficient_period,
+        Sadigh_97_sigma_coefficient_interpolation,
 
-ground_motion_init['Sadigh_97'] = Sadigh_97_args
+        Sadigh_97_uses_Vs30]
+
+ground_motion_init.add_model('Sadigh_97', Sadigh_97_args)
 
 
 #***************  End of Sadigh_97 MODEL  ************
@@ -1174,7 +1110,6 @@ Sadigh_Original_97_model_low = asarray([
     [3,       -3.700, 1, -0.080, -1.610, 1.29649, 0.250,  0.000],
     [4,       -4.230, 1, -0.100, -1.570, 1.29649, 0.250,  0.000]
 ]).T
-Sadigh_Original_97_coefficient_low = Sadigh_Original_97_model_low[1:]
 Sadigh_Original_97_coefficient_period_low = Sadigh_Original_97_model_low[0]
 
 # M > 6.5
@@ -1195,11 +1130,8 @@ Sadigh_Original_97_model_high = asarray([
     [3,       -4.350, 1.1, -0.080, -1.610, -0.48451, 0.524,  0.000],
     [4,       -4.880, 1.1, -0.100, -1.570, -0.48451, 0.524,  0.000]
 ]).T
-Sadigh_Original_97_coefficient_high = Sadigh_Original_97_model_high[1:]
 Sadigh_Original_97_coefficient_period_high= Sadigh_Original_97_model_high[0]
 
-Sadigh_Original_97_coefficient = concatenate((Sadigh_Original_97_coefficient_low,
-                                              Sadigh_Original_97_coefficient_high))
 Sadigh_Original_97_coefficient_period = Sadigh_Original_97_coefficient_period_low
 
 # Sigma coefficients as per 
@@ -1209,24 +1141,6 @@ Sadigh_Original_97_coefficient_period = Sadigh_Original_97_coefficient_period_lo
 # 2007
 # M < 7.21 -> sigma = coeff - 0.14M
 # M >= 7.12 -> sigma = coeff
-Sadigh_Original_97_sigma_model = asarray([
-    # Period, M < 7.21, M >= 7.21
-    [0,       1.39,     0.38],
-    [0.07,    1.40,     0.39],
-    [0.1,     1.41,     0.40],
-    [0.2,     1.43,     0.42],
-    [0.3,     1.45,     0.44],
-    [0.4,     1.48,     0.47],
-    [0.5,     1.50,     0.49],
-    [0.75,    1.52,     0.51],
-    [1,       1.53,     0.52],
-    [1.5,     1.53,     0.52],
-    [2,       1.53,     0.52],
-    [3,       1.53,     0.52],
-    [4,       1.53,     0.52]
-]).T
-Sadigh_Original_97_sigma_coefficient_period = Sadigh_Original_97_sigma_model[0]
-Sadigh_Original_97_sigma_coefficient = Sadigh_Original_97_sigma_model[1:]
 
 
 # TODO: Are these correct?
@@ -1297,22 +1211,46 @@ def Sadigh_Original_97_distribution(**kwargs):
 
     return (log_mean, log_sigma)
 
-Sadigh_Original_97_args=[
-    Sadigh_Original_97_distribution,
-    Sadigh_Original_97_magnitude_type,
-    Sadigh_Original_97_distance_types,
-    
-    Sadigh_Original_97_coefficient,
-    Sadigh_Original_97_coefficient_period,
-    Sadigh_Original_97_interpolation,
-    
-    Sadigh_Original_97_sigma_coefficient,
-    Sadigh_Original_97_sigma_coefficient_period,
-    Sadigh_Original_97_interpolation,
-
-    Sadigh_Original_97_uses_Vs30]
 
-ground_motion_init['Sadigh_Original_97'] = Sadigh_Original_97_args
+def Sadigh_Original_97_args():
+    Sadigh_Original_97_coefficient_low = Sadigh_Original_97_model_low[1:]
+    Sadigh_Original_97_coefficient_high = Sadigh_Original_97_model_high[1:]
+    Sadigh_Original_97_coefficient = concatenate((Sadigh_Original_97_coefficient_low,
+                                                  Sadigh_Original_97_coefficient_high))
+    Sadigh_Original_97_sigma_model = asarray([
+        # Period, M < 7.21, M >= 7.21
+        [0,       1.39,     0.38],
+        [0.07,    1.40,     0.39],
+        [0.1,     1.41,     0.40],
+        [0.2,     1.43,     0.42],
+        [0.3,     1.45,     0.44],
+        [0.4,     1.48,     0.47],
+        [0.5,     1.50,     0.49],
+        [0.75,    1.52,     0.51],
+        [1,       1.53,     0.52],
+        [1.5,     1.53,     0.52],
+        [2,       1.53,     0.52],
+        [3,       1.53,     0.52],
+        [4,       1.53,     0.52]
+    ]).T
+    Sadigh_Original_97_sigma_coefficient_period = Sadigh_Original_97_sigma_model[0]
+    Sadigh_Original_97_sigma_coefficient = Sadigh_Original_97_sigma_model[1:]
+    return [
+        Sadigh_Original_97_distribution,
+        Sadigh_Original_97_magnitude_type,
+        Sadigh_Original_97_distance_types,
+
+        Sadigh_Original_97_coefficient,
+        Sadigh_Original_97_coefficient_period,
+        Sadigh_Original_97_interpolation,
+
+        Sadigh_Original_97_sigma_coefficient,
+        Sadigh_Original_97_sigma_coefficient_period,
+        Sadigh_Original_97_interpolation,
+
+        Sadigh_Original_97_uses_Vs30]
+
+ground_motion_init.add_model('Sadigh_Original_97', Sadigh_Original_97_args)
 
 #***************  End of Sadigh_Original_97 MODEL  ************
 
@@ -1418,22 +1356,24 @@ Z_t_interface = [0.0]*len(Youngs_97_coefficient[0])
 Youngs_97_interface_coefficient =  Youngs_97_coefficient[:]
 Youngs_97_interface_coefficient.append(Z_t_interface)
 
-Youngs_97_interface_args=[
-    Youngs_97_distribution_python,
-    Youngs_97_magnitude_type,
-    Youngs_97_distance_types,
-    
-    Youngs_97_interface_coefficient,
-    Youngs_97_coefficient_period,
-    Youngs_97_interpolation,
-    
-    Youngs_97_sigma_coefficient,
-    Youngs_97_sigma_coefficient_period,
-    Youngs_97_sigma_coefficient_interpolation,
 
-    Youngs_97_uses_Vs30]
+def Youngs_97_interface_args():
+    return [
+        Youngs_97_distribution_python,
+        Youngs_97_magnitude_type,
+        Youngs_97_distance_types,
+
+        Youngs_97_interface_coefficient,
+        Youngs_97_coefficient_period,
+        Youngs_97_interpolation,
 
-ground_motion_init['Youngs_97_interface'] = Youngs_97_interface_args
+        Youngs_97_sigma_coefficient,
+        Youngs_97_sigma_coefficient_period,
+        Youngs_97_sigma_coefficient_interpolation,
+
+        Youngs_97_uses_Vs30]
+
+ground_motion_init.add_model('Youngs_97_interface', Youngs_97_interface_args)
 
 #***************  End of Youngs_97 interface MODEL  ***********
 
@@ -1445,22 +1385,24 @@ Z_t_intraslab = [1.0]*len(Youngs_97_coefficient[0])
 Youngs_97_intraslab_coefficient = Youngs_97_coefficient[:]
 Youngs_97_intraslab_coefficient.append(Z_t_intraslab) 
 
-Youngs_97_intraslab_args=[
-    Youngs_97_distribution_python,
-    Youngs_97_magnitude_type,
-    Youngs_97_distance_types,
-    
-    Youngs_97_intraslab_coefficient,
-    Youngs_97_coefficient_period,
-    Youngs_97_interpolation,
-    
-    Youngs_97_sigma_coefficient,
-    Youngs_97_sigma_coefficient_period,
-    Youngs_97_sigma_coefficient_interpolation,
 
-    Youngs_97_uses_Vs30]
+def Youngs_97_intraslab_args():
+    return [
+        Youngs_97_distribution_python,
+        Youngs_97_magnitude_type,
+        Youngs_97_distance_types,
 
-ground_motion_init['Youngs_97_intraslab'] = Youngs_97_intraslab_args
+        Youngs_97_intraslab_coefficient,
+        Youngs_97_coefficient_period,
+        Youngs_97_interpolation,
+
+        Youngs_97_sigma_coefficient,
+        Youngs_97_sigma_coefficient_period,
+        Youngs_97_sigma_coefficient_interpolation,
+
+        Youngs_97_uses_Vs30]
+
+ground_motion_init.add_model('Youngs_97_intraslab', Youngs_97_intraslab_args)
 
 #***************  End of Youngs_97 intraslab MODEL  ***********
 
@@ -1527,22 +1469,24 @@ Youngs_97_magnitude_type='Mw'
 
 Combo_Sadigh_Youngs_M8_uses_Vs30 = False
 
-Combo_Sadigh_Youngs_M8_args=[
-    Combo_Sadigh_Youngs_M8_distribution_python,
-    Youngs_97_magnitude_type,
-    Youngs_97_distance_types,
-    
-    Combo_Sadigh_Youngs_M8_coeff,
-    Sadigh_97_coefficient_period,
-    linear_interpolation,  
- 
-    Combo_Sadigh_Youngs_M8_sigma_coeff,
-    Sadigh_97_sigma_coefficient_period,
-    linear_interpolation,
 
-    Combo_Sadigh_Youngs_M8_uses_Vs30]
+def Combo_Sadigh_Youngs_M8_args():
+    return [
+        Combo_Sadigh_Youngs_M8_distribution_python,
+        Youngs_97_magnitude_type,
+        Youngs_97_distance_types,
 
-ground_motion_init['Combo_Sadigh_Youngs_M8'] = Combo_Sadigh_Youngs_M8_args
+        Combo_Sadigh_Youngs_M8_coeff,
+        Sadigh_97_coefficient_period,
+        linear_interpolation,
+
+        Combo_Sadigh_Youngs_M8_sigma_coeff,
+        Sadigh_97_sigma_coefficient_period,
+        linear_interpolation,
+
+        Combo_Sadigh_Youngs_M8_uses_Vs30]
+
+ground_motion_init.add_model('Combo_Sadigh_Youngs_M8', Combo_Sadigh_Youngs_M8_args)
 
 #***************  End of Combo_Sadigh_Youngs_M8 MODEL  ************
 
@@ -1781,23 +1725,15 @@ Boore_08_coefficient_raw = array([
     [-0.09824,-0.138,-0.00191,3.04,-2.15446,-2.16137,-2.53323,-2.14635,0.40387,
      -0.48492,0,8.5,0.645,0.355,0.735,0.477,0.801,-0.65,-0.215,0]])
 
-Boore_08_coefficient = Boore_08_coefficient_raw.transpose()
 
 PGA_BA08 = 0
 Boore_08_coefficient_period=[0.0,0.01,0.02,0.03,0.05,0.075,0.1,0.15,0.2,0.25,
                              0.3,0.4,0.5,0.75,1.,1.5,2.,3.,4.,5.,7.5,10.]
 assert Boore_08_coefficient_period[PGA_BA08] == 0.0
 
-Boore_08_sigma_coefficient=[[
-    0.566, 0.569, 0.569, 0.578, 0.589, 0.606, 0.608, 0.592, 0.596, 0.592,
-    0.608,
-    0.603, 0.615, 0.649, 0.654, 0.684, 0.702, 0.7, 0.702, 0.73, 0.781, 0.735]]
 
 Boore_08_interpolation=linear_interpolation
 
-Boore_08_sigma_coefficient_period = [
-    0.0,0.01,0.02,0.03,0.05,0.075,0.1,0.15,0.2,0.25,
-    0.3,0.4,0.5,0.75,1.,1.5,2.,3.,4.,5.,7.5,10.]
 
 Boore_08_sigma_coefficient_interpolation=linear_interpolation
 
@@ -1990,22 +1926,32 @@ Boore_08_magnitude_type='Mw'
 
 Boore_08_uses_Vs30 = True
 
-Boore_08_args=[
-    Boore_08_distribution,
-    Boore_08_magnitude_type,
-    Boore_08_distance_types,
-    
-    Boore_08_coefficient,
-    Boore_08_coefficient_period,
-    Boore_08_interpolation,
-    
-    Boore_08_sigma_coefficient,
-    Boore_08_sigma_coefficient_period,
-    Boore_08_sigma_coefficient_interpolation,
 
-    Boore_08_uses_Vs30]
+def Boore_08_args():
+    Boore_08_coefficient = Boore_08_coefficient_raw.transpose()
+    Boore_08_sigma_coefficient=[[
+        0.566, 0.569, 0.569, 0.578, 0.589, 0.606, 0.608, 0.592, 0.596, 0.592,
+        0.608,
+        0.603, 0.615, 0.649, 0.654, 0.684, 0.702, 0.7, 0.702, 0.73, 0.781, 0.735]]
+    Boore_08_sigma_coefficient_period = [
+        0.0,0.01,0.02,0.03,0.05,0.075,0.1,0.15,0.2,0.25,
+        0.3,0.4,0.5,0.75,1.,1.5,2.,3.,4.,5.,7.5,10.]
+    return [
+        Boore_08_distribution,
+        Boore_08_magnitude_type,
+        Boore_08_distance_types,
+
+        Boore_08_coefficient,
+        Boore_08_coefficient_period,
+        Boore_08_interpolation,
+
+        Boore_08_sigma_coefficient,
+        Boore_08_sigma_coefficient_period,
+        Boore_08_sigma_coefficient_interpolation,
 
-ground_motion_init['Boore_08'] = Boore_08_args
+        Boore_08_uses_Vs30]
+
+ground_motion_init.add_model('Boore_08', Boore_08_args)
 
 #***************  End of Boore_08 MODEL  ************
 
@@ -2074,130 +2020,134 @@ Somerville09_magnitude_type='Mw'
 
 #***************  Start of Somerville_Yilgarn MODEL  ************
 # dimension = (period, coeffiecient)
-Somerville09_Yilgarn_coefficient_raw = array([
-    [1.5456,1.4565,-1.1151,0.1664,-0.00567,-1.049,1.0553,0.2],
-    [1.5551,1.4638,-1.1146,0.1662,-0.00568,-1.0484,1.0585,0.2014],
-    [2.338,1.3806,-1.2297,0.1801,-0.00467,-1.3985,0.9599,0.2013],
-    [2.4809,1.3754,-1.1762,0.1712,-0.00542,-1.3872,0.9693,0.1928],
-    [2.3145,1.6025,-1.126,0.1715,-0.00629,-1.2791,1.0704,0.2356],
-    [2.2686,1.5584,-1.0734,0.1471,-0.00709,-1.0891,1.1075,0.2067],
-    [1.9707,1.6803,-1.0154,0.1456,-0.00737,-0.9193,1.1829,0.2217],
-    [1.7103,1.7507,-0.9933,0.1382,-0.00746,-0.7814,1.2939,0.2379],
-    [1.5231,1.6916,-0.9631,0.1333,-0.00713,-0.6733,1.2243,0.2102],
-    [1.3683,1.5794,-0.9472,0.1364,-0.00677,-0.6269,1.1776,0.1895],
-    [1.4018,1.2894,-0.9441,0.1436,-0.00617,-0.6707,1.0561,0.1459],
-    [1.45,1.0463,-0.9488,0.1476,-0.00581,-0.687,0.9404,0.1104],
-    [1.4415,0.9282,-0.9183,0.1132,-0.00576,-0.5952,0.8628,0.0406],
-    [1.4038,0.6916,-0.9101,0.1348,-0.00557,-0.6239,0.7123,0.0062],
-    [1.5084,0.758,-0.9901,0.1126,-0.00458,-0.6904,0.6859,-0.0563],
-    [2.1063,0.3818,-1.0868,0.0795,-0.00406,-0.9034,0.6185,-0.1825],
-    [2.5579,-0.8427,-0.8181,0.0765,-0.0022,-1.3532,-0.2544,-0.4666],
-    [2.396,-1.3995,-0.7044,0.0677,-0.00366,-0.9086,-0.6432,-0.596],
-    [0.9604,-0.4612,-0.7045,0.0645,-0.00429,-0.5119,-0.1643,-0.4631],
-    [0.1219,-0.0698,-0.7591,0.0849,-0.00374,-0.4145,0.1235,-0.3925],
-    [-0.8424,0.5316,-0.796,0.1033,-0.0018,-0.6213,0.5368,-0.2757],
-    [-1.9226,0.6376,-0.819,0.1455,-0.00066,-0.7574,0.6902,-0.2329],
-    [-2.6033,0.5906,-0.8094,0.1609,-0.00106,-0.6855,0.7035,-0.2291]])
 
 # dimension = (coeffiecient, period)
-Somerville09_Yilgarn_coefficient = Somerville09_Yilgarn_coefficient_raw.transpose()
 
-Somerville09_Yilgarn_sigma_coefficient=[[
-    0.5513, 0.5512, 0.551, 0.5508 ,0.5509, 0.551, 0.5514, 0.5529, 0.5544,
-    0.5558, 0.5583, 0.5602, 0.5614, 0.5636, 0.5878, 0.6817, 0.8514,
-    0.8646, 0.8424, 0.8225, 0.8088, 0.7808, 0.7624
-    ]]
 
-Somerville09_Yilgarn_coefficient_period=[
-    0.0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3003,
-   0.4, 0.5, 0.75, 1., 1.4993, 2., 3.003, 4., 5., 7.5019, 10.,]
 
-Somerville09_Yilgarn_sigma_coefficient_period=[
-   0.0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3003,
-   0.4, 0.5, 0.75, 1., 1.4993, 2., 3.003, 4., 5., 7.5019, 10.,]
 
 Somerville09_Yilgarn_uses_Vs30 = False
 
-Somerville09_Yilgarn_args=[
-    Somerville09_distribution,
-    Somerville09_magnitude_type,
-    Somerville09_distance_types,
-    
-    Somerville09_Yilgarn_coefficient,
-    Somerville09_Yilgarn_coefficient_period,
-    Somerville09_interpolation,
-    
-    Somerville09_Yilgarn_sigma_coefficient,
-    Somerville09_Yilgarn_sigma_coefficient_period,
-    Somerville09_sigma_coefficient_interpolation,
-
-    Somerville09_Yilgarn_uses_Vs30]
 
-ground_motion_init['Somerville09_Yilgarn'] = Somerville09_Yilgarn_args
+def Somerville09_Yilgarn_args():
+    Somerville09_Yilgarn_coefficient_raw = array([
+        [1.5456,1.4565,-1.1151,0.1664,-0.00567,-1.049,1.0553,0.2],
+        [1.5551,1.4638,-1.1146,0.1662,-0.00568,-1.0484,1.0585,0.2014],
+        [2.338,1.3806,-1.2297,0.1801,-0.00467,-1.3985,0.9599,0.2013],
+        [2.4809,1.3754,-1.1762,0.1712,-0.00542,-1.3872,0.9693,0.1928],
+        [2.3145,1.6025,-1.126,0.1715,-0.00629,-1.2791,1.0704,0.2356],
+        [2.2686,1.5584,-1.0734,0.1471,-0.00709,-1.0891,1.1075,0.2067],
+        [1.9707,1.6803,-1.0154,0.1456,-0.00737,-0.9193,1.1829,0.2217],
+        [1.7103,1.7507,-0.9933,0.1382,-0.00746,-0.7814,1.2939,0.2379],
+        [1.5231,1.6916,-0.9631,0.1333,-0.00713,-0.6733,1.2243,0.2102],
+        [1.3683,1.5794,-0.9472,0.1364,-0.00677,-0.6269,1.1776,0.1895],
+        [1.4018,1.2894,-0.9441,0.1436,-0.00617,-0.6707,1.0561,0.1459],
+        [1.45,1.0463,-0.9488,0.1476,-0.00581,-0.687,0.9404,0.1104],
+        [1.4415,0.9282,-0.9183,0.1132,-0.00576,-0.5952,0.8628,0.0406],
+        [1.4038,0.6916,-0.9101,0.1348,-0.00557,-0.6239,0.7123,0.0062],
+        [1.5084,0.758,-0.9901,0.1126,-0.00458,-0.6904,0.6859,-0.0563],
+        [2.1063,0.3818,-1.0868,0.0795,-0.00406,-0.9034,0.6185,-0.1825],
+        [2.5579,-0.8427,-0.8181,0.0765,-0.0022,-1.3532,-0.2544,-0.4666],
+        [2.396,-1.3995,-0.7044,0.0677,-0.00366,-0.9086,-0.6432,-0.596],
+        [0.9604,-0.4612,-0.7045,0.0645,-0.00429,-0.5119,-0.1643,-0.4631],
+        [0.1219,-0.0698,-0.7591,0.0849,-0.00374,-0.4145,0.1235,-0.3925],
+        [-0.8424,0.5316,-0.796,0.1033,-0.0018,-0.6213,0.5368,-0.2757],
+        [-1.9226,0.6376,-0.819,0.1455,-0.00066,-0.7574,0.6902,-0.2329],
+        [-2.6033,0.5906,-0.8094,0.1609,-0.00106,-0.6855,0.7035,-0.2291]])
+    Somerville09_Yilgarn_coefficient = Somerville09_Yilgarn_coefficient_raw.transpose()
+    Somerville09_Yilgarn_sigma_coefficient=[[
+        0.5513, 0.5512, 0.551, 0.5508 ,0.5509, 0.551, 0.5514, 0.5529, 0.5544,
+        0.5558, 0.5583, 0.5602, 0.5614, 0.5636, 0.5878, 0.6817, 0.8514,
+        0.8646, 0.8424, 0.8225, 0.8088, 0.7808, 0.7624
+        ]]
+    Somerville09_Yilgarn_coefficient_period=[
+        0.0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3003,
+       0.4, 0.5, 0.75, 1., 1.4993, 2., 3.003, 4., 5., 7.5019, 10.,]
+    Somerville09_Yilgarn_sigma_coefficient_period=[
+       0.0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3003,
+       0.4, 0.5, 0.75, 1., 1.4993, 2., 3.003, 4., 5., 7.5019, 10.,]
+    return [
+        Somerville09_distribution,
+        Somerville09_magnitude_type,
+        Somerville09_distance_types,
+
+        Somerville09_Yilgarn_coefficient,
+        Somerville09_Yilgarn_coefficient_period,
+        Somerville09_interpolation,
+
+        Somerville09_Yilgarn_sigma_coefficient,
+        Somerville09_Yilgarn_sigma_coefficient_period,
+        Somerville09_sigma_coefficient_interpolation,
+
+        Somerville09_Yilgarn_uses_Vs30]
+
+ground_motion_init.add_model('Somerville09_Yilgarn', Somerville09_Yilgarn_args)
 #***************  End of Somerville_Yilgarn MODEL   ************
 #***************  Start of Somerville_Non_Cratonic MODEL   ************
 # dimension = (period, coeffiecient)
-Somerville09_Non_Cratonic_coefficient_raw = array([
-    [1.03780,-0.03970,-0.79430,0.14450,-0.00618,-0.72540,-0.03590,-0.09730],
-    [1.05360,-0.04190,-0.79390,0.14450,-0.00619,-0.72660,-0.03940,-0.09740],
-    [1.05680,-0.03920,-0.79680,0.14550,-0.00617,-0.73230,-0.03930,-0.09600],
-    [1.13530,-0.04790,-0.80920,0.15000,-0.00610,-0.76410,-0.05710,-0.09210],
-    [1.30000,-0.07020,-0.83150,0.15920,-0.00599,-0.82850,-0.09810,-0.08530],
-    [1.47680,-0.09310,-0.83330,0.15600,-0.00606,-0.86740,-0.12740,-0.09130],
-    [1.70220,-0.05160,-0.80720,0.14560,-0.00655,-0.87690,-0.10970,-0.08690],
-    [1.65720,0.15080,-0.77590,0.13100,-0.00708,-0.77830,0.01690,-0.05980],
-    [1.94440,-0.09620,-0.75000,0.11670,-0.00698,-0.69490,-0.13320,-0.12530],
-    [1.82720,-0.06230,-0.73430,0.11940,-0.00677,-0.64380,-0.09570,-0.11920],
-    [1.74380,-0.02530,-0.72480,0.11950,-0.00646,-0.63740,-0.06250,-0.11650],
-    [1.80560,-0.27020,-0.73190,0.13490,-0.00606,-0.66440,-0.17470,-0.14340],
-    [1.88750,-0.37820,-0.70580,0.09960,-0.00589,-0.58770,-0.24420,-0.21890],
-    [2.03760,-0.79590, -0.69730,0.11470,-0.00565,-0.59990,-0.48670,-0.29690],
-    [1.93060,-0.80280,-0.74510,0.11220,-0.00503,-0.59460,-0.50120,-0.34990],
-    [1.60380,-0.47800,-0.86950,0.07320,-0.00569,-0.41590,0.06360,-0.33730],
-    [0.47740,0.90960,-1.02440,0.11060,-0.00652,-0.19000,1.09610,-0.10660],
-    [-0.25810,1.37770,-1.01000,0.10310,-0.00539,-0.27340,1.50330,-0.04530],
-    [-0.96360,1.14690,-0.88530,0.10380,-0.00478,-0.40420,1.54130,-0.11020],
-    [-1.46140,1.07950,-0.80490,0.10960,-0.00395,-0.46040,1.41960,-0.14700],
-    [-1.61160,0.74860,-0.78100,0.09650,-0.00307,-0.46490,1.24090,-0.22170],
-    [-2.35310,0.35190,-0.64340,0.09590,-0.00138,-0.68260,0.92880,-0.31230],
-    [-3.26140,0.69730,-0.62760,0.12920,-0.00155,-0.61980,1.01050,-0.24550]])
 
 
 # dimension = (coeffiecient, period)
-Somerville09_Non_Cratonic_coefficient = Somerville09_Non_Cratonic_coefficient_raw.transpose()
 
-Somerville09_Non_Cratonic_sigma_coefficient=[[
-    0.5685, 0.5684, 0.5684, 0.5681, 0.5676, 0.567, 0.5663, 0.5659, 0.5659,
-    0.5669, 0.5678, 0.5708, 0.5697, 0.5739, 0.5876, 0.6269, 0.7517, 0.8036,
-    0.8219, 0.8212, 0.824, 0.7957, 0.7602
-    ]]
 
-Somerville09_Non_Cratonic_coefficient_period=[
-    0.0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3003,
-   0.4, 0.5, 0.75, 1., 1.4993, 2., 3.003, 4., 5., 7.5019, 10.,]
 
-Somerville09_Non_Cratonic_sigma_coefficient_period=[
-   0.0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3003,
-   0.4, 0.5, 0.75, 1., 1.4993, 2., 3.003, 4., 5., 7.5019, 10.,]
 
 Somerville09_Non_Cratonic_uses_Vs30 = False
 
-Somerville09_Non_Cratonic_args=[
-    Somerville09_distribution,
-    Somerville09_magnitude_type,
-    Somerville09_distance_types,
-    
-    Somerville09_Non_Cratonic_coefficient,
-    Somerville09_Non_Cratonic_coefficient_period,
-    Somerville09_interpolation,
-    
-    Somerville09_Non_Cratonic_sigma_coefficient,
-    Somerville09_Non_Cratonic_sigma_coefficient_period,
-    Somerville09_sigma_coefficient_interpolation,
 
-    Somerville09_Non_Cratonic_uses_Vs30]
-
-ground_motion_init['Somerville09_Non_Cratonic'] = Somerville09_Non_Cratonic_args
+def Somerville09_Non_Cratonic_args():
+    Somerville09_Non_Cratonic_coefficient_raw = array([
+        [1.03780,-0.03970,-0.79430,0.14450,-0.00618,-0.72540,-0.03590,-0.09730],
+        [1.05360,-0.04190,-0.79390,0.14450,-0.00619,-0.72660,-0.03940,-0.09740],
+        [1.05680,-0.03920,-0.79680,0.14550,-0.00617,-0.73230,-0.03930,-0.09600],
+        [1.13530,-0.04790,-0.80920,0.15000,-0.00610,-0.76410,-0.05710,-0.09210],
+        [1.30000,-0.07020,-0.83150,0.15920,-0.00599,-0.82850,-0.09810,-0.08530],
+        [1.47680,-0.09310,-0.83330,0.15600,-0.00606,-0.86740,-0.12740,-0.09130],
+        [1.70220,-0.05160,-0.80720,0.14560,-0.00655,-0.87690,-0.10970,-0.08690],
+        [1.65720,0.15080,-0.77590,0.13100,-0.00708,-0.77830,0.01690,-0.05980],
+        [1.94440,-0.09620,-0.75000,0.11670,-0.00698,-0.69490,-0.13320,-0.12530],
+        [1.82720,-0.06230,-0.73430,0.11940,-0.00677,-0.64380,-0.09570,-0.11920],
+        [1.74380,-0.02530,-0.72480,0.11950,-0.00646,-0.63740,-0.06250,-0.11650],
+        [1.80560,-0.27020,-0.73190,0.13490,-0.00606,-0.66440,-0.17470,-0.14340],
+        [1.88750,-0.37820,-0.70580,0.09960,-0.00589,-0.58770,-0.24420,-0.21890],
+        [2.03760,-0.79590, -0.69730,0.11470,-0.00565,-0.59990,-0.48670,-0.29690],
+        [1.93060,-0.80280,-0.74510,0.11220,-0.00503,-0.59460,-0.50120,-0.34990],
+        [1.60380,-0.47800,-0.86950,0.07320,-0.00569,-0.41590,0.06360,-0.33730],
+        [0.47740,0.90960,-1.02440,0.11060,-0.00652,-0.19000,1.09610,-0.10660],
+        [-0.25810,1.37770,-1.01000,0.10310,-0.00539,-0.27340,1.50330,-0.04530],
+        [-0.96360,1.14690,-0.88530,0.10380,-0.00478,-0.40420,1.54130,-0.11020],
+        [-1.46140,1.07950,-0.80490,0.10960,-0.00395,-0.46040,1.41960,-0.14700],
+        [-1.61160,0.74860,-0.78100,0.09650,-0.00307,-0.46490,1.24090,-0.22170],
+        [-2.35310,0.35190,-0.64340,0.09590,-0.00138,-0.68260,0.92880,-0.31230],
+        [-3.26140,0.69730,-0.62760,0.12920,-0.00155,-0.61980,1.01050,-0.24550]])
+    Somerville09_Non_Cratonic_coefficient = Somerville09_Non_Cratonic_coefficient_raw.transpose()
+    Somerville09_Non_Cratonic_sigma_coefficient=[[
+        0.5685, 0.5684, 0.5684, 0.5681, 0.5676, 0.567, 0.5663, 0.5659, 0.5659,
+        0.5669, 0.5678, 0.5708, 0.5697, 0.5739, 0.5876, 0.6269, 0.7517, 0.8036,
+        0.8219, 0.8212, 0.824, 0.7957, 0.7602
+        ]]
+    Somerville09_Non_Cratonic_coefficient_period=[
+        0.0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3003,
+       0.4, 0.5, 0.75, 1., 1.4993, 2., 3.003, 4., 5., 7.5019, 10.,]
+    Somerville09_Non_Cratonic_sigma_coefficient_period=[
+       0.0, 0.01, 0.02, 0.03, 0.04, 0.05, 0.075, 0.1, 0.15, 0.2, 0.25, 0.3003,
+       0.4, 0.5, 0.75, 1., 1.4993, 2., 3.003, 4., 5., 7.5019, 10.,]
+    return [
+        Somerville09_distribution,
+        Somerville09_magnitude_type,
+        Somerville09_distance_types,
+
+        Somerville09_Non_Cratonic_coefficient,
+        Somerville09_Non_Cratonic_coefficient_period,
+        Somerville09_interpolation,
+
+        Somerville09_Non_Cratonic_sigma_coefficient,
+        Somerville09_Non_Cratonic_sigma_coefficient_period,
+        Somerville09_sigma_coefficient_interpolation,
+
+        Somerville09_Non_Cratonic_uses_Vs30]
+
+ground_motion_init.add_model('Somerville09_Non_Cratonic', Somerville09_Non_Cratonic_args)
 #***************  End of Somerville_Non_Cratonic MODEL   ************
 
 #########################  Start of Liang_2008 model  ##########################
@@ -2299,24 +2249,26 @@ Liang_2008_coefficient_period = [0.00, 0.05, 0.10, 0.15, 0.20,
 # dim = (sigmacoefficient, period)
 sigma = 1.166
 Liang_2008_sigma_coefficient = [[sigma,sigma], [sigma,sigma]]
-Liang_2008_sigma_coefficient_period = [0.0, 1.0]
 
 Liang_2008_interpolation = linear_interpolation
 
 Liang_2008_uses_Vs30 = False
 
-Liang_2008_args = [Liang_2008_distribution,
-                   Liang_2008_magnitude_type,
-                   Liang_2008_distance_types,
-                   Liang_2008_coefficient,
-                   Liang_2008_coefficient_period,
-                   Liang_2008_interpolation,
-                   Liang_2008_sigma_coefficient,
-                   Liang_2008_sigma_coefficient_period,
-                   Liang_2008_interpolation,
-                   Liang_2008_uses_Vs30]
 
-ground_motion_init['Liang_2008'] = Liang_2008_args
+def Liang_2008_args():
+    Liang_2008_sigma_coefficient_period = [0.0, 1.0]
+    return [Liang_2008_distribution,
+                       Liang_2008_magnitude_type,
+                       Liang_2008_distance_types,
+                       Liang_2008_coefficient,
+                       Liang_2008_coefficient_period,
+                       Liang_2008_interpolation,
+                       Liang_2008_sigma_coefficient,
+                       Liang_2008_sigma_coefficient_period,
+                       Liang_2008_interpolation,
+                       Liang_2008_uses_Vs30]
+
+ground_motion_init.add_model('Liang_2008', Liang_2008_args)
 
 ##########################  End of Liang_2008 model  ###########################
 
@@ -2704,41 +2656,12 @@ Atkinson06_Table8 = array([[-0.752, -0.300,  0.000],  # 5.00
                            [-0.361, -0.641, -0.144],  # 0.010 (PGA)
                            [-0.361, -0.641, -0.144]]) # 0.000 (PGA)
 
-Atkinson06_Table9 = array([
-[-4.85E+00, 1.58E+00, -8.07E-02, -2.53E+00, 2.22E-01, -1.43E+00, 1.36E-01,  6.34E-01, -1.41E-01, -1.61E-04],  # 5.00
-[-5.26E+00, 1.79E+00, -9.79E-02, -2.44E+00, 2.07E-01, -1.31E+00, 1.21E-01,  7.34E-01, -1.56E-01, -1.96E-04],  # 4.00
-[-5.59E+00, 1.97E+00, -1.14E-01, -2.33E+00, 1.91E-01, -1.20E+00, 1.10E-01,  8.45E-01, -1.72E-01, -2.45E-04],  # 3.13
-[-5.80E+00, 2.13E+00, -1.28E-01, -2.26E+00, 1.79E-01, -1.12E+00, 9.54E-02,  8.91E-01, -1.80E-01, -2.60E-04],  # 2.50
-[-5.85E+00, 2.23E+00, -1.39E-01, -2.20E+00, 1.69E-01, -1.04E+00, 8.00E-02,  8.67E-01, -1.79E-01, -2.86E-04],  # 2.00
-[-5.75E+00, 2.29E+00, -1.45E-01, -2.13E+00, 1.58E-01, -9.57E-01, 6.76E-02,  8.67E-01, -1.79E-01, -3.43E-04],  # 1.59
-[-5.49E+00, 2.29E+00, -1.48E-01, -2.08E+00, 1.50E-01, -9.00E-01, 5.79E-02,  8.21E-01, -1.72E-01, -4.07E-04],  # 1.25
-[-5.06E+00, 2.23E+00, -1.45E-01, -2.03E+00, 1.41E-01, -8.74E-01, 5.41E-02,  7.92E-01, -1.70E-01, -4.89E-04],  # 1.00
-[-4.45E+00, 2.12E+00, -1.39E-01, -2.01E+00, 1.36E-01, -8.58E-01, 4.98E-02,  7.08E-01, -1.59E-01, -5.75E-04],  # 0.794
-[-3.75E+00, 1.97E+00, -1.29E-01, -2.00E+00, 1.31E-01, -8.42E-01, 4.82E-02,  6.77E-01, -1.56E-01, -6.76E-04],  # 0.629
-[-3.01E+00, 1.80E+00, -1.18E-01, -1.98E+00, 1.27E-01, -8.47E-01, 4.70E-02,  6.67E-01, -1.55E-01, -7.68E-04],  # 0.500
-[-2.28E+00, 1.63E+00, -1.05E-01, -1.97E+00, 1.23E-01, -8.88E-01, 5.03E-02,  6.84E-01, -1.58E-01, -8.59E-04],  # 0.397
-[-1.56E+00, 1.46E+00, -9.31E-02, -1.98E+00, 1.21E-01, -9.47E-01, 5.58E-02,  6.50E-01, -1.56E-01, -9.55E-04],  # 0.315
-[-8.76E-01, 1.29E+00, -8.19E-02, -2.01E+00, 1.23E-01, -1.03E+00, 6.34E-02,  5.81E-01, -1.49E-01, -1.05E-03],  # 0.251
-[-3.06E-01, 1.16E+00, -7.21E-02, -2.04E+00, 1.22E-01, -1.15E+00, 7.38E-02,  5.08E-01, -1.43E-01, -1.14E-03],  # 0.199
-[ 1.19E-01, 1.06E+00, -6.47E-02, -2.05E+00, 1.19E-01, -1.36E+00, 9.16E-02,  5.16E-01, -1.50E-01, -1.18E-03],  # 0.158
-[ 5.36E-01, 9.65E-01, -5.84E-02, -2.11E+00, 1.21E-01, -1.67E+00, 1.16E-01,  3.43E-01, -1.32E-01, -1.13E-03],  # 0.125
-[ 7.82E-01, 9.24E-01, -5.56E-02, -2.17E+00, 1.19E-01, -2.10E+00, 1.48E-01,  2.85E-01, -1.32E-01, -9.90E-04],  # 0.100
-[ 9.67E-01, 9.03E-01, -5.48E-02, -2.25E+00, 1.22E-01, -2.53E+00, 1.78E-01,  1.00E-01, -1.15E-01, -7.72E-04],  # 0.079
-[ 1.11E+00, 8.88E-01, -5.39E-02, -2.33E+00, 1.23E-01, -2.88E+00, 2.01E-01, -3.19E-02, -1.07E-01, -5.48E-04],  # 0.063
-[ 1.21E+00, 8.83E-01, -5.44E-02, -2.44E+00, 1.30E-01, -3.04E+00, 2.13E-01, -2.10E-01, -9.00E-02, -4.15E-04],  # 0.050
-[ 1.26E+00, 8.79E-01, -5.52E-02, -2.54E+00, 1.39E-01, -2.99E+00, 2.16E-01, -3.91E-01, -6.75E-02, -3.88E-04],  # 0.040
-[ 1.19E+00, 8.88E-01, -5.64E-02, -2.58E+00, 1.45E-01, -2.84E+00, 2.12E-01, -4.37E-01, -5.87E-02, -4.33E-04],  # 0.031
-[ 1.05E+00, 9.03E-01, -5.77E-02, -2.57E+00, 1.48E-01, -2.65E+00, 2.07E-01, -4.08E-01, -5.77E-02, -5.12E-04],  # 0.025
-[ 5.23E-01, 9.69E-01, -6.20E-02, -2.44E+00, 1.47E-01, -2.34E+00, 1.91E-01, -8.70E-02, -8.29E-02, -6.30E-04],  # 0.010, (PGA)
-[ 5.23E-01, 9.69E-01, -6.20E-02, -2.44E+00, 1.47E-01, -2.34E+00, 1.91E-01, -8.70E-02, -8.29E-02, -6.30E-04]]) # 0.000, (PGA)
 
 # join tables 6 and 8, convert to dim = (#coefficients, #periods)
 Atkinson06_coefficient68 = concatenate((Atkinson06_Table6, Atkinson06_Table8), axis=1)
 Atkinson06_coefficient68 = Atkinson06_coefficient68.transpose()
 
 # join tables 9 and 8, convert to dim = (#coefficients, #periods)
-Atkinson06_coefficient98 = concatenate((Atkinson06_Table9, Atkinson06_Table8), axis=1)
-Atkinson06_coefficient98 = Atkinson06_coefficient98.transpose()	# used for bc_boundary_bedrock
 
 # get tables 6+8 PGA row (ie, end row) for soil calculations
 Atkinson06_coefficient_pga = reshape(Atkinson06_coefficient68[:,-1], (-1,1,1,1))
@@ -2760,44 +2683,80 @@ Atkinson06_sigma_coefficient_period = [0.0, 1.0]
 
 Atkinson06_hard_bedrock_uses_Vs30 = False
 
-ground_motion_init['Atkinson06_hard_bedrock'] = \
-                        [Atkinson06_hard_bedrock_distribution,
-                         Atkinson06_magnitude_type,
-                         Atkinson06_distance_types,
-                         Atkinson06_coefficient68,
-                         Atkinson06_coefficient_period,
-                         Atkinson06_interpolation,
-                         Atkinson06_sigma_coefficient,
-                         Atkinson06_sigma_coefficient_period,
-                         Atkinson06_interpolation,
-                         Atkinson06_hard_bedrock_uses_Vs30]
+def Atkinson06_hard_bedrock_args():
+    return [Atkinson06_hard_bedrock_distribution,
+                             Atkinson06_magnitude_type,
+                             Atkinson06_distance_types,
+                             Atkinson06_coefficient68,
+                             Atkinson06_coefficient_period,
+                             Atkinson06_interpolation,
+                             Atkinson06_sigma_coefficient,
+                             Atkinson06_sigma_coefficient_period,
+                             Atkinson06_interpolation,
+                             Atkinson06_hard_bedrock_uses_Vs30]
+
+ground_motion_init.add_model('Atkinson06_hard_bedrock', Atkinson06_hard_bedrock_args)
 
 Atkinson06_soil_uses_Vs30 = True
 
-ground_motion_init['Atkinson06_soil'] = [Atkinson06_soil_distribution,
-                                        Atkinson06_magnitude_type,
-                                        Atkinson06_distance_types,
-                                        Atkinson06_coefficient68,
-                                        Atkinson06_coefficient_period,
-                                        Atkinson06_interpolation,
-                                        Atkinson06_sigma_coefficient,
-                                        Atkinson06_sigma_coefficient_period,
-                                        Atkinson06_interpolation,
-                                        Atkinson06_soil_uses_Vs30]
+def Atkinson06_soil_args():
+    return [Atkinson06_soil_distribution,
+                                            Atkinson06_magnitude_type,
+                                            Atkinson06_distance_types,
+                                            Atkinson06_coefficient68,
+                                            Atkinson06_coefficient_period,
+                                            Atkinson06_interpolation,
+                                            Atkinson06_sigma_coefficient,
+                                            Atkinson06_sigma_coefficient_period,
+                                            Atkinson06_interpolation,
+                                            Atkinson06_soil_uses_Vs30]
+
+ground_motion_init.add_model('Atkinson06_soil', Atkinson06_soil_args)
 
 Atkinson06_bc_boundary_bedrock_uses_Vs30 = False
 
-ground_motion_init['Atkinson06_bc_boundary_bedrock'] = \
-                        [Atkinson06_bc_boundary_bedrock,
-                         Atkinson06_magnitude_type,
-                         Atkinson06_distance_types,
-                         Atkinson06_coefficient98,
-                         Atkinson06_coefficient_period,
-                         Atkinson06_interpolation,
-                         Atkinson06_sigma_coefficient,
-                         Atkinson06_sigma_coefficient_period,
-                         Atkinson06_interpolation,
-                         Atkinson06_bc_boundary_bedrock_uses_Vs30]
+def Atkinson06_bc_boundary_bedrock_args():
+    Atkinson06_Table9 = array([
+    [-4.85E+00, 1.58E+00, -8.07E-02, -2.53E+00, 2.22E-01, -1.43E+00, 1.36E-01,  6.34E-01, -1.41E-01, -1.61E-04],  # 5.00
+    [-5.26E+00, 1.79E+00, -9.79E-02, -2.44E+00, 2.07E-01, -1.31E+00, 1.21E-01,  7.34E-01, -1.56E-01, -1.96E-04],  # 4.00
+    [-5.59E+00, 1.97E+00, -1.14E-01, -2.33E+00, 1.91E-01, -1.20E+00, 1.10E-01,  8.45E-01, -1.72E-01, -2.45E-04],  # 3.13
+    [-5.80E+00, 2.13E+00, -1.28E-01, -2.26E+00, 1.79E-01, -1.12E+00, 9.54E-02,  8.91E-01, -1.80E-01, -2.60E-04],  # 2.50
+    [-5.85E+00, 2.23E+00, -1.39E-01, -2.20E+00, 1.69E-01, -1.04E+00, 8.00E-02,  8.67E-01, -1.79E-01, -2.86E-04],  # 2.00
+    [-5.75E+00, 2.29E+00, -1.45E-01, -2.13E+00, 1.58E-01, -9.57E-01, 6.76E-02,  8.67E-01, -1.79E-01, -3.43E-04],  # 1.59
+    [-5.49E+00, 2.29E+00, -1.48E-01, -2.08E+00, 1.50E-01, -9.00E-01, 5.79E-02,  8.21E-01, -1.72E-01, -4.07E-04],  # 1.25
+    [-5.06E+00, 2.23E+00, -1.45E-01, -2.03E+00, 1.41E-01, -8.74E-01, 5.41E-02,  7.92E-01, -1.70E-01, -4.89E-04],  # 1.00
+    [-4.45E+00, 2.12E+00, -1.39E-01, -2.01E+00, 1.36E-01, -8.58E-01, 4.98E-02,  7.08E-01, -1.59E-01, -5.75E-04],  # 0.794
+    [-3.75E+00, 1.97E+00, -1.29E-01, -2.00E+00, 1.31E-01, -8.42E-01, 4.82E-02,  6.77E-01, -1.56E-01, -6.76E-04],  # 0.629
+    [-3.01E+00, 1.80E+00, -1.18E-01, -1.98E+00, 1.27E-01, -8.47E-01, 4.70E-02,  6.67E-01, -1.55E-01, -7.68E-04],  # 0.500
+    [-2.28E+00, 1.63E+00, -1.05E-01, -1.97E+00, 1.23E-01, -8.88E-01, 5.03E-02,  6.84E-01, -1.58E-01, -8.59E-04],  # 0.397
+    [-1.56E+00, 1.46E+00, -9.31E-02, -1.98E+00, 1.21E-01, -9.47E-01, 5.58E-02,  6.50E-01, -1.56E-01, -9.55E-04],  # 0.315
+    [-8.76E-01, 1.29E+00, -8.19E-02, -2.01E+00, 1.23E-01, -1.03E+00, 6.34E-02,  5.81E-01, -1.49E-01, -1.05E-03],  # 0.251
+    [-3.06E-01, 1.16E+00, -7.21E-02, -2.04E+00, 1.22E-01, -1.15E+00, 7.38E-02,  5.08E-01, -1.43E-01, -1.14E-03],  # 0.199
+    [ 1.19E-01, 1.06E+00, -6.47E-02, -2.05E+00, 1.19E-01, -1.36E+00, 9.16E-02,  5.16E-01, -1.50E-01, -1.18E-03],  # 0.158
+    [ 5.36E-01, 9.65E-01, -5.84E-02, -2.11E+00, 1.21E-01, -1.67E+00, 1.16E-01,  3.43E-01, -1.32E-01, -1.13E-03],  # 0.125
+    [ 7.82E-01, 9.24E-01, -5.56E-02, -2.17E+00, 1.19E-01, -2.10E+00, 1.48E-01,  2.85E-01, -1.32E-01, -9.90E-04],  # 0.100
+    [ 9.67E-01, 9.03E-01, -5.48E-02, -2.25E+00, 1.22E-01, -2.53E+00, 1.78E-01,  1.00E-01, -1.15E-01, -7.72E-04],  # 0.079
+    [ 1.11E+00, 8.88E-01, -5.39E-02, -2.33E+00, 1.23E-01, -2.88E+00, 2.01E-01, -3.19E-02, -1.07E-01, -5.48E-04],  # 0.063
+    [ 1.21E+00, 8.83E-01, -5.44E-02, -2.44E+00, 1.30E-01, -3.04E+00, 2.13E-01, -2.10E-01, -9.00E-02, -4.15E-04],  # 0.050
+    [ 1.26E+00, 8.79E-01, -5.52E-02, -2.54E+00, 1.39E-01, -2.99E+00, 2.16E-01, -3.91E-01, -6.75E-02, -3.88E-04],  # 0.040
+    [ 1.19E+00, 8.88E-01, -5.64E-02, -2.58E+00, 1.45E-01, -2.84E+00, 2.12E-01, -4.37E-01, -5.87E-02, -4.33E-04],  # 0.031
+    [ 1.05E+00, 9.03E-01, -5.77E-02, -2.57E+00, 1.48E-01, -2.65E+00, 2.07E-01, -4.08E-01, -5.77E-02, -5.12E-04],  # 0.025
+    [ 5.23E-01, 9.69E-01, -6.20E-02, -2.44E+00, 1.47E-01, -2.34E+00, 1.91E-01, -8.70E-02, -8.29E-02, -6.30E-04],  # 0.010, (PGA)
+    [ 5.23E-01, 9.69E-01, -6.20E-02, -2.44E+00, 1.47E-01, -2.34E+00, 1.91E-01, -8.70E-02, -8.29E-02, -6.30E-04]]) # 0.000, (PGA)
+    Atkinson06_coefficient98 = concatenate((Atkinson06_Table9, Atkinson06_Table8), axis=1)
+    Atkinson06_coefficient98 = Atkinson06_coefficient98.transpose()	# used for bc_boundary_bedrock
+    return [Atkinson06_bc_boundary_bedrock,
+                             Atkinson06_magnitude_type,
+                             Atkinson06_distance_types,
+                             Atkinson06_coefficient98,
+                             Atkinson06_coefficient_period,
+                             Atkinson06_interpolation,
+                             Atkinson06_sigma_coefficient,
+                             Atkinson06_sigma_coefficient_period,
+                             Atkinson06_interpolation,
+                             Atkinson06_bc_boundary_bedrock_uses_Vs30]
+
+ground_motion_init.add_model('Atkinson06_bc_boundary_bedrock', Atkinson06_bc_boundary_bedrock_args)
 
 #############################  End of Atkinson06  ##############################
 
@@ -3019,16 +2978,13 @@ Chiou08_combined_coeff = array([
 ])
 
 # dim = (#coefficients, #periods)
-Chiou08_coefficient = Chiou08_combined_coeff[:,1:30].transpose()
 
 # dim = (period,)
 Chiou08_coefficient_period = Chiou08_combined_coeff[:,0]
 
 # dim = (sigmacoefficient, period)
-Chiou08_sigma_coefficient = Chiou08_combined_coeff[:,30:].transpose()
 
 # dim = (period,)
-Chiou08_sigma_coefficient_period = Chiou08_combined_coeff[:,0]
 
 Chiou08_PGA_coefficients = Chiou08_combined_coeff[0,1:30]
 
@@ -3044,16 +3000,22 @@ Chiou08_interpolation = linear_interpolation
 
 Chiou08_uses_Vs30 = True
 
-ground_motion_init['Chiou08'] = [Chiou08_distribution,
-                                Chiou08_magnitude_type,
-                                Chiou08_distance_types,
-                                Chiou08_coefficient,
-                                Chiou08_coefficient_period,
-                                Chiou08_interpolation,
-                                Chiou08_sigma_coefficient,
-                                Chiou08_sigma_coefficient_period,
-                                Chiou08_interpolation,
-                                Chiou08_uses_Vs30]
+def Chiou08_args():
+    Chiou08_coefficient = Chiou08_combined_coeff[:,1:30].transpose()
+    Chiou08_sigma_coefficient = Chiou08_combined_coeff[:,30:].transpose()
+    Chiou08_sigma_coefficient_period = Chiou08_combined_coeff[:,0]
+    return [Chiou08_distribution,
+                                    Chiou08_magnitude_type,
+                                    Chiou08_distance_types,
+                                    Chiou08_coefficient,
+                                    Chiou08_coefficient_period,
+                                    Chiou08_interpolation,
+                                    Chiou08_sigma_coefficient,
+                                    Chiou08_sigma_coefficient_period,
+                                    Chiou08_interpolation,
+                                    Chiou08_uses_Vs30]
+
+ground_motion_init.add_model('Chiou08', Chiou08_args)
 
 ###########################  End of Chiou08 model  #############################
 
@@ -3166,58 +3128,60 @@ Campbell03_distance_types = ['Rupture',]
 ######
 
 # dimension = (#periods, #coefficients)
-Campbell03_Table6 = array([
-# c1      c2      c3       c4      c5       c6        c7     c8     c9      c10    c11     c12     c13
-[ 0.0305, 0.633, -0.0427, -1.591, -0.00428, 0.000483, 0.683, 0.416, 1.140, -0.873, 1.030, -0.0860, 0.414],  # PGA
-[ 0.0305, 0.633, -0.0427, -1.591, -0.00428, 0.000483, 0.683, 0.416, 1.140, -0.873, 1.030, -0.0860, 0.414],  # 0.01
-[ 1.3535, 0.630, -0.0404, -1.787, -0.00388, 0.000497, 1.020, 0.363, 0.851, -0.715, 1.030, -0.0860, 0.414],  # 0.02
-[ 1.1860, 0.622, -0.0362, -1.691, -0.00367, 0.000501, 0.922, 0.376, 0.759, -0.922, 1.030, -0.0860, 0.414],  # 0.03
-[ 0.3736, 0.616, -0.0353, -1.469, -0.00378, 0.000500, 0.630, 0.423, 0.771, -1.239, 1.042, -0.0838, 0.443],  # 0.05
-[-0.0395, 0.615, -0.0353, -1.383, -0.00421, 0.000486, 0.491, 0.463, 0.955, -1.349, 1.052, -0.0838, 0.453],  # 0.075
-[-0.1475, 0.613, -0.0353, -1.369, -0.00454, 0.000460, 0.484, 0.467, 1.096, -1.284, 1.059, -0.0838, 0.460],  # 0.10
-[-0.1901, 0.616, -0.0478, -1.368, -0.00473, 0.000393, 0.461, 0.478, 1.239, -1.079, 1.068, -0.0838, 0.469],  # 0.15
-[-0.4328, 0.617, -0.0586, -1.320, -0.00460, 0.000337, 0.399, 0.493, 1.250, -0.928, 1.077, -0.0838, 0.478],  # 0.20
-[-0.6906, 0.609, -0.0786, -1.280, -0.00414, 0.000263, 0.349, 0.502, 1.241, -0.753, 1.081, -0.0838, 0.482],  # 0.30
-[-0.5907, 0.534, -0.1379, -1.216, -0.00341, 0.000194, 0.318, 0.503, 1.166, -0.606, 1.098, -0.0824, 0.508],  # 0.50
-[-0.5429, 0.480, -0.1806, -1.184, -0.00288, 0.000160, 0.304, 0.504, 1.110, -0.526, 1.105, -0.0806, 0.528],  # 0.75
-[-0.6104, 0.451, -0.2090, -1.158, -0.00255, 0.000141, 0.299, 0.503, 1.067, -0.482, 1.110, -0.0793, 0.543],  # 1.0
-[-0.9666, 0.441, -0.2405, -1.135, -0.00213, 0.000119, 0.304, 0.500, 1.029, -0.438, 1.099, -0.0771, 0.547],  # 1.5
-[-1.4306, 0.459, -0.2552, -1.124, -0.00187, 0.000103, 0.310, 0.499, 1.015, -0.417, 1.093, -0.0758, 0.551],  # 2.0
-[-2.2331, 0.492, -0.2646, -1.121, -0.00154, 0.000084, 0.310, 0.499, 1.014, -0.393, 1.090, -0.0737, 0.562],  # 3.0
-[-2.7975, 0.507, -0.2738, -1.119, -0.00135, 0.000074, 0.294, 0.506, 1.018, -0.386, 1.092, -0.0722, 0.575]]) # 4.0
 
 # convert to dim = (#coefficients, #periods)
-Campbell03_coefficient = Campbell03_Table6[:,0:10].transpose()
 
 # dim = (period,)
-Campbell03_coefficient_period = [0.000, 0.010, 0.020, 0.030, 0.050,
-                                 0.075, 0.100, 0.150, 0.200, 0.300,
-                                 0.500, 0.750, 1.000, 1.500, 2.000,
-                                 3.000, 4.000]
 
 # dim = (period,)
-Campbell03_sigma_coefficient = Campbell03_Table6[:,10:].transpose()
-Campbell03_sigma_coefficient_period = [0.000, 0.010, 0.020, 0.030, 0.050,
-                                       0.075, 0.100, 0.150, 0.200, 0.300,
-                                       0.500, 0.750, 1.000, 1.500, 2.000,
-                                       3.000, 4.000]
 
 Campbell03_interpolation = linear_interpolation
 
 Campbell03_uses_Vs30 = False
 
-ground_motion_init['Campbell03'] = [Campbell03_distribution,
-                                   Campbell03_magnitude_type,
-                                   Campbell03_distance_types,
-                                   Campbell03_coefficient,
-                                   Campbell03_coefficient_period,
-                                   Campbell03_interpolation,
-                                   Campbell03_sigma_coefficient,
-                                   Campbell03_sigma_coefficient_period,
-                                   Campbell03_interpolation,
-                                   Campbell03_uses_Vs30]
+def Campbell03_args():
+    Campbell03_Table6 = array([
+    # c1      c2      c3       c4      c5       c6        c7     c8     c9      c10    c11     c12     c13
+    [ 0.0305, 0.633, -0.0427, -1.591, -0.00428, 0.000483, 0.683, 0.416, 1.140, -0.873, 1.030, -0.0860, 0.414],  # PGA
+    [ 0.0305, 0.633, -0.0427, -1.591, -0.00428, 0.000483, 0.683, 0.416, 1.140, -0.873, 1.030, -0.0860, 0.414],  # 0.01
+    [ 1.3535, 0.630, -0.0404, -1.787, -0.00388, 0.000497, 1.020, 0.363, 0.851, -0.715, 1.030, -0.0860, 0.414],  # 0.02
+    [ 1.1860, 0.622, -0.0362, -1.691, -0.00367, 0.000501, 0.922, 0.376, 0.759, -0.922, 1.030, -0.0860, 0.414],  # 0.03
+    [ 0.3736, 0.616, -0.0353, -1.469, -0.00378, 0.000500, 0.630, 0.423, 0.771, -1.239, 1.042, -0.0838, 0.443],  # 0.05
+    [-0.0395, 0.615, -0.0353, -1.383, -0.00421, 0.000486, 0.491, 0.463, 0.955, -1.349, 1.052, -0.0838, 0.453],  # 0.075
+    [-0.1475, 0.613, -0.0353, -1.369, -0.00454, 0.000460, 0.484, 0.467, 1.096, -1.284, 1.059, -0.0838, 0.460],  # 0.10
+    [-0.1901, 0.616, -0.0478, -1.368, -0.00473, 0.000393, 0.461, 0.478, 1.239, -1.079, 1.068, -0.0838, 0.469],  # 0.15
+    [-0.4328, 0.617, -0.0586, -1.320, -0.00460, 0.000337, 0.399, 0.493, 1.250, -0.928, 1.077, -0.0838, 0.478],  # 0.20
+    [-0.6906, 0.609, -0.0786, -1.280, -0.00414, 0.000263, 0.349, 0.502, 1.241, -0.753, 1.081, -0.0838, 0.482],  # 0.30
+    [-0.5907, 0.534, -0.1379, -1.216, -0.00341, 0.000194, 0.318, 0.503, 1.166, -0.606, 1.098, -0.0824, 0.508],  # 0.50
+    [-0.5429, 0.480, -0.1806, -1.184, -0.00288, 0.000160, 0.304, 0.504, 1.110, -0.526, 1.105, -0.0806, 0.528],  # 0.75
+    [-0.6104, 0.451, -0.2090, -1.158, -0.00255, 0.000141, 0.299, 0.503, 1.067, -0.482, 1.110, -0.0793, 0.543],  # 1.0
+    [-0.9666, 0.441, -0.2405, -1.135, -0.00213, 0.000119, 0.304, 0.500, 1.029, -0.438, 1.099, -0.0771, 0.547],  # 1.5
+    [-1.4306, 0.459, -0.2552, -1.124, -0.00187, 0.000103, 0.310, 0.499, 1.015, -0.417, 1.093, -0.0758, 0.551],  # 2.0
+    [-2.2331, 0.492, -0.2646, -1.121, -0.00154, 0.000084, 0.310, 0.499, 1.014, -0.393, 1.090, -0.0737, 0.562],  # 3.0
+    [-2.7975, 0.507, -0.2738, -1.119, -0.00135, 0.000074, 0.294, 0.506, 1.018, -0.386, 1.092, -0.0722, 0.575]]) # 4.0
+    Campbell03_coefficient = Campbell03_Table6[:,0:10].transpose()
+    Campbell03_coefficient_period = [0.000, 0.010, 0.020, 0.030, 0.050,
+                                     0.075, 0.100, 0.150, 0.200, 0.300,
+                                     0.500, 0.750, 1.000, 1.500, 2.000,
+                                     3.000, 4.000]
+    Campbell03_sigma_coefficient = Campbell03_Table6[:,10:].transpose()
+    Campbell03_sigma_coefficient_period = [0.000, 0.010, 0.020, 0.030, 0.050,
+                                           0.075, 0.100, 0.150, 0.200, 0.300,
+                                           0.500, 0.750, 1.000, 1.500, 2.000,
+                                           3.000, 4.000]
+    return [Campbell03_distribution,
+                                       Campbell03_magnitude_type,
+                                       Campbell03_distance_types,
+                                       Campbell03_coefficient,
+                                       Campbell03_coefficient_period,
+                                       Campbell03_interpolation,
+                                       Campbell03_sigma_coefficient,
+                                       Campbell03_sigma_coefficient_period,
+                                       Campbell03_interpolation,
+                                       Campbell03_uses_Vs30]
+
+ground_motion_init.add_model('Campbell03', Campbell03_args)
 
-del Campbell03_Table6
 
 #########################  End of Campbell03 model  ############################
 
@@ -3549,7 +3513,7 @@ del tmp, tmp2
 
 
 # coefficient table from CB08_COEFS.TXT, T=0.0 moved to top, etc
-tmp = array([
+Campbell08_table = array([
 #T(s)  c0     c1     c2     c3     c4    c5   c6   c7     c8    c9     c10   c11   c12    k1   k2    k3    c    n    s_lny t_lny s_lnAF c_lny rho
 [ 0.0, -1.715,0.500,-0.530,-0.262,-2.118,0.17,5.60,0.280,-0.120,0.490, 1.058,0.040,0.610, 865,-1.186,1.839,1.88,1.18,0.478,0.219,0.300, 0.166,1.000],
 [0.010,-1.715,0.500,-0.530,-0.262,-2.118,0.17,5.60,0.280,-0.120,0.490, 1.058,0.040,0.610, 865,-1.186,1.839,1.88,1.18,0.478,0.219,0.300, 0.166,1.000],
@@ -3576,18 +3540,14 @@ tmp = array([
 
 # construct required coefficient tables for EQRM
 # shape = (#coefficients, #periods)
-Campbell08_coefficient = array(tmp[:,1:19]).transpose()
-Campbell08_sigma_coefficient = array(tmp[:,19:]).transpose()
 
 
 # coefficient period arrays
 # dim = (period,) 
-Campbell08_coefficient_period = array(tmp[:,0]).transpose()
-Campbell08_sigma_coefficient_period = array(tmp[:,0]).transpose()
 
 # PGA coefficient & sigma coefficient tables
-Campbell08_PGA_coefficient = array(tmp[0,1:19]).transpose()
-Campbell08_PGA_sigma_coefficient = array(tmp[0,19:]).transpose()
+Campbell08_PGA_coefficient = array(Campbell08_table[0,1:19]).transpose()
+Campbell08_PGA_sigma_coefficient = array(Campbell08_table[0,19:]).transpose()
 
 # now for the rest of the model attributes
 Campbell08_magnitude_type = 'Mw'
@@ -3595,18 +3555,24 @@ Campbell08_distance_types = ['Rupture','Joyner_Boore']
 Campbell08_interpolation = linear_interpolation
 Campbell08_uses_Vs30 = True
 
-ground_motion_init['Campbell08'] = [Campbell08_distribution,
-                                   Campbell08_magnitude_type,
-                                   Campbell08_distance_types,
-                                   Campbell08_coefficient,
-                                   Campbell08_coefficient_period,
-                                   Campbell08_interpolation,
-                                   Campbell08_sigma_coefficient,
-                                   Campbell08_sigma_coefficient_period,
-                                   Campbell08_interpolation,
-                                   Campbell08_uses_Vs30]
+def Campbell08_args():
+    Campbell08_coefficient = array(Campbell08_table[:,1:19]).transpose()
+    Campbell08_sigma_coefficient = array(Campbell08_table[:,19:]).transpose()
+    Campbell08_coefficient_period = array(Campbell08_table[:,0]).transpose()
+    Campbell08_sigma_coefficient_period = array(Campbell08_table[:,0]).transpose()
+    return [Campbell08_distribution,
+                                       Campbell08_magnitude_type,
+                                       Campbell08_distance_types,
+                                       Campbell08_coefficient,
+                                       Campbell08_coefficient_period,
+                                       Campbell08_interpolation,
+                                       Campbell08_sigma_coefficient,
+                                       Campbell08_sigma_coefficient_period,
+                                       Campbell08_interpolation,
+                                       Campbell08_uses_Vs30]
+
+ground_motion_init.add_model('Campbell08', Campbell08_args)
 
-del tmp
 #########################  End of Campbell08 model  ##########################
 
 
@@ -3635,22 +3601,24 @@ def mean_10_sigma_1_distribution(**kwargs):
     return log_mean, log_sigma
 
 
-mean_10_sigma_1_args=[
-    mean_10_sigma_1_distribution,
-    mean_model_magnitude_type,
-    mean_model_distance_types,
-    
-    mean_model_coefficient,
-    mean_model_coefficient_period,
-    mean_model_coefficient_interpolation,
-    
-    mean_model_sigma_coefficient,
-    mean_model_sigma_coefficient_period,
-    mean_model_sigma_coefficient_interpolation,
 
-    mean_model_uses_Vs30]
+def mean_10_sigma_1_args():
+    return [
+        mean_10_sigma_1_distribution,
+        mean_model_magnitude_type,
+        mean_model_distance_types,
+
+        mean_model_coefficient,
+        mean_model_coefficient_period,
+        mean_model_coefficient_interpolation,
 
-ground_motion_init['mean_10_sigma_1'] = mean_10_sigma_1_args
+        mean_model_sigma_coefficient,
+        mean_model_sigma_coefficient_period,
+        mean_model_sigma_coefficient_interpolation,
+
+        mean_model_uses_Vs30]
+
+ground_motion_init.add_model('mean_10_sigma_1', mean_10_sigma_1_args)
 
 #***************  End of mean_10_sigma_1 ****************************
 
@@ -3666,22 +3634,24 @@ def mean_20_sigma_2_distribution(**kwargs):
     log_sigma = ones((num_sites, num_events, num_periods))*2
     return log_mean, log_sigma
 
-mean_20_sigma_2_args=[
-    mean_20_sigma_2_distribution,
-    mean_model_magnitude_type,
-    mean_model_distance_types,
-    
-    mean_model_coefficient,
-    mean_model_coefficient_period,
-    mean_model_coefficient_interpolation,
-    
-    mean_model_sigma_coefficient,
-    mean_model_sigma_coefficient_period,
-    mean_model_sigma_coefficient_interpolation,
 
-    mean_model_uses_Vs30]
+def mean_20_sigma_2_args():
+    return [
+        mean_20_sigma_2_distribution,
+        mean_model_magnitude_type,
+        mean_model_distance_types,
+
+        mean_model_coefficient,
+        mean_model_coefficient_period,
+        mean_model_coefficient_interpolation,
+
+        mean_model_sigma_coefficient,
+        mean_model_sigma_coefficient_period,
+        mean_model_sigma_coefficient_interpolation,
 
-ground_motion_init['mean_20_sigma_2'] = mean_20_sigma_2_args
+        mean_model_uses_Vs30]
+
+ground_motion_init.add_model('mean_20_sigma_2', mean_20_sigma_2_args)
 
 #***************  End of mean_20_sigma_2 ****************************
 
@@ -3699,22 +3669,24 @@ def mean_1_sigma_0pt5_distribution(**kwargs):
     return log_mean, log_sigma
 
 
-mean_1_sigma_0pt5_args=[
-    mean_1_sigma_0pt5_distribution,
-    mean_model_magnitude_type,
-    mean_model_distance_types,
-    
-    mean_model_coefficient,
-    mean_model_coefficient_period,
-    mean_model_coefficient_interpolation,
-    
-    mean_model_sigma_coefficient,
-    mean_model_sigma_coefficient_period,
-    mean_model_sigma_coefficient_interpolation,
 
-    mean_model_uses_Vs30]
+def mean_1_sigma_0pt5_args():
+    return [
+        mean_1_sigma_0pt5_distribution,
+        mean_model_magnitude_type,
+        mean_model_distance_types,
+
+        mean_model_coefficient,
+        mean_model_coefficient_period,
+        mean_model_coefficient_interpolation,
+
+        mean_model_sigma_coefficient,
+        mean_model_sigma_coefficient_period,
+        mean_model_sigma_coefficient_interpolation,
 
-ground_motion_init['mean_1_sigma_0pt5'] = mean_1_sigma_0pt5_args
+        mean_model_uses_Vs30]
+
+ground_motion_init.add_model('mean_1_sigma_0pt5', mean_1_sigma_0pt5_args)
 
 #***************  End of mean_1_sigma_0pt5 ****************************
 #***************  START OF return_Vs30  ****************************
@@ -3734,22 +3706,24 @@ def return_Vs30_distribution(**kwargs):
 return_Vs30_uses_Vs30 = True
 
 
-return_Vs30_args=[
-    return_Vs30_distribution,
-    mean_model_magnitude_type,
-    mean_model_distance_types,
-    
-    mean_model_coefficient,
-    mean_model_coefficient_period,
-    mean_model_coefficient_interpolation,
-    
-    mean_model_sigma_coefficient,
-    mean_model_sigma_coefficient_period,
-    mean_model_sigma_coefficient_interpolation,
 
-    return_Vs30_uses_Vs30]
+def return_Vs30_args():
+    return [
+        return_Vs30_distribution,
+        mean_model_magnitude_type,
+        mean_model_distance_types,
 
-ground_motion_init['return_Vs30'] = return_Vs30_args
+        mean_model_coefficient,
+        mean_model_coefficient_period,
+        mean_model_coefficient_interpolation,
+
+        mean_model_sigma_coefficient,
+        mean_model_sigma_coefficient_period,
+        mean_model_sigma_coefficient_interpolation,
+
+        return_Vs30_uses_Vs30]
+
+ground_motion_init.add_model('return_Vs30', return_Vs30_args)
 
 #***************  End of return_Vs30 ****************************
 #***************  START OF mean_2_sigma_1  ****************************
@@ -3764,22 +3738,24 @@ def mean_2_sigma_1_distribution(**kwargs):
     log_sigma = ones((num_sites, num_events, num_periods))
     return log_mean, log_sigma
 
-mean_2_sigma_1_args=[
-    mean_2_sigma_1_distribution,
-    mean_model_magnitude_type,
-    mean_model_distance_types,
-    
-    mean_model_coefficient,
-    mean_model_coefficient_period,
-    mean_model_coefficient_interpolation,
-    
-    mean_model_sigma_coefficient,
-    mean_model_sigma_coefficient_period,
-    mean_model_sigma_coefficient_interpolation,
 
-    mean_model_uses_Vs30]
+def mean_2_sigma_1_args():
+    return [
+        mean_2_sigma_1_distribution,
+        mean_model_magnitude_type,
+        mean_model_distance_types,
 
-ground_motion_init['mean_2_sigma_1'] = mean_2_sigma_1_args
+        mean_model_coefficient,
+        mean_model_coefficient_period,
+        mean_model_coefficient_interpolation,
+
+        mean_model_sigma_coefficient,
+        mean_model_sigma_coefficient_period,
+        mean_model_sigma_coefficient_interpolation,
+
+        mean_model_uses_Vs30]
+
+ground_motion_init.add_model('mean_2_sigma_1', mean_2_sigma_1_args)
 
 #***************  End of Gaull 1990 WA MODEL  ****************************
 
@@ -4524,21 +4500,23 @@ Abrahamson08_interpolation = linear_interpolation
 Abrahamson08_uses_Vs30 = True
 
 
-Abrahamson08_args = [Abrahamson08_distribution,
-                     Abrahamson08_magnitude_type,
-                     Abrahamson08_distance_types,
 
-                     Abrahamson08_coefficient,
-                     Abrahamson08_coefficient_period,
-                     Abrahamson08_interpolation,
+def Abrahamson08_args():
+    return [Abrahamson08_distribution,
+                         Abrahamson08_magnitude_type,
+                         Abrahamson08_distance_types,
 
-                     Abrahamson08_sigma_coefficient,
-                     Abrahamson08_sigma_coefficient_period,
-                     Abrahamson08_interpolation,
+                         Abrahamson08_coefficient,
+                         Abrahamson08_coefficient_period,
+                         Abrahamson08_interpolation,
 
-                     Abrahamson08_uses_Vs30]
+                         Abrahamson08_sigma_coefficient,
+                         Abrahamson08_sigma_coefficient_period,
+                         Abrahamson08_interpolation,
 
-ground_motion_init['Abrahamson08'] = Abrahamson08_args
+                         Abrahamson08_uses_Vs30]
+
+ground_motion_init.add_model('Abrahamson08', Abrahamson08_args)
 
 del AS08_coeff
 
@@ -4616,29 +4594,32 @@ coefficient = array ( [(1.04159,2.11528,2.11994,1.64489,0.92065,0.13978,-0.84006
     (0.261,0.272,0.2728,0.2788,0.2821,0.2871,0.2902,0.2983,0.2998,0.3037,0.3078,0.307,0.3007,0.3004,0.2978,0.2973,0.2927,0.2917,0.2915,0.2912,0.2895,0.2888,0.2896,0.2871,0.2878,0.2863,0.2869,0.2885,0.2875,0.2857,0.2839,0.2845,0.2844,0.2841,0.284,0.284,0.2834,0.2828,0.2826,0.2832,0.2835,0.2836,0.2832,0.283,0.283,0.283,0.2829,0.2815,0.2826,0.2825,0.2818,0.2818,0.2838,0.2845,0.2854,0.2862,0.2867,0.2869,0.2874,0.2872,0.2876),
     (0.0994,0.1142,0.1167,0.1192,0.1081,0.099,0.0976,0.1054,0.1101,0.1123,0.1163,0.1274,0.143,0.1546,0.1626,0.1602,0.1584,0.1543,0.1521,0.1484,0.1483,0.1465,0.1427,0.1435,0.1439,0.1453,0.1427,0.1428,0.1458,0.1477,0.1468,0.145,0.1457,0.1503,0.1537,0.1558,0.1582,0.1592,0.1611,0.1642,0.1657,0.1665,0.1663,0.1661,0.1627,0.1627,0.1633,0.1632,0.1645,0.1665,0.1681,0.1688,0.1741,0.1759,0.1772,0.1783,0.1794,0.1788,0.1784,0.1783,0.1785)])
 
-Akkar_2010_crustal_coefficient = coefficient[0:10,:]
-Akkar_2010_crustal_coefficient_period = [0,0.05,0.1,0.15,0.2,0.25,0.3,0.35,0.4,0.45,0.5,0.55,0.6,0.65,0.7,0.75,0.8,0.85,0.9,0.95,1,1.05,1.1,1.15,1.2,1.25,1.3,1.35,1.4,1.45,1.5,1.55,1.6,1.65,1.7,1.75,1.8,1.85,1.9,1.95,2,2.05,2.1,2.15,2.2,2.25,2.3,2.35,2.4,2.45,2.5,2.55,2.6,2.65,2.7,2.75,2.8,2.85,2.9,2.95,3]
 
-Akkar_2010_crustal_sigma_coefficient = coefficient[10:,:]
-Akkar_2010_crustal_sigma_coefficient_period = [0,0.05,0.1,0.15,0.2,0.25,0.3,0.35,0.4,0.45,0.5,0.55,0.6,0.65,0.7,0.75,0.8,0.85,0.9,0.95,1,1.05,1.1,1.15,1.2,1.25,1.3,1.35,1.4,1.45,1.5,1.55,1.6,1.65,1.7,1.75,1.8,1.85,1.9,1.95,2,2.05,2.1,2.15,2.2,2.25,2.3,2.35,2.4,2.45,2.5,2.55,2.6,2.65,2.7,2.75,2.8,2.85,2.9,2.95,3]
     
 Akkar_2010_crustal_interpolation = linear_interpolation
 
 Akkar_2010_crustal_uses_Vs30 = True
 
-ground_motion_init['Akkar_2010_crustal'] = [Akkar_2010_crustal_distribution,
-                                Akkar_2010_crustal_magnitude_type,
-                                Akkar_2010_crustal_distance_types,
-                                
-                                Akkar_2010_crustal_coefficient,
-                                Akkar_2010_crustal_coefficient_period,
-                                Akkar_2010_crustal_interpolation,
-                                
-                                Akkar_2010_crustal_sigma_coefficient,
-                                Akkar_2010_crustal_sigma_coefficient_period,
-                                Akkar_2010_crustal_interpolation,
-                                
-                                Akkar_2010_crustal_uses_Vs30]
+def Akkar_2010_crustal_args():
+    Akkar_2010_crustal_coefficient = coefficient[0:10,:]
+    Akkar_2010_crustal_coefficient_period = [0,0.05,0.1,0.15,0.2,0.25,0.3,0.35,0.4,0.45,0.5,0.55,0.6,0.65,0.7,0.75,0.8,0.85,0.9,0.95,1,1.05,1.1,1.15,1.2,1.25,1.3,1.35,1.4,1.45,1.5,1.55,1.6,1.65,1.7,1.75,1.8,1.85,1.9,1.95,2,2.05,2.1,2.15,2.2,2.25,2.3,2.35,2.4,2.45,2.5,2.55,2.6,2.65,2.7,2.75,2.8,2.85,2.9,2.95,3]
+    Akkar_2010_crustal_sigma_coefficient = coefficient[10:,:]
+    Akkar_2010_crustal_sigma_coefficient_period = [0,0.05,0.1,0.15,0.2,0.25,0.3,0.35,0.4,0.45,0.5,0.55,0.6,0.65,0.7,0.75,0.8,0.85,0.9,0.95,1,1.05,1.1,1.15,1.2,1.25,1.3,1.35,1.4,1.45,1.5,1.55,1.6,1.65,1.7,1.75,1.8,1.85,1.9,1.95,2,2.05,2.1,2.15,2.2,2.25,2.3,2.35,2.4,2.45,2.5,2.55,2.6,2.65,2.7,2.75,2.8,2.85,2.9,2.95,3]
+    return [Akkar_2010_crustal_distribution,
+                                    Akkar_2010_crustal_magnitude_type,
+                                    Akkar_2010_crustal_distance_types,
+
+                                    Akkar_2010_crustal_coefficient,
+                                    Akkar_2010_crustal_coefficient_period,
+                                    Akkar_2010_crustal_interpolation,
+
+                                    Akkar_2010_crustal_sigma_coefficient,
+                                    Akkar_2010_crustal_sigma_coefficient_period,
+                                    Akkar_2010_crustal_interpolation,
+
+                                    Akkar_2010_crustal_uses_Vs30]
+
+ground_motion_init.add_model('Akkar_2010_crustal', Akkar_2010_crustal_args)
 
 #---------------------------end of Akkar and Bommer 2010-----------------------
 
@@ -4889,7 +4870,7 @@ Atkinson_2003_intraslab_distance_types = ['Rupture',]
 ##    
     # Interslab Events Coefficients
 
-coef_it = array ([(0,0.0400000000000000,0.100000000000000,0.200000000000000,0.400000000000000,1,2,3.03030303030303),
+Atkinson_2003_intraslab_table = array ([(0,0.0400000000000000,0.100000000000000,0.200000000000000,0.400000000000000,1,2,3.03030303030303),
 (-0.0471300000000000,0.506970000000000,0.439280000000000,0.515890000000000,0.00544500000000000,-1.02133000000000,-2.39234000000000,-3.70012000000000),
 (0.100000000000000,0.680000000000000,0.610000000000000,0.700000000000000,0.0700000000000000,-0.980000000000000,-2.44000000000000,-3.73000000000000),
 (-0.250000000000000,0.230000000000000,0.160000000000000,0.400000000000000,-0.0100000000000000,-0.980000000000000,-2.25000000000000,-3.64000000000000),
@@ -4903,30 +4884,33 @@ coef_it = array ([(0,0.0400000000000000,0.100000000000000,0.200000000000000,0.40
 (0.230000000000000,0.240000000000000,0.270000000000000,0.260000000000000,0.260000000000000,0.270000000000000,0.280000000000000,0.290000000000000),
 (0.140000000000000,0.0700000000000000,0.0700000000000000,0.100000000000000,0.100000000000000,0.110000000000000,0.110000000000000,0.0800000000000000)])
 
-Atkinson_2003_intraslab_coefficient = coef_it[1:10,:]
-Atkinson_2003_intraslab_coefficient_period = coef_it[0]
-Atkinson_2003_intraslab_sigma_coefficient = coef_it[11:13,:]
-Atkinson_2003_intraslab_sigma_coefficient_period = coef_it[0]
 
-Atkinson_2003_intraslab_PGA_coefficient = coef_it[1:10,0]
+Atkinson_2003_intraslab_PGA_coefficient = Atkinson_2003_intraslab_table[1:10,0]
 
 Atkinson_2003_intraslab_interpolation = linear_interpolation
 
 Atkinson_2003_intraslab_uses_Vs30 = True
 
-ground_motion_init['Atkinson_2003_intraslab'] = [Atkinson_2003_intraslab_distribution,
-                              Atkinson_2003_intraslab_magnitude_type,
-                              Atkinson_2003_intraslab_distance_types,
+def Atkinson_2003_intraslab_args():
+    Atkinson_2003_intraslab_coefficient = Atkinson_2003_intraslab_table[1:10,:]
+    Atkinson_2003_intraslab_coefficient_period = Atkinson_2003_intraslab_table[0]
+    Atkinson_2003_intraslab_sigma_coefficient = Atkinson_2003_intraslab_table[11:13,:]
+    Atkinson_2003_intraslab_sigma_coefficient_period = Atkinson_2003_intraslab_table[0]
+    return [Atkinson_2003_intraslab_distribution,
+                                  Atkinson_2003_intraslab_magnitude_type,
+                                  Atkinson_2003_intraslab_distance_types,
+
+                                  Atkinson_2003_intraslab_coefficient,
+                                  Atkinson_2003_intraslab_coefficient_period,
+                                  Atkinson_2003_intraslab_interpolation,
+
+                                  Atkinson_2003_intraslab_sigma_coefficient,
+                                  Atkinson_2003_intraslab_sigma_coefficient_period,
+                                  Atkinson_2003_intraslab_interpolation,
+
+                                  Atkinson_2003_intraslab_uses_Vs30]
 
-                              Atkinson_2003_intraslab_coefficient,
-                              Atkinson_2003_intraslab_coefficient_period,
-                              Atkinson_2003_intraslab_interpolation,
-                          
-                              Atkinson_2003_intraslab_sigma_coefficient,
-                              Atkinson_2003_intraslab_sigma_coefficient_period,
-                              Atkinson_2003_intraslab_interpolation,
-                          
-                              Atkinson_2003_intraslab_uses_Vs30]
+ground_motion_init.add_model('Atkinson_2003_intraslab', Atkinson_2003_intraslab_args)
 
     
 
@@ -5141,45 +5125,48 @@ Zhao_2006_interface_distance_types = ['Rupture',]
 ##    
     # Interface Events Coefficients
 
-coef =array([(1.10100000000000,1.07600000000000,1.11800000000000,1.13400000000000,1.14700000000000,1.14900000000000,1.16300000000000,1.20000000000000,1.25000000000000,1.29300000000000,1.33600000000000,1.38600000000000,1.43300000000000,1.47900000000000,1.55100000000000,1.62100000000000,1.69400000000000,1.74800000000000,1.75900000000000,1.82600000000000,1.82500000000000),
-(-0.00564000000000000,-0.00671000000000000,-0.00787000000000000,-0.00722000000000000,-0.00659000000000000,-0.00590000000000000,-0.00520000000000000,-0.00422000000000000,-0.00338000000000000,-0.00282000000000000,-0.00258000000000000,-0.00242000000000000,-0.00232000000000000,-0.00220000000000000,-0.00207000000000000,-0.00224000000000000,-0.00201000000000000,-0.00187000000000000,-0.00147000000000000,-0.00195000000000000,-0.00237000000000000),
-(0.00550000000000000,0.00750000000000000,0.00900000000000000,0.0100000000000000,0.0120000000000000,0.0140000000000000,0.0150000000000000,0.0100000000000000,0.00600000000000000,0.00300000000000000,0.00250000000000000,0.00220000000000000,0.00200000000000000,0.00200000000000000,0.00200000000000000,0.00200000000000000,0.00250000000000000,0.00280000000000000,0.00320000000000000,0.00400000000000000,0.00500000000000000),
-(1.08000000000000,1.06000000000000,1.08300000000000,1.05300000000000,1.01400000000000,0.966000000000000,0.934000000000000,0.959000000000000,1.00800000000000,1.08800000000000,1.08400000000000,1.08800000000000,1.10900000000000,1.11500000000000,1.08300000000000,1.09100000000000,1.05500000000000,1.05200000000000,1.02500000000000,1.04400000000000,1.06500000000000),
-(0.0141200000000000,0.0146300000000000,0.0142300000000000,0.0150900000000000,0.0146200000000000,0.0145900000000000,0.0145800000000000,0.0125700000000000,0.0111400000000000,0.0101900000000000,0.00979000000000000,0.00944000000000000,0.00972000000000000,0.0100500000000000,0.0100300000000000,0.00928000000000000,0.00833000000000000,0.00776000000000000,0.00644000000000000,0.00590000000000000,0.00510000000000000),
-(0,0,0,0,0,0,0,-0.0410000000000000,-0.0530000000000000,-0.103000000000000,-0.146000000000000,-0.164000000000000,-0.206000000000000,-0.239000000000000,-0.256000000000000,-0.306000000000000,-0.321000000000000,-0.337000000000000,-0.331000000000000,-0.390000000000000,-0.498000000000000),
-(0.293000000000000,0.939000000000000,1.49900000000000,1.46200000000000,1.28000000000000,1.12100000000000,0.852000000000000,0.365000000000000,-0.207000000000000,-0.705000000000000,-1.14400000000000,-1.60900000000000,-2.02300000000000,-2.45100000000000,-3.24300000000000,-3.88800000000000,-4.78300000000000,-5.44400000000000,-5.83900000000000,-6.59800000000000,-6.75200000000000),
-(1.11100000000000,1.68400000000000,2.06100000000000,1.91600000000000,1.66900000000000,1.46800000000000,1.17200000000000,0.655000000000000,0.0710000000000000,-0.429000000000000,-0.866000000000000,-1.32500000000000,-1.73200000000000,-2.15200000000000,-2.92300000000000,-3.54800000000000,-4.41000000000000,-5.04900000000000,-5.43100000000000,-6.18100000000000,-6.34700000000000),
-(1.34400000000000,1.79300000000000,2.13500000000000,2.16800000000000,2.08500000000000,1.94200000000000,1.68300000000000,1.12700000000000,0.515000000000000,-0.00300000000000000,-0.449000000000000,-0.928000000000000,-1.34900000000000,-1.77600000000000,-2.54200000000000,-3.16900000000000,-4.03900000000000,-4.69800000000000,-5.08900000000000,-5.88200000000000,-6.05100000000000),
-(1.35500000000000,1.74700000000000,2.03100000000000,2.05200000000000,2.00100000000000,1.94100000000000,1.80800000000000,1.48200000000000,0.934000000000000,0.394000000000000,-0.111000000000000,-0.620000000000000,-1.06600000000000,-1.52300000000000,-2.32700000000000,-2.97900000000000,-3.87100000000000,-4.49600000000000,-4.89300000000000,-5.69800000000000,-5.87300000000000),
-(1.42000000000000,1.81400000000000,2.08200000000000,2.11300000000000,2.03000000000000,1.93700000000000,1.77000000000000,1.39700000000000,0.955000000000000,0.559000000000000,0.188000000000000,-0.246000000000000,-0.643000000000000,-1.08400000000000,-1.93600000000000,-2.66100000000000,-3.64000000000000,-4.34100000000000,-4.75800000000000,-5.58800000000000,-5.79800000000000),
-(0,0,0,-0.0138000000000000,-0.0256000000000000,-0.0348000000000000,-0.0423000000000000,-0.0541000000000000,-0.0632000000000000,-0.0707000000000000,-0.0771000000000000,-0.0825000000000000,-0.0874000000000000,-0.0917000000000000,-0.100900000000000,-0.108300000000000,-0.120200000000000,-0.129300000000000,-0.136800000000000,-0.148600000000000,-0.157800000000000),
-(0,0,0,0.0286000000000000,0.0352000000000000,0.0403000000000000,0.0445000000000000,0.0511000000000000,0.0562000000000000,0.0604000000000000,0.0639000000000000,0.0670000000000000,0.0697000000000000,0.0721000000000000,0.0772000000000000,0.0814000000000000,0.0880000000000000,0.0931000000000000,0.0972000000000000,0.103800000000000,0.109000000000000),
-(0.604000000000000,0.640000000000000,0.694000000000000,0.702000000000000,0.692000000000000,0.682000000000000,0.670000000000000,0.659000000000000,0.653000000000000,0.653000000000000,0.652000000000000,0.647000000000000,0.653000000000000,0.657000000000000,0.660000000000000,0.664000000000000,0.669000000000000,0.671000000000000,0.667000000000000,0.647000000000000,0.643000000000000),
-(0.308000000000000,0.343000000000000,0.403000000000000,0.367000000000000,0.328000000000000,0.289000000000000,0.280000000000000,0.271000000000000,0.277000000000000,0.296000000000000,0.313000000000000,0.329000000000000,0.324000000000000,0.328000000000000,0.339000000000000,0.352000000000000,0.360000000000000,0.356000000000000,0.338000000000000,0.307000000000000,0.272000000000000)])
-
-
-Zhao_2006_interface_coefficient = coef[0:13,:]
-Zhao_2006_interface_coefficient_period = array([0,0.05,0.1,0.15,0.2,0.25,0.3,0.4,0.5,0.6,0.7,0.8,0.9,1,1.25,1.5,2,2.5,3,4,5])
-Zhao_2006_interface_sigma_coefficient = coef[13:17,:]
-Zhao_2006_interface_sigma_coefficient_period = array([0,0.05,0.1,0.15,0.2,0.25,0.3,0.4,0.5,0.6,0.7,0.8,0.9,1,1.25,1.5,2,2.5,3,4,5])
+
+
 
 Zhao_2006_interface_interpolation = linear_interpolation
 
 Zhao_2006_interface_uses_Vs30 = True
 
-ground_motion_init['Zhao_2006_interface'] = [Zhao_2006_interface_distribution,
-                              Zhao_2006_interface_magnitude_type,
-                              Zhao_2006_interface_distance_types,
-
-                              Zhao_2006_interface_coefficient,
-                              Zhao_2006_interface_coefficient_period,
-                              Zhao_2006_interface_interpolation,
-                          
-                              Zhao_2006_interface_sigma_coefficient,
-                              Zhao_2006_interface_sigma_coefficient_period,
-                              Zhao_2006_interface_interpolation,
-                          
-                              Zhao_2006_interface_uses_Vs30]
+def Zhao_2006_interface_args():
+    Zhao_2006_interface_table =array([(1.10100000000000,1.07600000000000,1.11800000000000,1.13400000000000,1.14700000000000,1.14900000000000,1.16300000000000,1.20000000000000,1.25000000000000,1.29300000000000,1.33600000000000,1.38600000000000,1.43300000000000,1.47900000000000,1.55100000000000,1.62100000000000,1.69400000000000,1.74800000000000,1.75900000000000,1.82600000000000,1.82500000000000),
+    (-0.00564000000000000,-0.00671000000000000,-0.00787000000000000,-0.00722000000000000,-0.00659000000000000,-0.00590000000000000,-0.00520000000000000,-0.00422000000000000,-0.00338000000000000,-0.00282000000000000,-0.00258000000000000,-0.00242000000000000,-0.00232000000000000,-0.00220000000000000,-0.00207000000000000,-0.00224000000000000,-0.00201000000000000,-0.00187000000000000,-0.00147000000000000,-0.00195000000000000,-0.00237000000000000),
+    (0.00550000000000000,0.00750000000000000,0.00900000000000000,0.0100000000000000,0.0120000000000000,0.0140000000000000,0.0150000000000000,0.0100000000000000,0.00600000000000000,0.00300000000000000,0.00250000000000000,0.00220000000000000,0.00200000000000000,0.00200000000000000,0.00200000000000000,0.00200000000000000,0.00250000000000000,0.00280000000000000,0.00320000000000000,0.00400000000000000,0.00500000000000000),
+    (1.08000000000000,1.06000000000000,1.08300000000000,1.05300000000000,1.01400000000000,0.966000000000000,0.934000000000000,0.959000000000000,1.00800000000000,1.08800000000000,1.08400000000000,1.08800000000000,1.10900000000000,1.11500000000000,1.08300000000000,1.09100000000000,1.05500000000000,1.05200000000000,1.02500000000000,1.04400000000000,1.06500000000000),
+    (0.0141200000000000,0.0146300000000000,0.0142300000000000,0.0150900000000000,0.0146200000000000,0.0145900000000000,0.0145800000000000,0.0125700000000000,0.0111400000000000,0.0101900000000000,0.00979000000000000,0.00944000000000000,0.00972000000000000,0.0100500000000000,0.0100300000000000,0.00928000000000000,0.00833000000000000,0.00776000000000000,0.00644000000000000,0.00590000000000000,0.00510000000000000),
+    (0,0,0,0,0,0,0,-0.0410000000000000,-0.0530000000000000,-0.103000000000000,-0.146000000000000,-0.164000000000000,-0.206000000000000,-0.239000000000000,-0.256000000000000,-0.306000000000000,-0.321000000000000,-0.337000000000000,-0.331000000000000,-0.390000000000000,-0.498000000000000),
+    (0.293000000000000,0.939000000000000,1.49900000000000,1.46200000000000,1.28000000000000,1.12100000000000,0.852000000000000,0.365000000000000,-0.207000000000000,-0.705000000000000,-1.14400000000000,-1.60900000000000,-2.02300000000000,-2.45100000000000,-3.24300000000000,-3.88800000000000,-4.78300000000000,-5.44400000000000,-5.83900000000000,-6.59800000000000,-6.75200000000000),
+    (1.11100000000000,1.68400000000000,2.06100000000000,1.91600000000000,1.66900000000000,1.46800000000000,1.17200000000000,0.655000000000000,0.0710000000000000,-0.429000000000000,-0.866000000000000,-1.32500000000000,-1.73200000000000,-2.15200000000000,-2.92300000000000,-3.54800000000000,-4.41000000000000,-5.04900000000000,-5.43100000000000,-6.18100000000000,-6.34700000000000),
+    (1.34400000000000,1.79300000000000,2.13500000000000,2.16800000000000,2.08500000000000,1.94200000000000,1.68300000000000,1.12700000000000,0.515000000000000,-0.00300000000000000,-0.449000000000000,-0.928000000000000,-1.34900000000000,-1.77600000000000,-2.54200000000000,-3.16900000000000,-4.03900000000000,-4.69800000000000,-5.08900000000000,-5.88200000000000,-6.05100000000000),
+    (1.35500000000000,1.74700000000000,2.03100000000000,2.05200000000000,2.00100000000000,1.94100000000000,1.80800000000000,1.48200000000000,0.934000000000000,0.394000000000000,-0.111000000000000,-0.620000000000000,-1.06600000000000,-1.52300000000000,-2.32700000000000,-2.97900000000000,-3.87100000000000,-4.49600000000000,-4.89300000000000,-5.69800000000000,-5.87300000000000),
+    (1.42000000000000,1.81400000000000,2.08200000000000,2.11300000000000,2.03000000000000,1.93700000000000,1.77000000000000,1.39700000000000,0.955000000000000,0.559000000000000,0.188000000000000,-0.246000000000000,-0.643000000000000,-1.08400000000000,-1.93600000000000,-2.66100000000000,-3.64000000000000,-4.34100000000000,-4.75800000000000,-5.58800000000000,-5.79800000000000),
+    (0,0,0,-0.0138000000000000,-0.0256000000000000,-0.0348000000000000,-0.0423000000000000,-0.0541000000000000,-0.0632000000000000,-0.0707000000000000,-0.0771000000000000,-0.0825000000000000,-0.0874000000000000,-0.0917000000000000,-0.100900000000000,-0.108300000000000,-0.120200000000000,-0.129300000000000,-0.136800000000000,-0.148600000000000,-0.157800000000000),
+    (0,0,0,0.0286000000000000,0.0352000000000000,0.0403000000000000,0.0445000000000000,0.0511000000000000,0.0562000000000000,0.0604000000000000,0.0639000000000000,0.0670000000000000,0.0697000000000000,0.0721000000000000,0.0772000000000000,0.0814000000000000,0.0880000000000000,0.0931000000000000,0.0972000000000000,0.103800000000000,0.109000000000000),
+    (0.604000000000000,0.640000000000000,0.694000000000000,0.702000000000000,0.692000000000000,0.682000000000000,0.670000000000000,0.659000000000000,0.653000000000000,0.653000000000000,0.652000000000000,0.647000000000000,0.653000000000000,0.657000000000000,0.660000000000000,0.664000000000000,0.669000000000000,0.671000000000000,0.667000000000000,0.647000000000000,0.643000000000000),
+    (0.308000000000000,0.343000000000000,0.403000000000000,0.367000000000000,0.328000000000000,0.289000000000000,0.280000000000000,0.271000000000000,0.277000000000000,0.296000000000000,0.313000000000000,0.329000000000000,0.324000000000000,0.328000000000000,0.339000000000000,0.352000000000000,0.360000000000000,0.356000000000000,0.338000000000000,0.307000000000000,0.272000000000000)])
+    Zhao_2006_interface_coefficient = Zhao_2006_interface_table[0:13,:]
+    Zhao_2006_interface_coefficient_period = array([0,0.05,0.1,0.15,0.2,0.25,0.3,0.4,0.5,0.6,0.7,0.8,0.9,1,1.25,1.5,2,2.5,3,4,5])
+    Zhao_2006_interface_sigma_coefficient = Zhao_2006_interface_table[13:17,:]
+    Zhao_2006_interface_sigma_coefficient_period = array([0,0.05,0.1,0.15,0.2,0.25,0.3,0.4,0.5,0.6,0.7,0.8,0.9,1,1.25,1.5,2,2.5,3,4,5])
+    return [Zhao_2006_interface_distribution,
+                                  Zhao_2006_interface_magnitude_type,
+                                  Zhao_2006_interface_distance_types,
+
+                                  Zhao_2006_interface_coefficient,
+                                  Zhao_2006_interface_coefficient_period,
+                                  Zhao_2006_interface_interpolation,
+
+                                  Zhao_2006_interface_sigma_coefficient,
+                                  Zhao_2006_interface_sigma_coefficient_period,
+                                  Zhao_2006_interface_interpolation,
+
+                                  Zhao_2006_interface_uses_Vs30]
+
+ground_motion_init.add_model('Zhao_2006_interface', Zhao_2006_interface_args)
     
 
 
@@ -5289,7 +5276,7 @@ Atkinson_2003_interface_distance_types = ['Rupture',]
 ##    
     # Interslab Events Coefficients
 
-coef_it = array([(0,0.0400000000000000,0.100000000000000,0.200000000000000,0.400000000000000,1,2,3.03030303030303),
+Atkinson_2003_interface_table = array([(0,0.0400000000000000,0.100000000000000,0.200000000000000,0.400000000000000,1,2,3.03030303030303),
     (2.99100000000000,2.87530000000000,2.77890000000000,2.66380000000000,2.52490000000000,2.14420000000000,2.19070000000000,2.30100000000000),
     (3.14000000000000,3.05000000000000,2.95000000000000,2.84000000000000,2.58000000000000,2.18000000000000,2.14000000000000,2.27000000000000),
     (2.79000000000000,2.60000000000000,2.50000000000000,2.54000000000000,2.50000000000000,2.18000000000000,2.33000000000000,2.36000000000000),
@@ -5302,30 +5289,33 @@ coef_it = array([(0,0.0400000000000000,0.100000000000000,0.200000000000000,0.400
     (0.230000000000000,0.260000000000000,0.270000000000000,0.280000000000000,0.290000000000000,0.340000000000000,0.340000000000000,0.360000000000000),
     (0.200000000000000,0.220000000000000,0.250000000000000,0.250000000000000,0.250000000000000,0.280000000000000,0.290000000000000,0.310000000000000),
     (0.110000000000000,0.140000000000000,0.100000000000000,0.130000000000000,0.150000000000000,0.190000000000000,0.180000000000000,0.180000000000000)])
-Atkinson_2003_interface_coefficient = coef_it[1:10,:]
-Atkinson_2003_interface_coefficient_period = coef_it[0]
-Atkinson_2003_interface_sigma_coefficient = coef_it[11:13,:]
-Atkinson_2003_interface_sigma_coefficient_period = coef_it[0]
 
-Atkinson_2003_interface_PGA_coefficient = coef_it[1:10,0]
+Atkinson_2003_interface_PGA_coefficient = Atkinson_2003_interface_table[1:10,0]
 
 Atkinson_2003_interface_interpolation = linear_interpolation
 
 Atkinson_2003_interface_uses_Vs30 = True
 
-ground_motion_init['Atkinson_2003_interface'] = [Atkinson_2003_interface_distribution,
-                              Atkinson_2003_interface_magnitude_type,
-                              Atkinson_2003_interface_distance_types,
-
-                              Atkinson_2003_interface_coefficient,
-                              Atkinson_2003_interface_coefficient_period,
-                              Atkinson_2003_interface_interpolation,
-                          
-                              Atkinson_2003_interface_sigma_coefficient,
-                              Atkinson_2003_interface_sigma_coefficient_period,
-                              Atkinson_2003_interface_interpolation,
-                          
-                              Atkinson_2003_interface_uses_Vs30]
+def Atkinson_2003_interface_args():
+    Atkinson_2003_interface_coefficient = Atkinson_2003_interface_table[1:10,:]
+    Atkinson_2003_interface_coefficient_period = Atkinson_2003_interface_table[0]
+    Atkinson_2003_interface_sigma_coefficient = Atkinson_2003_interface_table[11:13,:]
+    Atkinson_2003_interface_sigma_coefficient_period = Atkinson_2003_interface_table[0]
+    return [Atkinson_2003_interface_distribution,
+                                  Atkinson_2003_interface_magnitude_type,
+                                  Atkinson_2003_interface_distance_types,
+
+                                  Atkinson_2003_interface_coefficient,
+                                  Atkinson_2003_interface_coefficient_period,
+                                  Atkinson_2003_interface_interpolation,
+
+                                  Atkinson_2003_interface_sigma_coefficient,
+                                  Atkinson_2003_interface_sigma_coefficient_period,
+                                  Atkinson_2003_interface_interpolation,
+
+                                  Atkinson_2003_interface_uses_Vs30]
+
+ground_motion_init.add_model('Atkinson_2003_interface', Atkinson_2003_interface_args)
    
     
 ########################  Start of Zhao et al model (Zhao_2006_intraslab)  ###########################
@@ -5414,117 +5404,56 @@ Zhao_2006_intraslab_distance_types = ['Rupture',]
 ##    
     # Interslab Events Coefficients
 
-coef = array([(1.10100000000000,1.07600000000000,1.11800000000000,1.13400000000000,1.14700000000000,1.14900000000000,1.16300000000000,1.20000000000000,1.25000000000000,1.29300000000000,1.33600000000000,1.38600000000000,1.43300000000000,1.47900000000000,1.55100000000000,1.62100000000000,1.69400000000000,1.74800000000000,1.75900000000000,1.82600000000000,1.82500000000000),
-(-0.00564000000000000,-0.00671000000000000,-0.00787000000000000,-0.00722000000000000,-0.00659000000000000,-0.00590000000000000,-0.00520000000000000,-0.00422000000000000,-0.00338000000000000,-0.00282000000000000,-0.00258000000000000,-0.00242000000000000,-0.00232000000000000,-0.00220000000000000,-0.00207000000000000,-0.00224000000000000,-0.00201000000000000,-0.00187000000000000,-0.00147000000000000,-0.00195000000000000,-0.00237000000000000),
-(0.00550000000000000,0.00750000000000000,0.00900000000000000,0.0100000000000000,0.0120000000000000,0.0140000000000000,0.0150000000000000,0.0100000000000000,0.00600000000000000,0.00300000000000000,0.00250000000000000,0.00220000000000000,0.00200000000000000,0.00200000000000000,0.00200000000000000,0.00200000000000000,0.00250000000000000,0.00280000000000000,0.00320000000000000,0.00400000000000000,0.00500000000000000),
-(1.08000000000000,1.06000000000000,1.08300000000000,1.05300000000000,1.01400000000000,0.966000000000000,0.934000000000000,0.959000000000000,1.00800000000000,1.08800000000000,1.08400000000000,1.08800000000000,1.10900000000000,1.11500000000000,1.08300000000000,1.09100000000000,1.05500000000000,1.05200000000000,1.02500000000000,1.04400000000000,1.06500000000000),
-(0.0141200000000000,0.0146300000000000,0.0142300000000000,0.0150900000000000,0.0146200000000000,0.0145900000000000,0.0145800000000000,0.0125700000000000,0.0111400000000000,0.0101900000000000,0.00979000000000000,0.00944000000000000,0.00972000000000000,0.0100500000000000,0.0100300000000000,0.00928000000000000,0.00833000000000000,0.00776000000000000,0.00644000000000000,0.00590000000000000,0.00510000000000000),
-(2.60700000000000,2.76400000000000,2.15600000000000,2.16100000000000,1.90100000000000,1.81400000000000,2.18100000000000,2.43200000000000,2.62900000000000,2.70200000000000,2.65400000000000,2.48000000000000,2.33200000000000,2.23300000000000,2.02900000000000,1.58900000000000,0.966000000000000,0.789000000000000,1.03700000000000,0.561000000000000,0.225000000000000),
-(-0.528000000000000,-0.551000000000000,-0.420000000000000,-0.431000000000000,-0.372000000000000,-0.360000000000000,-0.450000000000000,-0.506000000000000,-0.554000000000000,-0.575000000000000,-0.572000000000000,-0.540000000000000,-0.522000000000000,-0.509000000000000,-0.469000000000000,-0.379000000000000,-0.248000000000000,-0.221000000000000,-0.263000000000000,-0.169000000000000,-0.120000000000000),
-(0.293000000000000,0.939000000000000,1.49900000000000,1.46200000000000,1.28000000000000,1.12100000000000,0.852000000000000,0.365000000000000,-0.207000000000000,-0.705000000000000,-1.14400000000000,-1.60900000000000,-2.02300000000000,-2.45100000000000,-3.24300000000000,-3.88800000000000,-4.78300000000000,-5.44400000000000,-5.83900000000000,-6.59800000000000,-6.75200000000000),
-(1.11100000000000,1.68400000000000,2.06100000000000,1.91600000000000,1.66900000000000,1.46800000000000,1.17200000000000,0.655000000000000,0.0710000000000000,-0.429000000000000,-0.866000000000000,-1.32500000000000,-1.73200000000000,-2.15200000000000,-2.92300000000000,-3.54800000000000,-4.41000000000000,-5.04900000000000,-5.43100000000000,-6.18100000000000,-6.34700000000000),
-(1.34400000000000,1.79300000000000,2.13500000000000,2.16800000000000,2.08500000000000,1.94200000000000,1.68300000000000,1.12700000000000,0.515000000000000,-0.00300000000000000,-0.449000000000000,-0.928000000000000,-1.34900000000000,-1.77600000000000,-2.54200000000000,-3.16900000000000,-4.03900000000000,-4.69800000000000,-5.08900000000000,-5.88200000000000,-6.05100000000000),
-(1.35500000000000,1.74700000000000,2.03100000000000,2.05200000000000,2.00100000000000,1.94100000000000,1.80800000000000,1.48200000000000,0.934000000000000,0.394000000000000,-0.111000000000000,-0.620000000000000,-1.06600000000000,-1.52300000000000,-2.32700000000000,-2.97900000000000,-3.87100000000000,-4.49600000000000,-4.89300000000000,-5.69800000000000,-5.87300000000000),
-(1.42000000000000,1.81400000000000,2.08200000000000,2.11300000000000,2.03000000000000,1.93700000000000,1.77000000000000,1.39700000000000,0.955000000000000,0.559000000000000,0.188000000000000,-0.246000000000000,-0.643000000000000,-1.08400000000000,-1.93600000000000,-2.66100000000000,-3.64000000000000,-4.34100000000000,-4.75800000000000,-5.58800000000000,-5.79800000000000),
-(0.139200000000000,0.163600000000000,0.169000000000000,0.166900000000000,0.163100000000000,0.158800000000000,0.154400000000000,0.146000000000000,0.138100000000000,0.130700000000000,0.123900000000000,0.117600000000000,0.111600000000000,0.106000000000000,0.0933000000000000,0.0821000000000000,0.0628000000000000,0.0465000000000000,0.0322000000000000,0.00830000000000000,-0.0117000000000000),
-(0.158400000000000,0.193200000000000,0.205700000000000,0.198400000000000,0.185600000000000,0.171400000000000,0.157300000000000,0.130900000000000,0.107800000000000,0.0878000000000000,0.0705000000000000,0.0556000000000000,0.0426000000000000,0.0314000000000000,0.00930000000000000,-0.00620000000000000,-0.0235000000000000,-0.0287000000000000,-0.0261000000000000,-0.00650000000000000,0.0246000000000000),
-(-0.0529000000000000,-0.0841000000000000,-0.0877000000000000,-0.0773000000000000,-0.0644000000000000,-0.0515000000000000,-0.0395000000000000,-0.0183000000000000,-0.000800000000000000,0.0136000000000000,0.0254000000000000,0.0352000000000000,0.0432000000000000,0.0498000000000000,0.0612000000000000,0.0674000000000000,0.0692000000000000,0.0622000000000000,0.0496000000000000,0.0150000000000000,-0.0268000000000000),
-(0.604000000000000,0.640000000000000,0.694000000000000,0.702000000000000,0.692000000000000,0.682000000000000,0.670000000000000,0.659000000000000,0.653000000000000,0.653000000000000,0.652000000000000,0.647000000000000,0.653000000000000,0.657000000000000,0.660000000000000,0.664000000000000,0.669000000000000,0.671000000000000,0.667000000000000,0.647000000000000,0.643000000000000),
-(0.321000000000000,0.378000000000000,0.420000000000000,0.372000000000000,0.324000000000000,0.294000000000000,0.284000000000000,0.278000000000000,0.272000000000000,0.285000000000000,0.290000000000000,0.299000000000000,0.289000000000000,0.286000000000000,0.277000000000000,0.282000000000000,0.300000000000000,0.292000000000000,0.274000000000000,0.281000000000000,0.296000000000000)])
-
-Zhao_2006_intraslab_coefficient = coef[0:15,:]
-Zhao_2006_intraslab_coefficient_period = array([0,0.05,0.1,0.15,0.2,0.25,0.3,0.4,0.5,0.6,0.7,0.8,0.9,1,1.25,1.5,2,2.5,3,4,5])
-Zhao_2006_intraslab_sigma_coefficient = coef[15:17,:]
-Zhao_2006_intraslab_sigma_coefficient_period = array([0,0.05,0.1,0.15,0.2,0.25,0.3,0.4,0.5,0.6,0.7,0.8,0.9,1,1.25,1.5,2,2.5,3,4,5])
+
 
 Zhao_2006_intraslab_interpolation = linear_interpolation
 
 Zhao_2006_intraslab_uses_Vs30 = True
 
-ground_motion_init['Zhao_2006_intraslab'] = [Zhao_2006_intraslab_distribution,
-                              Zhao_2006_intraslab_magnitude_type,
-                              Zhao_2006_intraslab_distance_types,
-
-                              Zhao_2006_intraslab_coefficient,
-                              Zhao_2006_intraslab_coefficient_period,
-                              Zhao_2006_intraslab_interpolation,
-                          
-                              Zhao_2006_intraslab_sigma_coefficient,
-                              Zhao_2006_intraslab_sigma_coefficient_period,
-                              Zhao_2006_intraslab_interpolation,
-                          
-                              Zhao_2006_intraslab_uses_Vs30]
+def Zhao_2006_intraslab_args():
+    Zhao_2006_intraslab_table = array([(1.10100000000000,1.07600000000000,1.11800000000000,1.13400000000000,1.14700000000000,1.14900000000000,1.16300000000000,1.20000000000000,1.25000000000000,1.29300000000000,1.33600000000000,1.38600000000000,1.43300000000000,1.47900000000000,1.55100000000000,1.62100000000000,1.69400000000000,1.74800000000000,1.75900000000000,1.82600000000000,1.82500000000000),
+    (-0.00564000000000000,-0.00671000000000000,-0.00787000000000000,-0.00722000000000000,-0.00659000000000000,-0.00590000000000000,-0.00520000000000000,-0.00422000000000000,-0.00338000000000000,-0.00282000000000000,-0.00258000000000000,-0.00242000000000000,-0.00232000000000000,-0.00220000000000000,-0.00207000000000000,-0.00224000000000000,-0.00201000000000000,-0.00187000000000000,-0.00147000000000000,-0.00195000000000000,-0.00237000000000000),
+    (0.00550000000000000,0.00750000000000000,0.00900000000000000,0.0100000000000000,0.0120000000000000,0.0140000000000000,0.0150000000000000,0.0100000000000000,0.00600000000000000,0.00300000000000000,0.00250000000000000,0.00220000000000000,0.00200000000000000,0.00200000000000000,0.00200000000000000,0.00200000000000000,0.00250000000000000,0.00280000000000000,0.00320000000000000,0.00400000000000000,0.00500000000000000),
+    (1.08000000000000,1.06000000000000,1.08300000000000,1.05300000000000,1.01400000000000,0.966000000000000,0.934000000000000,0.959000000000000,1.00800000000000,1.08800000000000,1.08400000000000,1.08800000000000,1.10900000000000,1.11500000000000,1.08300000000000,1.09100000000000,1.05500000000000,1.05200000000000,1.02500000000000,1.04400000000000,1.06500000000000),
+    (0.0141200000000000,0.0146300000000000,0.0142300000000000,0.0150900000000000,0.0146200000000000,0.0145900000000000,0.0145800000000000,0.0125700000000000,0.0111400000000000,0.0101900000000000,0.00979000000000000,0.00944000000000000,0.00972000000000000,0.0100500000000000,0.0100300000000000,0.00928000000000000,0.00833000000000000,0.00776000000000000,0.00644000000000000,0.00590000000000000,0.00510000000000000),
+    (2.60700000000000,2.76400000000000,2.15600000000000,2.16100000000000,1.90100000000000,1.81400000000000,2.18100000000000,2.43200000000000,2.62900000000000,2.70200000000000,2.65400000000000,2.48000000000000,2.33200000000000,2.23300000000000,2.02900000000000,1.58900000000000,0.966000000000000,0.789000000000000,1.03700000000000,0.561000000000000,0.225000000000000),
+    (-0.528000000000000,-0.551000000000000,-0.420000000000000,-0.431000000000000,-0.372000000000000,-0.360000000000000,-0.450000000000000,-0.506000000000000,-0.554000000000000,-0.575000000000000,-0.572000000000000,-0.540000000000000,-0.522000000000000,-0.509000000000000,-0.469000000000000,-0.379000000000000,-0.248000000000000,-0.221000000000000,-0.263000000000000,-0.169000000000000,-0.120000000000000),
+    (0.293000000000000,0.939000000000000,1.49900000000000,1.46200000000000,1.28000000000000,1.12100000000000,0.852000000000000,0.365000000000000,-0.207000000000000,-0.705000000000000,-1.14400000000000,-1.60900000000000,-2.02300000000000,-2.45100000000000,-3.24300000000000,-3.88800000000000,-4.78300000000000,-5.44400000000000,-5.83900000000000,-6.59800000000000,-6.75200000000000),
+    (1.11100000000000,1.68400000000000,2.06100000000000,1.91600000000000,1.66900000000000,1.46800000000000,1.17200000000000,0.655000000000000,0.0710000000000000,-0.429000000000000,-0.866000000000000,-1.32500000000000,-1.73200000000000,-2.15200000000000,-2.92300000000000,-3.54800000000000,-4.41000000000000,-5.04900000000000,-5.43100000000000,-6.18100000000000,-6.34700000000000),
+    (1.34400000000000,1.79300000000000,2.13500000000000,2.16800000000000,2.08500000000000,1.94200000000000,1.68300000000000,1.12700000000000,0.515000000000000,-0.00300000000000000,-0.449000000000000,-0.928000000000000,-1.34900000000000,-1.77600000000000,-2.54200000000000,-3.16900000000000,-4.03900000000000,-4.69800000000000,-5.08900000000000,-5.88200000000000,-6.05100000000000),
+    (1.35500000000000,1.74700000000000,2.03100000000000,2.05200000000000,2.00100000000000,1.94100000000000,1.80800000000000,1.48200000000000,0.934000000000000,0.394000000000000,-0.111000000000000,-0.620000000000000,-1.06600000000000,-1.52300000000000,-2.32700000000000,-2.97900000000000,-3.87100000000000,-4.49600000000000,-4.89300000000000,-5.69800000000000,-5.87300000000000),
+    (1.42000000000000,1.81400000000000,2.08200000000000,2.11300000000000,2.03000000000000,1.93700000000000,1.77000000000000,1.39700000000000,0.955000000000000,0.559000000000000,0.188000000000000,-0.246000000000000,-0.643000000000000,-1.08400000000000,-1.93600000000000,-2.66100000000000,-3.64000000000000,-4.34100000000000,-4.75800000000000,-5.58800000000000,-5.79800000000000),
+    (0.139200000000000,0.163600000000000,0.169000000000000,0.166900000000000,0.163100000000000,0.158800000000000,0.154400000000000,0.146000000000000,0.138100000000000,0.130700000000000,0.123900000000000,0.117600000000000,0.111600000000000,0.106000000000000,0.0933000000000000,0.0821000000000000,0.0628000000000000,0.0465000000000000,0.0322000000000000,0.00830000000000000,-0.0117000000000000),
+    (0.158400000000000,0.193200000000000,0.205700000000000,0.198400000000000,0.185600000000000,0.171400000000000,0.157300000000000,0.130900000000000,0.107800000000000,0.0878000000000000,0.0705000000000000,0.0556000000000000,0.0426000000000000,0.0314000000000000,0.00930000000000000,-0.00620000000000000,-0.0235000000000000,-0.0287000000000000,-0.0261000000000000,-0.00650000000000000,0.0246000000000000),
+    (-0.0529000000000000,-0.0841000000000000,-0.0877000000000000,-0.0773000000000000,-0.0644000000000000,-0.0515000000000000,-0.0395000000000000,-0.0183000000000000,-0.000800000000000000,0.0136000000000000,0.0254000000000000,0.0352000000000000,0.0432000000000000,0.0498000000000000,0.0612000000000000,0.0674000000000000,0.0692000000000000,0.0622000000000000,0.0496000000000000,0.0150000000000000,-0.0268000000000000),
+    (0.604000000000000,0.640000000000000,0.694000000000000,0.702000000000000,0.692000000000000,0.682000000000000,0.670000000000000,0.659000000000000,0.653000000000000,0.653000000000000,0.652000000000000,0.647000000000000,0.653000000000000,0.657000000000000,0.660000000000000,0.664000000000000,0.669000000000000,0.671000000000000,0.667000000000000,0.647000000000000,0.643000000000000),
+    (0.321000000000000,0.378000000000000,0.420000000000000,0.372000000000000,0.324000000000000,0.294000000000000,0.284000000000000,0.278000000000000,0.272000000000000,0.285000000000000,0.290000000000000,0.299000000000000,0.289000000000000,0.286000000000000,0.277000000000000,0.282000000000000,0.300000000000000,0.292000000000000,0.274000000000000,0.281000000000000,0.296000000000000)])
+    Zhao_2006_intraslab_coefficient = Zhao_2006_intraslab_table[0:15,:]
+    Zhao_2006_intraslab_coefficient_period = array([0,0.05,0.1,0.15,0.2,0.25,0.3,0.4,0.5,0.6,0.7,0.8,0.9,1,1.25,1.5,2,2.5,3,4,5])
+    Zhao_2006_intraslab_sigma_coefficient = Zhao_2006_intraslab_table[15:17,:]
+    Zhao_2006_intraslab_sigma_coefficient_period = array([0,0.05,0.1,0.15,0.2,0.25,0.3,0.4,0.5,0.6,0.7,0.8,0.9,1,1.25,1.5,2,2.5,3,4,5])
+    return [Zhao_2006_intraslab_distribution,
+                                  Zhao_2006_intraslab_magnitude_type,
+                                  Zhao_2006_intraslab_distance_types,
+
+                                  Zhao_2006_intraslab_coefficient,
+                                  Zhao_2006_intraslab_coefficient_period,
+                                  Zhao_2006_intraslab_interpolation,
+
+                                  Zhao_2006_intraslab_sigma_coefficient,
+                                  Zhao_2006_intraslab_sigma_coefficient_period,
+                                  Zhao_2006_intraslab_interpolation,
+
+                                  Zhao_2006_intraslab_uses_Vs30]
+
+ground_motion_init.add_model('Zhao_2006_intraslab', Zhao_2006_intraslab_args)
     
 
 
 #########
 
-Abrahamson_Silva_1997_coefficient_period = [5, 4, 3, 2, 1.5, 1, 0.85, 0.75, 0.6, 0.5, 0.46, 0.4, 0.36,
-                                            0.3, 0.24, 0.2, 0.17, 0.15, 0.12, 0.1,
-                                            0.09, 0.075, 0.06, 0.05, 0.04, 0.03, 0.02, 0.01]
-
-Abrahamson_Silva_1997_coefficient = asarray([
-        # c4, a1, a2, a3, a4, a5, a6, a9, a10, a11, a12, a13, c1, c5, n
-        [3.5, -1.46, 0.512, -0.725, -0.144, 0.4, -0.2, 0, 0.664, 0.04, -0.215, 0.17, 6.4, 0.03, 2], 
-        [3.5, -1.13, 0.512, -0.725, -0.144, 0.4, -0.2, 0.039, 0.64, 0.04, -0.1956, 0.17, 6.4, 0.03, 2], 
-        [3.5, -0.69, 0.512, -0.725, -0.144, 0.4, -0.156, 0.089, 0.63, 0.04, -0.1726, 0.17, 6.4, 0.03, 2], 
-        [3.5, -0.15, 0.512, -0.725, -0.144, 0.4, -0.094, 0.16, 0.61, 0.04, -0.14, 0.17, 6.4, 0.03, 2], 
-        [3.55, 0.26, 0.512, -0.7721, -0.144, 0.438, -0.049, 0.21, 0.6, 0.04, -0.12, 0.17, 6.4, 0.03, 2], 
-        [3.7, 0.828, 0.512, -0.8383, -0.144, 0.49, 0.013, 0.281, 0.423, 0, -0.102, 0.17, 6.4, 0.03, 2], 
-        [3.81, 1.02, 0.512, -0.8648, -0.144, 0.512, 0.038, 0.309, 0.37, -0.028, -0.0927, 0.17, 6.4, 0.03, 2], 
-        [3.9, 1.16, 0.512, -0.8852, -0.144, 0.528, 0.057, 0.331, 0.32, -0.05, -0.0862, 0.17, 6.4, 0.03, 2], 
-        [4.12, 1.428, 0.512, -0.9218, -0.144, 0.557, 0.091, 0.37, 0.194, -0.089, -0.074, 0.17, 6.4, 0.03, 2], 
-        [4.3, 1.615, 0.512, -0.9515, -0.144, 0.581, 0.119, 0.37, 0.085, -0.121, -0.0635, 0.17, 6.4, 0.03, 2], 
-        [4.38, 1.717, 0.512, -0.9652, -0.144, 0.592, 0.132, 0.37, 0.02, -0.136, -0.0594, 0.17, 6.4, 0.03, 2], 
-        [4.52, 1.86, 0.512, -0.988, -0.144, 0.61, 0.154, 0.37, -0.065, -0.16, -0.0518, 0.17, 6.4, 0.03, 2], 
-        [4.62, 1.955, 0.512, -1.0052, -0.144, 0.61, 0.17, 0.37, -0.123, -0.173, -0.046, 0.17, 6.4, 0.03, 2], 
-        [4.8, 2.114, 0.512, -1.035, -0.144, 0.61, 0.198, 0.37, -0.219, -0.195, -0.036, 0.17, 6.4, 0.03, 2], 
-        [4.97, 2.293, 0.512, -1.079, -0.144, 0.61, 0.232, 0.37, -0.35, -0.223, -0.0238, 0.17, 6.4, 0.03, 2], 
-        [5.1, 2.406, 0.512, -1.115, -0.144, 0.61, 0.26, 0.37, -0.445, -0.245, -0.0138, 0.17, 6.4, 0.03, 2], 
-        [5.19, 2.43, 0.512, -1.135, -0.144, 0.61, 0.26, 0.37, -0.522, -0.265, -0.004, 0.17, 6.4, 0.03, 2], 
-        [5.27, 2.407, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.577, -0.28, 0.005, 0.17, 6.4, 0.03, 2], 
-        [5.39, 2.272, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.591, -0.28, 0.018, 0.17, 6.4, 0.03, 2], 
-        [5.5, 2.16, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.598, -0.28, 0.028, 0.17, 6.4, 0.03, 2], 
-        [5.54, 2.1, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.609, -0.28, 0.03, 0.17, 6.4, 0.03, 2], 
-        [5.58, 2.037, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.628, -0.28, 0.03, 0.17, 6.4, 0.03, 2], 
-        [5.6, 1.94, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.665, -0.28, 0.03, 0.17, 6.4, 0.03, 2], 
-        [5.6, 1.87, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.62, -0.267, 0.028, 0.17, 6.4, 0.03, 2], 
-        [5.6, 1.78, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.555, -0.251, 0.0245, 0.17, 6.4, 0.03, 2], 
-        [5.6, 1.69, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.47, -0.23, 0.0143, 0.17, 6.4, 0.03, 2], 
-        [5.6, 1.64, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.417, -0.23, 0, 0.17, 6.4, 0.03, 2], 
-        [5.6, 1.64, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.417, -0.23, 0, 0.17, 6.4, 0.03, 2]
-        ]).T
-
-Abrahamson_Silva_1997_sigma_coefficient = asarray([
-        # b5, b6
-        [0.89, 0.087], 
-        [0.88, 0.092], 
-        [0.87, 0.097], 
-        [0.85, 0.105], 
-        [0.84, 0.11], 
-        [0.83, 0.118], 
-        [0.82, 0.121], 
-        [0.81, 0.123], 
-        [0.81, 0.127], 
-        [0.8, 0.13], 
-        [0.8, 0.132], 
-        [0.79, 0.135], 
-        [0.79, 0.135], 
-        [0.78, 0.135], 
-        [0.77, 0.135], 
-        [0.77, 0.135], 
-        [0.76, 0.135], 
-        [0.75, 0.135], 
-        [0.75, 0.135], 
-        [0.74, 0.135], 
-        [0.74, 0.135], 
-        [0.73, 0.135], 
-        [0.72, 0.135], 
-        [0.71, 0.135], 
-        [0.71, 0.135], 
-        [0.7, 0.135], 
-        [0.7, 0.135], 
-        [0.7, 0.135]]).T
+
+
 
 
 
@@ -5613,22 +5542,88 @@ def Abrahamson_Silva_1997_distribution(**kwargs):
     return log_mean, sd
 
 
-Abrahamson_Silva_1997_args = [Abrahamson_Silva_1997_distribution,
-                              Abrahamson_Silva_1997_magnitude_type,
-                              Abrahamson_Silva_1997_distance_types,
-                              
-                              Abrahamson_Silva_1997_coefficient,
-                              Abrahamson_Silva_1997_coefficient_period,
-                              linear_interpolation,
 
-                              Abrahamson_Silva_1997_sigma_coefficient,
-                              Abrahamson_Silva_1997_coefficient_period,
-                              linear_interpolation,
-                              
-                              Abrahamson_Silva_1997_uses_Vs30]
 
-
-ground_motion_init['Abrahamson_Silva_1997'] = Abrahamson_Silva_1997_args
+def Abrahamson_Silva_1997_args():
+    Abrahamson_Silva_1997_coefficient_period = [5, 4, 3, 2, 1.5, 1, 0.85, 0.75, 0.6, 0.5, 0.46, 0.4, 0.36,
+                                                0.3, 0.24, 0.2, 0.17, 0.15, 0.12, 0.1,
+                                                0.09, 0.075, 0.06, 0.05, 0.04, 0.03, 0.02, 0.01]
+    Abrahamson_Silva_1997_coefficient = asarray([
+            # c4, a1, a2, a3, a4, a5, a6, a9, a10, a11, a12, a13, c1, c5, n
+            [3.5, -1.46, 0.512, -0.725, -0.144, 0.4, -0.2, 0, 0.664, 0.04, -0.215, 0.17, 6.4, 0.03, 2],
+            [3.5, -1.13, 0.512, -0.725, -0.144, 0.4, -0.2, 0.039, 0.64, 0.04, -0.1956, 0.17, 6.4, 0.03, 2],
+            [3.5, -0.69, 0.512, -0.725, -0.144, 0.4, -0.156, 0.089, 0.63, 0.04, -0.1726, 0.17, 6.4, 0.03, 2],
+            [3.5, -0.15, 0.512, -0.725, -0.144, 0.4, -0.094, 0.16, 0.61, 0.04, -0.14, 0.17, 6.4, 0.03, 2],
+            [3.55, 0.26, 0.512, -0.7721, -0.144, 0.438, -0.049, 0.21, 0.6, 0.04, -0.12, 0.17, 6.4, 0.03, 2],
+            [3.7, 0.828, 0.512, -0.8383, -0.144, 0.49, 0.013, 0.281, 0.423, 0, -0.102, 0.17, 6.4, 0.03, 2],
+            [3.81, 1.02, 0.512, -0.8648, -0.144, 0.512, 0.038, 0.309, 0.37, -0.028, -0.0927, 0.17, 6.4, 0.03, 2],
+            [3.9, 1.16, 0.512, -0.8852, -0.144, 0.528, 0.057, 0.331, 0.32, -0.05, -0.0862, 0.17, 6.4, 0.03, 2],
+            [4.12, 1.428, 0.512, -0.9218, -0.144, 0.557, 0.091, 0.37, 0.194, -0.089, -0.074, 0.17, 6.4, 0.03, 2],
+            [4.3, 1.615, 0.512, -0.9515, -0.144, 0.581, 0.119, 0.37, 0.085, -0.121, -0.0635, 0.17, 6.4, 0.03, 2],
+            [4.38, 1.717, 0.512, -0.9652, -0.144, 0.592, 0.132, 0.37, 0.02, -0.136, -0.0594, 0.17, 6.4, 0.03, 2],
+            [4.52, 1.86, 0.512, -0.988, -0.144, 0.61, 0.154, 0.37, -0.065, -0.16, -0.0518, 0.17, 6.4, 0.03, 2],
+            [4.62, 1.955, 0.512, -1.0052, -0.144, 0.61, 0.17, 0.37, -0.123, -0.173, -0.046, 0.17, 6.4, 0.03, 2],
+            [4.8, 2.114, 0.512, -1.035, -0.144, 0.61, 0.198, 0.37, -0.219, -0.195, -0.036, 0.17, 6.4, 0.03, 2],
+            [4.97, 2.293, 0.512, -1.079, -0.144, 0.61, 0.232, 0.37, -0.35, -0.223, -0.0238, 0.17, 6.4, 0.03, 2],
+            [5.1, 2.406, 0.512, -1.115, -0.144, 0.61, 0.26, 0.37, -0.445, -0.245, -0.0138, 0.17, 6.4, 0.03, 2],
+            [5.19, 2.43, 0.512, -1.135, -0.144, 0.61, 0.26, 0.37, -0.522, -0.265, -0.004, 0.17, 6.4, 0.03, 2],
+            [5.27, 2.407, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.577, -0.28, 0.005, 0.17, 6.4, 0.03, 2],
+            [5.39, 2.272, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.591, -0.28, 0.018, 0.17, 6.4, 0.03, 2],
+            [5.5, 2.16, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.598, -0.28, 0.028, 0.17, 6.4, 0.03, 2],
+            [5.54, 2.1, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.609, -0.28, 0.03, 0.17, 6.4, 0.03, 2],
+            [5.58, 2.037, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.628, -0.28, 0.03, 0.17, 6.4, 0.03, 2],
+            [5.6, 1.94, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.665, -0.28, 0.03, 0.17, 6.4, 0.03, 2],
+            [5.6, 1.87, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.62, -0.267, 0.028, 0.17, 6.4, 0.03, 2],
+            [5.6, 1.78, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.555, -0.251, 0.0245, 0.17, 6.4, 0.03, 2],
+            [5.6, 1.69, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.47, -0.23, 0.0143, 0.17, 6.4, 0.03, 2],
+            [5.6, 1.64, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.417, -0.23, 0, 0.17, 6.4, 0.03, 2],
+            [5.6, 1.64, 0.512, -1.145, -0.144, 0.61, 0.26, 0.37, -0.417, -0.23, 0, 0.17, 6.4, 0.03, 2]
+            ]).T
+    Abrahamson_Silva_1997_sigma_coefficient = asarray([
+            # b5, b6
+            [0.89, 0.087],
+            [0.88, 0.092],
+            [0.87, 0.097],
+            [0.85, 0.105],
+            [0.84, 0.11],
+            [0.83, 0.118],
+            [0.82, 0.121],
+            [0.81, 0.123],
+            [0.81, 0.127],
+            [0.8, 0.13],
+            [0.8, 0.132],
+            [0.79, 0.135],
+            [0.79, 0.135],
+            [0.78, 0.135],
+            [0.77, 0.135],
+            [0.77, 0.135],
+            [0.76, 0.135],
+            [0.75, 0.135],
+            [0.75, 0.135],
+            [0.74, 0.135],
+            [0.74, 0.135],
+            [0.73, 0.135],
+            [0.72, 0.135],
+            [0.71, 0.135],
+            [0.71, 0.135],
+            [0.7, 0.135],
+            [0.7, 0.135],
+            [0.7, 0.135]]).T
+    return [Abrahamson_Silva_1997_distribution,
+                                  Abrahamson_Silva_1997_magnitude_type,
+                                  Abrahamson_Silva_1997_distance_types,
+
+                                  Abrahamson_Silva_1997_coefficient,
+                                  Abrahamson_Silva_1997_coefficient_period,
+                                  linear_interpolation,
+
+                                  Abrahamson_Silva_1997_sigma_coefficient,
+                                  Abrahamson_Silva_1997_coefficient_period,
+                                  linear_interpolation,
+
+                                  Abrahamson_Silva_1997_uses_Vs30]
+
+ground_motion_init.add_model('Abrahamson_Silva_1997', Abrahamson_Silva_1997_args)
 
 #########
 
@@ -5656,30 +5651,11 @@ Allen_2012_model_deep = array([
        [0.250000,0.320200,1.025000,-0.084500,-1.730700,0.229100,1.570300,0.640300,-0.176500,-2.737500,-2.811400,0.352600,-0.854700]]) 
 #  results are log10 of cm/sec**2
 
-Allen_2012_sigma_deep = array([[0.36530,
-                                0.38970,
-                                0.38400,
-                                0.35580,
-                                0.33920,
-                                0.33230,
-                                0.32710,
-                                0.32470,
-                                0.32460,
-                                0.32450,
-                                0.32480,
-                                0.32250,
-                                0.31880,
-                                0.31800,
-                                0.31610,
-                                0.31420,
-                                0.31130,
-                                0.30970]])
 
 
 # TA:
 # model = model(1:end-2,:);
 # T = [3, 4] at model(end-2:end) so using whole vector
-Allen_2012_coeff_deep = Allen_2012_model_deep.T[1:]
 # TA:
 # T = 1 ./ model(:,1);
 Allen_2012_coeff_period_deep = 1 / Allen_2012_model_deep.T[0]
@@ -5705,46 +5681,22 @@ Allen_2012_model_shallow = array([
        [0.2500,0.3395,0.9536,-0.0712,-1.6036,0.1884,1.0706,0.5091,-0.1580,-4.2008,-2.5644,0.2860,-0.1061]])
 #  results are log10 of cm/sec**2
     
-Allen_2012_sigma_shallow = array([[0.412000,
-                                   0.438300,
-                                   0.431000,
-                                   0.399400,
-                                   0.380500,
-                                   0.372000,
-                                   0.363700,
-                                   0.359400,
-                                   0.357500,
-                                   0.355800,
-                                   0.354400,
-                                   0.352200,
-                                   0.349500,
-                                   0.348700,
-                                   0.349200,
-                                   0.348400,
-                                   0.346700,
-                                   0.345700]])
 
 
 # TA:
 # model = model(1:end-2,:);
 # T = [3, 4] at model(end-2:end) so using whole vector
-Allen_2012_coeff_shallow = Allen_2012_model_shallow.T[1:]
 # TA:
 # T = 1 ./ model(:,1);
 Allen_2012_coeff_period_shallow = 1 / Allen_2012_model_shallow.T[0]
 
 # Concatenate the deep and shallow coefficients.
 # Allen_2012_distribution decides which indices to use based on the depth passed in
-Allen_2012_coefficient = concatenate((Allen_2012_coeff_deep, 
-                                      Allen_2012_coeff_shallow))
 
 # The period dimension is the same for both deep and shallow models
 Allen_2012_coefficient_period = Allen_2012_coeff_period_deep
 
 # Sigma
-Allen_2012_sigma_coefficient = concatenate((Allen_2012_sigma_deep,
-                                            Allen_2012_sigma_shallow))
-Allen_2012_sigma_coefficient_period = deepcopy(Allen_2012_coefficient_period)
 
 
 # Other parameters
@@ -5867,20 +5819,65 @@ def Allen_2012_distribution(**kwargs):
     return log_mean, log_sigma
     
 
-Allen_2012_args = [Allen_2012_distribution,
-                   Allen_2012_magnitude_type,
-                   Allen_2012_distance_types,
-                   
-                   Allen_2012_coefficient,
-                   Allen_2012_coefficient_period,
-                   Allen_2012_interpolation,
-                   
-                   Allen_2012_sigma_coefficient,
-                   Allen_2012_sigma_coefficient_period,
-                   Allen_2012_interpolation,
-                   
-                   Allen_2012_uses_Vs30]
-
-ground_motion_init['Allen_2012'] = Allen_2012_args
+
+def Allen_2012_args():
+    Allen_2012_sigma_deep = array([[0.36530,
+                                    0.38970,
+                                    0.38400,
+                                    0.35580,
+                                    0.33920,
+                                    0.33230,
+                                    0.32710,
+                                    0.32470,
+                                    0.32460,
+                                    0.32450,
+                                    0.32480,
+                                    0.32250,
+                                    0.31880,
+                                    0.31800,
+                                    0.31610,
+                                    0.31420,
+                                    0.31130,
+                                    0.30970]])
+    Allen_2012_coeff_deep = Allen_2012_model_deep.T[1:]
+    Allen_2012_sigma_shallow = array([[0.412000,
+                                       0.438300,
+                                       0.431000,
+                                       0.399400,
+                                       0.380500,
+                                       0.372000,
+                                       0.363700,
+                                       0.359400,
+                                       0.357500,
+                                       0.355800,
+                                       0.354400,
+                                       0.352200,
+                                       0.349500,
+                                       0.348700,
+                                       0.349200,
+                                       0.348400,
+                                       0.346700,
+                                       0.345700]])
+    Allen_2012_coeff_shallow = Allen_2012_model_shallow.T[1:]
+    Allen_2012_coefficient = concatenate((Allen_2012_coeff_deep,
+                                          Allen_2012_coeff_shallow))
+    Allen_2012_sigma_coefficient = concatenate((Allen_2012_sigma_deep,
+                                                Allen_2012_sigma_shallow))
+    Allen_2012_sigma_coefficient_period = deepcopy(Allen_2012_coefficient_period)
+    return [Allen_2012_distribution,
+                       Allen_2012_magnitude_type,
+                       Allen_2012_distance_types,
+
+                       Allen_2012_coefficient,
+                       Allen_2012_coefficient_period,
+                       Allen_2012_interpolation,
+
+                       Allen_2012_sigma_coefficient,
+                       Allen_2012_sigma_coefficient_period,
+                       Allen_2012_interpolation,
+
+                       Allen_2012_uses_Vs30]
+
+ground_motion_init.add_model('Allen_2012', Allen_2012_args)
 
 #***************  END OF ALLEN 2012 MODEL  *************************
@@ -15,7 +15,7 @@
 
 from scipy import asarray
 
-from eqrm_code.ground_motion_interface import ground_motion_init
+from eqrm_code.ground_motion_interface import ground_motion_model
 
 class Ground_motion_specification(object):
     """
@@ -37,7 +37,7 @@ class Ground_motion_specification(object):
     
     def __init__(self, ground_motion_model_name):
         try:
-            gm_args = ground_motion_init[ground_motion_model_name]
+            gm_args = ground_motion_model(ground_motion_model_name)
         except KeyError:
             raise KeyError, \
                   'Invalid ground motion model name: %s' \
@@ -14,8 +14,153 @@
 import math
 from eqrm_code.output_manager import FILE_TAG_DELIMITER
 import socket
+import multiprocessing
 from numpy import arange
 
+# The Local_Comm of this process, if it is a local process started by
+# run_local_processes.
+_local_comm = None
+
+# The pypar tag of the messages that ask for and hand out site chunks
+CHUNK_TAG = 17
+
+# How long run_local_processes waits for each process, in seconds,
+# before checking the others.
+LOCAL_PROCESS_POLL = 0.1
+
+
+class Local_Comm(object):
+
+    """ A pypar like communicator for processes on one node.
+
+    Built on multiprocessing, so EQRM can use all the cores of a
+    computer without MPI.  Has the subset of the pypar interface
+    that Parallel uses.
+    """
+
+    def __init__(self, size):
+        self._size = size
+        self._rank = 0
+        # One queue for each (source, destination) pair,
+        # so receive can select the source.
+        self._queues = {}
+        for source in range(size):
+            for destination in range(size):
+                self._queues[(source, destination)] = multiprocessing.Queue()
+
+        # A counter used to hand out work on demand.
+        self._work_count = multiprocessing.Value('i', 0)
+
+        # A reusable barrier, built from two turnstiles.
+        self._count = multiprocessing.Value('i', 0)
+        self._mutex = multiprocessing.Lock()
+        self._turnstile_in = multiprocessing.Semaphore(0)
+        self._turnstile_out = multiprocessing.Semaphore(0)
+
+    def rank(self):
+        return self._rank
+
+    def size(self):
+        return self._size
+
+    def get_processor_name(self):
+        return socket.gethostname()
+
+    def send(self, x, destination):
+        self._queues[(self._rank, destination)].put(x)
+
+    def receive(self, source):
+        return self._queues[(source, self._rank)].get()
+
+    def next_count(self):
+        """
+        Return the shared work counter, then increment it.
+        """
+        self._work_count.get_lock().acquire()
+        count = self._work_count.value
+        self._work_count.value += 1
+        self._work_count.get_lock().release()
+        return count
+
+    def barrier(self):
+        self._mutex.acquire()
+        self._count.value += 1
+        if self._count.value == self._size:
+            for _ in range(self._size):
+                self._turnstile_in.release()
+        self._mutex.release()
+        self._turnstile_in.acquire()
+
+        self._mutex.acquire()
+        self._count.value -= 1
+        if self._count.value == 0:
+            for _ in range(self._size):
+                self._turnstile_out.release()
+        self._mutex.release()
+        self._turnstile_out.acquire()
+
+    def finalize(self):
+        pass
+
+
+def _run_local_process(comm, rank, function, args, kwargs):
+    """
+    The target of each process started by run_local_processes.
+    """
+    global _local_comm
+    comm._rank = rank
+    _local_comm = comm
+    function(*args, **kwargs)
+
+
+def run_local_processes(num_processes, function, *args, **kwargs):
+    """
+    Run function(*args, **kwargs) in num_processes processes on this node.
+
+    In each process Parallel(is_parallel=True) uses a Local_Comm, so
+    the processes have a rank and size as if run with MPI.
+
+    If a process fails the others are terminated, since they may be
+    waiting for it, e.g. at a barrier, and a RuntimeError is raised.
+
+    The processes are forked, so the arguments are not copied.  Arrays
+    made before the call are shared, copy on write, by the processes.
+    """
+    comm = Local_Comm(num_processes)
+    processes = []
+    for rank in range(num_processes):
+        process = multiprocessing.Process(
+            target=_run_local_process,
+            args=(comm, rank, function, args, kwargs))
+        process.start()
+        processes.append(process)
+
+    running = list(range(num_processes))
+    try:
+        while running:
+            for rank in running[:]:
+                process = processes[rank]
+                process.join(LOCAL_PROCESS_POLL)
+                if process.exitcode is None:
+                    continue
+                running.remove(rank)
+                if process.exitcode != 0:
+                    raise RuntimeError(
+                        'Local process %i failed, exit code %i.' %
+                        (rank, process.exitcode))
+    finally:
+        for rank in running:
+            processes[rank].terminate()
+        for rank in running:
+            processes[rank].join()
+
+
+def is_local_process():
+    """
+    Return True if this process was started by run_local_processes.
+    """
+    return _local_comm is not None
+
 
 class Parallel(object):
 
@@ -26,6 +171,8 @@ class Parallel(object):
     size: How many processors are there in the cluster.
     node: name of the cluster node.
     is_parallel: True if parallel is operational
+    is_local: True if the processes are local processes, started by
+      run_local_processes, rather than MPI processes.
     file_tag: A string that can be added to files to identify who wrote the
       file.
     _make_block_file: Does this node have data to write to a block
@@ -41,19 +188,18 @@ class Parallel(object):
         several scenarios.
         """
 
-        if is_parallel is True:
+        self.is_local = False
+        if is_parallel is True and _local_comm is not None:
+            self.is_local = True
+            self._parallel(_local_comm)
+        elif is_parallel is True:
             try:
                 import pypar
             except ImportError:
                 self._not_parallel()
             else:
                 if pypar.size() >= 2:
-                    self.rank = pypar.rank()
-                    self.size = pypar.size()
-                    self.node = pypar.get_processor_name()
-                    self.is_parallel = True
-                    self.file_tag = FILE_TAG_DELIMITER + str(self.rank)
-                    self.log_file_tag = FILE_TAG_DELIMITER + str(self.rank)
+                    self._parallel(pypar)
                 else:
                     self._not_parallel()
         else:
@@ -62,6 +208,9 @@ class Parallel(object):
         # Some constants to identify messages
         self.load_event_set = 0
 
+        # The last chunk handed out to this node, see next_chunk
+        self._chunk = None
+
     def all_striped_indices(self, elements):
         """
         Return the indices for all nodes given the number of elements,
@@ -95,6 +244,66 @@ class Parallel(object):
         """
         return self.striped_indices(elements)
 
+    def calc_chunk_indices(self, elements, chunk_size):
+        """
+        Return the indices of each chunk, given the number of elements.
+        e.g. for 7 elements and a chunk_size of 3
+        indices [array([0, 1, 2]), array([3, 4, 5]), array([6])]
+        """
+        all_elements = arange(elements)
+        indices = []
+        for lo in range(0, elements, chunk_size):
+            indices.append(all_elements[lo:lo + chunk_size])
+        return indices
+
+    def next_chunk(self, num_chunks):
+        """
+        Return the next chunk for this node to work on, or None if
+        all num_chunks chunks have been handed out.
+
+        Local processes take chunks on demand from a shared counter.
+        The first chunk of each local process is its rank, so process 0
+        always has a chunk.
+
+        MPI nodes do not share memory, so node 0 hands out the chunks
+        to the other nodes as they ask for them, and does not work on
+        chunks itself.
+        """
+        if self.is_parallel and not self.is_local:
+            if self.rank == 0:
+                self._dispatch_chunks(num_chunks)
+                return None
+            self._comm.send(self.rank, 0, tag=CHUNK_TAG)
+            return self._comm.receive(0, tag=CHUNK_TAG)
+
+        if self._chunk is None:
+            chunk = self.rank
+        elif self.is_local:
+            chunk = self.size + self._comm.next_count()
+        else:
+            chunk = self._chunk + 1
+        self._chunk = chunk
+        if chunk >= num_chunks:
+            return None
+        return chunk
+
+    def _dispatch_chunks(self, num_chunks):
+        """
+        Hand out the chunks to the MPI nodes that ask for one, then
+        None to each node, once all num_chunks chunks are handed out.
+        """
+        comm = self._comm
+        chunk = 0
+        working = self.size - 1
+        while working > 0:
+            source = comm.receive(comm.any_source, tag=CHUNK_TAG)
+            if chunk < num_chunks:
+                comm.send(chunk, source, tag=CHUNK_TAG)
+                chunk += 1
+            else:
+                comm.send(None, source, tag=CHUNK_TAG)
+                working -= 1
+
     def calc_lo_hi(self, elements):
         """
         Calculate the low index and the high index of length elements,
@@ -126,10 +335,25 @@ class Parallel(object):
         else:
             self._make_block_file = 1
 
+    def _parallel(self, comm):
+        """
+        Set the attributes if there is more than one node.
+
+        comm is pypar, or a Local_Comm.
+        """
+        self._comm = comm
+        self.rank = comm.rank()
+        self.size = comm.size()
+        self.node = comm.get_processor_name()
+        self.is_parallel = True
+        self.file_tag = FILE_TAG_DELIMITER + str(self.rank)
+        self.log_file_tag = FILE_TAG_DELIMITER + str(self.rank)
+
     def _not_parallel(self):
         """
         Set the attributes if there is only one node.
         """
+        self._comm = None
         self.rank = 0
         self.size = 1
         self.node = socket.gethostname()  # The host name
@@ -144,24 +368,21 @@ class Parallel(object):
                processors have reached this point.
         """
         if self.is_parallel is True:
-            import pypar
-            pypar.barrier()
+            self._comm.barrier()
 
     def send(self, *args, **kwargs):
         """
         Wrapper for pypar.send
         """
         if self.is_parallel is True:
-            import pypar
-            pypar.send(*args, **kwargs)
+            self._comm.send(*args, **kwargs)
 
     def receive(self, *args, **kwargs):
         """
         Wrapper for pypar.receive
         """
         if self.is_parallel is True:
-            import pypar
-            return pypar.receive(*args, **kwargs)
+            return self._comm.receive(*args, **kwargs)
         else:
             return None
 
@@ -188,19 +409,19 @@ class Parallel(object):
         pre-req: calc_lo_hi has been calculated - and only calculated once!
         """
         if self.is_parallel is True:
-            import pypar
+            comm = self._comm
             # print "synchronise self.rank", self.rank
             if self.rank == 0:
                 calc_num_blocks = self._make_block_file
                 for source in range(1, self.size):
                     # print "waiting.."
-                    received = pypar.receive(source)
+                    received = comm.receive(source)
                     # print "received", received
                     calc_num_blocks += received
                 return calc_num_blocks
             else:
                 # print "sending from ", self.rank
-                pypar.send(self._make_block_file, 0)
+                comm.send(self._make_block_file, 0)
                 # print "sent from ", self.rank
 
     def finalize(self):
@@ -208,8 +429,7 @@ class Parallel(object):
         End being parallel
         """
         if self.is_parallel is True:
-            import pypar
-            pypar.finalize()
+            self._comm.finalize()
 
 
 # this will run if eqrm_analysis.py is called from DOS prompt or double clicked
@@ -85,6 +85,7 @@ except ImportError:
         return results
 
 from eqrm_code import file_store
+from eqrm_code.ground_motion_calculator import TABULATED_MODELS
 
 ENV_EQRMDATAHOME = 'EQRMDATAHOME'
 VAR_NAME_IN_SET_DATA_FILE = 'sdp'
@@ -286,6 +287,12 @@ CONV_NEW = [{'order': 10.0,
              'order': 50.13,
              'new_para': 'atten_log_sigma_eq_weight',
              'default': 0},
+            {'order': 50.14,
+             'new_para': 'atten_tabulated',
+             'default': False},
+            {'order': 50.15,
+             'new_para': 'atten_stream_seed',
+             'default': None},
             {'order': 60.0,
              'title': '\n# Amplification\n'},
             {'old_para': 'amp_switch',
@@ -388,6 +395,10 @@ CONV_NEW = [{'order': 10.0,
              'new_para': 'damage_extent_tag',
              'default': '',
              'run_type': ['risk_csm']},
+            {'order': 80.13,
+             'new_para': 'csm_active_set',
+             'default': False,
+             'run_type': ['risk_csm']},
             {'order': 90.0,
              'title': '\n# Loss\n',
              'default': None},
@@ -479,6 +490,37 @@ CONV_NEW = [{'order': 10.0,
             {'order': 110.06,
              'new_para': 'event_set_load_dir',
              'default': None},  # see _verify_eqrm_flags
+            {'order': 110.07,
+             'new_para': 'site_block_size',
+             'default': 1,
+             'run_type': ['hazard', 'risk_csm', 'fatality']},
+            {'order': 110.08,
+             'new_para': 'site_block_max_close_pairs',
+             'default': 10000000},  # sites in block * close events
+            {'order': 110.09,
+             'new_para': 'local_processes',
+             'default': 1},  # Used if MPI is not running
+            {'order': 110.10,
+             'new_para': 'site_scheduler',
+             'default': 'striped'},  # 'striped' or 'dynamic'. With MPI
+                                     # and 'dynamic' node 0 only hands
+                                     # out chunks
+            {'order': 110.11,
+             'new_para': 'site_chunk_size',
+             'default': 10},  # sites handed out at a time if 'dynamic'
+            {'order': 110.12,
+             'new_para': 'checkpoint_interval',
+             'default': None},  # sites between checkpoints. None is off
+            {'order': 110.13,
+             'new_para': 'hazard_map_bins_per_decade',
+             'default': None,  # None keeps all the close event SA
+             'run_type': ['hazard']},
+            {'order': 110.14,
+             'new_para': 'distance_cache_dir',
+             'default': None},  # None is off
+            {'order': 110.15,
+             'new_para': 'distance_cache_max_mb',
+             'default': 1000},  # size the distance cache is trimmed to
             {'order': 120.01,
              'new_para': 'file_log_level',
              'default': 'debug'},
@@ -501,6 +543,7 @@ KNOWN_KWARGS = {'use_determ_seed': None,
                 'compress_output': None,
                 'eqrm_dir': None,
                 'is_parallel': None,
+                'resume': None,
                 'default_input_dir': None}
 
 
@@ -559,6 +602,7 @@ def create_parameter_data(handle, **kwargs):
           compress_output
           eqrm_dir
           is_parallel
+          resume
           default_input_dir
 
     Returns:
@@ -944,6 +988,63 @@ def _verify_eqrm_flags(eqrm_flags):
             'data_array_storage %s must exist and be accessible from %s' %
             (eqrm_flags.data_array_storage, socket.gethostname()))
 
+    if eqrm_flags.site_block_size < 1:
+        raise AttributeSyntaxError(
+            'site_block_size must be 1 or more.')
+
+    if eqrm_flags.atten_stream_seed is not None and \
+            (not isinstance(eqrm_flags.atten_stream_seed, (int, long)) or
+             eqrm_flags.atten_stream_seed < 0):
+        raise AttributeSyntaxError(
+            'atten_stream_seed must be None or an int of 0 or more.')
+
+    if eqrm_flags.local_processes < 1:
+        raise AttributeSyntaxError(
+            'local_processes must be 1 or more.')
+
+    if eqrm_flags.site_scheduler not in ['striped', 'dynamic']:
+        raise AttributeSyntaxError(
+            'site_scheduler must be striped or dynamic.')
+
+    if eqrm_flags.site_chunk_size < 1:
+        raise AttributeSyntaxError(
+            'site_chunk_size must be 1 or more.')
+
+    if eqrm_flags.atten_tabulated is True and \
+            eqrm_flags.atten_models is not None:
+        untabulated = [model for model in eqrm_flags.atten_models
+                       if model not in TABULATED_MODELS]
+        if untabulated:
+            raise AttributeSyntaxError(
+                'atten_tabulated only works with the models %s, not %s.' %
+                (', '.join(TABULATED_MODELS), ', '.join(untabulated)))
+
+    if eqrm_flags.checkpoint_interval is not None and \
+            eqrm_flags.checkpoint_interval < 1:
+        raise AttributeSyntaxError(
+            'checkpoint_interval must be None or 1 or more.')
+
+    # A resumed run skips the blocks of sites that are done, and with
+    # the dynamic scheduler gets its blocks in any order, so random
+    # ground motion is only the same as an uninterrupted run's if it
+    # is keyed by site and source.  2 is random sampling.
+    if eqrm_flags.checkpoint_interval is not None and \
+            eqrm_flags.atten_stream_seed is None and \
+            (eqrm_flags.atten_variability_method == 2 or
+             eqrm_flags.amp_variability_method == 2):
+        raise AttributeSyntaxError(
+            'atten_stream_seed must be set to checkpoint randomly '
+            'sampled ground motion.')
+
+    if eqrm_flags.hazard_map_bins_per_decade is not None and \
+            eqrm_flags.hazard_map_bins_per_decade < 1:
+        raise AttributeSyntaxError(
+            'hazard_map_bins_per_decade must be None or 1 or more.')
+
+    if eqrm_flags.distance_cache_max_mb <= 0:
+        raise AttributeSyntaxError(
+            'distance_cache_max_mb must be more than 0.')
+
     if eqrm_flags.fault_source_tag is None and \
             eqrm_flags.zone_source_tag is None:
         raise AttributeSyntaxError(
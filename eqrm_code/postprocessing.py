@@ -176,11 +176,11 @@ def events_shaking_a_site(output_dir,
     # Collapse spawn and rm
     event_activity = event_activity.event_activity[0, :, 0,:]
 
-    # Distances
-    Rjb = sites.distances_from_event_set(event_set).distance('Joyner_Boore')
-    Rjb_for_site = Rjb.swapaxes(0, 1)[:, closest_site_ind]
-    Rrup = sites.distances_from_event_set(event_set).distance('Rupture')
-    Rrup_for_site = Rrup.swapaxes(0, 1)[:, closest_site_ind]
+    # Distances, for the closest site only
+    site_distances = sites[closest_site_ind].sparse_distances_from_event_set(
+        event_set, ['Joyner_Boore', 'Rupture'])
+    Rjb_for_site = site_distances.dense('Joyner_Boore')[0]
+    Rrup_for_site = site_distances.dense('Rupture')[0]
 
     if soil_amp is True:
         motion_name = 'soil_SA'
@@ -82,6 +82,22 @@ def azimuthal_orthographic_ll_to_xy(lat, lon, lat0, lon0, azimuth=0, R=6367.0):
     return x, y
 
 
+def azimuthal_orthographic_ll_to_xy_trig(lat, lon, lat0, lon0, cos_azimuth,
+                                         sin_azimuth, R=6367.0):
+    """
+    As azimuthal_orthographic_ll_to_xy, given the cosine and sine of
+    the azimuth rather than the azimuth.
+
+    The cosine and sine only depend on the azimuth, so they can be
+    worked out once for many conversions.
+    """
+    x = R * PI_DIV_180 * (lat - lat0)
+    y = R * PI_DIV_180 * (lon - lon0) * cos(lat * PI_DIV_180)
+    x_rotate = +cos_azimuth * x + sin_azimuth * y
+    y_rotate = -sin_azimuth * x + cos_azimuth * y
+    return x_rotate, y_rotate
+
+
 def azimuthal_orthographic_xy_to_ll(x, y, lat0, lon0, azimuth=0, R=6367.0):
     """
     x,y = point for conversion to lat,lon
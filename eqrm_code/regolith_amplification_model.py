@@ -12,13 +12,13 @@
   Copyright 2007 by Geoscience Australia
 """
 from scipy import asarray, exp, indices, minimum, maximum, zeros, array, log, \
-    r_, where, weave, arange
+    r_, where, arange, newaxis, concatenate
 
 from eqrm_code.xml_interface import Xml_Interface
 from eqrm_code.interp import interp
 from eqrm_code.csv_interface import csv2dict
-from eqrm_code import util
-from eqrm_code import weave_converters
+from eqrm_code.ground_motion_calculator import Distribution_Buffers
+from eqrm_code.ground_motion_distribution import RANDOM_SAMPLING
 
 
 class Regolith_amplification_model(object):
@@ -59,6 +59,60 @@ class Regolith_amplification_model(object):
                 self.log_stds[site_class] = self.log_stds[site_class][:, :, ::-1]
                 # reverse log standard deviations
 
+        # The site classes, sorted, so they can be searched
+        self.site_classes = array(sorted(self.log_amplifications.keys()))
+        # The amplification tables interpolated to some periods, keyed
+        # by the periods.  See ._tables()
+        self._period_tables = {}
+
+    def period_tables(self, event_periods):
+        """
+        Return the log amplifications and log standard deviations
+        interpolated to event_periods, dimensions (site class, moment
+        magnitude bin, pga bin, period).
+
+        The site classes are in the order of self.site_classes, with an
+        extra class of zeros for sites of other classes.  The tables
+        are only worked out once for each event_periods.
+        """
+        return self._tables(event_periods)[:2]
+
+    def _tables(self, event_periods):
+        """
+        Return (log amplifications, log standard deviations, rows), as
+        .period_tables().  rows holds both tables, with a row for each
+        (site class, moment magnitude bin, pga bin), and the log
+        amplifications then the log standard deviations of the periods.
+        """
+        key = tuple(asarray(event_periods, dtype=float).ravel())
+        if key not in self._period_tables:
+            log_amp = [interp(event_periods,
+                              self.log_amplifications[site_class],
+                              self.periods, axis=2)
+                       for site_class in self.site_classes]
+            log_stds = [interp(event_periods, self.log_stds[site_class],
+                               self.periods, axis=2)
+                        for site_class in self.site_classes]
+            no_class = zeros((1,) + log_amp[0].shape)
+            log_amp = concatenate([a[newaxis] for a in log_amp] + [no_class])
+            log_stds = concatenate([a[newaxis] for a in log_stds] +
+                                   [no_class])
+            rows = concatenate((log_amp, log_stds), axis=3).reshape(
+                -1, 2 * log_amp.shape[3])
+            self._period_tables[key] = (log_amp, log_stds, rows)
+        return self._period_tables[key]
+
+    def site_class_indices(self, site_classes):
+        """
+        Return the index of each site class in self.site_classes, or
+        len(self.site_classes) for classes that are not in the model.
+        """
+        site_classes = asarray(site_classes)
+        class_indices = self.site_classes.searchsorted(site_classes)
+        class_indices = class_indices.clip(0, len(self.site_classes) - 1)
+        return where(self.site_classes[class_indices] == site_classes,
+                     class_indices, len(self.site_classes))
+
     def distribution(self, ground_motion, site_classes,
                      Mw, event_periods,
                      event_activity=None):
@@ -74,12 +128,9 @@ class Regolith_amplification_model(object):
 
         Implementation:
         bin all the pga and magnitudes
-        loop over the models site classes:
-            get the amplification this site_class
-            get the indices of the sites that fall in the current site_class
-            get the gm, pga, and mag for the sites in this site_class
-            interpolate model amplification and std, then take the amp factors
-              ... and std from the right bins in the interpolated model
+        get the index of the site class of each site
+        take the amp factors and std from the right bins of the model,
+          interpolated to the event periods once by .period_tables()
 
         Dimension of final distribution = [ground_motion_samples]*[sites]*...
 
@@ -98,69 +149,19 @@ class Regolith_amplification_model(object):
                                                    self.pga_bins)
         event_mag_bins_indices = self._bin_indices(Mw,
                                                    self.moment_magnitude_bins)
+        class_indices = self.site_class_indices(site_classes)
 
-        # initialise mean and sigma
-        log_amplification = zeros(ground_motion.shape, dtype=float)
-        log_sigma = zeros(ground_motion.shape, dtype=float)
-
-        for site_class in self.log_amplifications.keys():
-            # interpolate model amplification and std, then take the amp
-            #  factors and std from the right bins in the interpolated model
+        log_amp, _, rows = self._tables(event_periods)
+        num_classes, num_mag_bins, num_pga_bins, num_periods = log_amp.shape
 
-            log_amp = interp(
-                event_periods, self.log_amplifications[site_class],
-                self.periods, axis=2)
-
-            log_stds = interp(event_periods, self.log_stds[site_class],
-                              self.periods, axis=2)
-
-            num_periods = len(event_periods)
-            num_events = len(Mw)
-            num_sites = len(site_classes)
-            try:
-                in_zone = [s == site_class for s in site_classes]
-                in_zone = array(in_zone) * 1  # upcast from boolean
-                code = """
-                int m,n;
-                for (int i=0; i<num_sites; ++i){
-                    if (in_zone(i)==1){
-                        for (int j=0; j<num_events; ++j){
-                            m=event_mag_bins_indices(j);
-                            n=event_pga_bins_indices(i,j);
-                            for (int k=0; k<num_periods; ++k){
-                                log_amplification(i,j,k)=log_amp(m,n,k);
-                                log_sigma(i,j,k)=log_stds(m,n,k);
-                            }
-                        }
-                    }
-                }
-                return_val = 0;
-                """
-                try:
-                    weave.inline(code,
-                                 ['event_pga_bins_indices',
-                                  'event_mag_bins_indices',
-                                  'log_amp', 'log_stds',
-                                  'log_amplification', 'log_sigma',
-                                  'num_sites', 'num_events',
-                                  'num_periods',
-                                  'in_zone'],
-                                 type_converters=weave_converters.eqrm,
-                                 compiler='gcc')
-                except IOError:
-                    raise util.WeaveIOError
-
-            except:
-                print "No gcc found. Running Regolith_amplification_model.\
-                distribution_function in pure python"
-                for i in range(num_sites):
-                    if site_classes[i] == site_class:
-                        for j in range(num_events):
-                            m = event_mag_bins_indices[j]
-                            n = event_pga_bins_indices[i, j]
-                            for k in range(num_periods):
-                                log_amplification[i, j, k] = log_amp[m, n, k]
-                                log_sigma[i, j, k] = log_stds[m, n, k]
+        # The row of each site and event, dimensions (site, event).
+        # Sites of other classes get the zeros of the extra class.
+        row_indices = ((class_indices[:, newaxis] * num_mag_bins +
+                        event_mag_bins_indices[newaxis, :]) * num_pga_bins +
+                       event_pga_bins_indices)
+        site_event_rows = rows.take(row_indices, axis=0)
+        log_amplification = site_event_rows[..., :num_periods]
+        log_sigma = site_event_rows[..., num_periods:]
 
         log_mean = log(ground_motion) + log_amplification
         return log_mean, log_sigma
@@ -282,22 +283,28 @@ def load_site_class2Vs30_old(file_name):
 def get_soil_SA(bedrock_SA, site_classes, Mw, atten_periods,
                 soil_amplification_model, amp_distribution,
                 ground_motion_calc, event_set, sites, distances,
-                ground_motion_distribution):
+                ground_motion_distribution, stream=None, buffers=None):
     """
     Determine the soil_SA.
 
     Parameters:
       bedrock_SA - spectral acceleration, in g. dimensions
         [spawn, GM_model, rec_model, site, event, period]
-      site_classes dimensions (site) = 1
+      site_classes dimensions (site)
       Mw - dimensions (events)
       atten_periods dimension (periods)
       amp_distribution - an instance of Distribution_Log_Normal.
       ground_motion_calc  - an instance of Multiple_ground_motion_calculator
       event_set - needed if a gmm has to be called
       sites - needed if a gmm has to be called
-
-    Returns: array with the same shape as bedrock_SA
+      distances - the Distances of the sites and events
+      stream - a Random_Stream of the sites and events, or None.
+      buffers - a Distribution_Buffers for the gmm results, or None.
+
+    Returns: array with the same shape as bedrock_SA, except the
+      rec_model dimension has a length of
+      ground_motion_distribution.n_recurrence_models if the
+      amplification is randomly sampled.
     """
     spawn_axis = 0
     GM_model_axis = 1
@@ -305,29 +312,65 @@ def get_soil_SA(bedrock_SA, site_classes, Mw, atten_periods,
     assert bedrock_SA.shape[GM_model_axis] == len(
         ground_motion_calc.GM_models)
 
-    soil_SA_new = zeros(bedrock_SA.shape)
+    # The bedrock SA has a rec_model dimension of length 1 if it is
+    # the same for each recurrence model.  Random amplification still
+    # differs between recurrence models.
+    num_bedrock_rm = bedrock_SA.shape[rec_model_axis]
+    num_rm = num_bedrock_rm
+    if amp_distribution.var_method == RANDOM_SAMPLING:
+        num_rm = ground_motion_distribution.n_recurrence_models
+    soil_shape = list(bedrock_SA.shape)
+    soil_shape[rec_model_axis] = num_rm
+    soil_SA_new = zeros(soil_shape)
+    if buffers is None:
+        buffers = Distribution_Buffers()
     for i_gmm, gmm in enumerate(ground_motion_calc.GM_models):
-        if gmm.GM_spec.uses_Vs30 is True:
+        if gmm.GM_spec.uses_Vs30 is True and len(sites) > 1:
+            # The Vs30 models take one Vs30 value per call,
+            # so do a block of sites one site at a time, with the
+            # distances of the block.
+            distances.calc_distances(gmm.GM_spec.distance_types)
+            for i_site in range(len(sites)):
+                site_slice = slice(i_site, i_site + 1)
+                log_mean, log_sigma = ground_motion_calc.distribution(
+                    sites[site_slice], event_set,
+                    distances.site_subset(site_slice),
+                    GM_models=[gmm], buffers=buffers)
+                site_stream = None
+                if stream is not None:
+                    site_stream = stream.tagged(1, i_gmm).sites(site_slice)
+                sub_soil_SA = ground_motion_distribution.ground_motion_sample(
+                    log_mean, log_sigma, stream=site_stream)
+                assert sub_soil_SA.ndim == 6
+                soil_SA_new[:, i_gmm, :, i_site:i_site + 1, :, :] = \
+                    sub_soil_SA[:, 0, :, :, :, :]
+        elif gmm.GM_spec.uses_Vs30 is True:
             log_mean, log_sigma = ground_motion_calc.distribution(
                 sites, event_set, distances,
-                GM_models=[gmm])
+                GM_models=[gmm], buffers=buffers)
+            gmm_stream = None
+            if stream is not None:
+                gmm_stream = stream.tagged(1, i_gmm)
             sub_soil_SA = ground_motion_distribution.ground_motion_sample(
-                log_mean, log_sigma)
+                log_mean, log_sigma, stream=gmm_stream)
             assert sub_soil_SA.ndim == 6
             soil_SA_new[:, i_gmm, :,:,:,:] = sub_soil_SA[:, 0,:,:,:,:]
         else:
             for i_spawn in arange(bedrock_SA.shape[spawn_axis]):
-                for i_rm in arange(bedrock_SA.shape[rec_model_axis]):
+                for i_rm in arange(num_rm):
                     log_mean, log_sigma = soil_amplification_model.distribution(
-                        bedrock_SA[i_spawn, i_gmm, i_rm, :],
+                        bedrock_SA[i_spawn, i_gmm, i_rm % num_bedrock_rm, :],
                         site_classes,
                         Mw,
                         atten_periods)
                     # No variability in the period axis
                     var_in_last_axis = False
+                    amp_stream = None
+                    if stream is not None:
+                        amp_stream = stream.tagged(2, i_gmm, i_spawn, i_rm)
                     sub_soil_SA = amp_distribution.sample_for_eqrm(
                         log_mean, log_sigma,
-                        var_in_last_axis)
+                        var_in_last_axis, stream=amp_stream)
 
                     assert sub_soil_SA.ndim == 3  # site, event, period
                     soil_SA_new[i_spawn, i_gmm, i_rm, :,:,:] = sub_soil_SA
@@ -31,7 +31,7 @@ from scipy import array, asarray
 #import numpy as np
 import scipy as np
 
-from eqrm_code.distances import Distances
+from eqrm_code.distances import Distances, sparse_distances
 from eqrm_code.distance_functions import As_The_Cockey_Flies
 from eqrm_code.csv_interface import csv_to_arrays
 from eqrm_code.projections import azimuthal_orthographic as projection
@@ -219,7 +219,8 @@ class Sites(file_store.File_Store):
                              trace_start_lat=event_set.trace_start_lat,
                              trace_start_lon=event_set.trace_start_lon,
                              rupture_centroid_x=event_set.rupture_centroid_x,
-                             rupture_centroid_y=event_set.rupture_centroid_y)
+                             rupture_centroid_y=event_set.rupture_centroid_y,
+                             rupture_geometry=event_set.rupture_geometry())
         else:
             return Distances(self.latitude,
                              self.longitude,
@@ -233,6 +234,26 @@ class Sites(file_store.File_Store):
                              event_set.depths_to_top,
                              projection)
 
+    def sparse_distances_from_event_set(self, event_set, distance_types,
+                                        threshold_distance=None,
+                                        event_index=None):
+        """
+        The distances from self.sites to the events that are within
+        threshold_distance (Joyner_Boore), as a Sparse_Distances.
+
+        The distances are calculated a tile of sites x events at a
+        time, so the dense (sites, events) arrays are never made.  If
+        threshold_distance is None all of the pairs are kept.
+        event_index is an optional Event_Spatial_Index of the event set.
+        """
+        return sparse_distances(self.latitude,
+                                self.longitude,
+                                event_set,
+                                distance_types,
+                                projection,
+                                threshold_distance=threshold_distance,
+                                event_index=event_index)
+
     def closest_site(self, lat, lon):
         """Return the index of the closest site to the given lat and lon"""
         distances = As_The_Cockey_Flies(
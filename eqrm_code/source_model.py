@@ -167,13 +167,16 @@ class Source_Model(object):
 
         event_activity.set_event_activity(event_activity_matrix)
 
-    def set_ground_motion_calcs(self, periods):
+    def set_ground_motion_calcs(self, periods, tabulated=False):
         """
         Given the attenuation periods of interest, set the
         ground motion calculators for each region.
+
+        If tabulated is True the ground motion models that can be are
+        tabulated.
         """
         for source in self._sources:
-            source.set_ground_motion_calcs(periods)
+            source.set_ground_motion_calcs(periods, tabulated)
 
     def get_max_num_atten_models(self):
         """
@@ -317,13 +320,14 @@ class EventZone(object):
         self.atten_model_weights = parse_in_parameters.check_sum_1_normalise(
             atten_model_weights)
 
-    def set_ground_motion_calcs(self, periods):
+    def set_ground_motion_calcs(self, periods, tabulated=False):
         """
         """
         self.ground_motion_calculator = Multiple_ground_motion_calculator(
             self.atten_models,
             periods,
-            self.atten_model_weights)
+            self.atten_model_weights,
+            tabulated)
 
     def get_event_zone_instance(self):
         """
@@ -337,6 +341,32 @@ class EventZone(object):
                          scaling=self.scaling)
 
 
+class Source_View(object):
+
+    """A light weight view of a Source/EventZone with its own event indexes.
+
+    All other attributes, such as the ground_motion_calculator, are
+    shared with the viewed source, so building a view is cheap.
+    Used to hold the events that are close to a site.
+    """
+
+    def __init__(self, source, event_set_indexes):
+        self._source = source
+        self.event_set_indexes = event_set_indexes
+
+    def __getattr__(self, name):
+        # Only called when normal attribute lookup fails.
+        if name == '_source':
+            raise AttributeError(name)
+        return getattr(self._source, name)
+
+    def set_event_set_indexes(self, event_indexes):
+        self.event_set_indexes = asarray(event_indexes)
+
+    def get_event_set_indexes(self):
+        return self.event_set_indexes
+
+
 class RecurrenceModel(object):
 
     """
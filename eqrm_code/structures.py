@@ -240,6 +240,8 @@ class Structures(Sites):
                       eqrm_flags.csm_SDcr_tolerance_percentage / 100.0,
                       'csm_damping_max_iterations':
                       eqrm_flags.csm_damping_max_iterations,
+                      'csm_active_set':
+                      eqrm_flags.csm_active_set,
                       'sdtcap':  # FIXME sdt -> std
                       eqrm_flags.csm_standard_deviation,
                       'csm_use_variability':
@@ -0,0 +1,113 @@
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+from scipy import allclose, loadtxt
+
+from eqrm_code.analysis import main
+
+
+INPUT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         '..', 'implementation_tests', 'input')
+
+
+def hazard_flags(output_dir, site_block_size, site_block_max_close_pairs):
+    """
+    The flags of a small hazard run, with a Vs30 model and
+    amplification, over 5 sites.
+    """
+    return {'run_type': 'hazard',
+            'is_scenario': False,
+            'site_tag': 'newc',
+            'site_db_tag': '',
+            'return_periods': [10, 50, 100, 500, 1000, 2500],
+            'input_dir': INPUT_DIR,
+            'output_dir': output_dir,
+            'use_site_indexes': True,
+            'site_indexes': [2255, 11511, 10963, 686, 1026],
+            'zone_source_tag': '',
+            'event_control_tag': 'use',
+            'prob_number_of_events_in_zones': [1, 2, 1, 0, 0, 0],
+            'atten_models': ['Sadigh_97', 'Chiou08', 'Boore_08'],
+            'atten_model_weights': [0.3, 0.3, 0.4],
+            'atten_collapse_Sa_of_atten_models': True,
+            'atten_variability_method': None,
+            'atten_periods': [0.0, 0.30303, 1.0],
+            'atten_threshold_distance': 400,
+            'atten_override_RSA_shape': None,
+            'atten_cutoff_max_spectral_displacement': False,
+            'atten_pga_scaling_cutoff': 2,
+            'atten_smooth_spectral_acceleration': None,
+            'use_amplification': True,
+            'amp_variability_method': None,
+            'amp_min_factor': 0.6,
+            'amp_max_factor': 10000,
+            'save_hazard_map': True,
+            'site_block_size': site_block_size,
+            'site_block_max_close_pairs': site_block_max_close_pairs}
+
+
+class Test_Analysis(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def run_hazard(self, name, site_block_size,
+                   site_block_max_close_pairs=1000000000,
+                   local_processes=1):
+        output_dir = os.path.join(self.output_dir, name)
+        flags = hazard_flags(output_dir, site_block_size,
+                             site_block_max_close_pairs)
+        flags['local_processes'] = local_processes
+        main(flags, is_parallel=local_processes > 1,
+             parallel_finalise=False)
+        return output_dir
+
+    def assert_same_hazard(self, expected_dir, result_dirs):
+        hazard_files = [name for name in os.listdir(expected_dir)
+                        if '_SA_rp' in name]
+        self.assertEqual(len(hazard_files), 12)
+        for name in hazard_files:
+            expected = loadtxt(os.path.join(expected_dir, name),
+                               comments='%')
+            self.failUnless(expected[1:].any())
+            for output_dir in result_dirs:
+                result = loadtxt(os.path.join(output_dir, name),
+                                 comments='%')
+                self.failUnless(allclose(result, expected), name)
+
+    def test_site_blocks(self):
+        # Blocks of sites give the results of one site at a time.  The
+        # run has 4 events, so a block of 5 sites is halved to keep
+        # to 8 (site, close event) pairs.
+        one_site = self.run_hazard('one_site', 1)
+        self.assert_same_hazard(one_site,
+                                [self.run_hazard('block', 5),
+                                 self.run_hazard('halved_block', 5, 8)])
+
+    def test_local_processes(self):
+        # Local processes, sharing the run inputs, give the results of
+        # one process
+        try:
+            import pypar
+        except ImportError:
+            pass
+        else:
+            # With MPI the local processes are not used
+            return
+        one_process = self.run_hazard('one_process', 1)
+        self.assert_same_hazard(one_process,
+                                [self.run_hazard('processes', 1,
+                                                 local_processes=2)])
+
+
+#-------------------------------------------------------------
+if __name__ == "__main__":
+    suite = unittest.makeSuite(Test_Analysis, 'test')
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
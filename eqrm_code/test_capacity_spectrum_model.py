@@ -3,10 +3,11 @@ import sys
 #sys.path.append(os.getcwd()+os.sep+os.pardir+os.sep+'eqrm_code')
 import unittest
 
-from numpy import array, allclose, asarray
+from numpy import array, allclose, asarray, newaxis
 
 from eqrm_code.capacity_spectrum_model import Capacity_spectrum_model, \
-     CSM_DAMPING_REGIMES_USE_ALL, CSM_DAMPING_MODIFY_TAV
+     CSM_DAMPING_REGIMES_USE_ALL, CSM_DAMPING_MODIFY_TAV, \
+     _building_type_tables
 from eqrm_code.capacity_spectrum_functions import CSM_DAMPING_USE_SMOOTHING
 
 
@@ -172,6 +173,106 @@ class Test_Capaciy_Spectrum_model(unittest.TestCase):
                         array([[ 7.35287023]]))
         assert allclose(asarray(point),asarray(point_windows) )
 
+    def test_active_set(self):
+        # Only updating the points that have not converged gives the
+        # same response, within rtol.
+        periods = array([0.0, 0.17544, 0.35088, 0.52632, 0.70175, 0.87719,
+                         1.0526, 1.2281, 1.4035, 1.5789, 1.7544, 1.9298,
+                         2.1053, 2.2807, 2.4561, 2.6316, 2.807, 2.9825,
+                         3.1579, 3.3333])
+        SA = array([0.14210731, 0.29123634, 0.23670422, 0.13234554,
+                    0.08648546, 0.06338455, 0.04945741, 0.04140068,
+                    0.03497466, 0.02969136, 0.02525473, 0.02151188,
+                    0.018371, 0.01571802, 0.01344816, 0.01148438,
+                    0.00980236, 0.00836594, 0.00714065, 0.00609482])
+        # (building, event, period)
+        SA = SA * array([0.5, 1.0, 2.0, 4.0, 8.0])[:, newaxis]
+        SA = SA[newaxis, :, :].repeat(2, axis=0)
+        building_parameters = {
+            'design_strength': array([0.033, 0.1]),
+            'ultimate_to_yield': array([3., 2.]),
+            'damping_Be': array([0.1, 0.05]),
+            'fraction_in_first_mode': array([0.8, 0.75]),
+            'natural_elastic_period': array([0.5, 0.2]),
+            'damping_s': array([0.4, 0.4]),
+            'yield_to_design': array([1.5, 1.5]),
+            'height_to_displacement': array([0.75, 0.75]),
+            'ductility': array([5., 3.]),
+            'damping_l': array([0., 0.]),
+            'damping_m': array([0.2, 0.2])}
+        csm_params = {
+            'building_parameters': building_parameters,
+            'loss_min_pga': 0.05,
+            'csm_hysteretic_damping': 'trapezoidal',
+            'csm_use_variability': False,
+            'sdtcap': 0.3,
+            'csm_variability_method': None,
+            'rtol': 0.01,
+            'csm_damping_regimes': CSM_DAMPING_REGIMES_USE_ALL,
+            'csm_damping_modify_Tav': CSM_DAMPING_MODIFY_TAV,
+            'csm_damping_use_smoothing': CSM_DAMPING_USE_SMOOTHING,
+            'magnitudes': array([5.0, 5.5, 6.0, 6.5, 7.0]),
+            'periods': periods,
+            'atten_override_RSA_shape': None,
+            'atten_cutoff_max_spectral_displacement': False,
+            'csm_damping_max_iterations': 7}
+
+        point = Capacity_spectrum_model(**csm_params).building_response(SA)
+        csm_params['csm_active_set'] = True
+        active_point = Capacity_spectrum_model(
+            **csm_params).building_response(SA)
+        self.assert_(point[1].shape == (2, 5))
+        self.assert_(active_point[1].shape == (2, 5))
+        for values, active_values in zip(point, active_point):
+            self.assert_(allclose(active_values, values, rtol=0.01))
+
+    def test_building_type_tables(self):
+        # Buildings of the same type share capacity parameters and
+        # kappa, which are only worked out once per magnitude array.
+        def parameters(index):
+            return {
+                'design_strength': array([0.033, 0.1, 0.06])[index],
+                'ultimate_to_yield': array([3., 2., 2.5])[index],
+                'damping_Be': array([0.1, 0.05, 0.08])[index],
+                'fraction_in_first_mode': array([0.8, 0.75, 0.7])[index],
+                'natural_elastic_period': array([0.5, 0.2, 0.35])[index],
+                'damping_s': array([0.4, 0.4, 0.3])[index],
+                'yield_to_design': array([1.5, 1.5, 1.5])[index],
+                'height_to_displacement': array([0.75, 0.75, 0.7])[index],
+                'ductility': array([5., 3., 4.])[index],
+                'damping_l': array([0., 0., 0.1])[index],
+                'damping_m': array([0.2, 0.2, 0.25])[index]}
+
+        magnitudes = array([5.0, 6.0, 7.0, 8.0])
+        csm_params = {'magnitudes': magnitudes,
+                      'periods': array([0.0, 0.5, 1.0]),
+                      'sdtcap': 0.3,
+                      'csm_use_variability': True,
+                      'csm_variability_method': 5}
+        first_site = Capacity_spectrum_model(
+            building_parameters=parameters([0, 1, 0]), **csm_params)
+        second_site = Capacity_spectrum_model(
+            building_parameters=parameters([2, 1]), **csm_params)
+        self.assert_(len(_building_type_tables(second_site).types) == 3)
+
+        for csm, index in [(first_site, [0, 1, 0]), (second_site, [2, 1])]:
+            building_parameters = parameters(index)
+            capacity_parameters = csm._calculate_parameters(
+                building_parameters, magnitudes)
+            kappa = csm._calculate_kappa(building_parameters, magnitudes)
+            self.assert_(allclose(csm.kappa[:, :, 0], kappa,
+                                  rtol=0.0, atol=0.0))
+            for value, expected in zip(csm.capacity_parameters,
+                                       capacity_parameters):
+                self.assert_(value.shape == expected.shape)
+                self.assert_(allclose(value, expected, rtol=0.0, atol=0.0))
+
+        # New magnitudes, new tables
+        csm_params['magnitudes'] = magnitudes.copy()
+        third_site = Capacity_spectrum_model(
+            building_parameters=parameters([1]), **csm_params)
+        self.assert_(len(_building_type_tables(third_site).types) == 1)
+
 #-------------------------------------------------------------
 if __name__ == "__main__":
     suite = unittest.makeSuite(Test_Capaciy_Spectrum_model,'test')
@@ -0,0 +1,96 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from scipy import allclose, zeros, arange, random as np_random
+from numpy import load
+
+from eqrm_code.checkpoint import *
+
+
+class Test_Checkpoint(unittest.TestCase):
+
+    def setUp(self):
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
+    def test_save_load_checkpoint(self):
+        site_indices = arange(5)
+        hazard = np_random.uniform(size=(5, 2, 3))
+        # The sites are on axis 1
+        loss = np_random.uniform(size=(4, 5))
+        arrays = {'hazard': hazard, 'loss': loss}
+        site_axes = {'loss': 1}
+        save_checkpoint(self.output_dir, '-1', 0, 2, site_indices, arrays,
+                        site_axes)
+        # Sites after the next site are not saved
+        hazard[4] = 9.0
+        save_checkpoint(self.output_dir, '-1', 2, 4, site_indices, arrays,
+                        site_axes)
+        python_random = random.random()
+        numpy_random = np_random.uniform(size=4)
+
+        # Move the random number generators on.
+        random.random()
+        np_random.uniform(size=10)
+
+        # Each part only has the sites done since the last part
+        saved = load(checkpoint_file_name(self.output_dir, '-1', 2))
+        self.assertEqual(saved['hazard'].shape, (2, 2, 3))
+        self.assertEqual(saved['loss'].shape, (4, 2))
+        saved.close()
+
+        new_hazard = zeros((5, 2, 3))
+        new_loss = zeros((4, 5))
+        next_site = load_checkpoint(self.output_dir, '-1', site_indices,
+                                    {'hazard': new_hazard, 'loss': new_loss},
+                                    site_axes)
+        self.assertEqual(next_site, 4)
+        self.failUnless(allclose(new_hazard[:4], hazard[:4]))
+        self.failUnless(allclose(new_hazard[4], 0.0))
+        self.failUnless(allclose(new_loss[:, :4], loss[:, :4]))
+        self.failUnless(allclose(new_loss[:, 4], 0.0))
+        # The random numbers are the same as after the checkpoint.
+        self.assertEqual(random.random(), python_random)
+        self.failUnless(allclose(np_random.uniform(size=4), numpy_random))
+
+        remove_checkpoint(self.output_dir, '-1')
+        self.assertEqual(checkpoint_file_names(self.output_dir, '-1'), [])
+
+    def test_load_checkpoint_none(self):
+        hazard = zeros((5, 2, 3))
+        next_site = load_checkpoint(self.output_dir, '', arange(5),
+                                    {'hazard': hazard})
+        self.assertEqual(next_site, 0)
+        self.failUnless(allclose(hazard, 0))
+
+    def test_load_checkpoint_other_sites(self):
+        hazard = zeros((5, 2, 3))
+        save_checkpoint(self.output_dir, '', 0, 2, arange(5),
+                        {'hazard': hazard})
+        self.assertRaises(RuntimeError, load_checkpoint, self.output_dir, '',
+                          arange(5) * 2, {'hazard': hazard})
+
+    def test_block_done(self):
+        files = ([('hazard.txt', 1)], ['distances.txt'], [])
+        self.assert_(load_block_done(self.output_dir, '-2') is None)
+        save_block_done(self.output_dir, '-2', arange(3), files)
+        # Other blocks are not done
+        self.assert_(load_block_done(self.output_dir, '-20') is None)
+        self.assertEqual(load_block_done(self.output_dir, '-2', arange(3)),
+                         files)
+        self.assertRaises(RuntimeError, load_block_done, self.output_dir,
+                          '-2', arange(4))
+        remove_block_done(self.output_dir, '-2')
+        self.assert_(load_block_done(self.output_dir, '-2') is None)
+
+################################################################################
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(Test_Checkpoint, 'test')
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
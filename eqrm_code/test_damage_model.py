@@ -503,6 +503,7 @@ class Test_damage_model(unittest.TestCase):
         eqrm_flags.csm_damping_use_smoothing = CSM_DAMPING_USE_SMOOTHING
         eqrm_flags.csm_SDcr_tolerance_percentage = 1
         eqrm_flags.csm_damping_max_iterations = 7
+        eqrm_flags.csm_active_set = False
         eqrm_flags.csm_hysteretic_damping = 'trapezoidal'
         eqrm_flags.bridges_functional_percentages = None
         eqrm_flags.atten_override_RSA_shape = None
@@ -576,6 +577,66 @@ class Test_damage_model(unittest.TestCase):
                               array([[9978.48421213, 1226.05473008, 0.]]))
         assert allclose(asarray(total_loss), asarray(total_loss_windows))
 
+    def test_unique_buildings(self):
+        # Buildings with the same parameters and SA share damage states
+        periods = array([0., 0.17544, 0.35088, 0.52632, 0.70175])
+        SA = array([[0.14210731, 0.29123634, 0.23670422, 0.13234554,
+                     0.08648546],
+                    [0.2093217, 0.30976405, 0.16232743, 0.06989206,
+                     0.03216174]])
+        magnitudes = array([6.0, 7.0])
+
+        def parameters(index):
+            return {
+                'design_strength': array([0.033, 0.1])[index],
+                'natural_elastic_period': array([0.5, 0.2])[index],
+                'fraction_in_first_mode': array([0.8, 0.75])[index],
+                'height_to_displacement': array([0.75, 0.75])[index],
+                'yield_to_design': array([1.5, 1.5])[index],
+                'ultimate_to_yield': array([3., 2.])[index],
+                'ductility': array([5., 3.])[index],
+                'damping_s': array([0.4, 0.4])[index],
+                'damping_m': array([0.2, 0.2])[index],
+                'damping_l': array([0., 0.])[index],
+                'damping_Be': array([0.1, 0.05])[index],
+                'structural_damage_threshold':
+                    array([[26.3, 41.7, 88.9, 219.5],
+                           [11.0, 22.0, 44.0, 88.0]])[index],
+                'drift_threshold':
+                    array([[5.5, 43.9, 82.3, 137.2],
+                           [5.5, 43.9, 82.3, 137.2]])[index],
+                'acceleration_threshold':
+                    array([[0.2, 0.4, 0.8, 1.6],
+                           [0.2, 0.4, 0.8, 1.6]])[index]}
+
+        # (type, SA row) of each building
+        buildings = [(0, 0), (1, 0), (0, 0), (0, 1)]
+        types = [b[0] for b in buildings]
+        SA_rows = [b[1] for b in buildings]
+        building_parameters = parameters(types)
+        structures = Structures(latitude=[-31] * 4, longitude=[150] * 4,
+                                building_parameters=building_parameters)
+        building_SA = SA[SA_rows][:, newaxis, :].repeat(2, axis=1)
+        damage_model = Damage_model(structures, building_SA, periods,
+                                    magnitudes, False, 0.3)
+        self.assert_(damage_model.building_index.tolist() == [0, 1, 0, 2])
+        self.assert_(len(damage_model.unique_SA) == 3)
+        states = damage_model.get_building_states()
+
+        # Work out the damage of every building
+        all_buildings = Damage_model(structures, building_SA, periods,
+                                     magnitudes, False, 0.3)
+        all_buildings.building_index = None
+        all_buildings.unique_parameters = building_parameters
+        all_buildings.unique_SA = building_SA
+        all_buildings.capacity_spectrum_model = Capacity_spectrum_model(
+            periods, magnitudes, building_parameters)
+        expected = all_buildings.get_building_states()
+
+        for state, expected_state in zip(states, expected):
+            self.assert_(state.shape == (4, 2, 4))
+            self.assert_(allclose(state, expected_state, rtol=0.0, atol=0.0))
+
     def test_save_structure_damage_states(self):
         pass
 
@@ -0,0 +1,115 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from scipy import allclose, array, arange, random as np_random
+
+from eqrm_code.distance_cache import *
+from eqrm_code.distances import Distances
+from eqrm_code.event_set import Event_Set
+from eqrm_code.projections import azimuthal_orthographic as projection
+
+
+class Test_Distance_Cache(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_fingerprint(self):
+        lat = array([-33.0, -34.0])
+        lon = array([150.0, 151.0])
+        key = distances_key(lat, lon, 'abc', arange(3))
+        self.assertEqual(key, distances_key(lat.copy(), lon.copy(), 'abc',
+                                            arange(3)))
+        self.assertNotEqual(key, distances_key(lat, lon + 0.001, 'abc',
+                                               arange(3)))
+        self.assertNotEqual(key, distances_key(lat, lon, 'abd', arange(3)))
+        self.assertNotEqual(key, distances_key(lat, lon, 'abc', arange(4)))
+
+    def test_save_load(self):
+        cache = Distance_Cache(self.cache_dir, 10 ** 6)
+        self.assert_(cache.load('key', 'Rupture') is None)
+        distances = np_random.uniform(size=(3, 4))
+        cache.save('key', 'Rupture', distances)
+        loaded = cache.load('key', 'Rupture')
+        self.failUnless(allclose(loaded, distances, rtol=0.0, atol=0.0))
+        self.assert_(cache.load('key', 'Joyner_Boore') is None)
+
+    def test_evict(self):
+        distances = np_random.uniform(size=(10, 10))
+        cache = Distance_Cache(self.cache_dir, 10 ** 6)
+        cache.save('a', 'Rupture', distances)
+        file_bytes = os.path.getsize(cache.file_name('a', 'Rupture'))
+
+        # Room for two files
+        cache = Distance_Cache(self.cache_dir, 2 * file_bytes)
+        os.utime(cache.file_name('a', 'Rupture'), (1.0e9, 1.0e9))
+        cache.save('b', 'Rupture', distances)
+        os.utime(cache.file_name('b', 'Rupture'), (1.1e9, 1.1e9))
+        # a is used, so b is the least recently used
+        self.assert_(cache.load('a', 'Rupture') is not None)
+        cache.save('c', 'Rupture', distances)
+        self.assert_(cache.load('b', 'Rupture') is None)
+        self.assert_(cache.load('a', 'Rupture') is not None)
+        self.assert_(cache.load('c', 'Rupture') is not None)
+
+    def test_Distances_disk_cache(self):
+        event_set = Event_Set.create(
+            rupture_centroid_lat=[-33.35, -32.76, -32.9],
+            rupture_centroid_lon=[151.46, 151.78, 151.6],
+            azimuth=[162.9, 201.5, 10.0],
+            dip=[35.0, 90.0, 60.0],
+            ML=None,
+            Mw=[5.0, 4.7, 6.1],
+            depth=None,
+            fault_width=[15.0, 15.0, 15.0],
+            depth_top_seismogenic=[7.0, 7.0, 7.0])
+        lat = array([-33.0, -34.0])
+        lon = array([150.0, 151.0])
+
+        def distances():
+            return Distances(lat, lon,
+                             event_set.rupture_centroid_lat,
+                             event_set.rupture_centroid_lon,
+                             event_set.length, event_set.azimuth,
+                             event_set.width, event_set.dip,
+                             event_set.depth, event_set.depth_to_top,
+                             projection,
+                             trace_start_lat=event_set.trace_start_lat,
+                             trace_start_lon=event_set.trace_start_lon,
+                             rupture_centroid_x=event_set.rupture_centroid_x,
+                             rupture_centroid_y=event_set.rupture_centroid_y)
+
+        cache = Distance_Cache(self.cache_dir, 10 ** 6)
+        key = distances_key(lat, lon, event_set_fingerprint(event_set),
+                            arange(3))
+        first = distances()
+        first.use_disk_cache(cache, key)
+        first.calc_distances(['Rupture', 'Joyner_Boore'])
+        epicentral = first.distance('Epicentral')
+
+        second = distances()
+        second.use_disk_cache(cache, key)
+        # The distances come from the cache, not the distance functions
+        second.distance_functions = {}
+        second.raw_distances = None
+        second.calc_distances(['Rupture'])
+        self.failUnless(allclose(second.distance('Rupture'),
+                                 first.distance('Rupture'),
+                                 rtol=0.0, atol=0.0))
+        self.failUnless(allclose(second.distance('Joyner_Boore'),
+                                 first.distance('Joyner_Boore'),
+                                 rtol=0.0, atol=0.0))
+        self.failUnless(allclose(second.distance('Epicentral'), epicentral,
+                                 rtol=0.0, atol=0.0))
+
+################################################################################
+
+if __name__ == "__main__":
+    suite = unittest.makeSuite(Test_Distance_Cache, 'test')
+    runner = unittest.TextTestRunner()
+    runner.run(suite)
@@ -553,6 +553,113 @@ class Test_Distance_functions(unittest.TestCase):
         msg = ('Expected Rrup=\n%s\ngot\n%s' % (str(expected_Rrup), str(Rrup)))
         self.failUnless(allclose(Rrup, expected_Rrup, atol=1e-06), msg)
 
+    def test_fused_distances(self):
+        from scipy import random
+        random.seed(11)
+        num_events = 7
+        lat_sites = random.uniform(-1.0, 1.0, size=5)
+        lon_sites = random.uniform(-1.0, 1.0, size=5)
+        lat_events = random.uniform(-0.5, 0.5, size=num_events)
+        lon_events = random.uniform(-0.5, 0.5, size=num_events)
+        lengths = random.uniform(1.0, 20.0, size=num_events)
+        azimuths = random.uniform(0.0, 360.0, size=num_events)
+        widths = random.uniform(1.0, 10.0, size=num_events)
+        dips = random.uniform(10.0, 90.0, size=num_events)
+        dips[0] = 90.0
+        depths = random.uniform(5.0, 15.0, size=num_events)
+        depths_to_top = random.uniform(0.0, 5.0, size=num_events)
+        trace_start_lat = lat_events - 0.01
+        trace_start_lon = lon_events - 0.01
+        rupture_centroid_x = lengths / 2.0
+        rupture_centroid_y = widths / 4.0
+        args = (lat_sites, lon_sites, lat_events, lon_events, lengths,
+                azimuths, widths, dips, depths, depths_to_top, projection,
+                trace_start_lat, trace_start_lon, rupture_centroid_x,
+                rupture_centroid_y)
+
+        distance_types = RUPTURE_FRAME_DISTANCES + EVENT_FRAME_DISTANCES + \
+            ['Mendez_rupture']
+        fused = fused_distances(distance_types, *args)
+        self.assertEqual(sorted(fused.keys()), sorted(distance_types))
+        for distance_type in distance_types:
+            distance = distance_functions[distance_type](*args)
+            self.assertEqual(fused[distance_type].shape, (5, num_events))
+            self.failUnless(allclose(fused[distance_type], distance,
+                                     rtol=0.0, atol=0.0), distance_type)
+
+        # Distances fills the cache in one pass
+        dist = Distances(lat_sites, lon_sites, lat_events, lon_events,
+                         lengths, azimuths, widths, dips, depths,
+                         depths_to_top, projection,
+                         trace_start_lat=trace_start_lat,
+                         trace_start_lon=trace_start_lon,
+                         rupture_centroid_x=rupture_centroid_x,
+                         rupture_centroid_y=rupture_centroid_y)
+        dist.calc_distances(['Rupture', 'Joyner_Boore', 'Rupture'])
+        self.assertEqual(sorted(dist.distance_cache.keys()),
+                         ['Joyner_Boore', 'Rupture'])
+        self.failUnless(allclose(dist.distance('Rupture'), fused['Rupture']))
+
+    def test_Rupture_Geometry(self):
+        from scipy import random, array
+        random.seed(13)
+        num_events = 6
+        lat_sites = random.uniform(-1.0, 1.0, size=4)
+        lon_sites = random.uniform(-1.0, 1.0, size=4)
+        lat_events = random.uniform(-0.5, 0.5, size=num_events)
+        lon_events = random.uniform(-0.5, 0.5, size=num_events)
+        lengths = random.uniform(1.0, 20.0, size=num_events)
+        azimuths = random.uniform(0.0, 360.0, size=num_events)
+        widths = random.uniform(1.0, 10.0, size=num_events)
+        dips = random.uniform(10.0, 90.0, size=num_events)
+        dips[2] = 90.0
+        depths = random.uniform(5.0, 15.0, size=num_events)
+        depths_to_top = random.uniform(0.0, 5.0, size=num_events)
+        trace_start_lat = lat_events - 0.01
+        trace_start_lon = lon_events - 0.01
+        rupture_centroid_x = lengths / 2.0
+        rupture_centroid_y = widths / 4.0
+        args = (lat_sites, lon_sites, lat_events, lon_events, lengths,
+                azimuths, widths, dips, depths, depths_to_top, projection,
+                trace_start_lat, trace_start_lon, rupture_centroid_x,
+                rupture_centroid_y)
+
+        geometry = Rupture_Geometry(lengths, azimuths, widths, dips,
+                                    depths_to_top, rupture_centroid_y)
+        self.assertEqual(len(geometry), num_events)
+        fused = fused_distances(RUPTURE_FRAME_DISTANCES, *args,
+                                rupture_geometry=geometry)
+        for distance_type in RUPTURE_FRAME_DISTANCES:
+            distance = distance_functions[distance_type](*args)
+            self.failUnless(allclose(fused[distance_type], distance,
+                                     rtol=0.0, atol=0.0), distance_type)
+
+        # A slice of the geometry is the geometry of the sliced events
+        events = array([4, 2, 3])
+        sliced = geometry[events]
+        geometry_of_slice = Rupture_Geometry(
+            lengths[events], azimuths[events], widths[events], dips[events],
+            depths_to_top[events], rupture_centroid_y[events])
+        for attribute in Rupture_Geometry.attributes:
+            self.failUnless(allclose(getattr(sliced, attribute),
+                                     getattr(geometry_of_slice, attribute),
+                                     rtol=0.0, atol=0.0), attribute)
+
+        # Distances slices the geometry with the events
+        dist = Distances(lat_sites, lon_sites, lat_events, lon_events,
+                         lengths, azimuths, widths, dips, depths,
+                         depths_to_top, projection,
+                         trace_start_lat=trace_start_lat,
+                         trace_start_lon=trace_start_lon,
+                         rupture_centroid_x=rupture_centroid_x,
+                         rupture_centroid_y=rupture_centroid_y,
+                         rupture_geometry=geometry)
+        sub_dist = dist[events]
+        self.assertEqual(len(sub_dist.rupture_geometry), 3)
+        self.failUnless(allclose(sub_dist.distance('Rupture'),
+                                 fused['Rupture'][:, events],
+                                 rtol=0.0, atol=0.0))
+
     def test_Rupture_issue_143(self):
 
         #Using the example in the implementation tests, results_check.py file..
@@ -2,6 +2,13 @@ import os
 import sys
 import unittest
 
+from scipy import allclose, random, isinf, array
+
+from eqrm_code.distances import *
+from eqrm_code.event_set import Event_Set
+from eqrm_code.filters import Event_Spatial_Index
+from eqrm_code.projections import azimuthal_orthographic as projection
+
 
 class Test_Distances(unittest.TestCase):
 
@@ -11,6 +18,80 @@ class Test_Distances(unittest.TestCase):
     def tearDown(self):
         pass
 
+    def test_sparse_distances(self):
+        random.seed(17)
+        num_sites = 13
+        num_events = 29
+        site_lat = random.uniform(-35.0, -33.0, size=num_sites)
+        site_lon = random.uniform(150.0, 152.0, size=num_sites)
+        event_set = Event_Set.create(
+            rupture_centroid_lat=random.uniform(-35.5, -32.5,
+                                                size=num_events),
+            rupture_centroid_lon=random.uniform(149.5, 152.5,
+                                                size=num_events),
+            azimuth=random.uniform(0.0, 360.0, size=num_events),
+            dip=random.uniform(20.0, 90.0, size=num_events),
+            ML=None,
+            Mw=random.uniform(4.5, 7.0, size=num_events),
+            depth=None,
+            fault_width=random.uniform(5.0, 15.0, size=num_events),
+            depth_top_seismogenic=random.uniform(0.0, 5.0,
+                                                 size=num_events))
+        distance_types = ['Rupture', 'Epicentral']
+        dense = Distances(site_lat, site_lon,
+                          event_set.rupture_centroid_lat,
+                          event_set.rupture_centroid_lon,
+                          event_set.length, event_set.azimuth,
+                          event_set.width, event_set.dip,
+                          event_set.depth, event_set.depth_to_top,
+                          projection,
+                          trace_start_lat=event_set.trace_start_lat,
+                          trace_start_lon=event_set.trace_start_lon,
+                          rupture_centroid_x=event_set.rupture_centroid_x,
+                          rupture_centroid_y=event_set.rupture_centroid_y)
+        threshold = 100.0
+        close = dense.distance('Joyner_Boore') <= threshold
+        # Some pairs are dropped
+        self.failIf(close.all())
+        self.failUnless(close.any())
+
+        for event_index in [None, Event_Spatial_Index(event_set)]:
+            sparse = sparse_distances(site_lat, site_lon, event_set,
+                                      distance_types, projection,
+                                      threshold_distance=threshold,
+                                      event_index=event_index,
+                                      site_chunk_size=4,
+                                      event_chunk_size=7)
+            self.assertEqual(len(sparse), close.sum())
+            self.assertEqual(sparse.site_pointers[-1], close.sum())
+            for distance_type in distance_types:
+                result = sparse.dense(distance_type)
+                self.failUnless(isinf(result[~close]).all())
+                self.failUnless(allclose(result[close],
+                                         dense.distance(distance_type)[close]))
+            events, distances = sparse.site_events(5)
+            self.failUnless((events == close[5].nonzero()[0]).all())
+            self.failUnless(allclose(distances['Rupture'],
+                                     dense.distance('Rupture')[5, events]))
+
+        # Without a threshold all the pairs are kept
+        sparse = sparse_distances(site_lat[:2], site_lon[:2], event_set,
+                                  ['Joyner_Boore'], projection,
+                                  event_chunk_size=10)
+        self.assertEqual(len(sparse), 2 * num_events)
+        self.failUnless(allclose(sparse.dense('Joyner_Boore'),
+                                 dense.distance('Joyner_Boore')[:2]))
+
+        # A subset of the sites keeps the cached distances, and
+        # calculates the others for its sites
+        subset = dense.site_subset(slice(3, 5))
+        self.failUnless(subset.distance_cache['Joyner_Boore'] is not
+                        dense.distance_cache['Joyner_Boore'])
+        self.failUnless(allclose(subset.distance_cache['Joyner_Boore'],
+                                 dense.distance('Joyner_Boore')[3:5]))
+        self.failUnless(allclose(subset.distance('Hypocentral'),
+                                 dense.distance('Hypocentral')[3:5]))
+
 
 #-------------------------------------------------------------
 if __name__ == "__main__":
@@ -839,6 +839,30 @@ class Test_Event_Set(unittest.TestCase):
             self.assert_(event.rupture_centroid_y == set.rupture_centroid_y[i])
             self.assert_(event.rupture_centroid_x == set.rupture_centroid_x[i])
            
+    def test_event_set_rupture_geometry(self):
+        set = Event_Set.create(
+            rupture_centroid_lat=[-33.35, -32.76, -32.9],
+            rupture_centroid_lon=[151.46, 151.78, 151.6],
+            azimuth=[162.9, 201.5, 10.0],
+            dip=[35.0, 90.0, 60.0],
+            ML=None,
+            Mw=[5.0, 4.7, 6.1],
+            depth=None,
+            fault_width=[15.0, 15.0, 15.0],
+            depth_top_seismogenic=[7.0, 7.0, 7.0])
+
+        # A slice taken before the geometry is worked out has none
+        self.assert_(set[[0, 2]]._rupture_geometry is None)
+
+        geometry = set.rupture_geometry()
+        self.assert_(set.rupture_geometry() is geometry)
+        sub_set = set[[2, 0]]
+        self.assert_(sub_set._rupture_geometry is not None)
+        self.assert_(allclose(sub_set.rupture_geometry().half_length,
+                              set.length[[2, 0]] / 2.0))
+        self.assertEqual(list(sub_set.rupture_geometry().vertical),
+                         [False, False])
+        self.assertEqual(list(geometry.vertical), [False, True, False])
 
         
         
@@ -924,6 +948,36 @@ class Test_Event_Set(unittest.TestCase):
         self.assert_(allclose(ea.event_activity[0, 0, 1, 4], 8.))
 
 
+    def test_Event_Activity_Table(self):
+        num_events = 6
+        ea = Event_Activity(num_events)
+        indexes = arange(6)
+        activity = array((indexes*7, indexes*3))
+        ea.set_event_activity(activity, indexes)
+        a = DummyEventSet()
+        b = DummyEventSet()
+        a.atten_model_weights = array([.4, .6])
+        a.event_set_indexes = [0, 1, 3]
+        b.atten_model_weights = array([.1, .4, .5])
+        b.event_set_indexes = [2, 4]
+        source_model = Source_Model([a, b])
+        ea.ground_motion_model_logic_split(source_model, apply_weights=True)
+        ea.spawn(array([0.25, 0.75]))
+
+        table = Event_Activity_Table(ea, source_model)
+        self.assertEqual((table.num_spawn, table.num_gmm, table.num_rm,
+                          table.num_events), (2, 3, 2, 6))
+        self.assertEqual(table.num_gmm_max, 3)
+        self.assertEqual(len(table.source_event_indexes), 2)
+        self.assert_(allclose(table.source_event_indexes[0], [0, 1, 3]))
+        self.assert_(allclose(table.source_event_indexes[1], [2, 4]))
+
+        close_events = array([4, 1])
+        self.assert_(allclose(table.close_event_activity(close_events),
+                              ea.event_activity[..., close_events]))
+        self.assert_(allclose(table.close_event_activity(close_events, 2),
+                              ea.event_activity[:, :2, :, close_events]))
+
     def test_apply_spawn(self):      
         num_events = 6
         max_weights = 5
@@ -557,6 +557,90 @@ class Test_Exceedance(unittest.TestCase):
         self.assert_ (allclose(hzd, hzd_results))
         
         
+    def test_hzd_do_value_histogram(self):
+        bins_per_decade = 20
+        edges = hazard_grid(bins_per_decade)
+        scipy.random.seed(7)
+        # (spawn, gmm, rm, sites, events, periods)
+        sa = scipy.random.lognormal(mean=-2.0, sigma=1.0,
+                                    size=(1, 2, 1, 3, 1000, 2))
+        sa[:, :, :, 1, 100:200, :] = 0.0
+        # (spawn, gmm, rm, events)
+        r_nu = scipy.random.uniform(0.0001, 0.001, size=(1, 2, 1, 1000))
+        return_rates = array([0.1, 0.05, 0.02, 0.01, 0.005])
+
+        histogram = scipy.zeros((3, 2, len(edges) - 1))
+        # Two sources
+        accumulate_hazard_histogram(histogram, sa[..., :400, :],
+                                    r_nu[..., :400], edges)
+        accumulate_hazard_histogram(histogram, sa[..., 400:, :],
+                                    r_nu[..., 400:], edges)
+        self.assert_(allclose(histogram.sum(axis=-1)[0], r_nu.sum()))
+        # Zero SA is ignored
+        self.assert_(allclose(histogram[1].sum(axis=-1),
+                              r_nu.sum() - r_nu[..., 100:200].sum()))
+        # The rate of exceeding a bin edge is exact
+        exceed = (sa[:, :, :, 2, :, 0] >= edges[100]) * r_nu
+        self.assert_(allclose(histogram[2, 0, 100:].sum(), exceed.sum()))
+
+        hzd = hzd_do_value_histogram(histogram, edges, return_rates)
+        # Within a bin of the exact values
+        one_bin = 10 ** (1.0 / bins_per_decade)
+        for k in range(3):
+            for j in range(2):
+                exact = hzd_do_value(sa[:, :, :, k, :, j].ravel(),
+                                     r_nu.ravel(), return_rates)
+                self.assert_((hzd[k, j] <= exact * one_bin).all())
+                self.assert_((hzd[k, j] >= exact / one_bin).all())
+
+    def test_accumulate_hazard_histogram_rec_models(self):
+        # SA that is the same for each recurrence model can have an rm
+        # dimension of length 1
+        edges = hazard_grid(10)
+        scipy.random.seed(3)
+        # (spawn, gmm, rm, sites, events, periods)
+        sa = scipy.random.lognormal(mean=-2.0, sigma=1.0,
+                                    size=(2, 1, 1, 2, 50, 3))
+        # (spawn, gmm, rm, events)
+        r_nu = scipy.random.uniform(0.0001, 0.001, size=(2, 1, 3, 50))
+
+        histogram = scipy.zeros((2, 3, len(edges) - 1))
+        accumulate_hazard_histogram(histogram, sa, r_nu, edges)
+        repeated_histogram = scipy.zeros((2, 3, len(edges) - 1))
+        accumulate_hazard_histogram(repeated_histogram,
+                                    sa.repeat(3, axis=2), r_nu, edges)
+        self.assert_(allclose(histogram, repeated_histogram))
+
+    def test_hzd_do_value_histogram_empty(self):
+        edges = hazard_grid(10)
+        histogram = scipy.zeros((2, 1, len(edges) - 1))
+        hzd = hzd_do_value_histogram(histogram, edges, array([0.1, 0.01]))
+        self.assert_(allclose(hzd, 0.0))
+
+    def test_hzd_do_value_histogram_converges(self):
+        # The hazard values are within a bin of those of hzd_do_value,
+        # so get closer to them as the bins are made finer
+        scipy.random.seed(11)
+        # (spawn, gmm, rm, sites, events, periods)
+        sa = scipy.random.lognormal(mean=-2.0, sigma=1.0,
+                                    size=(1, 1, 1, 1, 20000, 1))
+        # (spawn, gmm, rm, events)
+        r_nu = scipy.random.uniform(0.00001, 0.0001, size=(1, 1, 1, 20000))
+        return_rates = array([0.5, 0.2, 0.1, 0.05])
+        exact = hzd_do_value(sa.ravel(), r_nu.ravel(), return_rates)
+
+        errors = []
+        for bins_per_decade in [1, 10, 100]:
+            edges = hazard_grid(bins_per_decade)
+            histogram = scipy.zeros((1, 1, len(edges) - 1))
+            accumulate_hazard_histogram(histogram, sa, r_nu, edges)
+            hzd = hzd_do_value_histogram(histogram, edges,
+                                         return_rates)[0, 0]
+            error = abs(scipy.log10(hzd / exact)).max()
+            self.assert_(error <= 1.0 / bins_per_decade)
+            errors.append(error)
+        self.assert_(errors[2] < errors[1] < errors[0])
+
     def test_collapse_att_model_dimension(self):
         gmm = 3
         rec_model = 1
@@ -9,9 +9,10 @@ import os
 import tempfile
 import unittest
 
-from scipy import allclose, zeros, ones
+from scipy import allclose, zeros, ones, array, random, where
 
 from eqrm_code.filters import *
+from eqrm_code import filters
 
 from eqrm_code.event_set import Event_Set
 from eqrm_code.sites import Sites
@@ -297,6 +298,87 @@ class Test_Filters(unittest.TestCase):
             self.failUnless(allclose(source.event_set_indexes,
                                      source_model_expected[i].event_set_indexes))
 
+    def test_source_model_threshold_distance_subset_shares_source(self):
+        """
+        Test source_model_threshold_distance_subset does not change the
+        original source model and shares the source data.
+        """
+        atten_threshold_distance = 400
+        self.source_model[0].ground_motion_calculator = 'dummy calculator'
+        
+        source_model_subset = source_model_threshold_distance_subset(
+                                                        self.distances,
+                                                        self.source_model,
+                                                        atten_threshold_distance)
+        
+        self.failUnless(allclose(source_model_subset[0].event_set_indexes,
+                                 [0]))
+        self.failUnless(allclose(self.source_model[0].event_set_indexes,
+                                 [0, 1]))
+        self.assertEqual(source_model_subset[0].name, 'scenario')
+        self.failUnless(source_model_subset[0].ground_motion_calculator is
+                        self.source_model[0].ground_motion_calculator)
+
+    def test_Event_Spatial_Index(self):
+        """
+        Test the candidate events include all events within the
+        threshold distance, for a random event set and site block.
+        """
+        num_events = 200
+        event_set = Event_Set.create(
+            rupture_centroid_lat=random.uniform(-40, -10, num_events),
+            rupture_centroid_lon=random.uniform(115, 155, num_events),
+            azimuth=random.uniform(0, 360, num_events),
+            dip=random.uniform(10, 90, num_events),
+            Mw=random.uniform(4.5, 7.5, num_events),
+            depth_top_seismogenic=zeros(num_events),
+            depth_bottom_seismogenic=ones(num_events) * 20.)
+        sites = Sites(array([-35.3, -33.9, -37.8]),
+                      array([149.1, 151.2, 144.9]))
+        distances = sites.distances_from_event_set(event_set)
+        Rjb = distances.distance('Joyner_Boore')
+        event_index = Event_Spatial_Index(event_set)
+        
+        for atten_threshold_distance in [0, 100, 400, 2000]:
+            candidates = event_index.candidate_events(
+                sites.latitude, sites.longitude, atten_threshold_distance)
+            close = where((Rjb <= atten_threshold_distance).any(axis=0))[0]
+            self.failUnless(set(close).issubset(set(candidates)))
+
+            # Refining one site at a time gives the same candidates
+            refine_pairs = filters.INDEX_REFINE_PAIRS
+            filters.INDEX_REFINE_PAIRS = 1
+            try:
+                site_candidates = event_index.candidate_events(
+                    sites.latitude, sites.longitude,
+                    atten_threshold_distance)
+            finally:
+                filters.INDEX_REFINE_PAIRS = refine_pairs
+            self.assertEqual(list(site_candidates), list(candidates))
+            
+            # The subset only has close events
+            source_model_subset = source_model_threshold_distance_subset(
+                sites.distances_from_event_set(event_set[candidates]),
+                Source_Model.create_scenario_source_model(num_events),
+                atten_threshold_distance,
+                event_indexes=candidates,
+                num_events=num_events)
+            self.failUnless(allclose(
+                    source_model_subset[0].get_event_set_indexes(), close))
+
+        # The number of events is not guessed from the indexes
+        self.assertRaises(ValueError, source_model_threshold_distance_subset,
+                          sites.distances_from_event_set(
+                              event_set[candidates]),
+                          Source_Model.create_scenario_source_model(
+                              num_events),
+                          400, event_indexes=candidates)
+        
+        # Sites on the other side of the world are not close
+        candidates = event_index.candidate_events(
+            array([40.]), array([-30.]), 400)
+        self.assertEqual(len(candidates), 0)
+
 #-------------------------------------------------------------    
 if __name__ == "__main__":
     suite = unittest.makeSuite(Test_Filters,'test')
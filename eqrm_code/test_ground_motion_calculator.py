@@ -9,7 +9,8 @@ from eqrm_code.ground_motion_interface import ground_motion_init
 from eqrm_code.ground_motion_misc import \
     Australian_standard_model_interpolation
 from eqrm_code.ground_motion_calculator import Ground_motion_calculator, \
-    Multiple_ground_motion_calculator
+    Multiple_ground_motion_calculator, Distribution_Buffers, \
+    TABULATED_MODELS, TABLE_ERROR_BOUND, ground_motion_table
 
 
 from eqrm_code.test_ground_motion_specification import data2atts, \
@@ -241,6 +242,135 @@ class Test_ground_motion_calculator(unittest.TestCase):
         self.assert_(log_sigma_array.shape == (
             2, num_sites, num_events, num_periods))
 
+    def test_multiple_GM_buffers(self):
+        # The results are the same with and without scratch buffers,
+        # and the buffers are reused from call to call.
+        periods = [0.0, 0.3, 1.0]
+        gm = Multiple_ground_motion_calculator(
+            ['Toro_1997_midcontinent', 'Atkinson_Boore_97'], periods,
+            [0.5, 0.5])
+
+        class ADistObj(object):
+
+            def __init__(self, distance):
+                self.the_distance = distance
+
+            def distance(self, dist_type):
+                return self.the_distance
+
+        magnitudes = {'Mw': array([5.0, 6.0, 6.5]),
+                      'ML': array([5.0, 6.0, 6.5])}
+        distance = array([[10.0, 50.0, 150.0], [20.0, 5.0, 300.0]])
+        log_mean, log_sigma = gm._distribution_function(
+            dist_object=ADistObj(distance), mag_dict=magnitudes)
+        self.assert_(log_mean.shape == (2, 2, 3, 3))
+
+        buffers = Distribution_Buffers()
+        log_mean_b, log_sigma_b = gm._distribution_function(
+            dist_object=ADistObj(distance), mag_dict=magnitudes,
+            buffers=buffers)
+        self.assert_(allclose(log_mean_b, log_mean, rtol=0.0, atol=0.0))
+        self.assert_(allclose(log_sigma_b, log_sigma, rtol=0.0, atol=0.0))
+        buffer_log_mean = buffers.log_mean
+
+        # A smaller call uses the same buffers
+        log_mean_s, log_sigma_s = gm._distribution_function(
+            dist_object=ADistObj(distance[:1]), mag_dict=magnitudes,
+            buffers=buffers)
+        self.assert_(buffers.log_mean is buffer_log_mean)
+        self.assert_(log_mean_s.shape == (2, 1, 3, 3))
+        self.assert_(allclose(log_mean_s, log_mean[:, :1],
+                              rtol=0.0, atol=0.0))
+        self.assert_(allclose(log_sigma_s, log_sigma[:, :1],
+                              rtol=0.0, atol=0.0))
+
+    def test_Ground_motion_table(self):
+        # The tabulated models are within TABLE_ERROR_BOUND of the
+        # models, and exact off the grid.
+        from scipy import random
+        random.seed(11)
+        periods = array([0.0, 0.1, 0.3, 1.0, 2.0])
+
+        class ADistObj(object):
+
+            def __init__(self, distance):
+                self.the_distance = distance
+
+            def distance(self, dist_type):
+                return self.the_distance
+
+        num_events = 500
+        mw = random.uniform(2.0, 8.5, size=num_events)
+        # Some magnitudes and distances are off the grid
+        mw[:3] = [1.5, 8.6, 5.0]
+        distance = exp(random.uniform(log(1.0), log(1000.0),
+                                      size=(3, num_events)))
+        distance[:, 2:4] = [0.5, 1200.0]
+        fault_type = random.randint(0, 3, size=num_events)
+        # Sadigh_97 is cheaper to work out than to interpolate, so it
+        # is not one of the TABULATED_MODELS, but its table is checked
+        for model_name in TABULATED_MODELS + ['Sadigh_97']:
+            magnitudes = {'Mw': mw, 'ML': mw}
+            off_grid = (slice(None), slice(0, 4))
+            if model_name == 'Sadigh_97':
+                # Sadigh_97 is NaN over magnitude 8.5
+                magnitudes = {'Mw': mw.clip(max=8.5), 'ML': mw.clip(max=8.5)}
+                off_grid = (slice(None), [0, 2, 3])
+            model = Ground_motion_calculator(model_name, periods)
+            self.assert_(model.table is None)
+            if model_name in TABULATED_MODELS:
+                tabulated = Ground_motion_calculator(model_name, periods,
+                                                     tabulated=True)
+            else:
+                self.failUnlessRaises(ValueError, Ground_motion_calculator,
+                                      model_name, periods, tabulated=True)
+                tabulated = Ground_motion_calculator(model_name, periods)
+                tabulated.table = ground_motion_table(
+                    tabulated.GM_spec, tabulated.coefficient,
+                    tabulated.sigma_coefficient, periods)
+            self.assert_(tabulated.table is not None)
+            for Vs30 in [array([300.0]), array([760.0])]:
+                kwargs = {'dist_object': ADistObj(distance),
+                          'dist_types': model.GM_spec.distance_types,
+                          'mag_dict': magnitudes,
+                          'fault_type': fault_type,
+                          'Vs30': Vs30,
+                          'periods': periods,
+                          'mag_type': model.GM_spec.magnitude_type}
+                log_mean, log_sigma = model.distribution_function(**kwargs)
+                log_mean_t, log_sigma_t = tabulated.distribution_function(
+                    **kwargs)
+                self.assert_(allclose(log_mean_t, log_mean, rtol=0.0,
+                                      atol=TABLE_ERROR_BOUND), model_name)
+                self.assert_(allclose(log_sigma_t, log_sigma, rtol=0.0,
+                                      atol=TABLE_ERROR_BOUND), model_name)
+                self.assert_(allclose(log_mean_t[off_grid],
+                                      log_mean[off_grid],
+                                      rtol=0.0, atol=0.0), model_name)
+
+        # Calculators with the same model and periods share the table
+        self.assert_(Ground_motion_calculator('Boore_08', periods,
+                                              tabulated=True).table is
+                     Ground_motion_calculator('Boore_08', periods,
+                                              tabulated=True).table)
+
+    def test_shared_coefficients(self):
+        # Calculators of the same model and periods share read only
+        # coefficient arrays.
+        periods = [0.0, 0.3, 1.0]
+        calc = Ground_motion_calculator('Boore_08', periods)
+        calc2 = Ground_motion_calculator('Boore_08', array(periods))
+        self.assert_(calc.coefficient is calc2.coefficient)
+        self.assert_(calc.sigma_coefficient is calc2.sigma_coefficient)
+        self.assertRaises(ValueError, calc.coefficient.__setitem__, 0, 1.0)
+
+        calc3 = Ground_motion_calculator('Boore_08', [0.0, 0.3])
+        self.assert_(calc3.coefficient is not calc.coefficient)
+        self.assert_(allclose(calc3.coefficient, calc.coefficient[..., :2]))
+        calc4 = Ground_motion_calculator('Toro_1997_midcontinent', periods)
+        self.assert_(calc4.coefficient.shape[0] !=
+                     calc.coefficient.shape[0])
+
 ##########################################################################
 
 if __name__ == "__main__":
@@ -184,6 +184,24 @@ class Test_Log_normal_distribution(unittest.TestCase):
         act_SA_2 = ones((1, 1, 1, 2, 3, 4)) * (10 + 2.5)
         act_SA = exp(concatenate((act_SA_0, act_SA_1, act_SA_2)))
         self.assert_(allclose(act_SA, sample_values))
+
+    def test_spawning_recurrence_models(self):
+        # The SA of every recurrence model is the same, so the
+        # recurrence model dimension is not repeated.
+        dln = GroundMotionDistributionLogNormal(var_method=SPAWN,
+                                                atten_spawn_bins=3,
+                                                n_recurrence_models=4)
+        log_mean = ones((1, 2, 3, 4)) * 10
+        log_sigma = ones((1, 2, 3, 4))
+        sample_values = dln.ground_motion_sample(log_mean, log_sigma)
+        self.assert_(sample_values.shape == (3, 1, 1, 2, 3, 4))
+        self.assert_(allclose(sample_values[1], exp(10)))
+
+        dln = GroundMotionDistributionLogNormal(var_method=RANDOM_SAMPLING,
+                                                atten_spawn_bins=3,
+                                                n_recurrence_models=4)
+        sample_values = dln.ground_motion_sample(log_mean, log_sigma)
+        self.assert_(sample_values.shape == (1, 1, 4, 2, 3, 4))
                
 
     def test_GroundMotionDistributionLogNormal(self):
@@ -207,6 +225,53 @@ class Test_Log_normal_distribution(unittest.TestCase):
         #print "actual", actual
         #print "sample_values", sample_values 
         self.assert_(allclose(sample_values, actual))
+
+    def test_Random_Stream(self):
+        # The samples of a site do not depend on the block of sites
+        # or the other events sampled with it.
+        dln = GroundMotionDistributionLogNormal(var_method=RANDOM_SAMPLING,
+                                                atten_spawn_bins=1,
+                                                n_recurrence_models=2)
+        dim = (3, 5, 4, 2) # gmm, site, event, period
+        log_mean = resize(arange(120) * 0.01, dim)
+        log_sigma = resize(arange(1, 3) * 0.5, dim)
+        site_indexes = arange(10, 15)
+        event_indexes = array([3, 8, 9, 20])
+        stream = Random_Stream(7, site_indexes, 2, event_indexes)
+        all_sites = dln.ground_motion_sample(log_mean, log_sigma,
+                                             stream=stream)
+        self.assert_(all_sites.shape == (1, 3, 2, 5, 4, 2))
+        # again, for the same numbers
+        again = dln.ground_motion_sample(log_mean, log_sigma,
+                                         stream=stream)
+        self.assert_(allclose(all_sites, again, rtol=0.0, atol=0.0))
+
+        # Sites 11 and 12, for events 8 and 20
+        block = Random_Stream(7, site_indexes[1:3], 2, event_indexes[1::2])
+        block_sites = dln.ground_motion_sample(
+            log_mean[:, 1:3, 1::2, :], log_sigma[:, 1:3, 1::2, :],
+            stream=block)
+        self.assert_(allclose(block_sites, all_sites[:, :, :, 1:3, 1::2, :],
+                              rtol=0.0, atol=0.0))
+        self.assert_(allclose(stream.sites(slice(1, 3)).key[:, 1::2],
+                              block.key, rtol=0.0, atol=0.0))
+
+        # No randomness in the period dimension
+        variate = log(all_sites) - log_mean[newaxis, :, newaxis, ...]
+        variate /= log_sigma[newaxis, :, newaxis, ...]
+        self.assert_(allclose(variate[..., 0], variate[..., 1]))
+
+        # Another source, seed or tag is another stream
+        for other in [Random_Stream(7, site_indexes, 3, event_indexes),
+                      Random_Stream(8, site_indexes, 2, event_indexes),
+                      stream.tagged(1)]:
+            self.failIf(allclose(other.standard_normal(6),
+                                 stream.standard_normal(6)))
+
+        # The variates are standard normal
+        variate = stream.standard_normal(2000)
+        self.assert_(abs(variate.mean()) < 0.05)
+        self.assert_(abs(variate.std() - 1.0) < 0.05)
                
         
 #-------------------------------------------------------------
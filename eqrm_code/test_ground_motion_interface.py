@@ -242,6 +242,36 @@ class Test_ground_motion_interface(unittest.TestCase):
         self.assert_(allclose(actual, log_mean_p[0][0][0]))
         self.assert_(allclose(actual, log_mean[0][0][0]))
 
+    def test_ground_motion_ext(self):
+        # The C versions give the same numbers as the NumPy versions.
+        # The C extension is optional, so this only checks them if it
+        # has been built.
+        if ground_motion_ext is None:
+            return
+        from scipy import random
+        random.seed(3)
+        mag = random.uniform(4.0, 8.5, size=(1, 20, 1))
+        distance = random.uniform(0.5, 400.0, size=(3, 20, 1))
+        for (model_name, distance_type, coefficient_shape,
+             sigma_coefficient_shape) in [
+                ('Toro_1997_midcontinent', 'Joyner_Boore', 7, 7),
+                ('Atkinson_Boore_97', 'Rupture', 4, 1),
+                ('Sadigh_97', 'Rupture', 16, 3)]:
+            kwargs = {'mag': mag,
+                      distance_type: distance,
+                      'coefficient': random.uniform(
+                    0.01, 1.0, size=(coefficient_shape, 1, 1, 4)),
+                      'sigma_coefficient': random.uniform(
+                    0.01, 1.0, size=(sigma_coefficient_shape, 1, 1, 4))}
+            log_mean, log_sigma = globals()[
+                model_name + '_distribution_c'](**kwargs)
+            log_mean_p, log_sigma_p = globals()[
+                model_name + '_distribution_python'](**kwargs)
+            self.assert_(allclose(log_mean, log_mean_p, rtol=0.0, atol=0.0),
+                         model_name)
+            self.assert_(allclose(log_sigma, log_sigma_p, rtol=0.0,
+                                  atol=0.0), model_name)
+
     def test_Boore_08_distribution_subfunctions(self):
         
         model_name='Boore_08'
@@ -1947,7 +1977,7 @@ class Test_ground_motion_interface(unittest.TestCase):
                                  msg)
         
     def speed_test(self):
-        """Tests relative speeds of the weave and pure-python versions of:
+        """Tests relative speeds of the C and pure-python versions of:
             Toro_1997_midcontinent_distribution
             Atkinson_Boore_97_distribution
             Sadigh_97_distribution
@@ -1961,7 +1991,7 @@ class Test_ground_motion_interface(unittest.TestCase):
         def speedup(p_time, w_time):
             """Utility function to calculate a 'times faster' figure given:
             p_time  python time
-            w_time  weave time
+            w_time  C time
 
             Returns a times faster float value.
             """
@@ -2002,7 +2032,7 @@ class Test_ground_motion_interface(unittest.TestCase):
         py_delta = time.time() - start
         print('%-*s %d iterations took %.3fs' % (NAMEWIDTH, name, LOOP, py_delta))
 
-        name = 'Toro_1997 (weave)'
+        name = 'Toro_1997 (C)'
         start = time.time()
         for i in xrange(LOOP):
             Toro_1997_midcontinent_distribution(mag=mag, distance=distance,
@@ -2010,7 +2040,7 @@ class Test_ground_motion_interface(unittest.TestCase):
         delta = time.time() - start
         print '%-*s %d iterations took %.3fs' % (NAMEWIDTH, name, LOOP, delta),
         s = speedup(py_delta, delta)
-        print('- Weave is %.2f times faster\n' % s)
+        print('- C is %.2f times faster\n' % s)
 
         # Atkinson_Boore_97 model - generate test data
         distance = array([[[10]]*NUMEVENTS])
@@ -2027,7 +2057,7 @@ class Test_ground_motion_interface(unittest.TestCase):
         py_delta = time.time() - start
         print('%-*s %d iterations took %.3fs' % (NAMEWIDTH, name, LOOP, py_delta))
 
-        name = 'Atkinson_Boore_97 (weave)'
+        name = 'Atkinson_Boore_97 (C)'
         start = time.time()
         for i in xrange(LOOP):
             Atkinson_Boore_97_distribution(mag=mag, distance=distance,
@@ -2035,7 +2065,7 @@ class Test_ground_motion_interface(unittest.TestCase):
         delta = time.time() - start
         print '%-*s %d iterations took %.3fs' % (NAMEWIDTH, name, LOOP, delta),
         s = speedup(py_delta, delta)
-        print('- Weave is %.2f times faster\n' % s)
+        print('- C is %.2f times faster\n' % s)
 
         # Sadigh_97 model - generate test data
         distance=array([[[10.0]]*NUMEVENTS])
@@ -2060,7 +2090,7 @@ class Test_ground_motion_interface(unittest.TestCase):
         py_delta = time.time() - start
         print('%-*s %d iterations took %.3fs' % (NAMEWIDTH, name, LOOP, py_delta))
 
-        name = 'Sadigh_97 (weave)' 
+        name = 'Sadigh_97 (C)' 
         start = time.time()
         for i in xrange(LOOP):
             Sadigh_97_distribution(mag=mag, distance=distance,
@@ -2068,7 +2098,7 @@ class Test_ground_motion_interface(unittest.TestCase):
         delta = time.time() - start
         print '%-*s %d iterations took %.3fs' % (NAMEWIDTH, name, LOOP, delta),
         s = speedup(py_delta, delta)
-        print('- Weave is %.2f times faster\n' % s)
+        print('- C is %.2f times faster\n' % s)
 
         # mean_10_sigma_1 model - generate data
         distance = zeros((NUMSITES, NUMEVENTS, NUMPERIODS))
@@ -5,7 +5,7 @@ import math
 
 from eqrm_code.ground_motion_specification import *
 from eqrm_code.ground_motion_interface import ground_motion_init, \
-     Log102Ln, LnCmss2Lng
+     Log102Ln, LnCmss2Lng, ground_motion_model
 from eqrm_code.ground_motion_misc import \
      Australian_standard_model_interpolation
 from eqrm_code.ground_motion_calculator import Ground_motion_calculator, \
@@ -2346,6 +2346,20 @@ class Test_ground_motion_specification(unittest.TestCase):
         self.assert_(allclose(model.sigma_coefficient, imported[6]))
         self.assert_(allclose(model.sigma_coefficient_period, imported[7]))
 
+    def test_ground_motion_model(self):
+        # The coefficient arrays are made once, and shared by the
+        # specifications of a model.
+        model_name = 'Toro_1997_midcontinent'
+        model = ground_motion_model(model_name)
+        self.assert_(model is ground_motion_model(model_name))
+        self.assert_(model[3].dtype == float)
+        self.assert_(allclose(model[3], ground_motion_init[model_name][3]))
+        spec = Ground_motion_specification(model_name)
+        self.assert_(spec.coefficient is model[3])
+        self.assert_(spec.sigma_coefficient is
+                     Ground_motion_specification(model_name).sigma_coefficient)
+        self.assertRaises(KeyError, Ground_motion_specification, 'Not_a_model')
+
 
 #-------------------------------------------------------------
 if __name__ == "__main__":
@@ -1,10 +1,93 @@
 
 import os
 import sys
+import shutil
+import tempfile
 import unittest
 
 from eqrm_code.parallel import *
 
+
+def local_process_check(result_dir):
+    """
+    Run in local processes by test_local_processes.
+    """
+    parra = Parallel(is_parallel=True)
+    parra.barrier()
+    received = []
+    if parra.rank == 0:
+        for source in range(1, parra.size):
+            received.append(parra.receive(source=source))
+    else:
+        parra.send(parra.rank * 10, 0)
+    parra.barrier()
+    parra.calc_lo_hi(10)
+    num_blocks = parra.calc_num_blocks()
+    f = open(os.path.join(result_dir, str(parra.rank)), 'w')
+    f.write(repr((parra.rank, parra.size, parra.is_local,
+                  list(parra.calc_indices(10)), received, num_blocks)))
+    f.close()
+
+
+def local_process_chunks(result_dir):
+    """
+    Run in local processes by test_local_processes_next_chunk.
+    """
+    parra = Parallel(is_parallel=True)
+    chunks = []
+    while True:
+        chunk = parra.next_chunk(20)
+        if chunk is None:
+            break
+        chunks.append(chunk)
+    f = open(os.path.join(result_dir, str(parra.rank)), 'w')
+    f.write(repr(chunks))
+    f.close()
+
+
+class Dummy_MPI_Comm(object):
+
+    """
+    Stands in for pypar on node 0, with the other nodes asking for
+    chunks in the order of requests.
+    """
+    any_source = -1
+
+    def __init__(self, size, requests):
+        self._size = size
+        self.requests = list(requests)
+        self.sent = []
+
+    def rank(self):
+        return 0
+
+    def size(self):
+        return self._size
+
+    def get_processor_name(self):
+        return 'node'
+
+    def receive(self, source, tag=None):
+        assert source == self.any_source and tag == CHUNK_TAG
+        return self.requests.pop(0)
+
+    def send(self, x, destination, tag=None):
+        assert tag == CHUNK_TAG
+        self.sent.append((destination, x))
+
+
+def local_process_fail(result_dir):
+    """
+    Run in local processes by test_local_processes_fail.
+    """
+    parra = Parallel(is_parallel=True)
+    if parra.rank == 1:
+        raise ValueError('Rank 1 fails before the barrier')
+    parra.barrier()
+    f = open(os.path.join(result_dir, str(parra.rank)), 'w')
+    f.close()
+
+
 class Test_Parallel(unittest.TestCase):
     
     def setUp(self):
@@ -85,6 +168,74 @@ class Test_Parallel(unittest.TestCase):
             else:
                 self.assert_ (lo == 1) 
                 self.assert_ (hi == 1)
+
+    def test_local_processes(self):
+        result_dir = tempfile.mkdtemp()
+        run_local_processes(3, local_process_check, result_dir)
+        results = []
+        for rank in range(3):
+            f = open(os.path.join(result_dir, str(rank)))
+            results.append(eval(f.read()))
+            f.close()
+        shutil.rmtree(result_dir)
+        
+        self.assertEqual(results[0], (0, 3, True, [0, 3, 6, 9], [10, 20], 3))
+        self.assertEqual(results[1], (1, 3, True, [1, 4, 7], [], None))
+        self.assertEqual(results[2], (2, 3, True, [2, 5, 8], [], None))
+        self.failIf(is_local_process())
+
+    def test_calc_chunk_indices(self):
+        parra = Parallel(is_parallel=False)
+        indices = parra.calc_chunk_indices(7, 3)
+        self.assertEqual([list(chunk) for chunk in indices],
+                         [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(parra.calc_chunk_indices(0, 3), [])
+
+    def test_next_chunk_not_parallel(self):
+        parra = Parallel(is_parallel=False)
+        chunks = []
+        while True:
+            chunk = parra.next_chunk(4)
+            if chunk is None:
+                break
+            chunks.append(chunk)
+        self.assertEqual(chunks, [0, 1, 2, 3])
+
+    def test_local_processes_next_chunk(self):
+        result_dir = tempfile.mkdtemp()
+        run_local_processes(3, local_process_chunks, result_dir)
+        all_chunks = []
+        for rank in range(3):
+            f = open(os.path.join(result_dir, str(rank)))
+            chunks = eval(f.read())
+            f.close()
+            # The first chunk of each node is its rank
+            self.assertEqual(chunks[0], rank)
+            all_chunks.extend(chunks)
+        shutil.rmtree(result_dir)
+        
+        # Each chunk is done once
+        self.assertEqual(sorted(all_chunks), range(20))
+
+    def test_mpi_next_chunk(self):
+        # Node 0 hands out the chunks as they are asked for
+        comm = Dummy_MPI_Comm(3, [1, 2, 2, 2, 1])
+        parra = Parallel(is_parallel=False)
+        parra._parallel(comm)
+        self.assertEqual(parra.next_chunk(3), None)
+        self.assertEqual(comm.sent, [(1, 0), (2, 1), (2, 2), (2, None),
+                                     (1, None)])
+        self.assertEqual(comm.requests, [])
+
+    def test_local_processes_fail(self):
+        # The other processes, waiting at the barrier, are terminated
+        result_dir = tempfile.mkdtemp()
+        try:
+            self.assertRaises(RuntimeError, run_local_processes, 3,
+                              local_process_fail, result_dir)
+            self.assertEqual(os.listdir(result_dir), [])
+        finally:
+            shutil.rmtree(result_dir)
              
 #-------------------------------------------------------------
 if __name__ == "__main__":
@@ -400,6 +400,27 @@ class Test_Parse_in_parameters(unittest.TestCase):
         data_array_storage = os.path.abspath(eqrm_flags.data_array_storage)
         self.failUnlessEqual(data_array_storage, expected_dir)
     
+    def test_checkpoint_random_sampling(self):
+        set = self.build_instance_to_eqrm_flags()
+        set.checkpoint_interval = 10
+        # Random sampling of the ground motion needs atten_stream_seed
+        set.atten_variability_method = 2
+        self.failUnlessRaises(AttributeSyntaxError,
+                              create_parameter_data, (set,))
+        set.atten_stream_seed = 5
+        create_parameter_data(set)
+
+    def test_tabulated_models(self):
+        set = self.build_instance_to_eqrm_flags()
+        # Only the TABULATED_MODELS can be tabulated
+        set.atten_tabulated = True
+        set.atten_models = ['Boore_08', 'Chiou08']
+        self.failUnlessRaises(AttributeSyntaxError,
+                              create_parameter_data, (set,))
+        set.atten_models = ['Boore_08', 'Campbell03']
+        set.atten_model_weights = [0.5, 0.5]
+        create_parameter_data(set)
+
     def test_directory_exists_check(self):
         set = self.build_instance_to_eqrm_flags()
         
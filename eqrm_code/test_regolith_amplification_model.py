@@ -4,9 +4,11 @@ import sys
 import unittest
 import tempfile
 
-from scipy import array, asarray, allclose, concatenate, newaxis, log, exp
+from scipy import array, asarray, allclose, concatenate, newaxis, log, exp, \
+    arange
 
 from eqrm_code.regolith_amplification_model import *
+from eqrm_code.interp import interp
 from eqrm_code.util import dict2csv
 
 
@@ -184,6 +186,51 @@ CD
 
         os.remove(file_name)
 
+    def test_distribution(self):
+        pga = [0.1, 0.2, 0.4]
+        moment_magnitude = [5.0, 6.0]
+        periods = [0.0, 0.5, 1.0]
+        log_amplifications = {}
+        log_stds = {}
+        for i, site_class in enumerate(['C', 'E', 'B']):
+            log_amplifications[site_class] = (
+                arange(18).reshape(2, 3, 3) * 0.1 + i)
+            log_stds[site_class] = arange(18).reshape(2, 3, 3) * 0.01 + i
+        amp_model = Regolith_amplification_model(
+            pga, moment_magnitude, periods, log_amplifications, log_stds)
+
+        site_classes = array(['E', 'A', 'B', 'C', 'E'])
+        Mw = array([4.0, 5.6, 6.6, 5.2])
+        ground_motion = exp(arange(60).reshape(5, 4, 3) * -0.05)
+        event_periods = array([0.25, 1.0, 0.5])
+        log_mean, log_sigma = amp_model.distribution(
+            ground_motion, site_classes, Mw, event_periods)
+
+        # The amplification of each site and event, the slow way
+        pga_bins = amp_model._bin_indices(ground_motion[:, :, 0], array(pga))
+        mag_bins = amp_model._bin_indices(Mw, array(moment_magnitude))
+        for i in range(5):
+            if site_classes[i] not in log_amplifications:
+                self.failUnless(allclose(log_mean[i], log(ground_motion[i])))
+                self.failUnless(allclose(log_sigma[i], 0.0))
+                continue
+            log_amp = interp(event_periods, log_amplifications[site_classes[i]],
+                             array(periods), axis=2)
+            log_std = interp(event_periods, log_stds[site_classes[i]],
+                             array(periods), axis=2)
+            for j in range(4):
+                m = mag_bins[j]
+                n = pga_bins[i, j]
+                self.failUnless(allclose(log_mean[i, j],
+                                         log(ground_motion[i, j]) +
+                                         log_amp[m, n]))
+                self.failUnless(allclose(log_sigma[i, j], log_std[m, n]))
+
+        # The interpolated tables are kept for the next call
+        tables = amp_model.period_tables(event_periods)
+        self.failUnless(amp_model.period_tables(event_periods.copy())[0]
+                        is tables[0])
+
     def test_load_site_class2Vs30(self):
         a = 60.0
         b = 2.0